@@ -1,15 +1,12 @@
 from typing import List
 
-from django.core.files.base import ContentFile
-
 from drf_chunked_upload.serializers import ChunkedUploadSerializer
-from drf_chunked_upload.views import ChunkedUploadView
 from rest_framework import status
 from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from .chunked_upload import BaseChunkedUpload
+from .chunked_upload import BaseChunkedUpload, BaseChunkedUploadView
 from .models import Annotation, AnnotationFolder
 
 
@@ -169,7 +166,7 @@ class AnnotationFileUploadSerializer(ChunkedUploadSerializer):
         read_only_fields = ("id", "created_at", "status", "completed_at")
 
 
-class AnnotationChunkedUploadView(ChunkedUploadView):
+class AnnotationChunkedUploadView(BaseChunkedUploadView):
     model = AnnotationFileUpload
     serializer_class = AnnotationFileUploadSerializer
     permission_classes = [IsAuthenticated]
@@ -265,12 +262,7 @@ class AnnotationChunkedUploadView(ChunkedUploadView):
         )
 
         if upload.file:
-            with open(upload.file.path, "rb") as f:
-                file_content = f.read()
-                annotation.file.save(
-                    upload.filename or f"upload_{annotation.id}",
-                    ContentFile(file_content),
-                    save=True,
-                )
+            upload.move_file_to(annotation.file, upload.filename or f"upload_{annotation.id}")
+            annotation.save()
 
         return annotation
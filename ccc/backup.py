@@ -0,0 +1,309 @@
+"""
+Incremental media backups.
+
+A media backup writes a tar archive straight into the destination directory
+together with a content-hash manifest. The manifest maps every media file
+(relative to MEDIA_ROOT) to its SHA-256, size, modification time and the
+archive member that holds its content. In incremental mode the previous
+manifest for the same destination is loaded first: files whose size and
+modification time are unchanged reuse the recorded hash without being read, and
+files whose content already exists in an earlier archive are referenced rather
+than stored again. Only new or changed content is written, so a run costs a
+directory walk plus time proportional to what changed. Full backups store
+every file, so their archive is a plain tar of MEDIA_ROOT.
+
+Every manifest lists every file, including content stored by earlier runs, so
+``restore_media_backup`` rebuilds MEDIA_ROOT from a single manifest plus the
+archives it references. ``prune_backups`` applies retention without breaking
+that: an archive is only deleted once no kept manifest references it.
+
+Every artefact is named after its BackupLog id and listed on the log, so
+concurrent or earlier runs never pick up each other's files.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tarfile
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MEDIA_BACKUP_EXCLUDE_DIRS = ("temp", "chunked_uploads")
+MANIFEST_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+# Completed backups kept per destination, matching dbbackup's --clean default
+BACKUP_RETENTION_COUNT = 10
+
+# Manifest entry positions: [sha256, size, mtime_ns, archive, member]
+SHA256, SIZE, MTIME_NS, ARCHIVE, MEMBER = range(5)
+
+
+@dataclass
+class MediaBackupResult:
+    """Outcome of one media backup run."""
+
+    archive_path: Optional[Path]
+    manifest_path: Path
+    files_total: int = 0
+    files_changed: int = 0
+    bytes_written: int = 0
+    artifacts: List[str] = field(default_factory=list)
+
+
+def file_sha256(path) -> str:
+    """Hash a file in fixed-size chunks."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def iter_media_files(media_root):
+    """
+    Yield (relative_path, os.stat_result) for every backed-up file under ``media_root``.
+
+    Top-level directories in MEDIA_BACKUP_EXCLUDE_DIRS (temporary exports and
+    in-progress uploads) are skipped.
+    """
+    media_root = Path(media_root)
+    excluded = set(getattr(settings, "MEDIA_BACKUP_EXCLUDE_DIRS", MEDIA_BACKUP_EXCLUDE_DIRS))
+    for dirpath, dirnames, filenames in os.walk(media_root):
+        if Path(dirpath) == media_root:
+            dirnames[:] = [name for name in dirnames if name not in excluded]
+        dirnames.sort()
+        for filename in sorted(filenames):
+            full_path = Path(dirpath) / filename
+            try:
+                stat_result = full_path.stat()
+            except OSError:
+                continue
+            yield full_path.relative_to(media_root).as_posix(), stat_result
+
+
+def load_manifest(manifest_path) -> Dict[str, list]:
+    """Load the file entries of a manifest, or an empty mapping if it is missing or unreadable."""
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return json.load(f).get("files", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def run_media_backup(destination, backup_id, previous_manifest=None, media_root=None) -> MediaBackupResult:
+    """
+    Back up MEDIA_ROOT into ``destination``.
+
+    Args:
+        destination: Directory receiving the archive and manifest
+        backup_id: BackupLog id used to name the artefacts
+        previous_manifest: Path of the manifest to diff against (full backup if None)
+        media_root: Directory to back up (defaults to MEDIA_ROOT)
+
+    Returns:
+        MediaBackupResult: Artefact paths and counts
+    """
+    destination = Path(destination)
+    media_root = Path(media_root or settings.MEDIA_ROOT)
+    incremental = previous_manifest is not None
+    previous = load_manifest(previous_manifest) if incremental else {}
+    stored_content = {entry[SHA256]: (entry[ARCHIVE], entry[MEMBER]) for entry in previous.values()}
+
+    archive_name = f"media_{backup_id}.tar"
+    archive_path = destination / archive_name
+    partial_path = destination / f"{archive_name}.part"
+    manifest_path = destination / f"media_{backup_id}.manifest.json"
+
+    result = MediaBackupResult(archive_path=archive_path, manifest_path=manifest_path)
+    files = {}
+
+    try:
+        with tarfile.open(partial_path, "w") as archive:
+            for relative_path, stat_result in iter_media_files(media_root):
+                old = previous.get(relative_path)
+                if old and old[SIZE] == stat_result.st_size and old[MTIME_NS] == stat_result.st_mtime_ns:
+                    digest = old[SHA256]
+                else:
+                    digest = file_sha256(media_root / relative_path)
+
+                result.files_total += 1
+                if digest in stored_content:
+                    location = stored_content[digest]
+                else:
+                    archive.add(str(media_root / relative_path), arcname=relative_path, recursive=False)
+                    location = (archive_name, relative_path)
+                    if incremental:
+                        stored_content[digest] = location
+                    result.files_changed += 1
+                    result.bytes_written += stat_result.st_size
+
+                files[relative_path] = [digest, stat_result.st_size, stat_result.st_mtime_ns, *location]
+    except BaseException:
+        if partial_path.exists():
+            os.remove(partial_path)
+        raise
+
+    if result.files_changed:
+        os.replace(partial_path, archive_path)
+        result.artifacts.append(str(archive_path))
+    else:
+        os.remove(partial_path)
+        result.archive_path = None
+
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "version": MANIFEST_VERSION,
+                "backup_id": backup_id,
+                "base_manifest": str(previous_manifest) if previous_manifest else None,
+                "files": files,
+            },
+            f,
+        )
+    result.artifacts.append(str(manifest_path))
+
+    logger.info(
+        f"Media backup {backup_id}: {result.files_changed} of {result.files_total} files written "
+        f"({result.bytes_written} bytes)"
+    )
+    return result
+
+
+def _restore_target(media_root, relative_path) -> Path:
+    target = (media_root / relative_path).resolve()
+    if not target.is_relative_to(media_root.resolve()):
+        raise ValueError(f"Manifest path {relative_path!r} escapes the restore directory")
+    return target
+
+
+def restore_media_backup(manifest_path, media_root=None, clean=False) -> int:
+    """
+    Rebuild ``media_root`` from a manifest and the archives it references.
+
+    Archives are looked up next to the manifest. Restored files are checked
+    against their recorded SHA-256 and get their recorded modification time
+    back, so the next incremental backup does not re-hash them.
+
+    Args:
+        manifest_path: Manifest of the backup to restore
+        media_root: Directory to restore into (defaults to MEDIA_ROOT)
+        clean: Also delete backed-up files that are not in the manifest
+
+    Returns:
+        int: Number of files restored
+
+    Raises:
+        FileNotFoundError: If the manifest or a referenced archive is missing
+        ValueError: If the manifest is invalid or restored content does not match it
+    """
+    manifest_path = Path(manifest_path)
+    media_root = Path(media_root or settings.MEDIA_ROOT)
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        files = json.load(f)["files"]
+
+    by_archive = defaultdict(list)
+    for relative_path, entry in files.items():
+        by_archive[entry[ARCHIVE]].append((relative_path, entry))
+
+    restored = 0
+    for archive_name, entries in sorted(by_archive.items()):
+        with tarfile.open(manifest_path.parent / archive_name) as archive:
+            for relative_path, entry in entries:
+                target = _restore_target(media_root, relative_path)
+                source = archive.extractfile(entry[MEMBER])
+                if source is None:
+                    raise ValueError(f"{archive_name} has no file {entry[MEMBER]!r}")
+                target.parent.mkdir(parents=True, exist_ok=True)
+                partial_path = target.with_name(f"{target.name}.part")
+                hasher = hashlib.sha256()
+                with source, open(partial_path, "wb") as out:
+                    for chunk in iter(lambda: source.read(HASH_CHUNK_SIZE), b""):
+                        hasher.update(chunk)
+                        out.write(chunk)
+                if hasher.hexdigest() != entry[SHA256]:
+                    os.remove(partial_path)
+                    raise ValueError(f"Checksum mismatch restoring {relative_path!r} from {archive_name}")
+                os.replace(partial_path, target)
+                os.utime(target, ns=(entry[MTIME_NS], entry[MTIME_NS]))
+                restored += 1
+
+    if clean:
+        for relative_path, _ in list(iter_media_files(media_root)):
+            if relative_path not in files:
+                os.remove(media_root / relative_path)
+
+    logger.info(f"Restored {restored} media files from {manifest_path}")
+    return restored
+
+
+def _referenced_archives(manifest_path) -> set:
+    manifest_dir = Path(manifest_path).parent
+    return {str(manifest_dir / entry[ARCHIVE]) for entry in load_manifest(manifest_path).values()}
+
+
+def prune_backups(destination, keep=None) -> List[str]:
+    """
+    Delete the artefacts of backups to ``destination`` older than the newest ``keep`` completed ones.
+
+    A media archive of a pruned backup is kept while any kept manifest still
+    references it, so every kept backup stays restorable. Pruned logs keep
+    their rows, with ``artifacts`` trimmed to the files that remain.
+
+    Args:
+        destination: Backup destination directory
+        keep: Completed backups to keep (defaults to BACKUP_RETENTION_COUNT,
+            or DBBACKUP_CLEANUP_KEEP when set)
+
+    Returns:
+        list: Paths of the deleted files
+    """
+    from ccc.models import BackupLog
+
+    if keep is None:
+        keep = getattr(settings, "BACKUP_RETENTION_COUNT", getattr(settings, "DBBACKUP_CLEANUP_KEEP", None))
+    keep = max(int(keep or BACKUP_RETENTION_COUNT), 1)
+
+    logs = (
+        BackupLog.objects.filter(destination=str(destination)).exclude(status="running").order_by("-started_at", "-id")
+    )
+    kept, older = [], []
+    for log in logs:
+        if len(kept) < keep and log.status == "completed":
+            kept.append(log)
+        elif len(kept) >= keep:
+            older.append(log)
+
+    referenced = set()
+    for log in kept:
+        referenced.update(log.artifacts)
+        if log.manifest_path:
+            referenced.update(_referenced_archives(log.manifest_path))
+
+    removed = []
+    for log in older:
+        remaining = []
+        for path in log.artifacts:
+            if path in referenced:
+                remaining.append(path)
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            removed.append(path)
+        if remaining != log.artifacts:
+            log.artifacts = remaining
+            if log.manifest_path not in remaining:
+                log.manifest_path = ""
+            log.save(update_fields=["artifacts", "manifest_path"])
+
+    if removed:
+        logger.info(f"Pruned {len(removed)} backup files from {destination}")
+    return removed
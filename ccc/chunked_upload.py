@@ -4,22 +4,50 @@ CUPCAKE Core (CCC) - Base Chunked Upload Infrastructure.
 Provides reusable chunked upload functionality that can be extended by any
 CUPCAKE application. Built on top of drf-chunked-upload with additional
 features for security, integrity checking, and file management.
+
+Checksums are computed incrementally: the hash state of each upload is kept in
+process memory and updated as chunks are appended, so completing an upload does
+not re-read the assembled file. If a chunk lands on another worker process, the
+state is rebuilt once from the bytes already on disk. Completed files are moved
+into their final location with a rename rather than a copy.
 """
 
 import hashlib
 import mimetypes
 import os
+from collections import OrderedDict
 from typing import List, Optional, Tuple
 
 from django.conf import settings
+from django.core.files import File
 from django.db import models
 from django.utils import timezone
 
+from drf_chunked_upload import settings as chunked_upload_settings
+from drf_chunked_upload.exceptions import ChunkedUploadError
 from drf_chunked_upload.models import AbstractChunkedUpload
 from drf_chunked_upload.serializers import ChunkedUploadSerializer
 from drf_chunked_upload.views import ChunkedUploadView
+from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 
+# Upload id -> (offset, hash object) for uploads in progress in this process
+_CHECKSUM_STATES = OrderedDict()
+CHECKSUM_STATE_CACHE_SIZE = 256
+
+
+def new_checksum_hasher():
+    """Create a hash object of the configured DRF_CHUNKED_UPLOAD_CHECKSUM type."""
+    return hashlib.new(chunked_upload_settings.CHECKSUM_TYPE)
+
+
+def hash_chunk(chunk, hasher=None):
+    """Feed an uploaded chunk into ``hasher`` (a new one by default) and return it."""
+    hasher = hasher or new_checksum_hasher()
+    for subchunk in chunk.chunks():
+        hasher.update(subchunk)
+    return hasher
+
 
 class BaseChunkedUpload(AbstractChunkedUpload):
     """
@@ -88,18 +116,112 @@ class BaseChunkedUpload(AbstractChunkedUpload):
 
         super().save(*args, **kwargs)
 
+    @property
+    def checksum(self):
+        """Checksum of the uploaded bytes, from the incremental state when available."""
+        if getattr(self, "_checksum", None) is None:
+            state = _CHECKSUM_STATES.get(self.pk)
+            if state and state[0] == self.offset:
+                self._checksum = state[1].copy().hexdigest()
+            else:
+                self._checksum = AbstractChunkedUpload.checksum.fget(self)
+        return self._checksum
+
+    def remember_checksum_state(self, hasher):
+        """Store the hash state for the bytes uploaded so far (up to ``offset``)."""
+        _CHECKSUM_STATES[self.pk] = (self.offset, hasher)
+        _CHECKSUM_STATES.move_to_end(self.pk)
+        while len(_CHECKSUM_STATES) > CHECKSUM_STATE_CACHE_SIZE:
+            _CHECKSUM_STATES.popitem(last=False)
+
+    def forget_checksum_state(self):
+        _CHECKSUM_STATES.pop(self.pk, None)
+
+    def _checksum_state(self):
+        """Return the hash state at ``offset``, rebuilding it from disk if this process has none."""
+        state = _CHECKSUM_STATES.get(self.pk)
+        if state and state[0] == self.offset:
+            return state[1]
+
+        hasher = new_checksum_hasher()
+        if self.file and self.offset:
+            remaining = self.offset
+            with open(self.file.path, "rb") as f:
+                while remaining > 0:
+                    data = f.read(min(1024 * 1024, remaining))
+                    if not data:
+                        break
+                    hasher.update(data)
+                    remaining -= len(data)
+        return hasher
+
+    def append_chunk(self, chunk, chunk_size=None, save=True):
+        """Append a chunk to the file, updating the checksum state with the same bytes."""
+        hasher = self._checksum_state()
+        self.file.close()
+        self.file.open(mode="ab")
+        for subchunk in chunk.chunks():
+            self.file.write(subchunk)
+            hasher.update(subchunk)
+        if chunk_size is not None:
+            self.offset += chunk_size
+        elif hasattr(chunk, "size"):
+            self.offset += chunk.size
+        else:
+            self.offset = self.file.size
+        self._checksum = None
+        self.remember_checksum_state(hasher)
+        if save:
+            self.save()
+        self.file.close()
+
+    def delete(self, delete_file=True, *args, **kwargs):
+        self.forget_checksum_state()
+        return super().delete(delete_file, *args, **kwargs)
+
+    def move_file_to(self, field_file, name):
+        """
+        Move the completed upload into another model's file field.
+
+        The file is renamed into place when both locations are on the same
+        filesystem, and copied otherwise. The upload no longer references the
+        file afterwards. The instance owning ``field_file`` is not saved.
+
+        Args:
+            field_file: Target FieldFile (e.g. ``annotation.file``)
+            name: Filename passed to the target field's ``upload_to``
+
+        Returns:
+            str: Stored name of the file in the target storage
+        """
+        storage = field_file.storage
+        field = field_file.field
+        target_name = storage.get_available_name(
+            field.generate_filename(field_file.instance, name), max_length=field.max_length
+        )
+        source_path = self.file.path
+        self.file.close()
+
+        try:
+            target_path = storage.path(target_name)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            os.replace(source_path, target_path)
+            field_file.name = target_name
+        except (NotImplementedError, OSError):
+            with open(source_path, "rb") as f:
+                field_file.save(name, File(f), save=False)
+            self.file.storage.delete(self.file.name)
+
+        self.forget_checksum_state()
+        self.file = None
+        self.save()
+        return field_file.name
+
     def generate_filename(self):
         """Generate secure filename using SHA-256 hash and timestamp."""
         if self.file and self.user:
-            # Calculate hash for uniqueness
-            sha256_hash = hashlib.sha256()
-            self.file.seek(0)
-            for chunk in iter(lambda: self.file.read(4096), b""):
-                sha256_hash.update(chunk)
-            self.file.seek(0)
-
             # Create filename components
-            hash_prefix = sha256_hash.hexdigest()[:16]
+            hash_prefix = self.checksum[:16]
             timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
             user_id = self.user.id
 
@@ -267,5 +389,31 @@ class BaseChunkedUploadSerializer(ChunkedUploadSerializer):
 
 
 class BaseChunkedUploadView(ChunkedUploadView):
+    """
+    Chunked upload view with optional per-chunk checksums.
+
+    Clients may send the checksum of each chunk (same algorithm as the final
+    checksum) in the ``X-Chunk-Checksum`` header; a mismatching chunk is
+    rejected before it is written.
+    """
+
     serializer_class = BaseChunkedUploadSerializer
     permission_classes = [IsAuthenticated]
+    chunk_checksum_header = "HTTP_X_CHUNK_CHECKSUM"
+
+    def _put_chunk(self, request, pk=None, whole=False, *args, **kwargs):
+        chunk = request.data.get(self.field_name)
+        expected_checksum = request.META.get(self.chunk_checksum_header)
+
+        chunk_hasher = None
+        if chunk is not None and (expected_checksum or not pk):
+            chunk_hasher = hash_chunk(chunk)
+            if expected_checksum and chunk_hasher.hexdigest() != expected_checksum.strip().lower():
+                raise ChunkedUploadError(status=status.HTTP_400_BAD_REQUEST, detail="Chunk checksum does not match")
+
+        chunked_upload = super()._put_chunk(request, pk, whole, *args, **kwargs)
+
+        # The first chunk is written by the serializer rather than append_chunk
+        if not pk and chunk_hasher is not None:
+            chunked_upload.remember_checksum_state(chunk_hasher)
+        return chunked_upload
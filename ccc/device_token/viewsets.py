@@ -66,7 +66,7 @@ class DeviceSummaryViewSet(viewsets.ViewSet):
             instrument_count = Instrument.objects.filter(enabled=True, is_vaulted=False).count()
             active_jobs = InstrumentJob.objects.filter(status__in=["pending", "in_progress"], user=user).count()
             low_reagents = StoredReagent.objects.filter(
-                quantity__lte=models.F("low_stock_threshold"), user=user
+                current_quantity__lte=models.F("low_stock_threshold"), user=user
             ).count()
         except ImportError:
             pass
@@ -0,0 +1,195 @@
+"""
+File serving for signed downloads.
+
+Behind nginx, downloads are handed off with ``X-Accel-Redirect`` to the
+``/internal/media/`` location. In the desktop builds (Electron and Wails) there
+is no nginx, so files are streamed from disk in fixed-size chunks instead of
+being read into memory, with support for single byte ranges (so media players
+can seek) and for ``If-None-Match`` / ``If-Modified-Since`` revalidation.
+
+Callers verify the signed download token and permissions before calling
+``serve_file``; the file is only opened once the response is being sent.
+"""
+
+import os
+import re
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.http import http_date, parse_http_date_safe
+
+FILE_STREAM_CHUNK_SIZE = 64 * 1024
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def use_x_accel_redirect():
+    """
+    Return whether downloads should be delegated to nginx.
+
+    ``USE_X_ACCEL_REDIRECT`` overrides the default, which is to use nginx
+    everywhere except the Electron and Wails desktop environments.
+    """
+    explicit = getattr(settings, "USE_X_ACCEL_REDIRECT", None)
+    if explicit is not None:
+        return explicit
+    return not (getattr(settings, "IS_ELECTRON_ENVIRONMENT", False) or getattr(settings, "IS_WAILS_ENVIRONMENT", False))
+
+
+def file_etag(stat_result):
+    """Build a strong ETag from file size and modification time."""
+    return f'"{stat_result.st_size:x}-{stat_result.st_mtime_ns:x}"'
+
+
+def parse_range_header(header, size):
+    """
+    Parse a single-range ``Range`` header.
+
+    Args:
+        header: Raw ``Range`` header value
+        size: File size in bytes
+
+    Returns:
+        tuple: (start, end) inclusive byte positions, ``None`` if the header
+            should be ignored (absent, malformed or multi-range), or ``False``
+            if the range cannot be satisfied
+    """
+    if not header:
+        return None
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            return False
+        return max(0, size - suffix), size - 1
+
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        return False
+    return start, end
+
+
+def _not_modified(request, etag, mtime):
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+    if_modified_since = parse_http_date_safe(request.META.get("HTTP_IF_MODIFIED_SINCE", ""))
+    return if_modified_since is not None and int(mtime) <= if_modified_since
+
+
+def _range_applies(request, etag, last_modified):
+    if_range = request.META.get("HTTP_IF_RANGE")
+    return if_range is None or if_range.strip() in (etag, last_modified)
+
+
+def iter_file(path, start=0, length=None, chunk_size=None):
+    """
+    Yield ``length`` bytes of a file from ``start`` in chunks.
+
+    The file is closed when the iterator is exhausted or closed by the server.
+    """
+    chunk_size = chunk_size or getattr(settings, "FILE_STREAM_CHUNK_SIZE", FILE_STREAM_CHUNK_SIZE)
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = length
+        while remaining is None or remaining > 0:
+            data = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+            if not data:
+                break
+            if remaining is not None:
+                remaining -= len(data)
+            yield data
+
+
+def _set_common_headers(response, filename, content_type, as_attachment, cache_control):
+    disposition = "attachment" if as_attachment else "inline"
+    response["Content-Type"] = content_type or "application/octet-stream"
+    response["Content-Disposition"] = f'{disposition}; filename="{filename}"'
+    response["Cache-Control"] = cache_control
+    response["X-Content-Type-Options"] = "nosniff"
+    response["X-Download-Options"] = "noopen"
+
+
+def serve_file(
+    request,
+    file_field,
+    filename=None,
+    content_type=None,
+    as_attachment=True,
+    cache_control="private, max-age=300",
+):
+    """
+    Serve a stored file, through nginx when available or streamed from disk otherwise.
+
+    Args:
+        request: Incoming request (used for Range and conditional headers)
+        file_field: FieldFile of the file to serve
+        filename: Download filename (defaults to the stored file's basename)
+        content_type: Response content type
+        as_attachment: Send ``Content-Disposition: attachment`` rather than inline
+        cache_control: ``Cache-Control`` header value
+
+    Returns:
+        HttpResponse: X-Accel-Redirect response, 200/206 streamed response,
+            304 when the client copy is current, 404 if the file is missing or
+            416 for an unsatisfiable range
+    """
+    filename = filename or os.path.basename(file_field.name)
+
+    if use_x_accel_redirect():
+        response = HttpResponse()
+        response["X-Accel-Redirect"] = f"/internal/media/{file_field.name}"
+        _set_common_headers(response, filename, content_type, as_attachment, cache_control)
+        return response
+
+    path = file_field.path
+    try:
+        stat_result = os.stat(path)
+    except OSError:
+        return HttpResponse("File not found", status=404)
+
+    size = stat_result.st_size
+    etag = file_etag(stat_result)
+    last_modified = http_date(stat_result.st_mtime)
+
+    if _not_modified(request, etag, stat_result.st_mtime):
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        response["Last-Modified"] = last_modified
+        response["Cache-Control"] = cache_control
+        return response
+
+    byte_range = None
+    if _range_applies(request, etag, last_modified):
+        byte_range = parse_range_header(request.META.get("HTTP_RANGE"), size)
+
+    if byte_range is False:
+        response = HttpResponse("Requested range not satisfiable", status=416)
+        response["Content-Range"] = f"bytes */{size}"
+        return response
+
+    if byte_range:
+        start, end = byte_range
+        response = StreamingHttpResponse(iter_file(path, start, end - start + 1), status=206)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Content-Length"] = str(end - start + 1)
+    else:
+        response = StreamingHttpResponse(iter_file(path, 0, size))
+        response["Content-Length"] = str(size)
+
+    _set_common_headers(response, filename, content_type, as_attachment, cache_control)
+    response["Accept-Ranges"] = "bytes"
+    response["ETag"] = etag
+    response["Last-Modified"] = last_modified
+    # Keep compression middleware from changing the body under a fixed Content-Length
+    response["Content-Encoding"] = "identity"
+    return response
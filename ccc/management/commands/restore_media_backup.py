@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from ccc.backup import restore_media_backup
+from ccc.models import BackupLog
+
+
+class Command(BaseCommand):
+    """Rebuild MEDIA_ROOT from a media backup manifest.
+
+    The manifest lists every backed-up file together with the archive holding
+    its content, including archives written by earlier runs, so restoring an
+    incremental backup only needs its manifest and the archives next to it.
+    """
+
+    help = "Restore media files from a backup manifest or BackupLog id"
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="Path of a media manifest, or the id of a completed BackupLog")
+        parser.add_argument(
+            "--media-root",
+            help="Directory to restore into (default: MEDIA_ROOT)",
+        )
+        parser.add_argument(
+            "--clean",
+            action="store_true",
+            help="Delete backed-up media files that are not in the manifest",
+        )
+
+    def handle(self, *args, **options):
+        source = options["source"]
+        if source.isdigit():
+            log = BackupLog.objects.filter(id=int(source), status="completed").exclude(manifest_path="").first()
+            if log is None:
+                raise CommandError(f"No completed media backup with id {source}")
+            source = log.manifest_path
+
+        try:
+            restored = restore_media_backup(source, media_root=options.get("media_root"), clean=options["clean"])
+        except (OSError, ValueError, KeyError) as e:
+            raise CommandError(f"Restore from {source} failed: {e}")
+
+        self.stdout.write(self.style.SUCCESS(f"Restored {restored} files from {source}"))
@@ -0,0 +1,34 @@
+# Generated by Django 6.0.5 on 2026-10-18 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ccc", "0021_asynctaskstatus_import_protocol"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="asynctaskstatus",
+            name="task_type",
+            field=models.CharField(
+                choices=[
+                    ("EXPORT_EXCEL", "Export Excel Template"),
+                    ("EXPORT_SDRF", "Export SDRF File"),
+                    ("IMPORT_SDRF", "Import SDRF File"),
+                    ("IMPORT_EXCEL", "Import Excel File"),
+                    ("EXPORT_MULTIPLE_SDRF", "Export Multiple SDRF Files"),
+                    ("EXPORT_MULTIPLE_EXCEL", "Export Multiple Excel Templates"),
+                    ("VALIDATE_TABLE", "Validate Metadata Table"),
+                    ("REORDER_TABLE_COLUMNS", "Reorder Table Columns"),
+                    ("REORDER_TEMPLATE_COLUMNS", "Reorder Template Columns"),
+                    ("TRANSCRIBE_AUDIO", "Transcribe Audio"),
+                    ("TRANSCRIBE_VIDEO", "Transcribe Video"),
+                    ("IMPORT_PROTOCOL", "Import Protocol"),
+                    ("EXPORT_HTML_BUNDLE", "Export HTML Bundle"),
+                ],
+                max_length=25,
+            ),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 6.0.5 on 2026-10-18 23:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ccc", "0022_asynctaskstatus_export_html_bundle"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="backuplog",
+            name="artifacts",
+            field=models.JSONField(blank=True, default=list, help_text="Files written by this run"),
+        ),
+        migrations.AddField(
+            model_name="backuplog",
+            name="base_backup",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Backup whose media manifest this incremental run was compared against",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="incremental_backups",
+                to="ccc.backuplog",
+            ),
+        ),
+        migrations.AddField(
+            model_name="backuplog",
+            name="files_changed",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="backuplog",
+            name="files_total",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="backuplog",
+            name="incremental",
+            field=models.BooleanField(
+                default=False,
+                help_text="Only store media whose content is not in an earlier backup to this destination",
+            ),
+        ),
+        migrations.AddField(
+            model_name="backuplog",
+            name="manifest_path",
+            field=models.TextField(blank=True, help_text="Content-hash manifest of the media backed up by this run"),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 6.0.5 on 2026-10-18 23:32
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ccc", "0023_backuplog_incremental_manifest"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="annotation",
+            name="is_attached",
+            field=models.BooleanField(
+                default=False,
+                help_text="Whether this annotation is attached to a parent resource through a junction model. Maintained by the junction models' signal handlers.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicalannotation",
+            name="is_attached",
+            field=models.BooleanField(
+                default=False,
+                help_text="Whether this annotation is attached to a parent resource through a junction model. Maintained by the junction models' signal handlers.",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="annotation",
+            index=models.Index(fields=["owner", "is_attached", "created_at"], name="ccc_annotat_owner_i_ef581f_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="annotation",
+            index=models.Index(
+                fields=["visibility", "is_attached", "created_at"], name="ccc_annotat_visibil_487211_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="annotation",
+            index=models.Index(
+                fields=["lab_group", "visibility", "is_attached"], name="ccc_annotat_lab_gro_008b15_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="annotation",
+            index=models.Index(fields=["folder", "is_attached", "created_at"], name="ccc_annotat_folder__9d27b8_idx"),
+        ),
+    ]
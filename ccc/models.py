@@ -13,6 +13,7 @@ from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericRelation
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.crypto import get_random_string
 
@@ -1047,18 +1048,128 @@ class LabGroup(models.Model):
         """
         from django.db.models import Q
 
-        accessible_groups = set()
-        direct_groups = cls.objects.filter(Q(members=user) | Q(creator=user))
+        direct_ids = cls.objects.filter(Q(members=user) | Q(creator=user)).values_list("id", flat=True)
+        return set(cls.get_ancestor_map(direct_ids))
 
-        for group in direct_groups:
-            accessible_groups.add(group.id)
-            # Add all parent groups (bubble up)
-            current = group.parent_group
-            while current:
-                accessible_groups.add(current.id)
-                current = current.parent_group
+    @classmethod
+    def get_ancestor_map(cls, group_ids):
+        """
+        Load the given groups and all of their ancestors.
+
+        Walks the hierarchy one level per query instead of one query per
+        parent, so the cost depends on the depth of the tree rather than on
+        the number of groups.
+
+        Args:
+            group_ids (iterable[int]): IDs of the groups to start from.
 
-        return accessible_groups
+        Returns:
+            dict[int, tuple[str, int | None]]: ``{id: (name, parent_group_id)}``
+                                               for the groups and their ancestors.
+        """
+        groups = {}
+        pending = set(group_ids)
+        while pending:
+            level = cls.objects.filter(id__in=pending).values_list("id", "name", "parent_group_id")
+            groups.update({group_id: (name, parent_id) for group_id, name, parent_id in level})
+            pending = {parent_id for _, parent_id in groups.values() if parent_id and parent_id not in groups}
+        return groups
+
+    @staticmethod
+    def build_path(group_id, ancestor_map):
+        """
+        Build the same path as ``get_full_path`` from a ``get_ancestor_map`` result.
+
+        Returns:
+            list[dict]: Path from the root with 'id' and 'name' keys.
+        """
+        path = []
+        while group_id in ancestor_map:
+            name, parent_id = ancestor_map[group_id]
+            path.insert(0, {"id": group_id, "name": name})
+            group_id = parent_id
+        return path
+
+    @classmethod
+    def with_counts(cls, queryset=None):
+        """
+        Annotate ``member_count`` and active ``sub_groups_count`` on a queryset.
+
+        Counts are correlated subqueries so the two relations are not joined
+        against each other.
+        """
+        queryset = cls.objects.all() if queryset is None else queryset
+        members = (
+            cls.members.through.objects.filter(labgroup_id=models.OuterRef("pk"))
+            .values("labgroup_id")
+            .annotate(total=models.Count("id"))
+            .values("total")
+        )
+        sub_groups = (
+            cls.objects.filter(parent_group_id=models.OuterRef("pk"), is_active=True)
+            .values("parent_group_id")
+            .annotate(total=models.Count("id"))
+            .values("total")
+        )
+        return queryset.annotate(
+            member_count=Coalesce(models.Subquery(members, output_field=models.IntegerField()), 0),
+            sub_groups_count=Coalesce(models.Subquery(sub_groups, output_field=models.IntegerField()), 0),
+        )
+
+    @classmethod
+    def resolve_access(cls, user, groups):
+        """
+        Resolve a user's membership and permissions for many groups at once.
+
+        Gives the same answers as ``is_member``, ``can_invite``, ``can_manage``
+        and ``can_process_jobs`` for each group, using a fixed number of
+        queries plus one per hierarchy level.
+
+        Args:
+            user (User): The user to check.
+            groups (iterable[LabGroup]): The groups to resolve.
+
+        Returns:
+            dict[int, dict]: Flags keyed by group ID, plus the group's ``full_path``.
+        """
+        groups = list(groups)
+        if not groups:
+            return {}
+
+        is_staff = user.is_authenticated and user.is_staff
+        direct_ids = set(user.lab_groups.values_list("id", flat=True)) if user.is_authenticated else set()
+        ancestor_map = cls.get_ancestor_map(direct_ids | {group.id for group in groups})
+
+        # Membership bubbles up: a member of a sub-group is a member of every ancestor
+        member_ids = set()
+        for group_id in direct_ids:
+            while group_id and group_id not in member_ids:
+                member_ids.add(group_id)
+                group_id = ancestor_map.get(group_id, (None, None))[1]
+
+        permissions = {}
+        if user.is_authenticated:
+            permissions = {
+                permission.lab_group_id: permission
+                for permission in LabGroupPermission.objects.filter(
+                    user=user, lab_group_id__in=[group.id for group in groups]
+                )
+            }
+
+        access = {}
+        for group in groups:
+            permission = permissions.get(group.id)
+            is_member = group.id in member_ids
+            access[group.id] = {
+                "is_member": is_member,
+                "can_invite": is_staff
+                or bool(permission and permission.can_invite)
+                or (group.allow_member_invites and is_member),
+                "can_manage": is_staff or bool(permission and permission.can_manage),
+                "can_process_jobs": is_staff or bool(permission and permission.can_process_jobs),
+                "full_path": cls.build_path(group.id, ancestor_map),
+            }
+        return access
 
     def get_all_members(self, include_subgroups=True):
         """
@@ -1600,6 +1711,11 @@ class Annotation(AbstractResource):
 
     # Status flags
     scratched = models.BooleanField(default=False, help_text="Whether this annotation is marked as deleted/scratched")
+    is_attached = models.BooleanField(
+        default=False,
+        help_text="Whether this annotation is attached to a parent resource through a junction model. "
+        "Maintained by the junction models' signal handlers.",
+    )
 
     # Remote sync fields
     remote_id = models.BigIntegerField(blank=True, null=True)
@@ -1607,9 +1723,24 @@ class Annotation(AbstractResource):
         "RemoteHost", on_delete=models.CASCADE, related_name="annotations", blank=True, null=True
     )
 
+    # Reverse relations of the junction models whose rows make an annotation "attached"
+    ATTACHMENT_RELATIONS = (
+        "instrument_attachments",
+        "stored_reagent_attachments",
+        "maintenance_log_attachments",
+        "session_attachments",
+        "step_attachments",
+    )
+
     class Meta:
         app_label = "ccc"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["owner", "is_attached", "created_at"]),
+            models.Index(fields=["visibility", "is_attached", "created_at"]),
+            models.Index(fields=["lab_group", "visibility", "is_attached"]),
+            models.Index(fields=["folder", "is_attached", "created_at"]),
+        ]
 
     def __str__(self):
         if self.annotation:
@@ -1619,6 +1750,36 @@ class Annotation(AbstractResource):
             return f"{self.get_annotation_type_display()}: {preview}"
         return f"{self.get_annotation_type_display()}: [File]"
 
+    @classmethod
+    def refresh_attachment_state(cls, annotation_ids):
+        """
+        Recompute ``is_attached`` for the given annotations from their junction rows.
+
+        Args:
+            annotation_ids: Iterable of annotation primary keys
+
+        Returns:
+            int: Number of annotations whose state changed
+        """
+        annotation_ids = list(annotation_ids)
+        installed = {relation.get_accessor_name() for relation in cls._meta.related_objects}
+        attached_filter = models.Q()
+        for relation in cls.ATTACHMENT_RELATIONS:
+            if relation in installed:
+                attached_filter |= models.Q(**{f"{relation}__isnull": False})
+
+        attached_ids = set()
+        if attached_filter:
+            attached_ids = set(cls.objects.filter(attached_filter, pk__in=annotation_ids).values_list("pk", flat=True))
+
+        changed = cls.objects.filter(pk__in=attached_ids, is_attached=False).update(is_attached=True)
+        changed += (
+            cls.objects.filter(pk__in=annotation_ids, is_attached=True)
+            .exclude(pk__in=attached_ids)
+            .update(is_attached=False)
+        )
+        return changed
+
     def _check_parent_resource_permission(self, user, permission_method):
         """
         Check permissions on parent resources via junction models.
@@ -1793,6 +1954,8 @@ class AsyncTaskStatus(models.Model):
         ("REORDER_TEMPLATE_COLUMNS", "Reorder Template Columns"),
         ("TRANSCRIBE_AUDIO", "Transcribe Audio"),
         ("TRANSCRIBE_VIDEO", "Transcribe Video"),
+        ("IMPORT_PROTOCOL", "Import Protocol"),
+        ("EXPORT_HTML_BUNDLE", "Export HTML Bundle"),
     ]
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -2235,6 +2398,21 @@ class BackupLog(models.Model):
     triggered_by = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name="backup_logs"
     )
+    incremental = models.BooleanField(
+        default=False, help_text="Only store media whose content is not in an earlier backup to this destination"
+    )
+    base_backup = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="incremental_backups",
+        help_text="Backup whose media manifest this incremental run was compared against",
+    )
+    manifest_path = models.TextField(blank=True, help_text="Content-hash manifest of the media backed up by this run")
+    artifacts = models.JSONField(default=list, blank=True, help_text="Files written by this run")
+    files_total = models.PositiveIntegerField(null=True, blank=True)
+    files_changed = models.PositiveIntegerField(null=True, blank=True)
 
     class Meta:
         ordering = ["-started_at"]
@@ -2242,6 +2420,21 @@ class BackupLog(models.Model):
     def __str__(self):
         return f"{self.backup_type} backup to {self.destination} [{self.status}]"
 
+    def find_base_backup(self):
+        """Return the latest completed media backup to the same destination whose manifest still exists."""
+        candidates = (
+            BackupLog.objects.filter(
+                destination=self.destination, status="completed", backup_type__in=("media", "full")
+            )
+            .exclude(manifest_path="")
+            .exclude(pk=self.pk)
+            .order_by("-started_at")
+        )
+        for candidate in candidates[:10]:
+            if os.path.exists(candidate.manifest_path):
+                return candidate
+        return None
+
 
 class DeletionLog(models.Model):
     """
@@ -2274,5 +2467,38 @@ class DeletionLog(models.Model):
         return f"{self.content_type.model}#{self.object_id} deleted at {self.deleted_at}"
 
 
+class OutboundEmail(models.Model):
+    """
+    Persistent outbox entry for an email sent by the application.
+
+    Requests write a row with ``ccc.outbox.queue_email`` and return; the
+    ``mail`` RQ queue delivers due rows in batches over one SMTP connection and
+    reschedules failures with exponential backoff (see ``ccc.outbox``).
+    """
+
+    STATUS = [("pending", "Pending"), ("sending", "Sending"), ("sent", "Sent"), ("failed", "Failed")]
+
+    category = models.CharField(max_length=50, blank=True, help_text="What the email is for, e.g. password_reset")
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    from_email = models.CharField(max_length=255)
+    recipients = models.JSONField(default=list)
+    status = models.CharField(max_length=20, choices=STATUS, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} to {', '.join(self.recipients)} [{self.status}]"
+
+
 from ccc.device_token.model import DeviceToken  # noqa: E402, F401
 from ccc.plugin.model import Plugin  # noqa: E402, F401
@@ -0,0 +1,209 @@
+"""
+Outbound email queue.
+
+Request handlers never talk to the mail relay directly. ``queue_email`` writes
+an ``OutboundEmail`` row and, once the transaction commits, schedules the
+``deliver_outbound_email`` job on the dedicated ``mail`` RQ queue. The job
+claims due rows in batches, sends each batch over a single connection from the
+configured EMAIL_BACKEND, and reschedules failures with exponential backoff
+until OUTBOX_MAX_ATTEMPTS is reached. Rows claimed by a worker that died are
+picked up again once their lease expires.
+
+With SYNC_OPERATIONS_ONLY (desktop builds without a worker) the outbox is
+flushed inline after commit.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ccc.models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+OUTBOX_BATCH_SIZE = 50
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_RETRY_BASE_SECONDS = 60
+OUTBOX_RETRY_MAX_SECONDS = 60 * 60
+OUTBOX_SENDING_LEASE = timedelta(minutes=10)
+OUTBOX_RETRY_JOB_ID = "ccc-outbox-retry"
+
+
+@dataclass
+class OutboxRun:
+    """Counts from one delivery run."""
+
+    sent: int = 0
+    retrying: int = 0
+    failed: int = 0
+
+
+def queue_email(subject, body, recipients, from_email=None, category=""):
+    """
+    Put an email in the outbox; it is delivered after the current transaction commits.
+
+    Args:
+        subject: Subject line
+        body: Plain-text body
+        recipients: List of recipient addresses
+        from_email: Sender (defaults to DEFAULT_FROM_EMAIL)
+        category: Short label for what the email is for
+
+    Returns:
+        OutboundEmail: The queued row
+    """
+    email = OutboundEmail.objects.create(
+        category=category,
+        subject=subject,
+        body=body,
+        from_email=from_email or getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@example.com"),
+        recipients=list(recipients),
+    )
+    transaction.on_commit(schedule_delivery)
+    return email
+
+
+def schedule_delivery(delay=None):
+    """
+    Queue an outbox delivery run, optionally after ``delay``.
+
+    Delayed runs share one job id, so repeated failures keep a single retry
+    scheduled. Failures to reach RQ are logged; the rows stay pending and are
+    picked up by the next run.
+    """
+    if getattr(settings, "SYNC_OPERATIONS_ONLY", False):
+        if delay is None:
+            deliver_outbox()
+        return
+
+    from ccc.tasks import deliver_outbound_email
+
+    try:
+        if delay is None:
+            deliver_outbound_email.delay()
+        else:
+            import django_rq
+
+            django_rq.get_queue("mail").enqueue_in(delay, deliver_outbound_email, job_id=OUTBOX_RETRY_JOB_ID)
+    except Exception as e:
+        logger.error(f"Failed to schedule outbox delivery: {e}")
+
+
+def retry_delay(attempts):
+    """Backoff before retry number ``attempts`` (1-based)."""
+    return timedelta(seconds=min(OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1), OUTBOX_RETRY_MAX_SECONDS))
+
+
+def claim_due_emails(batch_size=OUTBOX_BATCH_SIZE, now=None):
+    """
+    Mark up to ``batch_size`` due emails as sending and return them.
+
+    Uses SKIP LOCKED where available so concurrent workers claim disjoint rows.
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        due = OutboundEmail.objects.filter(
+            Q(status="pending") | Q(status="sending"), next_attempt_at__lte=now
+        ).order_by("next_attempt_at", "id")
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.values_list("id", flat=True)[:batch_size])
+        OutboundEmail.objects.filter(id__in=ids).update(status="sending", next_attempt_at=now + OUTBOX_SENDING_LEASE)
+    return list(OutboundEmail.objects.filter(id__in=ids).order_by("next_attempt_at", "id"))
+
+
+def send_batch(emails, now=None):
+    """
+    Send claimed emails over one connection and record the outcome.
+
+    Returns:
+        OutboxRun: Counts for this batch
+    """
+    now = now or timezone.now()
+    run = OutboxRun()
+    sent, errors = [], {}
+
+    try:
+        mail_connection = get_connection(fail_silently=False)
+        mail_connection.open()
+    except Exception as e:
+        logger.error(f"Could not connect to mail server: {e}")
+        errors = {email.id: e for email in emails}
+    else:
+        try:
+            for email in emails:
+                try:
+                    EmailMessage(
+                        email.subject, email.body, email.from_email, email.recipients, connection=mail_connection
+                    ).send()
+                    sent.append(email.id)
+                except Exception as e:
+                    errors[email.id] = e
+        finally:
+            try:
+                mail_connection.close()
+            except Exception as e:
+                logger.warning(f"Error closing mail connection: {e}")
+
+    if sent:
+        run.sent = OutboundEmail.objects.filter(id__in=sent).update(status="sent", sent_at=now, last_error="")
+
+    failed = []
+    for email in emails:
+        if email.id not in errors:
+            continue
+        email.attempts += 1
+        email.last_error = str(errors[email.id])
+        if email.attempts >= OUTBOX_MAX_ATTEMPTS:
+            email.status = "failed"
+            run.failed += 1
+            logger.error(f"Giving up on email {email.id} after {email.attempts} attempts: {email.last_error}")
+        else:
+            email.status = "pending"
+            email.next_attempt_at = now + retry_delay(email.attempts)
+            run.retrying += 1
+        failed.append(email)
+    if failed:
+        OutboundEmail.objects.bulk_update(failed, ["attempts", "last_error", "status", "next_attempt_at"])
+    return run
+
+
+def deliver_outbox(batch_size=OUTBOX_BATCH_SIZE):
+    """
+    Deliver every due email in batches, then schedule a run for the next retry.
+
+    Returns:
+        OutboxRun: Totals across all batches
+    """
+    total = OutboxRun()
+    while True:
+        now = timezone.now()
+        emails = claim_due_emails(batch_size, now)
+        if not emails:
+            break
+        run = send_batch(emails, now)
+        total.sent += run.sent
+        total.retrying += run.retrying
+        total.failed += run.failed
+        if run.sent == 0:
+            # Nothing got through; leave the rest for the scheduled retry instead of hammering the relay
+            break
+
+    next_attempt = (
+        OutboundEmail.objects.filter(status="pending")
+        .order_by("next_attempt_at")
+        .values_list("next_attempt_at", flat=True)
+        .first()
+    )
+    if next_attempt and not getattr(settings, "SYNC_OPERATIONS_ONLY", False):
+        schedule_delivery(max(next_attempt - timezone.now(), timedelta(seconds=1)))
+
+    if total.sent or total.retrying or total.failed:
+        logger.info(f"Outbox run: {total.sent} sent, {total.retrying} retrying, {total.failed} failed")
+    return total
@@ -10,6 +10,7 @@ import logging
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
+from django.db.models.manager import BaseManager
 from django.urls import reverse
 
 from rest_framework import serializers
@@ -167,6 +168,22 @@ class SiteConfigSerializer(serializers.ModelSerializer):
         return settings.DRF_CHUNKED_UPLOAD_MAX_BYTES
 
 
+class LabGroupListSerializer(serializers.ListSerializer):
+    """
+    Resolves the requesting user's access to every listed group in one pass.
+
+    The per-group flags are stored in the context, where ``LabGroupSerializer``
+    picks them up instead of querying once per group and field.
+    """
+
+    def to_representation(self, data):
+        groups = list(data.all() if isinstance(data, BaseManager) else data)
+        request = self.context.get("request")
+        if request is not None:
+            self.context.setdefault("lab_group_access", {}).update(LabGroup.resolve_access(request.user, groups))
+        return super().to_representation(groups)
+
+
 class LabGroupSerializer(serializers.ModelSerializer):
     """Serializer for lab group objects."""
 
@@ -183,6 +200,7 @@ class LabGroupSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = LabGroup
+        list_serializer_class = LabGroupListSerializer
         fields = [
             "id",
             "name",
@@ -215,34 +233,39 @@ class LabGroupSerializer(serializers.ModelSerializer):
             "sub_groups_count",
         ]
 
+    def _get_access(self, obj):
+        """Return the requesting user's resolved access to ``obj``."""
+        access = self.context.setdefault("lab_group_access", {})
+        if obj.id not in access:
+            access.update(LabGroup.resolve_access(self.context.get("request").user, [obj]))
+        return access[obj.id]
+
     def get_member_count(self, obj):
         """Return the number of members in this lab group."""
+        if hasattr(obj, "member_count"):
+            return obj.member_count
         return obj.members.count()
 
     def get_is_creator(self, obj):
         """Check if current user is the creator."""
         user = self.context.get("request").user
-        return obj.is_creator(user) if user.is_authenticated else False
+        return obj.creator_id == user.id if user.is_authenticated else False
 
     def get_is_member(self, obj):
         """Check if current user is a member."""
-        user = self.context.get("request").user
-        return obj.is_member(user) if user.is_authenticated else False
+        return self._get_access(obj)["is_member"]
 
     def get_can_invite(self, obj):
         """Check if current user can invite others."""
-        user = self.context.get("request").user
-        return obj.can_invite(user) if user.is_authenticated else False
+        return self._get_access(obj)["can_invite"]
 
     def get_can_manage(self, obj):
         """Check if current user can manage this group."""
-        user = self.context.get("request").user
-        return obj.can_manage(user) if user.is_authenticated else False
+        return self._get_access(obj)["can_manage"]
 
     def get_can_process_jobs(self, obj):
         """Check if current user can process instrument jobs."""
-        user = self.context.get("request").user
-        return obj.can_process_jobs(user) if user.is_authenticated else False
+        return self._get_access(obj)["can_process_jobs"]
 
     def get_creator_name(self, obj):
         """Return the creator's display name."""
@@ -252,10 +275,12 @@ class LabGroupSerializer(serializers.ModelSerializer):
 
     def get_full_path(self, obj):
         """Get the full hierarchical path to root."""
-        return obj.get_full_path()
+        return self._get_access(obj)["full_path"]
 
     def get_sub_groups_count(self, obj):
         """Return the number of direct sub groups."""
+        if hasattr(obj, "sub_groups_count"):
+            return obj.sub_groups_count
         return obj.sub_groups.filter(is_active=True).count()
 
     def create(self, validated_data):
@@ -1148,6 +1173,12 @@ class BackupLogSerializer(serializers.ModelSerializer):
             "backup_type",
             "status",
             "destination",
+            "incremental",
+            "base_backup",
+            "manifest_path",
+            "artifacts",
+            "files_total",
+            "files_changed",
             "size_bytes",
             "started_at",
             "completed_at",
@@ -1155,7 +1186,20 @@ class BackupLogSerializer(serializers.ModelSerializer):
             "triggered_by",
             "triggered_by_username",
         ]
-        read_only_fields = ["id", "status", "size_bytes", "started_at", "completed_at", "error_message", "triggered_by"]
+        read_only_fields = [
+            "id",
+            "status",
+            "base_backup",
+            "manifest_path",
+            "artifacts",
+            "files_total",
+            "files_changed",
+            "size_bytes",
+            "started_at",
+            "completed_at",
+            "error_message",
+            "triggered_by",
+        ]
 
 
 from ccc.device_token.serializer import DeviceTokenSerializer  # noqa: E402, F401
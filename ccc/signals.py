@@ -1,7 +1,9 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from ccc.models import LabGroup, LabGroupPermission
+from ccc.models import Annotation, LabGroup, LabGroupPermission, SiteConfig
+from ccc.site_config_cache import invalidate_site_config_cache
 
 
 @receiver(post_save, sender=LabGroup)
@@ -26,3 +28,38 @@ def create_creator_permission(sender, instance, created, **kwargs):
                 "can_process_jobs": instance.allow_process_jobs,
             },
         )
+
+
+@receiver(post_save, sender=SiteConfig)
+@receiver(post_delete, sender=SiteConfig)
+def invalidate_site_config_payload(sender, instance, **kwargs):
+    """
+    Drop the cached site configuration payload when SiteConfig changes.
+
+    This covers admin edits as well as the Whisper model list refreshed by
+    ``refresh_available_whisper_models``. The version is bumped again on commit
+    so a request that rebuilt the payload from pre-commit data is not served.
+    """
+    invalidate_site_config_cache()
+    transaction.on_commit(invalidate_site_config_cache)
+
+
+def _annotation_attached(sender, instance, created, **kwargs):
+    if created:
+        Annotation.objects.filter(pk=instance.annotation_id, is_attached=False).update(is_attached=True)
+
+
+def _annotation_detached(sender, instance, **kwargs):
+    Annotation.refresh_attachment_state([instance.annotation_id])
+
+
+def track_annotation_attachments(junction_model):
+    """
+    Keep ``Annotation.is_attached`` in sync with rows of an annotation junction model.
+
+    Apps that attach annotations to their resources (instruments, sessions, ...)
+    call this for each junction model listed in ``Annotation.ATTACHMENT_RELATIONS``.
+    """
+    uid = f"annotation_attachment_{junction_model._meta.label_lower}"
+    post_save.connect(_annotation_attached, sender=junction_model, dispatch_uid=uid)
+    post_delete.connect(_annotation_detached, sender=junction_model, dispatch_uid=uid)
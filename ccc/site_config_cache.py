@@ -0,0 +1,164 @@
+"""
+Cached site configuration payloads.
+
+The site configuration is fetched by every frontend on every page load, yet it
+only changes when an administrator saves ``SiteConfig`` or the transcribe
+worker refreshes the Whisper model list. Both payloads served by
+``SiteConfigViewSet`` (the public bootstrap payload and the admin view) are
+therefore built once, stored in the cache under a version number together with
+a content ETag, and served from there until a ``SiteConfig`` save bumps the
+version (see ``ccc.signals``).
+
+Values derived from Django settings are folded into the cache key, so a
+deployment that changes them never serves a payload built under the old
+settings. Cache errors never propagate; the payload is rebuilt instead.
+"""
+
+import hashlib
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags
+
+logger = logging.getLogger(__name__)
+
+SITE_CONFIG_VERSION_KEY = "ccc:site_config:version"
+SITE_CONFIG_PAYLOAD_KEY = "ccc:site_config:payload"
+SITE_CONFIG_CACHE_TIMEOUT = 60 * 60 * 24
+
+PUBLIC_DEFAULTS = {
+    "site_name": "CUPCAKE",
+    "logo_url": None,
+    "primary_color": "#1976d2",
+    "show_powered_by": True,
+    "allow_user_registration": False,
+    "enable_orcid_login": False,
+    "booking_deletion_window_minutes": 30,
+}
+
+
+def _settings_fingerprint():
+    """Short hash of the settings that feed into the payload."""
+    values = [
+        sorted(settings.INSTALLED_APPS),
+        settings.FILE_UPLOAD_MAX_MEMORY_SIZE,
+        settings.DRF_CHUNKED_UPLOAD_MAX_BYTES,
+        getattr(settings, "DEMO_MODE", False),
+        getattr(settings, "DEMO_CLEANUP_INTERVAL_MINUTES", None),
+    ]
+    values += [
+        getattr(settings, flag, False)
+        for flag in (
+            "ENABLE_CUPCAKE_MACARON",
+            "ENABLE_CUPCAKE_MINT_CHOCOLATE",
+            "ENABLE_CUPCAKE_SALTED_CARAMEL",
+            "ENABLE_CUPCAKE_RED_VELVET",
+        )
+    ]
+    return hashlib.sha256(json.dumps(values, default=str).encode("utf-8")).hexdigest()[:12]
+
+
+def get_site_config_version():
+    """Return the current payload version, initialising it if needed."""
+    try:
+        version = cache.get(SITE_CONFIG_VERSION_KEY)
+        if version is None:
+            cache.add(SITE_CONFIG_VERSION_KEY, int(time.time()), None)
+            version = cache.get(SITE_CONFIG_VERSION_KEY)
+        return int(version)
+    except Exception as e:
+        logger.warning(f"Site config cache unavailable: {e}")
+        return None
+
+
+def invalidate_site_config_cache():
+    """Bump the payload version so the next request rebuilds it."""
+    try:
+        if not cache.add(SITE_CONFIG_VERSION_KEY, int(time.time()), None):
+            cache.incr(SITE_CONFIG_VERSION_KEY)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate site config cache: {e}")
+
+
+def _etag(data):
+    digest = hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def build_site_config_payload(version=None):
+    """
+    Serialize the site configuration into its public and admin payloads.
+
+    Returns:
+        dict: ``version``, ``public`` and ``admin`` payloads with their ETags.
+        ``admin`` is None when no SiteConfig exists yet.
+    """
+    from ccc.models import SiteConfig
+    from ccc.serializers import SiteConfigSerializer
+
+    site_config = SiteConfig.objects.first()
+    data = SiteConfigSerializer(site_config or SiteConfig()).data
+
+    if site_config:
+        public = {key: data[key] for key in PUBLIC_DEFAULTS}
+    else:
+        public = dict(PUBLIC_DEFAULTS)
+    public.update(
+        {
+            "ui_features": data["ui_features_with_defaults"],
+            "installed_apps": data["installed_apps"],
+            "max_upload_size": data["max_upload_size"],
+            "max_chunked_upload_size": data["max_chunked_upload_size"],
+            "demo_mode": settings.DEMO_MODE,
+            "demo_cleanup_interval_minutes": settings.DEMO_CLEANUP_INTERVAL_MINUTES if settings.DEMO_MODE else None,
+        }
+    )
+    admin = dict(data) if site_config else None
+
+    return {
+        "version": version,
+        "public": public,
+        "public_etag": _etag(public),
+        "admin": admin,
+        "admin_etag": _etag(admin) if admin is not None else None,
+    }
+
+
+def get_site_config_payload():
+    """
+    Return the cached site configuration payload, building it on a miss.
+
+    Returns:
+        dict: See ``build_site_config_payload``
+    """
+    version = get_site_config_version()
+    if version is None:
+        return build_site_config_payload()
+
+    key = f"{SITE_CONFIG_PAYLOAD_KEY}:{version}:{_settings_fingerprint()}"
+    try:
+        payload = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Site config cache read failed: {e}")
+        payload = None
+    if payload is not None:
+        return payload
+
+    payload = build_site_config_payload(version)
+    try:
+        cache.set(key, payload, SITE_CONFIG_CACHE_TIMEOUT)
+    except Exception as e:
+        logger.warning(f"Site config cache write failed: {e}")
+    return payload
+
+
+def etag_matches(request, etag):
+    """Return True if the request's If-None-Match header matches ``etag``."""
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if not if_none_match or not etag:
+        return False
+    tags = parse_etags(if_none_match)
+    return "*" in tags or etag in tags
@@ -3,7 +3,7 @@ RQ tasks for CUPCAKE Core (CCC).
 """
 
 import logging
-import shutil
+import os
 from io import StringIO
 from pathlib import Path
 
@@ -12,6 +12,7 @@ from django.utils import timezone
 
 from django_rq import job
 
+from ccc.backup import prune_backups, run_media_backup
 from ccc.models import SiteConfig
 
 logger = logging.getLogger(__name__)
@@ -94,53 +95,73 @@ def refresh_available_whisper_models():
 @job("default", timeout="2h")
 def run_backup(backup_log_id):
     """
-    Run a backup operation and copy the result to the specified destination.
+    Run a backup operation, writing its artefacts directly into the destination.
+
+    The database dump is written by dbbackup to an explicit path named after the
+    BackupLog id. Media is backed up by ``ccc.backup.run_media_backup``; when the
+    log is incremental, media content already stored by an earlier backup to the
+    same destination is skipped. The files produced are recorded on the log, and
+    older backups to the destination are then pruned with ``prune_backups``.
 
     Args:
         backup_log_id: ID of the BackupLog record to update
     """
     from ccc.models import BackupLog
 
-    BACKUP_DIR = Path("/opt/cupcake/backups")
-
     try:
         log = BackupLog.objects.get(id=backup_log_id)
     except BackupLog.DoesNotExist:
         logger.error(f"BackupLog {backup_log_id} not found")
         return
 
+    artifacts = []
     try:
         destination = Path(log.destination)
         destination.mkdir(parents=True, exist_ok=True)
 
-        stdout = StringIO()
+        update_fields = ["status", "size_bytes", "completed_at", "artifacts"]
 
         if log.backup_type in ("database", "full"):
-            call_command("dbbackup", "--clean", stdout=stdout)
+            timestamp = timezone.now().strftime("%Y%m%d_%H%M%S")
+            db_path = destination / f"db_{log.id}_{timestamp}.dump"
+            call_command("dbbackup", "--output-path", str(db_path), stdout=StringIO())
+            artifacts.append(str(db_path))
 
         if log.backup_type in ("media", "full"):
-            call_command("mediabackup", "--clean", stdout=stdout)
-
-        latest_files = sorted(BACKUP_DIR.glob("*"), key=lambda p: p.stat().st_mtime, reverse=True)
-        if log.backup_type == "full":
-            files_to_copy = latest_files[:2]
-        else:
-            files_to_copy = latest_files[:1]
-
-        total_size = 0
-        for src in files_to_copy:
-            dest_file = destination / src.name
-            shutil.copy2(src, dest_file)
-            total_size += dest_file.stat().st_size
+            base = log.find_base_backup() if log.incremental else None
+            result = run_media_backup(destination, log.id, previous_manifest=base.manifest_path if base else None)
+            artifacts.extend(result.artifacts)
+            log.base_backup = base
+            log.manifest_path = str(result.manifest_path)
+            log.files_total = result.files_total
+            log.files_changed = result.files_changed
+            update_fields += ["base_backup", "manifest_path", "files_total", "files_changed"]
 
         log.status = "completed"
-        log.size_bytes = total_size
+        log.artifacts = artifacts
+        log.size_bytes = sum(os.path.getsize(path) for path in artifacts if os.path.exists(path))
         log.completed_at = timezone.now()
-        log.save(update_fields=["status", "size_bytes", "completed_at"])
+        log.save(update_fields=update_fields)
 
     except Exception as e:
         logger.exception(f"Backup {backup_log_id} failed")
         log.status = "failed"
         log.error_message = str(e)
+        log.artifacts = artifacts
         log.completed_at = timezone.now()
-        log.save(update_fields=["status", "error_message", "completed_at"])
+        log.save(update_fields=["status", "error_message", "artifacts", "completed_at"])
+        return
+
+    try:
+        prune_backups(log.destination)
+    except Exception:
+        logger.exception(f"Pruning old backups in {log.destination} failed")
+
+
+@job("mail", timeout="10m")
+def deliver_outbound_email():
+    """Deliver due outbox emails in batches and schedule the next retry (see ``ccc.outbox``)."""
+    from ccc.outbox import deliver_outbox
+
+    run = deliver_outbox()
+    return {"sent": run.sent, "retrying": run.retrying, "failed": run.failed}
@@ -0,0 +1,199 @@
+"""
+Tests for incremental media backups and the run_backup task.
+"""
+
+import json
+import shutil
+import tarfile
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from ccc import backup
+from ccc.backup import ARCHIVE, MEMBER, SHA256, load_manifest, restore_media_backup, run_media_backup
+from ccc.models import BackupLog
+from ccc.tasks import run_backup
+
+
+def _write(root, relative_path, content):
+    path = Path(root) / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(content)
+    return path
+
+
+class MediaBackupTestCase(TestCase):
+    """Test manifest-based media backups outside the database."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.destination = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, self.destination, ignore_errors=True)
+        _write(self.media_root, "annotations/a.png", b"a" * 100)
+        _write(self.media_root, "annotations/b.png", b"b" * 200)
+        _write(self.media_root, "temp/export.zip", b"skip me")
+
+    def test_full_backup_archives_every_file(self):
+        result = run_media_backup(self.destination, 1, media_root=self.media_root)
+
+        self.assertEqual((result.files_total, result.files_changed, result.bytes_written), (2, 2, 300))
+        with tarfile.open(result.archive_path) as archive:
+            self.assertEqual(sorted(archive.getnames()), ["annotations/a.png", "annotations/b.png"])
+        manifest = load_manifest(result.manifest_path)
+        self.assertEqual(manifest["annotations/a.png"][ARCHIVE], "media_1.tar")
+        self.assertFalse((Path(self.destination) / "media_1.tar.part").exists())
+
+    def test_incremental_backup_stores_only_new_content(self):
+        full = run_media_backup(self.destination, 1, media_root=self.media_root)
+        _write(self.media_root, "annotations/b.png", b"B" * 250)
+        _write(self.media_root, "annotations/copy.png", b"a" * 100)
+
+        with patch("ccc.backup.file_sha256", wraps=backup.file_sha256) as hasher:
+            result = run_media_backup(
+                self.destination, 2, previous_manifest=full.manifest_path, media_root=self.media_root
+            )
+
+        hashed = sorted(Path(call.args[0]).name for call in hasher.call_args_list)
+        self.assertEqual(hashed, ["b.png", "copy.png"])
+        self.assertEqual((result.files_total, result.files_changed, result.bytes_written), (3, 1, 250))
+        with tarfile.open(result.archive_path) as archive:
+            self.assertEqual(archive.getnames(), ["annotations/b.png"])
+        manifest = load_manifest(result.manifest_path)
+        self.assertEqual(manifest["annotations/copy.png"][ARCHIVE:], ["media_1.tar", "annotations/a.png"])
+        self.assertEqual(manifest["annotations/copy.png"][SHA256], manifest["annotations/a.png"][SHA256])
+        self.assertEqual(manifest["annotations/b.png"][MEMBER], "annotations/b.png")
+
+    def test_unchanged_incremental_backup_writes_only_manifest(self):
+        full = run_media_backup(self.destination, 1, media_root=self.media_root)
+
+        result = run_media_backup(self.destination, 2, previous_manifest=full.manifest_path, media_root=self.media_root)
+
+        self.assertIsNone(result.archive_path)
+        self.assertEqual(result.artifacts, [str(result.manifest_path)])
+        self.assertFalse((Path(self.destination) / "media_2.tar").exists())
+        with open(result.manifest_path) as f:
+            self.assertEqual(json.load(f)["base_manifest"], str(full.manifest_path))
+
+    def test_full_and_incremental_backups_restore(self):
+        _write(self.media_root, "annotations/copy.png", b"a" * 100)
+        full = run_media_backup(self.destination, 1, media_root=self.media_root)
+        with tarfile.open(full.archive_path) as archive:
+            self.assertIn("annotations/copy.png", archive.getnames())
+
+        _write(self.media_root, "annotations/b.png", b"B" * 250)
+        _write(self.media_root, "notes/new.txt", b"a" * 100)
+        (Path(self.media_root) / "annotations/copy.png").unlink()
+        incremental = run_media_backup(
+            self.destination, 2, previous_manifest=full.manifest_path, media_root=self.media_root
+        )
+
+        restore_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, restore_root, ignore_errors=True)
+        _write(restore_root, "stale.txt", b"old")
+        call_command(
+            "restore_media_backup",
+            str(incremental.manifest_path),
+            "--media-root",
+            restore_root,
+            "--clean",
+            stdout=StringIO(),
+        )
+
+        restored = {path: (Path(restore_root) / path).read_bytes() for path, _ in backup.iter_media_files(restore_root)}
+        self.assertEqual(
+            restored, {"annotations/a.png": b"a" * 100, "annotations/b.png": b"B" * 250, "notes/new.txt": b"a" * 100}
+        )
+        source_mtime = (Path(self.media_root) / "annotations/b.png").stat().st_mtime_ns
+        self.assertEqual((Path(restore_root) / "annotations/b.png").stat().st_mtime_ns, source_mtime)
+
+        restore_media_backup(full.manifest_path, media_root=restore_root)
+        self.assertEqual((Path(restore_root) / "annotations/b.png").read_bytes(), b"b" * 200)
+
+    def test_restore_rejects_corrupt_content(self):
+        full = run_media_backup(self.destination, 1, media_root=self.media_root)
+        with open(full.manifest_path) as f:
+            manifest = json.load(f)
+        manifest["files"]["annotations/a.png"][SHA256] = "0" * 64
+        with open(full.manifest_path, "w") as f:
+            json.dump(manifest, f)
+
+        with self.assertRaises(ValueError):
+            restore_media_backup(full.manifest_path, media_root=tempfile.mkdtemp(dir=self.destination))
+
+
+class RunBackupTaskTestCase(TestCase):
+    """Test that run_backup records the artefacts it writes on the BackupLog."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.destination = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, self.destination, ignore_errors=True)
+        _write(self.media_root, "annotations/a.png", b"a" * 100)
+        self.user = User.objects.create_user(username="admin", password="pass", is_staff=True)
+
+    def _fake_dbbackup(self, name, *args, **kwargs):
+        _write(Path(args[1]).parent, Path(args[1]).name, b"dump")
+
+    def _run(self, backup_type, incremental=False, keep=10):
+        log = BackupLog.objects.create(
+            backup_type=backup_type, destination=self.destination, incremental=incremental, triggered_by=self.user
+        )
+        with override_settings(MEDIA_ROOT=self.media_root, BACKUP_RETENTION_COUNT=keep), patch(
+            "ccc.tasks.call_command", side_effect=self._fake_dbbackup
+        ) as mock_command:
+            run_backup(log.id)
+        log.refresh_from_db()
+        return log, mock_command
+
+    def test_full_backup_records_artifacts(self):
+        log, mock_command = self._run("full")
+
+        self.assertEqual(log.status, "completed")
+        self.assertEqual(mock_command.call_args.args[:2], ("dbbackup", "--output-path"))
+        names = sorted(Path(path).name for path in log.artifacts)
+        self.assertTrue(names[0].startswith(f"db_{log.id}_"))
+        self.assertEqual(names[1:], [f"media_{log.id}.manifest.json", f"media_{log.id}.tar"])
+        self.assertEqual(log.size_bytes, sum(Path(path).stat().st_size for path in log.artifacts))
+        self.assertEqual((log.files_total, log.files_changed), (1, 1))
+
+    def test_incremental_backup_chains_to_previous_manifest(self):
+        first, _ = self._run("media")
+        second, _ = self._run("media", incremental=True)
+
+        self.assertEqual(second.status, "completed")
+        self.assertEqual(second.base_backup, first)
+        self.assertEqual((second.files_total, second.files_changed), (1, 0))
+        self.assertEqual(second.artifacts, [second.manifest_path])
+
+    def test_retention_keeps_archives_referenced_by_kept_manifests(self):
+        database, _ = self._run("database", keep=1)
+        first, _ = self._run("media", keep=1)
+        _write(self.media_root, "annotations/b.png", b"b" * 200)
+        second, _ = self._run("media", incremental=True, keep=1)
+
+        database.refresh_from_db()
+        first.refresh_from_db()
+        self.assertEqual(database.artifacts, [])
+        self.assertFalse(any(Path(self.destination).glob("db_*")))
+        archive = str(Path(self.destination) / f"media_{first.id}.tar")
+        self.assertEqual((first.artifacts, first.manifest_path), ([archive], ""))
+        self.assertTrue(Path(archive).exists())
+
+        restore_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, restore_root, ignore_errors=True)
+        call_command("restore_media_backup", str(second.id), "--media-root", restore_root, stdout=StringIO())
+        self.assertEqual(
+            sorted(path for path, _ in backup.iter_media_files(restore_root)),
+            ["annotations/a.png", "annotations/b.png"],
+        )
+
+        (Path(self.media_root) / "annotations/a.png").unlink()
+        self._run("media", keep=1)
+        self.assertFalse(Path(archive).exists())
@@ -683,6 +683,99 @@ class ChunkedUploadFileHandlingTestCase(TestCase):
                 pass
 
 
+class IncrementalChecksumTestCase(APITestCase):
+    """Test incremental checksums, per-chunk checksums and move-on-completion."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.user = User.objects.create_user("user", "user@test.com", "password")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.chunks = [b"a" * 1000, b"b" * 1000, b"c" * 500]
+        self.total = sum(len(chunk) for chunk in self.chunks)
+
+    def tearDown(self):
+        import shutil
+
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def _put(self, chunk, start, upload_id=None, **headers):
+        from django.core.files.uploadedfile import SimpleUploadedFile
+
+        data = {"file": SimpleUploadedFile("video.mp4", chunk, content_type="video/mp4")}
+        if upload_id:
+            url = reverse("ccc:annotation-chunked-upload-detail", kwargs={"pk": upload_id})
+        else:
+            url = reverse("ccc:annotation-chunked-upload")
+            data["filename"] = "video.mp4"
+        content_range = f"bytes {start}-{start + len(chunk) - 1}/{self.total}"
+        return self.client.put(url, data, format="multipart", HTTP_CONTENT_RANGE=content_range, **headers)
+
+    def _upload_all(self):
+        upload_id, start = None, 0
+        for chunk in self.chunks:
+            response = self._put(chunk, start, upload_id)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            upload_id = response.data["id"]
+            start += len(chunk)
+        return AnnotationFileUpload.objects.get(id=upload_id)
+
+    def test_checksum_tracked_while_appending(self):
+        """The checksum is available after the last chunk without re-reading the file."""
+        upload = self._upload_all()
+        expected = hashlib.sha256(b"".join(self.chunks)).hexdigest()
+
+        with patch("builtins.open", side_effect=AssertionError("file re-read")):
+            self.assertEqual(upload.checksum, expected)
+
+    def test_checksum_state_rebuilt_from_disk(self):
+        """A process without the hash state rebuilds it from the bytes on disk."""
+        from ccc.chunked_upload import _CHECKSUM_STATES
+
+        upload_id = self._put(self.chunks[0], 0).data["id"]
+        _CHECKSUM_STATES.clear()
+        self._put(self.chunks[1], 1000, upload_id)
+        self._put(self.chunks[2], 2000, upload_id)
+
+        upload = AnnotationFileUpload.objects.get(id=upload_id)
+        self.assertEqual(upload.checksum, hashlib.sha256(b"".join(self.chunks)).hexdigest())
+
+    def test_chunk_checksum_mismatch_rejected(self):
+        """A chunk whose X-Chunk-Checksum does not match is rejected before it is written."""
+        upload_id = self._put(self.chunks[0], 0, HTTP_X_CHUNK_CHECKSUM=hashlib.sha256(self.chunks[0]).hexdigest())
+        upload_id = upload_id.data["id"]
+
+        response = self._put(self.chunks[1], 1000, upload_id, HTTP_X_CHUNK_CHECKSUM="0" * 64)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(AnnotationFileUpload.objects.get(id=upload_id).offset, 1000)
+
+    def test_completion_moves_file_into_annotation(self):
+        """Completing the upload renames the assembled file into the annotation's storage."""
+        import os
+
+        upload = self._upload_all()
+        upload_path = upload.file.path
+
+        response = self.client.post(
+            reverse("ccc:annotation-chunked-upload-detail", kwargs={"pk": upload.id}),
+            {"sha256": hashlib.sha256(b"".join(self.chunks)).hexdigest(), "annotation_type": "video"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        annotation = Annotation.objects.get(id=response.data["annotation_id"])
+        self.assertTrue(annotation.file.name.startswith("annotations/"))
+        with open(annotation.file.path, "rb") as f:
+            self.assertEqual(f.read(), b"".join(self.chunks))
+        self.assertFalse(os.path.exists(upload_path))
+        self.assertFalse(os.path.exists(os.path.splitext(upload_path)[0] + ".done"))
+        upload.refresh_from_db()
+        self.assertFalse(upload.file)
+
+
 class ChunkedUploadSecurityTestCase(TestCase):
     """Security-focused tests for chunked upload functionality."""
 
@@ -0,0 +1,117 @@
+"""
+Tests for signed file downloads streamed from disk or delegated to nginx.
+"""
+
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ccc.file_serving import parse_range_header
+from ccc.models import Annotation
+
+FILE_CONTENT = bytes(range(256)) * 40
+
+
+class ParseRangeHeaderTestCase(TestCase):
+    """Test Range header parsing."""
+
+    def test_ranges(self):
+        self.assertEqual(parse_range_header("bytes=0-99", 1000), (0, 99))
+        self.assertEqual(parse_range_header("bytes=900-", 1000), (900, 999))
+        self.assertEqual(parse_range_header("bytes=-100", 1000), (900, 999))
+        self.assertEqual(parse_range_header("bytes=990-2000", 1000), (990, 999))
+
+    def test_ignored_and_unsatisfiable(self):
+        self.assertIsNone(parse_range_header(None, 1000))
+        self.assertIsNone(parse_range_header("bytes=0-1,5-6", 1000))
+        self.assertIsNone(parse_range_header("items=0-1", 1000))
+        self.assertFalse(parse_range_header("bytes=1000-", 1000))
+        self.assertFalse(parse_range_header("bytes=50-10", 1000))
+
+
+class AnnotationDownloadTestCase(TestCase):
+    """Test annotation downloads in desktop (streamed) and nginx modes."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        self.user = User.objects.create_user(username="downloader", password="testpass")
+        self.annotation = Annotation.objects.create(
+            annotation="Video",
+            annotation_type="video",
+            owner=self.user,
+            file=SimpleUploadedFile("clip.mp4", FILE_CONTENT, content_type="video/mp4"),
+        )
+        self.client = APIClient()
+        token = self.annotation.generate_download_token(self.user)
+        self.url = f"{reverse('ccc:annotation-download', args=[self.annotation.id])}?token={token}"
+
+    @override_settings(USE_X_ACCEL_REDIRECT=False)
+    def test_streams_full_file(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(b"".join(response.streaming_content), FILE_CONTENT)
+        self.assertEqual(response["Content-Length"], str(len(FILE_CONTENT)))
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertIn('attachment; filename="', response["Content-Disposition"])
+
+    @override_settings(USE_X_ACCEL_REDIRECT=False, FILE_STREAM_CHUNK_SIZE=1000)
+    def test_range_request(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=5000-7499")
+
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        chunks = list(response.streaming_content)
+        self.assertEqual([len(chunk) for chunk in chunks], [1000, 1000, 500])
+        self.assertEqual(b"".join(chunks), FILE_CONTENT[5000:7500])
+        self.assertEqual(response["Content-Range"], f"bytes 5000-7499/{len(FILE_CONTENT)}")
+        self.assertEqual(response["Content-Length"], "2500")
+
+    @override_settings(USE_X_ACCEL_REDIRECT=False)
+    def test_unsatisfiable_range(self):
+        response = self.client.get(self.url, HTTP_RANGE=f"bytes={len(FILE_CONTENT)}-")
+
+        self.assertEqual(response.status_code, status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(FILE_CONTENT)}")
+
+    @override_settings(USE_X_ACCEL_REDIRECT=False)
+    def test_conditional_requests(self):
+        first = self.client.get(self.url)
+        etag, last_modified = first["ETag"], first["Last-Modified"]
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"stale"').status_code, 200)
+
+        stale_range = self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"stale"')
+        self.assertEqual(stale_range.status_code, 200)
+        fresh_range = self.client.get(self.url, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE=etag)
+        self.assertEqual(fresh_range.status_code, 206)
+
+    @override_settings(USE_X_ACCEL_REDIRECT=True)
+    def test_x_accel_redirect_with_nginx(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Accel-Redirect"], f"/internal/media/{self.annotation.file.name}")
+        self.assertFalse(response.streaming)
+
+    @override_settings(USE_X_ACCEL_REDIRECT=False)
+    def test_invalid_token_does_not_open_file(self):
+        response = self.client.get(
+            f"{reverse('ccc:annotation-download', args=[self.annotation.id])}?token={self.annotation.id}:bad"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
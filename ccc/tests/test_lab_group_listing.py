@@ -0,0 +1,86 @@
+"""
+Tests for batched lab group serialization.
+"""
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ccc.models import LabGroup, LabGroupPermission
+
+
+class LabGroupListingTestCase(TestCase):
+    """Test that listed groups report the same access as the per-group model methods."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("member", "member@test.com", "password")
+        self.other = User.objects.create_user("other", "other@test.com", "password")
+        self.root = LabGroup.objects.create(name="Institute", creator=self.other, allow_member_invites=False)
+        self.department = LabGroup.objects.create(name="Department", parent_group=self.root, creator=self.other)
+        self.lab = LabGroup.objects.create(name="Lab", parent_group=self.department, creator=self.other)
+        self.own = LabGroup.objects.create(name="Own Lab", creator=self.user)
+        LabGroup.objects.create(name="Retired", parent_group=self.department, is_active=False)
+        self.lab.members.add(self.user, self.other)
+        self.own.members.add(self.user)
+        LabGroupPermission.objects.create(user=self.user, lab_group=self.department, can_manage=True)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _list(self):
+        response = self.client.get(reverse("ccc:labgroup-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {group["name"]: group for group in response.data["results"]}
+
+    def test_list_matches_model_methods(self):
+        """Batched flags, counts and paths agree with the LabGroup methods."""
+        groups = self._list()
+
+        self.assertEqual(set(groups), {"Institute", "Department", "Lab", "Own Lab"})
+        for lab_group in [self.root, self.department, self.lab, self.own]:
+            data = groups[lab_group.name]
+            self.assertEqual(data["is_member"], lab_group.is_member(self.user), lab_group.name)
+            self.assertEqual(data["can_invite"], lab_group.can_invite(self.user), lab_group.name)
+            self.assertEqual(data["can_manage"], lab_group.can_manage(self.user), lab_group.name)
+            self.assertEqual(data["can_process_jobs"], lab_group.can_process_jobs(self.user), lab_group.name)
+            self.assertEqual(data["is_creator"], lab_group.is_creator(self.user), lab_group.name)
+            self.assertEqual(data["full_path"], lab_group.get_full_path(), lab_group.name)
+            self.assertEqual(data["member_count"], lab_group.members.count(), lab_group.name)
+            self.assertEqual(
+                data["sub_groups_count"], lab_group.sub_groups.filter(is_active=True).count(), lab_group.name
+            )
+
+        self.assertFalse(groups["Institute"]["can_invite"])
+        self.assertTrue(groups["Department"]["can_manage"])
+        self.assertEqual(groups["Lab"]["member_count"], 2)
+        self.assertEqual([step["name"] for step in groups["Lab"]["full_path"]], ["Institute", "Department", "Lab"])
+
+    def test_query_count_does_not_grow_with_groups(self):
+        """Listing more sibling groups does not add queries."""
+        with CaptureQueriesContext(connection) as baseline:
+            self._list()
+
+        for index in range(20):
+            sibling = LabGroup.objects.create(name=f"Sibling {index}", parent_group=self.department)
+            sibling.members.add(self.user)
+            LabGroupPermission.objects.create(user=self.user, lab_group=sibling, can_invite=True)
+
+        with CaptureQueriesContext(connection) as queries:
+            groups = self._list()
+
+        self.assertEqual(len(groups), 24)
+        self.assertEqual(len(queries), len(baseline))
+        self.assertTrue(groups["Sibling 0"]["can_invite"])
+
+    def test_detail_resolves_single_group(self):
+        """The detail view resolves access for just the requested group."""
+        response = self.client.get(reverse("ccc:labgroup-detail", args=[self.lab.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["is_member"])
+        self.assertEqual(response.data["member_count"], 2)
+        self.assertEqual(len(response.data["full_path"]), 3)
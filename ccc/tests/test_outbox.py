@@ -0,0 +1,120 @@
+"""
+Tests for the outbound email queue.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.mail import get_connection
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ccc.models import OutboundEmail
+from ccc.outbox import OUTBOX_MAX_ATTEMPTS, deliver_outbox, queue_email
+
+
+class OutboxTestCase(TestCase):
+    """Test queueing, batched delivery and retry scheduling."""
+
+    @patch("ccc.tasks.deliver_outbound_email.delay")
+    def test_queue_email_defers_delivery_until_commit(self, mock_delay):
+        """Queueing writes a row and only schedules the delivery job once the transaction commits."""
+        with self.captureOnCommitCallbacks(execute=True):
+            email = queue_email("Hello", "Body", ["a@example.com"], category="test")
+            mock_delay.assert_not_called()
+
+        mock_delay.assert_called_once_with()
+        self.assertEqual(email.status, "pending")
+        self.assertEqual(email.from_email, "webmaster@localhost")
+        self.assertEqual(mail.outbox, [])
+
+    @patch("ccc.outbox.schedule_delivery")
+    def test_batch_sent_over_one_connection(self, mock_schedule):
+        """Due emails are sent over a single connection and marked sent together."""
+        for index in range(3):
+            OutboundEmail.objects.create(
+                subject=f"Email {index}", body="Body", from_email="from@example.com", recipients=[f"{index}@x.org"]
+            )
+
+        with patch("ccc.outbox.get_connection", wraps=get_connection) as mock_connection:
+            run = deliver_outbox()
+
+        self.assertEqual(run.sent, 3)
+        mock_connection.assert_called_once()
+        self.assertEqual(sorted(message.subject for message in mail.outbox), ["Email 0", "Email 1", "Email 2"])
+        self.assertEqual(OutboundEmail.objects.filter(status="sent", sent_at__isnull=False).count(), 3)
+        mock_schedule.assert_not_called()
+
+    @patch("ccc.outbox.schedule_delivery")
+    def test_failures_back_off_then_give_up(self, mock_schedule):
+        """An unreachable relay reschedules with backoff and eventually marks the email failed."""
+        email = OutboundEmail.objects.create(
+            subject="Retry", body="Body", from_email="from@example.com", recipients=["r@x.org"]
+        )
+
+        with patch("ccc.outbox.get_connection") as mock_connection:
+            mock_connection.return_value.open.side_effect = OSError("Connection refused")
+            before = timezone.now()
+            run = deliver_outbox()
+
+            email.refresh_from_db()
+            self.assertEqual((run.retrying, email.status, email.attempts), (1, "pending", 1))
+            self.assertIn("Connection refused", email.last_error)
+            self.assertGreaterEqual(email.next_attempt_at, before + timedelta(seconds=60))
+            self.assertGreaterEqual(mock_schedule.call_args[0][0], timedelta(seconds=59))
+
+            OutboundEmail.objects.filter(id=email.id).update(
+                attempts=OUTBOX_MAX_ATTEMPTS - 1, next_attempt_at=timezone.now()
+            )
+            run = deliver_outbox()
+
+        email.refresh_from_db()
+        self.assertEqual((run.failed, email.status), (1, "failed"))
+
+    @patch("ccc.outbox.schedule_delivery")
+    def test_expired_sending_lease_is_reclaimed(self, mock_schedule):
+        """Emails left in sending by a dead worker are delivered once the lease expires."""
+        OutboundEmail.objects.create(
+            subject="Stuck",
+            body="Body",
+            from_email="from@example.com",
+            recipients=["s@x.org"],
+            status="sending",
+            next_attempt_at=timezone.now() - timedelta(minutes=1),
+        )
+
+        self.assertEqual(deliver_outbox().sent, 1)
+        self.assertEqual(len(mail.outbox), 1)
+
+    @override_settings(SYNC_OPERATIONS_ONLY=True)
+    def test_sync_mode_flushes_after_commit(self):
+        """Without a worker the outbox is flushed inline after commit."""
+        with self.captureOnCommitCallbacks(execute=True):
+            queue_email("Desktop", "Body", ["d@example.com"])
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(OutboundEmail.objects.get().status, "sent")
+
+    @patch("ccc.tasks.deliver_outbound_email.delay")
+    def test_password_reset_request_queues_email(self, mock_delay):
+        """The password reset endpoint queues the email instead of talking to the relay."""
+        user = User.objects.create_user("forgetful", "forgetful@example.com", "password")
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.post(
+                reverse("ccc:users-request-password-reset"), {"email": "forgetful@example.com"}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        email = OutboundEmail.objects.get()
+        self.assertEqual((email.category, email.recipients), ("password_reset", ["forgetful@example.com"]))
+        self.assertEqual(mail.outbox, [])
+        mock_delay.assert_called_once_with()
@@ -0,0 +1,70 @@
+"""
+Tests for the cached site configuration payload.
+"""
+
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from ccc.models import SiteConfig
+from ccc.tasks import refresh_available_whisper_models
+
+
+class SiteConfigCacheTestCase(APITestCase):
+    """Test that site configuration is served from cache with ETag support."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.config = SiteConfig.objects.create(site_name="Cached Site")
+        self.url = reverse("ccc:siteconfig-public")
+
+    def test_public_payload_served_from_cache(self):
+        first = self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(second.data["site_name"], "Cached Site")
+
+    def test_matching_etag_returns_304(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_save_invalidates_payload(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.config.site_name = "Renamed Site"
+            self.config.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["site_name"], "Renamed Site")
+        self.assertNotEqual(response["ETag"], etag)
+
+    @patch.object(SiteConfig, "scan_available_whisper_models")
+    def test_whisper_model_refresh_invalidates_payload(self, mock_scan):
+        admin = User.objects.create_user("admin", "admin@test.com", "password", is_staff=True)
+        self.client.force_authenticate(user=admin)
+        current_url = reverse("ccc:siteconfig-current")
+        self.assertEqual(self.client.get(current_url).data["available_whisper_models"], [])
+
+        mock_scan.return_value = [{"path": "/models/ggml-tiny.bin", "name": "tiny"}]
+        refresh_available_whisper_models()
+        response = self.client.get(current_url)
+
+        self.assertEqual(response.data["available_whisper_models"], mock_scan.return_value)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
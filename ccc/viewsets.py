@@ -17,7 +17,6 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import User
 from django.contrib.auth.tokens import default_token_generator
-from django.core.mail import send_mail
 from django.core.signing import TimestampSigner
 from django.db import models
 from django.db.models import Q
@@ -38,6 +37,7 @@ from rest_framework.response import Response
 
 from ccc.permissions import IsSuperUser
 
+from .file_serving import serve_file
 from .models import (
     Annotation,
     AnnotationFolder,
@@ -51,6 +51,7 @@ from .models import (
     SiteConfig,
     UserOrcidProfile,
 )
+from .outbox import queue_email
 from .serializers import (
     AccountLinkingSerializer,
     AccountMergeRequestSerializer,
@@ -77,6 +78,7 @@ from .serializers import (
     UserRegistrationSerializer,
     UserSerializer,
 )
+from .site_config_cache import build_site_config_payload, etag_matches, get_site_config_payload
 from .tasks import run_backup as run_backup_task
 
 logger = logging.getLogger(__name__)
@@ -112,52 +114,22 @@ class SiteConfigViewSet(viewsets.ModelViewSet, FilterMixin):
         """Track who created the configuration."""
         serializer.save(updated_by=self.request.user)
 
+    def _payload_response(self, request, data, etag, cache_control):
+        """Return a cached payload, or 304 if the client already holds this version."""
+        if etag_matches(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(data)
+        response["ETag"] = etag
+        response["Cache-Control"] = cache_control
+        return response
+
     @action(detail=False, methods=["get"], permission_classes=[AllowAny])
     def public(self, request):
-        """Get public site configuration (no auth required)."""
+        """Get public site configuration (no auth required), served from cache with ETag support."""
         try:
-            site_config = SiteConfig.objects.first()
-            if site_config:
-                serializer = self.get_serializer(site_config)
-                data = {
-                    "site_name": serializer.data["site_name"],
-                    "logo_url": serializer.data["logo_url"],
-                    "primary_color": serializer.data["primary_color"],
-                    "show_powered_by": serializer.data["show_powered_by"],
-                    "allow_user_registration": serializer.data["allow_user_registration"],
-                    "enable_orcid_login": serializer.data["enable_orcid_login"],
-                    "booking_deletion_window_minutes": serializer.data["booking_deletion_window_minutes"],
-                    "ui_features": serializer.data["ui_features_with_defaults"],
-                    "installed_apps": serializer.data["installed_apps"],
-                    "max_upload_size": serializer.data["max_upload_size"],
-                    "max_chunked_upload_size": serializer.data["max_chunked_upload_size"],
-                    "demo_mode": settings.DEMO_MODE,
-                    "demo_cleanup_interval_minutes": settings.DEMO_CLEANUP_INTERVAL_MINUTES
-                    if settings.DEMO_MODE
-                    else None,
-                }
-                return Response(data)
-            else:
-                default_config = SiteConfig()
-                temp_serializer = self.get_serializer(default_config)
-                return Response(
-                    {
-                        "site_name": "CUPCAKE",
-                        "primary_color": "#1976d2",
-                        "show_powered_by": True,
-                        "allow_user_registration": False,
-                        "enable_orcid_login": False,
-                        "booking_deletion_window_minutes": 30,
-                        "ui_features": temp_serializer.data["ui_features_with_defaults"],
-                        "installed_apps": temp_serializer.data["installed_apps"],
-                        "max_upload_size": temp_serializer.data["max_upload_size"],
-                        "max_chunked_upload_size": temp_serializer.data["max_chunked_upload_size"],
-                        "demo_mode": settings.DEMO_MODE,
-                        "demo_cleanup_interval_minutes": settings.DEMO_CLEANUP_INTERVAL_MINUTES
-                        if settings.DEMO_MODE
-                        else None,
-                    }
-                )
+            payload = get_site_config_payload()
+            return self._payload_response(request, payload["public"], payload["public_etag"], "no-cache")
         except Exception as e:
             return Response(
                 {"error": f"Failed to get site config: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -183,13 +155,13 @@ class SiteConfigViewSet(viewsets.ModelViewSet, FilterMixin):
 
     @action(detail=False, methods=["get"], permission_classes=[IsAdminUser])
     def current(self, request):
-        """Get current site configuration (admin only)."""
+        """Get current site configuration (admin only), served from cache with ETag support."""
         try:
-            site_config = SiteConfig.objects.first()
-            if not site_config:
-                site_config = SiteConfig.objects.create()
-            serializer = SiteConfigSerializer(site_config)
-            return Response(serializer.data)
+            payload = get_site_config_payload()
+            if payload["admin"] is None:
+                SiteConfig.objects.create()
+                payload = build_site_config_payload()
+            return self._payload_response(request, payload["admin"], payload["admin_etag"], "private, no-cache")
         except Exception as e:
             return Response(
                 {"error": f"Failed to get site config: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -347,34 +319,19 @@ class LabGroupViewSet(viewsets.ModelViewSet, FilterMixin):
         3. Parent groups of groups they're members of (bubble-up)
         """
         user = self.request.user
+        queryset = LabGroup.with_counts(super().get_queryset())
         if user.is_staff:
             # Admins can see all groups
-            return LabGroup.objects.all()
-        else:
-            # Start with groups user created or is a direct member of
-            accessible_groups = set()
-
-            # Groups where user is creator or direct member
-            direct_groups = LabGroup.objects.filter(Q(members=user) | Q(creator=user))
-
-            for group in direct_groups:
-                # Add the group itself
-                accessible_groups.add(group.id)
-
-                # Add all parent groups (bubble up)
-                current = group.parent_group
-                while current:
-                    accessible_groups.add(current.id)
-                    current = current.parent_group
-
-            return LabGroup.objects.filter(id__in=accessible_groups).distinct()
+            return queryset
+        # Groups the user created or is a direct member of, plus their parents (bubble up)
+        return queryset.filter(id__in=LabGroup.get_accessible_group_ids(user))
 
     @action(detail=False, methods=["get"])
     def my_groups(self, request):
         """Get lab groups the current user is a member of or has created."""
         user = request.user
         groups = self.get_queryset()
-        groups = groups.filter(Q(members=user) | Q(creator=user)).distinct()
+        groups = groups.filter(Q(id__in=user.lab_groups.values("id")) | Q(creator=user))
         paginator = self.pagination_class()
         paginated_groups = paginator.paginate_queryset(groups, request)
         serializer = self.get_serializer(paginated_groups, many=True)
@@ -431,13 +388,7 @@ Best regards,
 The Team
                 """.strip()
 
-                send_mail(
-                    subject,
-                    message,
-                    getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@example.com"),
-                    [invited_email],
-                    fail_silently=True,  # Don't fail the invitation if email fails
-                )
+                queue_email(subject, message, [invited_email], category="lab_group_invitation")
             except Exception as e:
                 # Log the error but don't fail the invitation creation
                 # Could be logged to a proper logging system in production
@@ -1139,24 +1090,12 @@ Best regards,
 The Team
                 """.strip()
 
-                try:
-                    send_mail(
-                        subject,
-                        message,
-                        getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@example.com"),
-                        [new_email],
-                        fail_silently=False,
-                    )
+                queue_email(subject, message, [new_email], category="email_change_verification")
 
-                    return Response(
-                        {"message": f"Verification email sent to {new_email}", "new_email": new_email},
-                        status=status.HTTP_200_OK,
-                    )
-                except Exception as email_error:
-                    return Response(
-                        {"error": f"Failed to send verification email: {str(email_error)}"},
-                        status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    )
+                return Response(
+                    {"message": f"Verification email sent to {new_email}", "new_email": new_email},
+                    status=status.HTTP_200_OK,
+                )
             except Exception as e:
                 return Response(
                     {"error": f"Failed to request email change: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -1206,13 +1145,7 @@ Best regards,
 The Team
                     """.strip()
 
-                    send_mail(
-                        subject,
-                        message,
-                        getattr(settings, "DEFAULT_FROM_EMAIL", "noreply@example.com"),
-                        [old_email],
-                        fail_silently=True,  # Don't fail if old email can't receive
-                    )
+                    queue_email(subject, message, [old_email], category="email_change_confirmation")
                 except Exception:
                     # Don't fail the email change if notification fails
                     pass
@@ -1295,17 +1228,7 @@ The Team
                     This link will expire in 24 hours.
                     """
 
-                    try:
-                        send_mail(
-                            subject,
-                            message,
-                            settings.DEFAULT_FROM_EMAIL,
-                            [user.email],
-                            fail_silently=False,
-                        )
-                    except Exception as e:
-                        # Log the error but don't reveal it to user
-                        print(f"Failed to send password reset email: {str(e)}")
+                    queue_email(subject, message, [user.email], category="password_reset")
 
                 # Always return success to prevent email enumeration
                 return Response(
@@ -1478,24 +1401,21 @@ class AnnotationViewSet(viewsets.ModelViewSet, FilterMixin):
         - Standalone annotations in shared folders
         - Personal notes not attached to any resource
         - Annotations before they're attached to a parent
+
+        Standalone annotations are found through the maintained ``is_attached``
+        flag, and group visibility is a semi-join on the user's lab groups, so
+        the query needs neither reverse joins nor DISTINCT.
         """
         user = self.request.user
-        base_queryset = Annotation.objects.filter(is_active=True, scratched=False)
-
-        base_queryset = base_queryset.filter(
-            instrument_attachments__isnull=True,
-            stored_reagent_attachments__isnull=True,
-            maintenance_log_attachments__isnull=True,
-            session_attachments__isnull=True,
-            step_attachments__isnull=True,
-        )
+        base_queryset = Annotation.objects.filter(is_attached=False, is_active=True, scratched=False)
 
         if user.is_staff:
             return base_queryset
 
+        user_lab_groups = LabGroup.objects.filter(members=user).values("id")
         return base_queryset.filter(
-            Q(owner=user) | Q(visibility="public") | (Q(visibility="group") & Q(lab_group__members=user))
-        ).distinct()
+            Q(owner=user) | Q(visibility="public") | Q(visibility="group", lab_group__in=user_lab_groups)
+        )
 
     def perform_create(self, serializer):
         """Set owner and default values on annotation creation."""
@@ -1615,27 +1535,7 @@ class AnnotationViewSet(viewsets.ModelViewSet, FilterMixin):
         if not annotation.can_view(user):
             return HttpResponse("Permission denied", status=403)
 
-        is_electron = getattr(settings, "IS_ELECTRON_ENVIRONMENT", False)
-
-        if is_electron:
-            file_path = annotation.file.path
-            if not os.path.exists(file_path):
-                return HttpResponse("File not found", status=404)
-
-            with open(file_path, "rb") as f:
-                file_content = f.read()
-
-            response = HttpResponse(file_content, content_type="application/octet-stream")
-            response["Content-Disposition"] = f'attachment; filename="{os.path.basename(annotation.file.name)}"'
-            response["Content-Encoding"] = "identity"
-        else:
-            response = HttpResponse()
-            response["X-Accel-Redirect"] = f"/internal/media/{annotation.file.name}"
-            response["Content-Type"] = "application/octet-stream"
-            response["Content-Disposition"] = f'attachment; filename="{os.path.basename(annotation.file.name)}"'
-            response["Cache-Control"] = "private, max-age=300"
-            response["X-Content-Type-Options"] = "nosniff"
-            response["X-Download-Options"] = "noopen"
+        response = serve_file(request, annotation.file)
 
         origin = request.META.get("HTTP_ORIGIN")
         cors_allowed_origins = getattr(settings, "CORS_ORIGIN_WHITELIST", [])
@@ -1646,6 +1546,7 @@ class AnnotationViewSet(viewsets.ModelViewSet, FilterMixin):
             response["Access-Control-Allow-Credentials"] = "true"
             response["Access-Control-Allow-Methods"] = "GET, OPTIONS"
             response["Access-Control-Allow-Headers"] = ", ".join(getattr(settings, "CORS_ALLOW_HEADERS", []))
+            response["Access-Control-Expose-Headers"] = "Accept-Ranges, Content-Length, Content-Range, ETag"
 
         return response
 
@@ -1980,6 +1881,7 @@ class ApplianceViewSet(viewsets.ViewSet):
         self._require_staff(request)
         backup_type = request.data.get("backup_type", "").strip()
         destination = request.data.get("destination", "").strip()
+        incremental = str(request.data.get("incremental", False)).lower() == "true"
 
         if backup_type not in _VALID_BACKUP_TYPES:
             return Response(
@@ -2000,6 +1902,7 @@ class ApplianceViewSet(viewsets.ViewSet):
         log = BackupLog.objects.create(
             backup_type=backup_type,
             destination=destination,
+            incremental=incremental,
             triggered_by=request.user,
         )
         run_backup_task.delay(log.id)
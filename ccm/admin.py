@@ -252,7 +252,7 @@ class StoredReagentAdmin(admin.ModelAdmin):
 
     def low_stock_status(self, obj):
         """Display low stock warning."""
-        if obj.notify_on_low_stock and obj.low_stock_threshold and obj.quantity <= obj.low_stock_threshold:
+        if obj.notify_on_low_stock and obj.low_stock_threshold and obj.current_quantity <= obj.low_stock_threshold:
             return format_html('<span style="color:red;">LOW</span>')
         return "-"
 
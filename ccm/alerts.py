@@ -0,0 +1,326 @@
+"""
+Set-based alert scanning for instruments and stored reagents.
+
+The per-object ``check_*`` methods on ``Instrument`` and ``StoredReagent`` each
+issue their own queries, notifications and ``save()`` calls, which makes a full
+scan grow with inventory size. ``AlertScanner`` selects the candidates with a
+handful of queries (thresholds, expiry windows and notification throttles are
+applied in SQL, and instruments are range-scanned on their stored
+``next_maintenance_due`` and ``warranty_expires_on`` dates), delivers the
+notifications in batches through ``ccm.communication.send_notifications_bulk``
+and writes the throttle timestamps back with one ``UPDATE`` per alert kind.
+The alert rules match the per-object methods, which remain the entry point for
+single-object checks.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Dict, List
+
+from django.db.models import F, Max, OuterRef, Prefetch, Q, Subquery
+from django.utils import timezone
+
+from .communication import build_maintenance_alert, build_reagent_alert, send_notifications_bulk
+from .models import Instrument, MaintenanceLog, ReagentSubscription, StoredReagent, SupportInformation
+
+logger = logging.getLogger(__name__)
+
+INSTRUMENT_THROTTLE = timedelta(days=7)
+LOW_STOCK_THROTTLE = timedelta(days=7)
+EXPIRY_THROTTLE = timedelta(days=3)
+
+DEFAULT_WARRANTY_DAYS = 30
+DEFAULT_MAINTENANCE_DAYS = 14
+
+
+@dataclass
+class AlertScanReport:
+    """Outcome of an alert scan: alerted objects per kind and per-phase timings in seconds."""
+
+    warranty: List[Instrument] = field(default_factory=list)
+    maintenance: List[Instrument] = field(default_factory=list)
+    low_stock: List[StoredReagent] = field(default_factory=list)
+    expiry: List[StoredReagent] = field(default_factory=list)
+    notifications_sent: int = 0
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def total_alerts(self) -> int:
+        return len(self.warranty) + len(self.maintenance) + len(self.low_stock) + len(self.expiry)
+
+
+class AlertScanner:
+    """
+    Scan all instruments and stored reagents for alerts with set-based queries.
+
+    Args:
+        warranty_days: Days before warranty expiry to alert; falls back to each
+            instrument's ``days_before_warranty_notification`` when falsy
+        maintenance_days: Days before maintenance is due to alert; falls back to
+            each instrument's ``days_before_maintenance_notification`` when falsy
+        expiry_days: Days before reagent expiry to alert
+        batch_size: Notification rows per INSERT
+    """
+
+    def __init__(self, warranty_days=30, maintenance_days=14, expiry_days=7, batch_size=500):
+        """Initialize the alert windows in days, the notification batch size and the scan timestamp."""
+        self.warranty_days = warranty_days
+        self.maintenance_days = maintenance_days
+        self.expiry_days = expiry_days
+        self.batch_size = batch_size
+        self.now = timezone.now()
+        self.today = self.now.date()
+
+    def run(self) -> AlertScanReport:
+        """Run every alert phase and return the report."""
+        report = AlertScanReport()
+        for phase in ("warranty", "maintenance", "low_stock", "expiry"):
+            started = time.monotonic()
+            getattr(self, f"scan_{phase}")(report)
+            report.timings[phase] = time.monotonic() - started
+        report.timings["total"] = sum(report.timings.values())
+        return report
+
+    # -- helpers -------------------------------------------------------------
+
+    def _window(self, explicit, per_object_field, default):
+        """Return the largest threshold any instrument can use, for bounding the SQL window."""
+        if explicit:
+            return explicit
+        configured = Instrument.objects.filter(enabled=True).aggregate(days=Max(per_object_field))["days"]
+        return max(configured or 0, default)
+
+    @staticmethod
+    def _threshold(explicit, configured, default):
+        return explicit or configured or default
+
+    def _send_bulk(self, notifications):
+        return send_notifications_bulk(notifications, batch_size=self.batch_size)
+
+    def _instrument_notifications(self, alerts, message_type):
+        notifications = []
+        for instrument, info in alerts:
+            if not instrument.user:
+                logger.warning(f"No users to notify for instrument {instrument.id}")
+                continue
+            alert = build_maintenance_alert(instrument, message_type, info)
+            notifications.append(
+                {
+                    "title": alert["title"],
+                    "message": alert["message"],
+                    "recipient": instrument.user,
+                    "notification_type": alert["notification_type"],
+                    "priority": alert["priority"],
+                    "related_object": instrument,
+                    "data": alert["data"],
+                }
+            )
+        return notifications
+
+    def _reagent_notifications(self, alerts):
+        notifications = []
+        for stored_reagent, alert_type in alerts:
+            recipients = [subscription.user for subscription in stored_reagent.subscriptions.all()]
+            if not recipients and stored_reagent.user:
+                recipients = [stored_reagent.user]
+            if not recipients:
+                logger.warning(f"No users to notify for stored reagent {stored_reagent.id}")
+                continue
+            alert = build_reagent_alert(stored_reagent, alert_type)
+            for user in recipients:
+                notifications.append(
+                    {
+                        "title": alert["title"],
+                        "message": alert["message"],
+                        "recipient": user,
+                        "notification_type": alert["notification_type"],
+                        "priority": alert["priority"],
+                        "related_object": stored_reagent,
+                        "data": alert["data"],
+                    }
+                )
+        return notifications
+
+    def _instrument_candidates(self, throttle_field):
+        throttled = Q(**{f"{throttle_field}__isnull": True}) | Q(
+            **{f"{throttle_field}__lt": self.now - INSTRUMENT_THROTTLE}
+        )
+        return Instrument.objects.filter(throttled, enabled=True)
+
+    def _prefetched_instruments(self, queryset):
+        return (
+            queryset.select_related("user")
+            .prefetch_related(Prefetch("support_information", queryset=SupportInformation.objects.order_by("id")))
+            .order_by("id")
+        )
+
+    def _prefetched_reagents(self, queryset):
+        return queryset.select_related("reagent", "user").prefetch_related(
+            Prefetch("subscriptions", queryset=ReagentSubscription.objects.select_related("user").order_by("id"))
+        )
+
+    # -- instrument phases ---------------------------------------------------
+
+    def scan_warranty(self, report: AlertScanReport) -> None:
+        """Alert on warranties ending within the threshold (not already ended)."""
+        window = self._window(self.warranty_days, "days_before_warranty_notification", DEFAULT_WARRANTY_DAYS)
+        Instrument.rebuild_lapsed_warranties()
+        candidates = self._instrument_candidates("last_warranty_notification_sent").filter(
+            warranty_expires_on__gt=self.today, warranty_expires_on__lte=self.today + timedelta(days=window)
+        )
+
+        alerts = []
+        for instrument in self._prefetched_instruments(candidates):
+            threshold = self._threshold(
+                self.warranty_days, instrument.days_before_warranty_notification, DEFAULT_WARRANTY_DAYS
+            )
+            days_remaining = (instrument.warranty_expires_on - self.today).days
+            if days_remaining > threshold:
+                continue
+            vendor = next(
+                (
+                    support_info.vendor_name
+                    for support_info in instrument.support_information.all()
+                    if support_info.warranty_end_date == instrument.warranty_expires_on
+                ),
+                None,
+            )
+            info = {
+                "warranty_end_date": instrument.warranty_expires_on.isoformat(),
+                "days_remaining": days_remaining,
+                "vendor": vendor,
+            }
+            alerts.append((instrument, info))
+
+        if not alerts:
+            return
+        report.notifications_sent += len(self._send_bulk(self._instrument_notifications(alerts, "warranty_expiring")))
+        # Instruments are throttled whether or not delivery succeeded, as with check_warranty_expiration
+        Instrument.objects.filter(id__in=[instrument.id for instrument, _ in alerts]).update(
+            last_warranty_notification_sent=self.now
+        )
+        report.warranty.extend(instrument for instrument, _ in alerts)
+
+    def scan_maintenance(self, report: AlertScanReport) -> None:
+        """
+        Alert on maintenance due within the threshold, from the stored next-due date.
+
+        Instruments never maintained are due one maintenance interval from today.
+        """
+        window = self._window(self.maintenance_days, "days_before_maintenance_notification", DEFAULT_MAINTENANCE_DAYS)
+        last_completed = (
+            MaintenanceLog.objects.filter(instrument=OuterRef("pk"), status="completed", maintenance_date__isnull=False)
+            .order_by("-maintenance_date")
+            .values("maintenance_date")[:1]
+        )
+        candidates = (
+            self._instrument_candidates("last_maintenance_notification_sent")
+            .filter(
+                Q(next_maintenance_due__lte=self.today + timedelta(days=window))
+                | Q(next_maintenance_due__isnull=True, maintenance_interval_days__lte=window)
+            )
+            .annotate(last_completed=Subquery(last_completed))
+        )
+
+        alerts = []
+        for instrument in self._prefetched_instruments(candidates):
+            threshold = self._threshold(
+                self.maintenance_days, instrument.days_before_maintenance_notification, DEFAULT_MAINTENANCE_DAYS
+            )
+            days_remaining = instrument.days_until_maintenance(self.today)
+            if days_remaining > threshold:
+                continue
+            if instrument.next_maintenance_due:
+                info = {
+                    "next_maintenance_date": instrument.next_maintenance_due.isoformat(),
+                    "days_remaining": days_remaining,
+                    "frequency_days": instrument.maintenance_interval_days,
+                    "last_maintenance": instrument.last_completed.isoformat(),
+                }
+            else:
+                info = {"frequency_days": instrument.maintenance_interval_days, "initial_maintenance": True}
+            alerts.append((instrument, info))
+
+        if not alerts:
+            return
+        report.notifications_sent += len(self._send_bulk(self._instrument_notifications(alerts, "maintenance_due")))
+        Instrument.objects.filter(id__in=[instrument.id for instrument, _ in alerts]).update(
+            last_maintenance_notification_sent=self.now
+        )
+        report.maintenance.extend(instrument for instrument, _ in alerts)
+
+    # -- reagent phases ------------------------------------------------------
+
+    def _deliver_reagent_alerts(self, alerts):
+        """Send reagent alerts and return the ids of stored reagents with at least one delivered notification."""
+        created = self._send_bulk(self._reagent_notifications(alerts))
+        delivered = {notification.object_id for notification in created}
+        if delivered:
+            StoredReagent.objects.filter(id__in=delivered).update(last_notification_sent=self.now)
+        return len(created), delivered
+
+    def scan_low_stock(self, report: AlertScanReport) -> None:
+        """Alert on stored reagents at or below their low-stock threshold."""
+        candidates = (
+            StoredReagent.objects.filter(
+                notify_on_low_stock=True,
+                low_stock_threshold__isnull=False,
+                current_quantity__lte=F("low_stock_threshold"),
+            )
+            .exclude(low_stock_threshold=0)
+            .filter(
+                Q(last_notification_sent__isnull=True) | Q(last_notification_sent__lt=self.now - LOW_STOCK_THROTTLE)
+            )
+            .order_by("id")
+        )
+        alerts = [(stored_reagent, "low_stock") for stored_reagent in self._prefetched_reagents(candidates)]
+        if not alerts:
+            return
+
+        sent, delivered = self._deliver_reagent_alerts(alerts)
+        report.notifications_sent += sent
+        report.low_stock.extend(stored_reagent for stored_reagent, _ in alerts if stored_reagent.id in delivered)
+
+    def scan_expiry(self, report: AlertScanReport) -> None:
+        """
+        Alert on stored reagents that have expired or expire within the threshold.
+
+        Runs after the low-stock phase, so reagents alerted for low stock in this
+        scan are already excluded by the throttle window.
+        """
+        candidates = (
+            StoredReagent.objects.filter(
+                expiration_date__isnull=False,
+                expiration_date__lte=self.today + timedelta(days=self.expiry_days or 0),
+            )
+            .filter(Q(last_notification_sent__isnull=True) | Q(last_notification_sent__lt=self.now - EXPIRY_THROTTLE))
+            .order_by("id")
+        )
+        alerts = [
+            (stored_reagent, "expired" if stored_reagent.expiration_date <= self.today else "expiring_soon")
+            for stored_reagent in self._prefetched_reagents(candidates)
+        ]
+        if not alerts:
+            return
+
+        sent, delivered = self._deliver_reagent_alerts(alerts)
+        report.notifications_sent += sent
+        report.expiry.extend(stored_reagent for stored_reagent, _ in alerts if stored_reagent.id in delivered)
+
+
+def scan_alerts(warranty_days=30, maintenance_days=14, expiry_days=7, batch_size=500) -> AlertScanReport:
+    """
+    Scan all instruments and stored reagents and deliver the resulting alerts.
+
+    Args:
+        warranty_days: Days before warranty expiry to alert
+        maintenance_days: Days before maintenance is due to alert
+        expiry_days: Days before reagent expiry to alert
+        batch_size: Notification rows per INSERT
+
+    Returns:
+        AlertScanReport: Alerted objects per kind and per-phase timings
+    """
+    return AlertScanner(warranty_days, maintenance_days, expiry_days, batch_size).run()
@@ -0,0 +1,134 @@
+"""
+Booking overlap enforcement and availability for instrument usage.
+
+Bookings on instruments that do not allow overlaps are flagged ``exclusive``.
+On PostgreSQL a GiST exclusion constraint over ``(instrument, [time_started,
+time_ended))`` for exclusive bookings makes overlapping inserts fail in the
+database, whatever the interleaving of concurrent requests. Everywhere else
+(the SQLite desktop builds) ``save_booking`` serializes bookings per
+instrument by taking a write lock on the instrument row before the overlap
+check, so the check and the write happen in one serialized transaction.
+"""
+
+from django.db import IntegrityError, connection, models, transaction
+
+from .models import Instrument, InstrumentUsage
+
+NO_OVERLAP_CONSTRAINT = "ccm_instrumentusage_no_overlap"
+
+
+class BookingOverlapError(Exception):
+    """Raised when a booking would overlap an existing one on an exclusive instrument."""
+
+    def __init__(self, overlap_count=None):
+        """Initialize the error, mentioning how many bookings overlap when known."""
+        self.overlap_count = overlap_count
+        if overlap_count:
+            message = (
+                "This instrument does not allow overlapping bookings. "
+                f"There are {overlap_count} existing booking(s) during this time period."
+            )
+        else:
+            message = "This instrument does not allow overlapping bookings."
+        super().__init__(message)
+
+
+def overlapping_bookings(instrument_id, time_started, time_ended, exclude_id=None):
+    """Return bookings on an instrument that overlap ``[time_started, time_ended)``."""
+    queryset = InstrumentUsage.objects.filter(
+        instrument_id=instrument_id, time_started__lt=time_ended, time_ended__gt=time_started
+    )
+    if exclude_id:
+        queryset = queryset.exclude(id=exclude_id)
+    return queryset
+
+
+def lock_instrument_bookings(instrument_id):
+    """
+    Serialize booking writes for an instrument until the current transaction ends.
+
+    Uses a row lock where the backend supports SELECT ... FOR UPDATE. SQLite
+    ignores row locks, so a no-op UPDATE takes the database write lock instead.
+    """
+    if connection.features.has_select_for_update:
+        list(Instrument.objects.select_for_update().filter(pk=instrument_id).values_list("pk", flat=True))
+    else:
+        Instrument.objects.filter(pk=instrument_id).update(id=models.F("id"))
+
+
+def save_booking(save, instrument, time_started, time_ended, exclude_id=None):
+    """
+    Run ``save`` (which creates or updates a booking) with overlap enforcement.
+
+    For instruments that disallow overlaps the overlap check and ``save`` run in
+    one transaction holding the instrument's booking lock.
+
+    Args:
+        save: Callable performing the write and returning its result
+        instrument: Instrument being booked
+        time_started: Booking start
+        time_ended: Booking end
+        exclude_id: Booking being updated, ignored by the overlap check
+
+    Raises:
+        BookingOverlapError: If the instrument disallows overlaps and the slot is taken
+    """
+    try:
+        with transaction.atomic():
+            if instrument and not instrument.allow_overlapping_bookings and time_started and time_ended:
+                lock_instrument_bookings(instrument.pk)
+                overlap_count = overlapping_bookings(instrument.pk, time_started, time_ended, exclude_id).count()
+                if overlap_count:
+                    raise BookingOverlapError(overlap_count)
+            return save()
+    except IntegrityError as e:
+        if NO_OVERLAP_CONSTRAINT in str(e):
+            raise BookingOverlapError() from e
+        raise
+
+
+def booking_availability(instrument_ids, window_start, window_end):
+    """
+    Compute busy and free intervals for instruments over a window in one query.
+
+    Overlapping or touching bookings are merged into a single busy interval and
+    clipped to the window; free intervals are the gaps between them.
+
+    Args:
+        instrument_ids: Instruments to report on
+        window_start: Start of the window (aware datetime)
+        window_end: End of the window (aware datetime)
+
+    Returns:
+        dict: instrument id -> {"busy": [{"start", "end", "bookings"}], "free": [{"start", "end"}]}
+    """
+    bookings = (
+        InstrumentUsage.objects.filter(
+            instrument_id__in=instrument_ids, time_started__lt=window_end, time_ended__gt=window_start
+        )
+        .order_by("instrument_id", "time_started")
+        .values_list("instrument_id", "time_started", "time_ended")
+    )
+
+    busy = {instrument_id: [] for instrument_id in instrument_ids}
+    for instrument_id, start, end in bookings:
+        start, end = max(start, window_start), min(end, window_end)
+        intervals = busy[instrument_id]
+        if intervals and start <= intervals[-1]["end"]:
+            intervals[-1]["end"] = max(intervals[-1]["end"], end)
+            intervals[-1]["bookings"] += 1
+        else:
+            intervals.append({"start": start, "end": end, "bookings": 1})
+
+    availability = {}
+    for instrument_id, intervals in busy.items():
+        free = []
+        cursor = window_start
+        for interval in intervals:
+            if interval["start"] > cursor:
+                free.append({"start": cursor, "end": interval["start"]})
+            cursor = max(cursor, interval["end"])
+        if cursor < window_end:
+            free.append({"start": cursor, "end": window_end})
+        availability[instrument_id] = {"busy": intervals, "free": free}
+    return availability
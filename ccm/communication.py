@@ -6,10 +6,12 @@ system. All functions gracefully handle the case where CCMC is not installed.
 """
 
 import logging
+from functools import partial
 
 from django.apps import apps
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -73,6 +75,177 @@ def send_notification(
         return False
 
 
+def build_maintenance_alert(instrument, message_type="maintenance_due", maintenance_info=None):
+    """
+    Build the notification content for an instrument maintenance/warranty alert.
+
+    Args:
+        instrument: Instrument instance
+        message_type (str): Type of maintenance message
+        maintenance_info (dict): Details about the maintenance
+
+    Returns:
+        dict: title, message, priority, notification_type and data for the notification
+    """
+    # Determine message content based on type
+    if message_type == "maintenance_due":
+        title = f"Maintenance Due: {instrument.instrument_name}"
+        message = f"Scheduled maintenance is due for {instrument.instrument_name}."
+        priority = "high"
+        notification_type = "maintenance"
+    elif message_type == "warranty_expiring":
+        title = f"Warranty Expiring: {instrument.instrument_name}"
+        message = f"The warranty for {instrument.instrument_name} is expiring soon."
+        priority = "high"
+        notification_type = "maintenance"
+    elif message_type == "maintenance_completed":
+        title = f"Maintenance Completed: {instrument.instrument_name}"
+        message = f"Maintenance has been completed for {instrument.instrument_name}."
+        priority = "normal"
+        notification_type = "maintenance"
+    else:
+        title = f"Instrument Alert: {instrument.instrument_name}"
+        message = f"Alert for {instrument.instrument_name}: {message_type}"
+        priority = "normal"
+        notification_type = "system"
+
+    return {
+        "title": title,
+        "message": message,
+        "priority": priority,
+        "notification_type": notification_type,
+        "data": maintenance_info or {},
+    }
+
+
+def build_reagent_alert(stored_reagent, alert_type="low_stock"):
+    """
+    Build the notification content for a stored reagent alert.
+
+    Args:
+        stored_reagent: StoredReagent instance (with reagent loaded)
+        alert_type (str): Type of alert (low_stock, expired, expiring_soon, ...)
+
+    Returns:
+        dict: title, message, priority, notification_type and data for the notification
+    """
+    reagent_data = {"alert_type": alert_type, "quantity": stored_reagent.current_quantity}
+
+    if stored_reagent.storage_object_id:
+        link = f"/storage/{stored_reagent.storage_object_id}?reagentId={stored_reagent.id}"
+        reagent_data["link"] = link
+
+    if alert_type == "low_stock":
+        title = f"Low Stock Alert: {stored_reagent.reagent.name}"
+        message = f"Stock is running low for {stored_reagent.reagent.name} (Current: {stored_reagent.current_quantity} {stored_reagent.reagent.unit})"
+        priority = "high"
+        notification_type = "inventory"
+    elif alert_type == "expired":
+        title = f"Expired Reagent: {stored_reagent.reagent.name}"
+        message = f"{stored_reagent.reagent.name} has expired and should be disposed of safely."
+        priority = "urgent"
+        notification_type = "inventory"
+    elif alert_type == "expiring_soon":
+        title = f"Reagent Expiring Soon: {stored_reagent.reagent.name}"
+        message = f"{stored_reagent.reagent.name} will expire soon. Please use or dispose of safely."
+        priority = "high"
+        notification_type = "inventory"
+    else:
+        title = f"Reagent Alert: {stored_reagent.reagent.name}"
+        message = f"Alert for {stored_reagent.reagent.name}: {alert_type}"
+        priority = "normal"
+        notification_type = "inventory"
+
+    return {
+        "title": title,
+        "message": message,
+        "priority": priority,
+        "notification_type": notification_type,
+        "data": reagent_data,
+    }
+
+
+def send_notifications_bulk(notifications, batch_size=500):
+    """
+    Create and deliver many notifications with batched inserts.
+
+    Each notification is a dict with the same keys as ``send_notification``'s
+    arguments (title, message, recipient, notification_type, priority,
+    related_object, data). Rows are inserted with ``bulk_create`` and pushed over
+    WebSocket in one pass afterwards, instead of one insert, signal and status
+    update per notification.
+
+    Args:
+        notifications (list[dict]): Notifications to send
+        batch_size (int): Rows per INSERT
+
+    Returns:
+        list: Created Notification instances (empty if CCMC unavailable)
+    """
+    if not notifications:
+        return []
+
+    if not is_ccmc_available():
+        logger.info(f"CCMC not available - {len(notifications)} notifications not sent")
+        return []
+
+    try:
+        from django.contrib.contenttypes.models import ContentType
+
+        from ccmc.models import Notification
+        from ccmc.websocket_utils import deliver_notifications
+
+        rows = []
+        for notification in notifications:
+            related_object = notification.get("related_object")
+            row = Notification(
+                title=notification["title"],
+                message=notification["message"],
+                recipient=notification["recipient"],
+                notification_type=notification.get("notification_type", "system"),
+                priority=notification.get("priority", "normal"),
+                data=notification.get("data") or {},
+            )
+            if related_object is not None:
+                row.content_type = ContentType.objects.get_for_model(related_object)
+                row.object_id = related_object.pk
+            rows.append(row)
+
+        created = Notification.objects.bulk_create(rows, batch_size=batch_size)
+        transaction.on_commit(partial(deliver_notifications, created))
+        logger.info(f"CCMC notifications sent in bulk: {len(created)}")
+        return created
+
+    except Exception as e:
+        logger.error(f"Failed to send CCMC notifications in bulk: {e}")
+        return []
+
+
+def enqueue_alert(task, **kwargs):
+    """
+    Queue an alert job on RQ once the current transaction commits.
+
+    With SYNC_OPERATIONS_ONLY, or if the job cannot be queued, the job function
+    runs inline instead so the alert is never lost.
+
+    Args:
+        task: django_rq job function from ``ccm.tasks.notification_tasks``
+        **kwargs: Job arguments (ids and JSON-serializable values only)
+    """
+
+    def _enqueue():
+        if getattr(settings, "SYNC_OPERATIONS_ONLY", False):
+            task(**kwargs)
+            return
+        try:
+            task.delay(**kwargs)
+        except Exception as e:
+            logger.error(f"Failed to queue {task.__name__}, sending inline: {e}")
+            task(**kwargs)
+
+    transaction.on_commit(_enqueue)
+
+
 def create_instrument_thread(instrument, title, description="", participants=None):
     """
     Create a message thread for an instrument if CCMC is available.
@@ -117,7 +290,9 @@ def create_instrument_thread(instrument, title, description="", participants=Non
         return None
 
 
-def send_maintenance_alert(instrument, message_type="maintenance_due", maintenance_info=None, notify_users=None):
+def send_maintenance_alert(
+    instrument, message_type="maintenance_due", maintenance_info=None, notify_users=None, run_async=False
+):
     """
     Send maintenance alerts using CCMC if available.
 
@@ -126,9 +301,10 @@ def send_maintenance_alert(instrument, message_type="maintenance_due", maintenan
         message_type (str): Type of maintenance message
         maintenance_info (dict): Details about the maintenance
         notify_users (list): Specific users to notify, defaults to instrument owner
+        run_async (bool): Queue the fan-out on RQ after commit instead of sending in the request
 
     Returns:
-        bool: True if alerts sent successfully
+        bool: True if alerts were sent (or queued) successfully
     """
     if not is_ccmc_available():
         logger.warning("CCMC not available - cannot send maintenance alert")
@@ -141,45 +317,39 @@ def send_maintenance_alert(instrument, message_type="maintenance_due", maintenan
         logger.warning(f"No users to notify for instrument {instrument.id}")
         return False
 
-    maintenance_info = maintenance_info or {}
+    if run_async:
+        from .tasks.notification_tasks import send_maintenance_alert_task
 
-    # Determine message content based on type
-    if message_type == "maintenance_due":
-        title = f"Maintenance Due: {instrument.instrument_name}"
-        message = f"Scheduled maintenance is due for {instrument.instrument_name}."
-        priority = "high"
-        notification_type = "maintenance"
-    elif message_type == "warranty_expiring":
-        title = f"Warranty Expiring: {instrument.instrument_name}"
-        message = f"The warranty for {instrument.instrument_name} is expiring soon."
-        priority = "high"
-        notification_type = "maintenance"
-    elif message_type == "maintenance_completed":
-        title = f"Maintenance Completed: {instrument.instrument_name}"
-        message = f"Maintenance has been completed for {instrument.instrument_name}."
-        priority = "normal"
-        notification_type = "maintenance"
-    else:
-        title = f"Instrument Alert: {instrument.instrument_name}"
-        message = f"Alert for {instrument.instrument_name}: {message_type}"
-        priority = "normal"
-        notification_type = "system"
+        enqueue_alert(
+            send_maintenance_alert_task,
+            instrument_id=instrument.id,
+            message_type=message_type,
+            maintenance_info=maintenance_info,
+            user_ids=[user.id for user in notify_users],
+        )
+        return True
 
-    # Send notifications to all specified users
-    success_count = 0
-    for user in notify_users:
-        if send_notification(
-            title=title,
-            message=message,
-            recipient=user,
-            notification_type=notification_type,
-            priority=priority,
-            related_object=instrument,
-            data=maintenance_info,
-        ):
-            success_count += 1
-        else:
-            logger.warning(f"Failed to send maintenance alert to user {user.id}")
+    alert = build_maintenance_alert(instrument, message_type, maintenance_info)
+    title, message = alert["title"], alert["message"]
+    priority, notification_type = alert["priority"], alert["notification_type"]
+    maintenance_info = alert["data"]
+
+    # Send notifications to all specified users in one batch
+    created = send_notifications_bulk(
+        [
+            {
+                "title": title,
+                "message": message,
+                "recipient": user,
+                "notification_type": notification_type,
+                "priority": priority,
+                "related_object": instrument,
+                "data": maintenance_info,
+            }
+            for user in notify_users
+        ]
+    )
+    success_count = len(created)
 
     if success_count == 0:
         logger.error(f"Failed to send maintenance alerts to any of {len(notify_users)} users")
@@ -189,7 +359,7 @@ def send_maintenance_alert(instrument, message_type="maintenance_due", maintenan
     return success_count > 0
 
 
-def send_reagent_alert(stored_reagent, alert_type="low_stock", notify_users=None):
+def send_reagent_alert(stored_reagent, alert_type="low_stock", notify_users=None, run_async=False):
     """
     Send reagent alerts using CCMC if available.
 
@@ -197,9 +367,10 @@ def send_reagent_alert(stored_reagent, alert_type="low_stock", notify_users=None
         stored_reagent: StoredReagent instance
         alert_type (str): Type of alert (low_stock, expired, etc.)
         notify_users (list): Specific users to notify
+        run_async (bool): Queue the fan-out on RQ after commit instead of sending in the request
 
     Returns:
-        bool: True if alerts sent successfully
+        bool: True if alerts were sent (or queued) successfully
     """
     if not is_ccmc_available():
         logger.warning("CCMC not available - cannot send reagent alert")
@@ -219,48 +390,38 @@ def send_reagent_alert(stored_reagent, alert_type="low_stock", notify_users=None
         logger.warning(f"No users to notify for stored reagent {stored_reagent.id}")
         return False
 
-    reagent_data = {"alert_type": alert_type, "quantity": stored_reagent.quantity}
-
-    if stored_reagent.storage_object_id:
-        link = f"/storage/{stored_reagent.storage_object_id}?reagentId={stored_reagent.id}"
-        reagent_data["link"] = link
+    if run_async:
+        from .tasks.notification_tasks import send_reagent_alert_task
 
-    if alert_type == "low_stock":
-        title = f"Low Stock Alert: {stored_reagent.reagent.name}"
-        message = f"Stock is running low for {stored_reagent.reagent.name} (Current: {stored_reagent.quantity} {stored_reagent.reagent.unit})"
-        priority = "high"
-        notification_type = "inventory"
-    elif alert_type == "expired":
-        title = f"Expired Reagent: {stored_reagent.reagent.name}"
-        message = f"{stored_reagent.reagent.name} has expired and should be disposed of safely."
-        priority = "urgent"
-        notification_type = "inventory"
-    elif alert_type == "expiring_soon":
-        title = f"Reagent Expiring Soon: {stored_reagent.reagent.name}"
-        message = f"{stored_reagent.reagent.name} will expire soon. Please use or dispose of safely."
-        priority = "high"
-        notification_type = "inventory"
-    else:
-        title = f"Reagent Alert: {stored_reagent.reagent.name}"
-        message = f"Alert for {stored_reagent.reagent.name}: {alert_type}"
-        priority = "normal"
-        notification_type = "inventory"
+        enqueue_alert(
+            send_reagent_alert_task,
+            stored_reagent_id=stored_reagent.id,
+            alert_type=alert_type,
+            user_ids=[user.id for user in notify_users],
+        )
+        return True
 
-    # Send notifications to all specified users
-    success_count = 0
-    for user in notify_users:
-        if send_notification(
-            title=title,
-            message=message,
-            recipient=user,
-            notification_type=notification_type,
-            priority=priority,
-            related_object=stored_reagent,
-            data=reagent_data,
-        ):
-            success_count += 1
-        else:
-            logger.warning(f"Failed to send reagent alert to user {user.id}")
+    alert = build_reagent_alert(stored_reagent, alert_type)
+    title, message = alert["title"], alert["message"]
+    priority, notification_type = alert["priority"], alert["notification_type"]
+    reagent_data = alert["data"]
+
+    # Send notifications to all specified users in one batch
+    created = send_notifications_bulk(
+        [
+            {
+                "title": title,
+                "message": message,
+                "recipient": user,
+                "notification_type": notification_type,
+                "priority": priority,
+                "related_object": stored_reagent,
+                "data": reagent_data,
+            }
+            for user in notify_users
+        ]
+    )
+    success_count = len(created)
 
     if success_count == 0:
         logger.error(f"Failed to send reagent alerts to any of {len(notify_users)} users")
@@ -0,0 +1,138 @@
+"""
+Aggregate counts for instrument job dashboards.
+
+``job_dashboard`` summarises a queryset of jobs by status, instrument and
+assignee in a single round trip: a ``(status, instrument)`` grouping and an
+assignee grouping are combined with UNION ALL, and the per-status and
+per-instrument totals are rolled up from the first grouping in Python. Each
+job falls in exactly one ``(status, instrument)`` group, so the roll-up is
+exact; a job with several assignees counts once for each of them.
+
+Turnaround is measured from ``submitted_at`` to ``completed_at`` and only
+covers jobs that have both.
+"""
+
+from datetime import timedelta
+
+from django.db.models import CharField, Count, DurationField, ExpressionWrapper, F, IntegerField, Q, Sum, Value
+
+
+def _as_timedelta(value):
+    if value is None or isinstance(value, timedelta):
+        return value or timedelta()
+    # Inside a UNION the summed interval can come back as raw microseconds
+    return timedelta(microseconds=value)
+
+
+def _turnaround_hours(total, jobs):
+    if not jobs:
+        return None
+    return round(_as_timedelta(total).total_seconds() / 3600 / jobs, 2)
+
+
+def _grouped(queryset, group_fields, kind, constants):
+    """Aggregate ``queryset`` by ``group_fields`` into the shared dashboard row shape."""
+    turnaround = ExpressionWrapper(F("completed_at") - F("submitted_at"), output_field=DurationField())
+    measured = Q(completed_at__isnull=False, submitted_at__isnull=False)
+    return (
+        queryset.order_by()
+        .values(*group_fields)
+        .annotate(
+            jobs=Count("id"),
+            turnaround_total=Sum(turnaround, filter=measured),
+            turnaround_jobs=Count("id", filter=measured),
+            kind=Value(kind, output_field=CharField()),
+            **constants,
+        )
+        .values_list(
+            "kind",
+            "status_key",
+            "instrument_key",
+            "instrument_name",
+            "assignee_key",
+            "assignee_name",
+            "jobs",
+            "turnaround_total",
+            "turnaround_jobs",
+        )
+    )
+
+
+def job_dashboard(queryset):
+    """
+    Summarise jobs by status, instrument and assignee.
+
+    Args:
+        queryset: InstrumentJob queryset, already filtered to what the user may see
+
+    Returns:
+        dict: ``total`` plus ``by_status``, ``by_instrument`` and ``by_assignee``
+              lists, each entry with ``count`` and ``avg_turnaround_hours``
+    """
+    no_id = Value(None, output_field=IntegerField())
+    no_text = Value(None, output_field=CharField())
+    by_status_instrument = _grouped(
+        queryset.annotate(
+            status_key=F("status"),
+            instrument_key=F("instrument_id"),
+            instrument_name=F("instrument__instrument_name"),
+        ),
+        ["status_key", "instrument_key", "instrument_name"],
+        "status_instrument",
+        {"assignee_key": no_id, "assignee_name": no_text},
+    )
+    by_assignee = _grouped(
+        queryset.annotate(assignee_key=F("staff__id"), assignee_name=F("staff__username")),
+        ["assignee_key", "assignee_name"],
+        "assignee",
+        {"status_key": no_text, "instrument_key": no_id, "instrument_name": no_text},
+    )
+
+    statuses, instruments, assignees = {}, {}, []
+    total = 0
+    for (
+        kind,
+        status,
+        instrument_id,
+        instrument_name,
+        assignee_id,
+        assignee_name,
+        jobs,
+        turnaround,
+        measured,
+    ) in by_status_instrument.union(by_assignee, all=True):
+        if kind == "assignee":
+            assignees.append(
+                {
+                    "assignee": assignee_id,
+                    "assignee_username": assignee_name,
+                    "count": jobs,
+                    "avg_turnaround_hours": _turnaround_hours(turnaround, measured),
+                }
+            )
+            continue
+
+        total += jobs
+        for groups, key, extra in [
+            (statuses, status, {"status": status}),
+            (instruments, instrument_id, {"instrument": instrument_id, "instrument_name": instrument_name}),
+        ]:
+            entry = groups.setdefault(key, {**extra, "count": 0, "turnaround": timedelta(), "measured": 0})
+            entry["count"] += jobs
+            if measured:
+                entry["turnaround"] += _as_timedelta(turnaround)
+                entry["measured"] += measured
+
+    def finish(entries):
+        rows = []
+        for entry in entries:
+            turnaround, measured = entry.pop("turnaround"), entry.pop("measured")
+            rows.append({**entry, "avg_turnaround_hours": _turnaround_hours(turnaround, measured)})
+        return sorted(rows, key=lambda row: -row["count"])
+
+    return {
+        "total": total,
+        "by_status": finish(statuses.values()),
+        "by_instrument": finish(instruments.values()),
+        "by_assignee": sorted(assignees, key=lambda row: -row["count"]),
+    }
@@ -2,13 +2,13 @@
 Management command to check all CCM alerts and send notifications via CCMC if available.
 
 Usage:
-    python manage.py check_ccm_alerts [--warranty-days 30] [--maintenance-days 14] [--expiry-days 7]
+    python manage.py check_ccm_alerts [--warranty-days 30] [--maintenance-days 14] [--expiry-days 7] [--batch-size 500]
 """
 
 from django.core.management.base import BaseCommand
 
+from ccm.alerts import scan_alerts
 from ccm.communication import is_ccmc_available
-from ccm.models import Instrument, StoredReagent
 
 
 class Command(BaseCommand):
@@ -27,6 +27,9 @@ class Command(BaseCommand):
         parser.add_argument(
             "--expiry-days", type=int, default=7, help="Days before reagent expiry to trigger alerts (default: 7)"
         )
+        parser.add_argument(
+            "--batch-size", type=int, default=500, help="Notifications created per INSERT (default: 500)"
+        )
 
     def handle(self, *args, **options):
         warranty_days = options["warranty_days"]
@@ -40,52 +43,36 @@ class Command(BaseCommand):
         else:
             self.stdout.write(self.style.WARNING("CCMC not available - no notifications will be sent"))
 
-        # Check instrument alerts
-        self.stdout.write("\n--- Checking Instrument Alerts ---")
-        warranty_count = 0
-        maintenance_count = 0
-        instrument_count = 0
-
-        instruments = Instrument.objects.filter(enabled=True).prefetch_related("support_information")
-
-        for instrument in instruments:
-            instrument_count += 1
-
-            if instrument.check_warranty_expiration(warranty_days):
-                warranty_count += 1
-                self.stdout.write(f"Warranty alert: {instrument.instrument_name}")
-
-            if instrument.check_upcoming_maintenance(maintenance_days):
-                maintenance_count += 1
-                self.stdout.write(f"Maintenance alert: {instrument.instrument_name}")
-
-        self.stdout.write(f"Checked {instrument_count} instruments")
-        self.stdout.write(f"Warranty alerts sent: {warranty_count}")
-        self.stdout.write(f"Maintenance alerts sent: {maintenance_count}")
-
-        # Check reagent alerts
-        self.stdout.write("\n--- Checking Reagent Alerts ---")
-        low_stock_count = 0
-        expiry_count = 0
-        reagent_count = 0
-
-        stored_reagents = StoredReagent.objects.all().select_related("reagent")
-
-        for reagent in stored_reagents:
-            reagent_count += 1
-
-            if reagent.check_low_stock():
-                low_stock_count += 1
-                self.stdout.write(f"Low stock alert: {reagent.reagent.name}")
-
-            if reagent.check_expiration(expiry_days):
-                expiry_count += 1
-                self.stdout.write(f"Expiry alert: {reagent.reagent.name}")
-
-        self.stdout.write(f"Checked {reagent_count} reagents")
-        self.stdout.write(f"Low stock alerts sent: {low_stock_count}")
-        self.stdout.write(f"Expiry alerts sent: {expiry_count}")
+        report = scan_alerts(
+            warranty_days=warranty_days,
+            maintenance_days=maintenance_days,
+            expiry_days=expiry_days,
+            batch_size=options["batch_size"],
+        )
 
-        # Summary
-        total_alerts = warranty_count + maintenance_count + low_stock_count + expiry_count
-        self.stdout.write(self.style.SUCCESS(f"\nAlert check complete! Total alerts sent: {total_alerts}"))
+        self.stdout.write("\n--- Instrument Alerts ---")
+        for instrument in report.warranty:
+            self.stdout.write(f"Warranty alert: {instrument.instrument_name}")
+        for instrument in report.maintenance:
+            self.stdout.write(f"Maintenance alert: {instrument.instrument_name}")
+        self.stdout.write(f"Warranty alerts sent: {len(report.warranty)}")
+        self.stdout.write(f"Maintenance alerts sent: {len(report.maintenance)}")
+
+        self.stdout.write("\n--- Reagent Alerts ---")
+        for stored_reagent in report.low_stock:
+            self.stdout.write(f"Low stock alert: {stored_reagent.reagent.name}")
+        for stored_reagent in report.expiry:
+            self.stdout.write(f"Expiry alert: {stored_reagent.reagent.name}")
+        self.stdout.write(f"Low stock alerts sent: {len(report.low_stock)}")
+        self.stdout.write(f"Expiry alerts sent: {len(report.expiry)}")
+
+        self.stdout.write("\n--- Timings ---")
+        for phase, seconds in report.timings.items():
+            self.stdout.write(f"{phase}: {seconds:.3f}s")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"\nAlert check complete! Total alerts sent: {report.total_alerts} "
+                f"({report.notifications_sent} notifications)"
+            )
+        )
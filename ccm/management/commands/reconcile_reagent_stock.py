@@ -0,0 +1,45 @@
+"""
+Management command to rebuild stored reagent stock balances from the ReagentAction ledger.
+
+Usage:
+    python manage.py reconcile_reagent_stock [--reagent 12 --reagent 15] [--dry-run]
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ccm.models import StoredReagent
+
+
+class Command(BaseCommand):
+    help = "Recompute StoredReagent.current_quantity from quantity and the ReagentAction ledger"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reagent", type=int, action="append", dest="reagent_ids", help="Stored reagent id (repeatable)"
+        )
+        parser.add_argument(
+            "--dry-run", action="store_true", help="Report reagents whose balance would change without saving"
+        )
+
+    def handle(self, *args, **options):
+        queryset = StoredReagent.objects.all()
+        if options["reagent_ids"]:
+            queryset = queryset.filter(id__in=options["reagent_ids"])
+
+        with transaction.atomic():
+            before = dict(queryset.values_list("id", "current_quantity"))
+            StoredReagent.rebuild_stock_balances(queryset)
+            after = dict(queryset.values_list("id", "current_quantity"))
+
+            drifted = sorted(
+                reagent_id for reagent_id, balance in after.items() if abs(balance - before.get(reagent_id, 0.0)) > 1e-9
+            )
+            for reagent_id in drifted:
+                self.stdout.write(f"Stored reagent {reagent_id}: {before[reagent_id]} -> {after[reagent_id]}")
+
+            if options["dry_run"]:
+                transaction.set_rollback(True)
+
+        verb = "would be corrected" if options["dry_run"] else "corrected"
+        self.stdout.write(self.style.SUCCESS(f"Checked {len(after)} stored reagents, {len(drifted)} {verb}"))
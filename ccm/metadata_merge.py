@@ -0,0 +1,146 @@
+"""
+Merge of instrument metadata into instrument job metadata.
+
+When a booking is made for an instrument job, the instrument's metadata columns
+are copied into the job's metadata table: job columns that are empty, blank or
+marked N/A take the instrument value, and instrument columns the job does not
+have are added. The full diff is computed up front and applied with one
+``bulk_update`` and one ``bulk_create`` in a single transaction, with the history
+rows for both written under one shared timestamp and change reason.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import List
+
+from django.db import transaction
+from django.utils import timezone
+
+from ccv.models import MetadataColumn
+
+logger = logging.getLogger(__name__)
+
+MERGE_UPDATE_FIELDS = ["value", "not_applicable", "not_available"]
+
+MERGE_COPY_FIELDS = [
+    "name",
+    "type",
+    "value",
+    "not_applicable",
+    "not_available",
+    "column_position",
+    "template",
+    "mandatory",
+    "hidden",
+    "readonly",
+    "staff_only",
+    "ontology_type",
+]
+
+MERGE_CHANGE_REASON = "Merged from instrument metadata on booking"
+
+
+@dataclass
+class MetadataMergePlan:
+    """Columns to update and to create when merging one metadata table into another."""
+
+    to_update: List[MetadataColumn] = field(default_factory=list)
+    to_create: List[MetadataColumn] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.to_update or self.to_create)
+
+
+def _needs_value(column: MetadataColumn) -> bool:
+    return not column.value or column.value.strip() == "" or column.not_applicable or column.not_available
+
+
+def plan_metadata_merge(source_table, target_table) -> MetadataMergePlan:
+    """
+    Compute the columns of ``target_table`` to fill and the columns to add from ``source_table``.
+
+    Columns are matched on (name, type). A matched target column is filled when it
+    has no usable value and the source column has one; unmatched source columns
+    are copied.
+
+    Args:
+        source_table: MetadataTable to merge from (the instrument's table)
+        target_table: MetadataTable to merge into (the job's table)
+
+    Returns:
+        MetadataMergePlan: Unsaved column changes
+    """
+    target_columns = {(column.name, column.type): column for column in target_table.columns.all()}
+    plan = MetadataMergePlan()
+
+    for source_column in source_table.columns.all():
+        target_column = target_columns.get((source_column.name, source_column.type))
+
+        if target_column is None:
+            plan.to_create.append(
+                MetadataColumn(
+                    metadata_table=target_table,
+                    **{name: getattr(source_column, name) for name in MERGE_COPY_FIELDS},
+                )
+            )
+        elif source_column.value and _needs_value(target_column):
+            for name in MERGE_UPDATE_FIELDS:
+                setattr(target_column, name, getattr(source_column, name))
+            plan.to_update.append(target_column)
+
+    return plan
+
+
+def apply_metadata_merge(plan: MetadataMergePlan, user=None) -> MetadataMergePlan:
+    """
+    Write a merge plan in a single transaction.
+
+    Per-row ``post_save`` signals are not sent; the merge only fills values and
+    adds columns, so there is no hidden-state change for pool columns to follow.
+
+    Args:
+        plan: Plan from ``plan_metadata_merge``
+        user: User recorded on the history rows
+
+    Returns:
+        MetadataMergePlan: The plan, with primary keys set on created columns
+    """
+    if not plan:
+        return plan
+
+    history_date = timezone.now()
+    with transaction.atomic():
+        if plan.to_update:
+            MetadataColumn.objects.bulk_update(plan.to_update, MERGE_UPDATE_FIELDS)
+        if plan.to_create:
+            plan.to_create = MetadataColumn.objects.bulk_create(plan.to_create)
+
+        for columns, update in ((plan.to_update, True), (plan.to_create, False)):
+            if columns:
+                MetadataColumn.history.bulk_history_create(
+                    columns,
+                    update=update,
+                    default_user=user,
+                    default_change_reason=MERGE_CHANGE_REASON,
+                    default_date=history_date,
+                )
+    return plan
+
+
+def merge_instrument_metadata(instrument_job, user=None) -> MetadataMergePlan:
+    """
+    Merge an instrument's metadata into the metadata table of one of its jobs.
+
+    Args:
+        instrument_job: InstrumentJob with an instrument and a metadata table
+        user: User recorded on the history rows
+
+    Returns:
+        MetadataMergePlan: Applied changes (empty if either table is missing)
+    """
+    instrument = instrument_job.instrument
+    if not instrument or not instrument.metadata_table or not instrument_job.metadata_table:
+        return MetadataMergePlan()
+
+    plan = plan_metadata_merge(instrument.metadata_table, instrument_job.metadata_table)
+    return apply_metadata_merge(plan, user=user)
@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+def mark_attached_annotations(apps, schema_editor):
+    """Flag annotations already linked through instrument, reagent and maintenance log attachments as attached."""
+    Annotation = apps.get_model("ccc", "Annotation")
+    for relation in ("instrument_attachments", "stored_reagent_attachments", "maintenance_log_attachments"):
+        attached = Annotation.objects.filter(**{f"{relation}__isnull": False}).values("pk")
+        Annotation.objects.filter(pk__in=attached, is_attached=False).update(is_attached=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ccc", "0024_annotation_is_attached"),
+        ("ccm", "0014_historicalstoredreagent_molecular_weight_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(mark_attached_annotations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 6.0.5 on 2026-10-18 23:38
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def rebuild_stock_balances(apps, schema_editor):
+    """Set each stored reagent's current quantity from its initial quantity plus the action ledger."""
+    StoredReagent = apps.get_model("ccm", "StoredReagent")
+    ReagentAction = apps.get_model("ccm", "ReagentAction")
+    ledger = (
+        ReagentAction.objects.filter(reagent=models.OuterRef("pk"))
+        .values("reagent")
+        .annotate(
+            total=models.Sum(
+                models.Case(
+                    models.When(action_type="add", then=models.F("quantity")),
+                    models.When(action_type="reserve", then=-models.F("quantity")),
+                    default=models.Value(0.0),
+                    output_field=models.FloatField(),
+                )
+            )
+        )
+        .values("total")
+    )
+    StoredReagent.objects.update(
+        current_quantity=models.F("quantity")
+        + Coalesce(models.Subquery(ledger, output_field=models.FloatField()), models.Value(0.0))
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ccc", "0024_annotation_is_attached"),
+        ("ccm", "0015_backfill_annotation_is_attached"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="historicalstoredreagent",
+            name="current_quantity",
+            field=models.FloatField(
+                default=0.0,
+                help_text="Running stock balance: quantity plus added minus reserved ReagentAction quantities. Maintained as actions are created, changed and deleted; rebuild with reconcile_reagent_stock.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="storedreagent",
+            name="current_quantity",
+            field=models.FloatField(
+                default=0.0,
+                help_text="Running stock balance: quantity plus added minus reserved ReagentAction quantities. Maintained as actions are created, changed and deleted; rebuild with reconcile_reagent_stock.",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="storedreagent",
+            index=models.Index(fields=["current_quantity"], name="ccm_storedr_current_890c96_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="storedreagent",
+            index=models.Index(
+                fields=["notify_on_low_stock", "current_quantity"], name="ccm_storedr_notify__719f4e_idx"
+            ),
+        ),
+        migrations.RunPython(rebuild_stock_balances, migrations.RunPython.noop),
+    ]
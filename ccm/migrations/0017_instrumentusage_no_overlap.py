@@ -0,0 +1,64 @@
+# Generated by Django 6.0.5 on 2026-10-18 23:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+CONSTRAINT_NAME = "ccm_instrumentusage_no_overlap"
+
+
+def add_no_overlap_constraint(apps, schema_editor):
+    """Add the exclusion constraint that rejects overlapping exclusive bookings on PostgreSQL."""
+    # Range exclusion constraints are PostgreSQL-only; other backends rely on the
+    # serialized booking transaction in ccm.bookings. Existing rows keep
+    # exclusive=False so legacy overlaps cannot block the migration.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    table = apps.get_model("ccm", "InstrumentUsage")._meta.db_table
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    schema_editor.execute(
+        f"ALTER TABLE {table} ADD CONSTRAINT {CONSTRAINT_NAME} EXCLUDE USING gist "
+        "(instrument_id WITH =, tstzrange(time_started, time_ended, '[)') WITH &&) "
+        "WHERE (exclusive AND time_started IS NOT NULL AND time_ended IS NOT NULL)"
+    )
+
+
+def remove_no_overlap_constraint(apps, schema_editor):
+    """Drop the booking exclusion constraint on PostgreSQL."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    table = apps.get_model("ccm", "InstrumentUsage")._meta.db_table
+    schema_editor.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {CONSTRAINT_NAME}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ccc", "0024_annotation_is_attached"),
+        ("ccm", "0016_storedreagent_current_quantity"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="historicalinstrumentusage",
+            name="exclusive",
+            field=models.BooleanField(
+                default=False,
+                help_text="Booked on an instrument that does not allow overlapping bookings. Exclusive bookings may not overlap each other (enforced by a database constraint on PostgreSQL).",
+            ),
+        ),
+        migrations.AddField(
+            model_name="instrumentusage",
+            name="exclusive",
+            field=models.BooleanField(
+                default=False,
+                help_text="Booked on an instrument that does not allow overlapping bookings. Exclusive bookings may not overlap each other (enforced by a database constraint on PostgreSQL).",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="instrumentusage",
+            index=models.Index(
+                fields=["instrument", "time_started", "time_ended"], name="ccm_instrum_instrum_0b8c70_idx"
+            ),
+        ),
+        migrations.RunPython(add_no_overlap_constraint, remove_no_overlap_constraint),
+    ]
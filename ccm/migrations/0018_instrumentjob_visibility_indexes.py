@@ -0,0 +1,20 @@
+# Generated by Django 6.0.5 on 2026-10-19 00:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ccm", "0017_instrumentusage_no_overlap"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="instrumentjob",
+            index=models.Index(fields=["lab_group", "status", "created_at"], name="ccm_instjob_group_status_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="instrumentjob",
+            index=models.Index(fields=["user", "created_at"], name="ccm_instjob_user_created_idx"),
+        ),
+    ]
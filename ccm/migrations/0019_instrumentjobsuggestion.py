@@ -0,0 +1,96 @@
+# Generated by Django 6.0.5 on 2026-10-19 00:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_job_suggestions(apps, schema_editor):
+    """Seed the suggestion index with per-user value counts from existing jobs."""
+    InstrumentJob = apps.get_model("ccm", "InstrumentJob")
+    InstrumentJobSuggestion = apps.get_model("ccm", "InstrumentJobSuggestion")
+
+    suggestions = {}
+    groupings = [
+        ("funder", "funder", None),
+        ("cost_center", "cost_center", None),
+        ("search_engine", "search_engine", "search_engine_version"),
+    ]
+    jobs = InstrumentJob.objects.filter(user__isnull=False).order_by()
+    for field, value_field, version_field in groupings:
+        columns = ["user_id", value_field] + ([version_field] if version_field else [])
+        grouped = (
+            jobs.exclude(**{f"{value_field}__isnull": True})
+            .values(*columns)
+            .annotate(total=models.Count("id"), last_used_at=models.Max("updated_at"))
+        )
+        for row in grouped:
+            value = (row[value_field] or "").strip()
+            version = (row[version_field] or "").strip() if version_field else ""
+            if not value or max(len(value), len(version)) > 255:
+                continue
+            key = (row["user_id"], field, value, version)
+            total, last_used_at = suggestions.get(key, (0, row["last_used_at"]))
+            suggestions[key] = (total + row["total"], max(last_used_at, row["last_used_at"]))
+
+    InstrumentJobSuggestion.objects.bulk_create(
+        [
+            InstrumentJobSuggestion(
+                user_id=user_id, field=field, value=value, version=version, use_count=total, last_used_at=last_used_at
+            )
+            for (user_id, field, value, version), (total, last_used_at) in suggestions.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ccm", "0018_instrumentjob_visibility_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InstrumentJobSuggestion",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "field",
+                    models.CharField(
+                        choices=[
+                            ("funder", "Funder"),
+                            ("cost_center", "Cost Center"),
+                            ("search_engine", "Search Engine"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("value", models.CharField(max_length=255)),
+                (
+                    "version",
+                    models.CharField(blank=True, default="", help_text="Search engine version, if any", max_length=255),
+                ),
+                ("use_count", models.PositiveIntegerField(default=0)),
+                ("last_used_at", models.DateTimeField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="instrument_job_suggestions",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-use_count", "-last_used_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "field", "-use_count", "-last_used_at"], name="ccm_jobsuggest_rank_idx"
+                    )
+                ],
+                "unique_together": {("user", "field", "value", "version")},
+            },
+        ),
+        migrations.RunPython(build_job_suggestions, migrations.RunPython.noop),
+    ]
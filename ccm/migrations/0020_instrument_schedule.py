@@ -0,0 +1,87 @@
+# Generated by Django 6.0.5 on 2026-10-19 00:57
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce, TruncDate
+
+
+def build_instrument_schedules(apps, schema_editor):
+    """Fill in the stored maintenance and warranty dates for existing instruments."""
+    Instrument = apps.get_model("ccm", "Instrument")
+    MaintenanceLog = apps.get_model("ccm", "MaintenanceLog")
+    SupportInformation = apps.get_model("ccm", "SupportInformation")
+
+    support = SupportInformation.objects.filter(instrument=models.OuterRef("pk")).values("instrument")
+    warranty = support.annotate(end=models.Max("warranty_end_date")).values("end")
+    frequency = (
+        support.filter(maintenance_frequency_days__gt=0)
+        .annotate(days=models.Min("maintenance_frequency_days"))
+        .values("days")
+    )
+    last_completed = (
+        MaintenanceLog.objects.filter(
+            instrument=models.OuterRef("pk"), status="completed", maintenance_date__isnull=False
+        )
+        .order_by("-maintenance_date")
+        .values("maintenance_date")[:1]
+    )
+    Instrument.objects.update(
+        warranty_expires_on=models.Subquery(warranty, output_field=models.DateField()),
+        next_maintenance_due=TruncDate(
+            models.ExpressionWrapper(
+                Coalesce(models.Subquery(last_completed), models.F("created_at"))
+                + models.ExpressionWrapper(
+                    models.Subquery(frequency, output_field=models.IntegerField()) * models.Value(timedelta(days=1)),
+                    output_field=models.DurationField(),
+                ),
+                output_field=models.DateTimeField(),
+            )
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ccm", "0019_instrumentjobsuggestion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="historicalinstrument",
+            name="next_maintenance_due",
+            field=models.DateField(
+                blank=True,
+                help_text="Last completed maintenance (or creation) plus the shortest maintenance frequency",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicalinstrument",
+            name="warranty_expires_on",
+            field=models.DateField(blank=True, help_text="Latest warranty end date", null=True),
+        ),
+        migrations.AddField(
+            model_name="instrument",
+            name="next_maintenance_due",
+            field=models.DateField(
+                blank=True,
+                help_text="Last completed maintenance (or creation) plus the shortest maintenance frequency",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="instrument",
+            name="warranty_expires_on",
+            field=models.DateField(blank=True, help_text="Latest warranty end date", null=True),
+        ),
+        migrations.AddIndex(
+            model_name="instrument",
+            index=models.Index(fields=["enabled", "next_maintenance_due"], name="ccm_instrument_maint_due_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="instrument",
+            index=models.Index(fields=["enabled", "warranty_expires_on"], name="ccm_instrument_warranty_idx"),
+        ),
+        migrations.RunPython(build_instrument_schedules, migrations.RunPython.noop),
+    ]
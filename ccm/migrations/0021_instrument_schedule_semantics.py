@@ -0,0 +1,95 @@
+# Generated by Django 6.0.5 on 2026-10-19 02:15
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+def rebuild_instrument_schedules(apps, schema_editor):
+    """Recompute stored schedules as the earliest active warranty and interval-based maintenance."""
+    Instrument = apps.get_model("ccm", "Instrument")
+    MaintenanceLog = apps.get_model("ccm", "MaintenanceLog")
+    SupportInformation = apps.get_model("ccm", "SupportInformation")
+
+    support = SupportInformation.objects.filter(instrument=models.OuterRef("pk")).values("instrument")
+    warranty = (
+        support.filter(warranty_end_date__gt=timezone.now().date())
+        .annotate(end=models.Min("warranty_end_date"))
+        .values("end")
+    )
+    frequency = (
+        support.filter(maintenance_frequency_days__gt=0)
+        .annotate(days=models.Min("maintenance_frequency_days"))
+        .values("days")
+    )
+    last_completed = (
+        MaintenanceLog.objects.filter(
+            instrument=models.OuterRef("pk"), status="completed", maintenance_date__isnull=False
+        )
+        .order_by("-maintenance_date")
+        .values("maintenance_date")[:1]
+    )
+    interval = models.Subquery(frequency, output_field=models.IntegerField())
+    Instrument.objects.update(
+        warranty_expires_on=models.Subquery(warranty, output_field=models.DateField()),
+        maintenance_interval_days=interval,
+        next_maintenance_due=TruncDate(
+            models.ExpressionWrapper(
+                models.Subquery(last_completed)
+                + models.ExpressionWrapper(
+                    interval * models.Value(timedelta(days=1)), output_field=models.DurationField()
+                ),
+                output_field=models.DateTimeField(),
+            )
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ccm", "0020_instrument_schedule"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="historicalinstrument",
+            name="maintenance_interval_days",
+            field=models.PositiveIntegerField(
+                blank=True, help_text="Shortest maintenance frequency across support information", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="instrument",
+            name="maintenance_interval_days",
+            field=models.PositiveIntegerField(
+                blank=True, help_text="Shortest maintenance frequency across support information", null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="historicalinstrument",
+            name="next_maintenance_due",
+            field=models.DateField(
+                blank=True, help_text="Last completed maintenance plus the shortest maintenance frequency", null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="historicalinstrument",
+            name="warranty_expires_on",
+            field=models.DateField(blank=True, help_text="Earliest warranty end date still in the future", null=True),
+        ),
+        migrations.AlterField(
+            model_name="instrument",
+            name="next_maintenance_due",
+            field=models.DateField(
+                blank=True, help_text="Last completed maintenance plus the shortest maintenance frequency", null=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="instrument",
+            name="warranty_expires_on",
+            field=models.DateField(blank=True, help_text="Earliest warranty end date still in the future", null=True),
+        ),
+        migrations.RunPython(rebuild_instrument_schedules, migrations.RunPython.noop),
+    ]
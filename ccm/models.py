@@ -1,5 +1,8 @@
+from datetime import timedelta
+
 from django.conf import settings
 from django.db import models
+from django.db.models.functions import Coalesce, RowNumber, TruncDate
 from django.utils import timezone
 
 from simple_history.models import HistoricalRecords
@@ -29,6 +32,19 @@ class Instrument(models.Model):
     accepts_bookings = models.BooleanField(default=True)
     allow_overlapping_bookings = models.BooleanField(default=False)
 
+    # Maintenance schedule, kept up to date from support information and maintenance logs
+    next_maintenance_due = models.DateField(
+        blank=True,
+        null=True,
+        help_text="Last completed maintenance plus the shortest maintenance frequency",
+    )
+    maintenance_interval_days = models.PositiveIntegerField(
+        blank=True, null=True, help_text="Shortest maintenance frequency across support information"
+    )
+    warranty_expires_on = models.DateField(
+        blank=True, null=True, help_text="Earliest warranty end date still in the future"
+    )
+
     # Vaulting system for imported data
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -59,15 +75,98 @@ class Instrument(models.Model):
     class Meta:
         app_label = "ccm"
         ordering = ["id"]
+        indexes = [
+            models.Index(fields=["enabled", "next_maintenance_due"], name="ccm_instrument_maint_due_idx"),
+            models.Index(fields=["enabled", "warranty_expires_on"], name="ccm_instrument_warranty_idx"),
+        ]
 
-    def check_warranty_expiration(self, days_threshold=30):
+    SCHEDULE_FIELDS = ["next_maintenance_due", "maintenance_interval_days", "warranty_expires_on"]
+
+    @classmethod
+    def rebuild_schedules(cls, queryset=None):
         """
-        Check if instrument warranty is expiring soon and send notification
+        Recompute the stored maintenance and warranty schedule in a single UPDATE.
+
+        Maintenance is due the shortest maintenance frequency after the last
+        completed maintenance; instruments never maintained have no due date
+        and are treated as due one interval from today. The warranty expires
+        on the earliest warranty end date still in the future, which moves on
+        to the next contract through ``rebuild_lapsed_warranties``.
+
+        Args:
+            queryset: Instruments to rebuild (all if None)
+
+        Returns:
+            int: Number of instruments updated
         """
-        from datetime import timedelta
+        support = SupportInformation.objects.filter(instrument=models.OuterRef("pk")).values("instrument")
+        warranty = (
+            support.filter(warranty_end_date__gt=timezone.now().date())
+            .annotate(end=models.Min("warranty_end_date"))
+            .values("end")
+        )
+        frequency = (
+            support.filter(maintenance_frequency_days__gt=0)
+            .annotate(days=models.Min("maintenance_frequency_days"))
+            .values("days")
+        )
+        last_completed = (
+            MaintenanceLog.objects.filter(
+                instrument=models.OuterRef("pk"), status="completed", maintenance_date__isnull=False
+            )
+            .order_by("-maintenance_date")
+            .values("maintenance_date")[:1]
+        )
+        interval = models.Subquery(frequency, output_field=models.IntegerField())
+        queryset = cls.objects.all() if queryset is None else queryset
+        return queryset.update(
+            warranty_expires_on=models.Subquery(warranty, output_field=models.DateField()),
+            maintenance_interval_days=interval,
+            next_maintenance_due=TruncDate(
+                models.ExpressionWrapper(
+                    models.Subquery(last_completed)
+                    + models.ExpressionWrapper(
+                        interval * models.Value(timedelta(days=1)),
+                        output_field=models.DurationField(),
+                    ),
+                    output_field=models.DateTimeField(),
+                )
+            ),
+        )
 
-        from django.utils import timezone
+    @classmethod
+    def rebuild_lapsed_warranties(cls):
+        """
+        Rebuild instruments whose stored warranty end date has passed.
+
+        Moves ``warranty_expires_on`` on to the next contract, or clears it,
+        with an indexed range UPDATE.
+        """
+        return cls.rebuild_schedules(cls.objects.filter(warranty_expires_on__lte=timezone.now().date()))
+
+    def refresh_schedule(self):
+        """Reload the stored schedule dates, which signals update behind this instance's back."""
+        self.refresh_from_db(fields=self.SCHEDULE_FIELDS)
+
+    def days_until_maintenance(self, today=None):
+        """
+        Days until maintenance is due, negative when overdue.
+
+        Instruments never maintained are due one maintenance interval from today.
+
+        Returns:
+            int or None: None when no support information sets a maintenance frequency
+        """
+        if not self.maintenance_interval_days:
+            return None
+        if self.next_maintenance_due is None:
+            return self.maintenance_interval_days
+        return (self.next_maintenance_due - (today or timezone.now().date())).days
 
+    def check_warranty_expiration(self, days_threshold=30):
+        """
+        Check if instrument warranty is expiring soon and send notification
+        """
         from .communication import send_maintenance_alert
 
         if not days_threshold:
@@ -80,130 +179,126 @@ class Instrument(models.Model):
         ):
             return False
 
-        for support_info in self.support_information.all():
-            if not support_info.warranty_end_date:
-                continue
-
-            days_remaining = (support_info.warranty_end_date - today).days
-
-            if 0 < days_remaining <= days_threshold:
-                # Send CCMC notification if available
-                maintenance_info = {
-                    "warranty_end_date": support_info.warranty_end_date.isoformat(),
-                    "days_remaining": days_remaining,
-                    "vendor": support_info.vendor_name,
-                }
-                send_maintenance_alert(
-                    instrument=self, message_type="warranty_expiring", maintenance_info=maintenance_info
-                )
+        self.refresh_schedule()
+        if self.warranty_expires_on and self.warranty_expires_on <= today:
+            type(self).rebuild_schedules(type(self).objects.filter(pk=self.pk))
+            self.refresh_schedule()
+        if not self.warranty_expires_on:
+            return False
 
-                self.last_warranty_notification_sent = timezone.now()
-                self.save(update_fields=["last_warranty_notification_sent"])
-                return True
+        days_remaining = (self.warranty_expires_on - today).days
+        if not 0 < days_remaining <= days_threshold:
+            return False
 
-        return False
+        support_info = self.support_information.filter(warranty_end_date=self.warranty_expires_on).first()
+        # Send CCMC notification if available
+        maintenance_info = {
+            "warranty_end_date": self.warranty_expires_on.isoformat(),
+            "days_remaining": days_remaining,
+            "vendor": support_info.vendor_name if support_info else None,
+        }
+        send_maintenance_alert(instrument=self, message_type="warranty_expiring", maintenance_info=maintenance_info)
+
+        self.last_warranty_notification_sent = timezone.now()
+        self.save(update_fields=["last_warranty_notification_sent"])
+        return True
 
     def is_maintenance_overdue(self, days_threshold=14):
         """
         Check if instrument maintenance is overdue WITHOUT sending notifications.
         Used for status display in serializers.
         """
-        from datetime import timedelta
-
-        from django.utils import timezone
-
         if not days_threshold:
             days_threshold = self.days_before_maintenance_notification or 14
 
-        today = timezone.now().date()
-
-        for support_info in self.support_information.all():
-            if not support_info.maintenance_frequency_days:
-                continue
-
-            last_maintenance = self.maintenance_logs.filter(status="completed").order_by("-maintenance_date").first()
+        days_remaining = self.days_until_maintenance()
+        return days_remaining is not None and days_remaining <= days_threshold
 
-            if last_maintenance:
-                next_maintenance_date = last_maintenance.maintenance_date.date() + timedelta(
-                    days=support_info.maintenance_frequency_days
-                )
-                days_remaining = (next_maintenance_date - today).days
-
-                if days_remaining <= days_threshold:
-                    return True
-            else:
-                if support_info.maintenance_frequency_days <= days_threshold:
-                    return True
+    def get_maintenance_info(self):
+        """
+        Describe the maintenance schedule for a maintenance-due alert.
 
-        return False
+        Returns:
+            dict: Next due date, frequency and last completed maintenance, or
+                  ``initial_maintenance`` when the instrument was never maintained
+        """
+        frequency_days = self.maintenance_interval_days
+        if self.next_maintenance_due is None:
+            return {"frequency_days": frequency_days, "initial_maintenance": True}
+        last_maintenance = (
+            self.maintenance_logs.filter(status="completed", maintenance_date__isnull=False)
+            .order_by("-maintenance_date")
+            .values_list("maintenance_date", flat=True)
+            .first()
+        )
+        return {
+            "next_maintenance_date": self.next_maintenance_due.isoformat(),
+            "days_remaining": (self.next_maintenance_due - timezone.now().date()).days,
+            "frequency_days": frequency_days,
+            "last_maintenance": last_maintenance.isoformat(),
+        }
 
     def check_upcoming_maintenance(self, days_threshold=14):
         """
         Check if instrument is due for maintenance and send notification
         """
-        from datetime import timedelta
-
-        from django.utils import timezone
-
         from .communication import send_maintenance_alert
 
         if not days_threshold:
             days_threshold = self.days_before_maintenance_notification or 14
 
-        today = timezone.now().date()
-
         if (
             self.last_maintenance_notification_sent
             and timezone.now() - self.last_maintenance_notification_sent < timedelta(days=7)
         ):
             return False
 
-        for support_info in self.support_information.all():
-            if not support_info.maintenance_frequency_days:
-                continue
+        self.refresh_schedule()
+        if not self.is_maintenance_overdue(days_threshold):
+            return False
 
-            # Check actual maintenance logs
-            last_maintenance = self.maintenance_logs.filter(status="completed").order_by("-maintenance_date").first()
+        # Send CCMC notification if available
+        send_maintenance_alert(
+            instrument=self, message_type="maintenance_due", maintenance_info=self.get_maintenance_info()
+        )
 
-            if last_maintenance:
-                next_maintenance_date = last_maintenance.maintenance_date.date() + timedelta(
-                    days=support_info.maintenance_frequency_days
-                )
+        self.last_maintenance_notification_sent = timezone.now()
+        self.save(update_fields=["last_maintenance_notification_sent"])
+        return True
 
-                days_remaining = (next_maintenance_date - today).days
-
-                if days_remaining <= days_threshold:
-                    # Send CCMC notification if available
-                    maintenance_info = {
-                        "next_maintenance_date": next_maintenance_date.isoformat(),
-                        "days_remaining": days_remaining,
-                        "frequency_days": support_info.maintenance_frequency_days,
-                        "last_maintenance": last_maintenance.maintenance_date.isoformat(),
-                    }
-                    send_maintenance_alert(
-                        instrument=self, message_type="maintenance_due", maintenance_info=maintenance_info
-                    )
-
-                    self.last_maintenance_notification_sent = timezone.now()
-                    self.save(update_fields=["last_maintenance_notification_sent"])
-                    return True
-            else:
-                # No maintenance history - trigger initial maintenance notification
-                if support_info.maintenance_frequency_days <= days_threshold:
-                    # Send CCMC notification if available
-                    maintenance_info = {
-                        "frequency_days": support_info.maintenance_frequency_days,
-                        "initial_maintenance": True,
-                    }
-                    send_maintenance_alert(
-                        instrument=self, message_type="maintenance_due", maintenance_info=maintenance_info
-                    )
-
-                    self.last_maintenance_notification_sent = timezone.now()
-                    self.save(update_fields=["last_maintenance_notification_sent"])
-                    return True
+    @classmethod
+    def due_soon(cls, days, queryset=None, maintenance=True, warranty=True):
+        """
+        Filter instruments with maintenance or warranty expiry due within ``days``.
 
-        return False
+        Overdue maintenance is included, as are instruments never maintained
+        whose maintenance interval fits in the window; warranties that already
+        ended are not. Lapsed warranty dates are rebuilt first.
+
+        Args:
+            days: Window in days from today
+            queryset: Instruments to filter (all if None)
+            maintenance: Include instruments with maintenance due
+            warranty: Include instruments with a warranty expiring
+
+        Returns:
+            QuerySet of Instrument instances
+        """
+        queryset = cls.objects.all() if queryset is None else queryset
+        if not (maintenance or warranty):
+            return queryset.none()
+
+        today = timezone.now().date()
+        horizon = today + timedelta(days=days)
+        due = models.Q()
+        if maintenance:
+            due |= models.Q(next_maintenance_due__lte=horizon) | models.Q(
+                next_maintenance_due__isnull=True, maintenance_interval_days__lte=days
+            )
+        if warranty:
+            cls.rebuild_lapsed_warranties()
+            due |= models.Q(warranty_expires_on__gt=today, warranty_expires_on__lte=horizon)
+        return queryset.filter(due)
 
     @classmethod
     def check_all_instruments(cls, days_threshold=30):
@@ -213,7 +308,9 @@ class Instrument(models.Model):
         warranty_count = 0
         maintenance_count = 0
 
-        instruments = cls.objects.filter(enabled=True).prefetch_related("support_information")
+        instruments = cls.objects.filter(enabled=True)
+        if days_threshold:
+            instruments = cls.due_soon(days_threshold, instruments)
 
         for instrument in instruments:
             if instrument.check_warranty_expiration(days_threshold):
@@ -463,6 +560,11 @@ class StoredReagent(models.Model):
     )
     notify_on_low_stock = models.BooleanField(default=False)
     last_notification_sent = models.DateTimeField(blank=True, null=True)
+    current_quantity = models.FloatField(
+        default=0.0,
+        help_text="Running stock balance: quantity plus added minus reserved ReagentAction quantities. "
+        "Maintained as actions are created, changed and deleted; rebuild with reconcile_reagent_stock.",
+    )
 
     # Metadata table for reagent specifications and properties
     metadata_table = models.OneToOneField(
@@ -477,10 +579,54 @@ class StoredReagent(models.Model):
     class Meta:
         app_label = "ccm"
         ordering = ["reagent__name"]
+        indexes = [
+            models.Index(fields=["current_quantity"]),
+            models.Index(fields=["notify_on_low_stock", "current_quantity"]),
+        ]
 
     def __str__(self):
         return f"{self.reagent.name} in {self.storage_object.object_name}"
 
+    def save(self, *args, **kwargs):
+        """Save the reagent, rebuilding the stock balance when the base quantity may have changed."""
+        creating = self.pk is None
+        update_fields = kwargs.get("update_fields")
+        if creating:
+            self.current_quantity = self.quantity or 0.0
+        super().save(*args, **kwargs)
+        if not creating and (update_fields is None or "quantity" in update_fields):
+            StoredReagent.rebuild_stock_balances(StoredReagent.objects.filter(pk=self.pk))
+            self.refresh_from_db(fields=["current_quantity"])
+
+    @classmethod
+    def adjust_stock_balance(cls, stored_reagent_id, delta):
+        """Atomically add ``delta`` to a reagent's running balance."""
+        if delta:
+            cls.objects.filter(pk=stored_reagent_id).update(current_quantity=models.F("current_quantity") + delta)
+
+    @classmethod
+    def rebuild_stock_balances(cls, queryset=None):
+        """
+        Recompute ``current_quantity`` from the ReagentAction ledger in a single UPDATE.
+
+        Args:
+            queryset: Stored reagents to rebuild (all if None)
+
+        Returns:
+            int: Number of stored reagents updated
+        """
+        ledger = (
+            ReagentAction.objects.filter(reagent=models.OuterRef("pk"))
+            .values("reagent")
+            .annotate(total=models.Sum(ReagentAction.signed_quantity_expression()))
+            .values("total")
+        )
+        queryset = cls.objects.all() if queryset is None else queryset
+        return queryset.update(
+            current_quantity=models.F("quantity")
+            + Coalesce(models.Subquery(ledger, output_field=models.FloatField()), models.Value(0.0))
+        )
+
     def can_access(self, user):
         """
         Check if user can access this stored reagent.
@@ -523,9 +669,11 @@ class StoredReagent(models.Model):
 
         return False
 
-    def check_low_stock(self):
+    def check_low_stock(self, run_async=False):
         """
         Check if reagent stock is below threshold and send notification
+
+        With ``run_async`` the notification fan-out is queued on RQ after commit.
         """
         from datetime import timedelta
 
@@ -540,9 +688,9 @@ class StoredReagent(models.Model):
         if self.last_notification_sent and timezone.now() - self.last_notification_sent < timedelta(days=7):
             return False
 
-        if self.quantity <= self.low_stock_threshold:
+        if self.current_quantity <= self.low_stock_threshold:
             # Send CCMC notification if available
-            success = send_reagent_alert(stored_reagent=self, alert_type="low_stock")
+            success = send_reagent_alert(stored_reagent=self, alert_type="low_stock", run_async=run_async)
 
             if success:
                 self.last_notification_sent = timezone.now()
@@ -724,6 +872,25 @@ class ReagentAction(models.Model):
     def __str__(self):
         return f"{self.action_type} {self.quantity} - {self.reagent.reagent.name}"
 
+    @property
+    def signed_quantity(self):
+        """Change this action makes to the reagent's stock balance."""
+        if self.action_type == "add":
+            return self.quantity or 0.0
+        if self.action_type == "reserve":
+            return -(self.quantity or 0.0)
+        return 0.0
+
+    @staticmethod
+    def signed_quantity_expression():
+        """Database expression equivalent of ``signed_quantity``."""
+        return models.Case(
+            models.When(action_type="add", then=models.F("quantity")),
+            models.When(action_type="reserve", then=-models.F("quantity")),
+            default=models.Value(0.0),
+            output_field=models.FloatField(),
+        )
+
     def is_within_deletion_window(self):
         """
         Check if this reagent action is still within the deletion time window.
@@ -787,14 +954,31 @@ class InstrumentUsage(models.Model):
         blank=True,
         null=True,
     )
+    exclusive = models.BooleanField(
+        default=False,
+        help_text="Booked on an instrument that does not allow overlapping bookings. "
+        "Exclusive bookings may not overlap each other (enforced by a database constraint on PostgreSQL).",
+    )
 
     class Meta:
         app_label = "ccm"
         ordering = ["id"]
+        indexes = [
+            models.Index(fields=["instrument", "time_started", "time_ended"]),
+        ]
 
     def __str__(self):
         return f"{self.instrument.instrument_name} - {self.time_started}"
 
+    def save(self, *args, **kwargs):
+        """Save the booking, flagging it exclusive when its instrument disallows overlaps."""
+        update_fields = kwargs.get("update_fields")
+        if self.instrument_id and (update_fields is None or "instrument" in update_fields):
+            self.exclusive = not self.instrument.allow_overlapping_bookings
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "exclusive"}
+        super().save(*args, **kwargs)
+
     def user_can_create(self, user):
         """
         Check if user can create an instrument usage booking.
@@ -1090,6 +1274,10 @@ class InstrumentJob(models.Model):
     class Meta:
         app_label = "ccm"
         ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["lab_group", "status", "created_at"], name="ccm_instjob_group_status_idx"),
+            models.Index(fields=["user", "created_at"], name="ccm_instjob_user_created_idx"),
+        ]
 
     def __str__(self):
         job_name = self.job_name or f"{self.get_job_type_display()} Job"
@@ -1164,6 +1352,37 @@ class InstrumentJob(models.Model):
             # Non-staff can only edit non-staff_only columns
             return columns.filter(staff_only=False)
 
+    @classmethod
+    def get_accessible_jobs(cls, user, queryset=None):
+        """
+        Filter jobs visible to a user, matching check_job_permissions for reads.
+
+        - Staff/superuser: everything
+        - Owner: their own jobs, any status
+        - Assigned staff: jobs they're assigned to
+        - Lab group members: jobs assigned to their lab group (or a parent of it), once submitted
+
+        Staff assignment is matched through a subquery on the M2M table rather
+        than a join, so each job appears once and no DISTINCT is needed.
+
+        Args:
+            user: User instance
+            queryset: Jobs to filter, defaults to all jobs
+
+        Returns:
+            QuerySet of visible InstrumentJob instances
+        """
+        queryset = cls.objects.all() if queryset is None else queryset
+        if user.is_staff or user.is_superuser:
+            return queryset
+
+        assigned_job_ids = cls.staff.through.objects.filter(user=user).values("instrumentjob_id")
+        return queryset.filter(
+            models.Q(user=user)
+            | models.Q(id__in=assigned_job_ids)
+            | (models.Q(lab_group_id__in=LabGroup.get_accessible_group_ids(user)) & ~models.Q(status="draft"))
+        )
+
     def check_job_permissions(self, user, action="read"):
         """
         Check if user has permission to perform action on instrument job.
@@ -1489,6 +1708,145 @@ class InstrumentJob(models.Model):
         return self.user == user and self.status == "draft"
 
 
+class InstrumentJobSuggestion(models.Model):
+    """
+    Per-user autocomplete index of values used on instrument jobs.
+
+    One row per user, field and value (and search engine version), kept up to
+    date by signals as jobs are saved, edited and deleted; a row is dropped once
+    no job of the user carries its value any more. Suggestions are ranked by how
+    many jobs use the value, most recent use breaking ties, so the submission
+    form can be served from one bounded lookup instead of scanning the user's
+    whole job history.
+    """
+
+    FIELD_CHOICES = [
+        ("funder", "Funder"),
+        ("cost_center", "Cost Center"),
+        ("search_engine", "Search Engine"),
+    ]
+    MAX_VALUE_LENGTH = 255
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="instrument_job_suggestions"
+    )
+    field = models.CharField(max_length=20, choices=FIELD_CHOICES)
+    value = models.CharField(max_length=MAX_VALUE_LENGTH)
+    version = models.CharField(
+        max_length=MAX_VALUE_LENGTH, blank=True, default="", help_text="Search engine version, if any"
+    )
+    use_count = models.PositiveIntegerField(default=0)
+    last_used_at = models.DateTimeField()
+
+    class Meta:
+        app_label = "ccm"
+        ordering = ["-use_count", "-last_used_at"]
+        unique_together = [["user", "field", "value", "version"]]
+        indexes = [
+            models.Index(fields=["user", "field", "-use_count", "-last_used_at"], name="ccm_jobsuggest_rank_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.field}: {self.value} {self.version}".rstrip()
+
+    @staticmethod
+    def job_entries(job):
+        """
+        Return the ``(field, value, version)`` entries a job contributes.
+
+        Args:
+            job: InstrumentJob instance
+
+        Returns:
+            set[tuple]: Non-empty autocomplete entries
+        """
+        entries = set()
+        for field in ("funder", "cost_center"):
+            value = (getattr(job, field) or "").strip()
+            if value:
+                entries.add((field, value, ""))
+        engine = (job.search_engine or "").strip()
+        if engine:
+            entries.add(("search_engine", engine, (job.search_engine_version or "").strip()))
+        limit = InstrumentJobSuggestion.MAX_VALUE_LENGTH
+        return {(field, value, version) for field, value, version in entries if max(len(value), len(version)) <= limit}
+
+    @classmethod
+    def record(cls, user_id, entries, used_at=None):
+        """
+        Count one more use of each entry for a user.
+
+        Args:
+            user_id: ID of the job owner
+            entries: Iterable of ``(field, value, version)`` tuples
+            used_at: When the values were used, defaults to now
+        """
+        used_at = used_at or timezone.now()
+        for field, value, version in entries:
+            suggestion, _ = cls.objects.get_or_create(
+                user_id=user_id, field=field, value=value, version=version, defaults={"last_used_at": used_at}
+            )
+            cls.objects.filter(pk=suggestion.pk).update(use_count=models.F("use_count") + 1, last_used_at=used_at)
+
+    @classmethod
+    def forget(cls, user_id, entries):
+        """
+        Count one fewer use of each entry for a user, removing entries no job uses any more.
+
+        Args:
+            user_id: ID of the job owner
+            entries: Iterable of ``(field, value, version)`` tuples
+        """
+        matching = models.Q()
+        for field, value, version in entries:
+            matching |= models.Q(field=field, value=value, version=version)
+        if not matching:
+            return
+        queryset = cls.objects.filter(matching, user_id=user_id)
+        queryset.filter(use_count__lte=1).delete()
+        queryset.update(use_count=models.F("use_count") - 1)
+
+    @classmethod
+    def suggestions_for(cls, user, prefix="", limit=20):
+        """
+        Return a user's autocomplete suggestions for all fields in one query.
+
+        Args:
+            user: User instance
+            prefix: Only return values starting with this (case-insensitive)
+            limit: Maximum number of suggestions per field
+
+        Returns:
+            dict: ``funders`` and ``cost_centers`` lists and a ``search_engines``
+                  mapping of engine to versions, best ranked first
+        """
+        queryset = cls.objects.filter(user=user)
+        if prefix:
+            queryset = queryset.filter(value__istartswith=prefix)
+        ranked = (
+            queryset.annotate(
+                rank=models.Window(
+                    expression=RowNumber(),
+                    partition_by=[models.F("field")],
+                    order_by=[models.F("use_count").desc(), models.F("last_used_at").desc(), models.F("id").asc()],
+                )
+            )
+            .filter(rank__lte=limit)
+            .order_by("field", "rank")
+            .values_list("field", "value", "version")
+        )
+
+        suggestions = {"funders": [], "cost_centers": [], "search_engines": {}}
+        for field, value, version in ranked:
+            if field == "search_engine":
+                versions = suggestions["search_engines"].setdefault(value, [])
+                if version:
+                    versions.append(version)
+            else:
+                suggestions[f"{field}s"].append(value)
+        return suggestions
+
+
 # Annotation relationship models for CCM entities
 class InstrumentAnnotation(models.Model):
     """
@@ -17,6 +17,7 @@ from ccc.models import Annotation, AsyncTaskStatus, LabGroupPermission, SiteConf
 
 logger = logging.getLogger(__name__)
 
+from .bookings import BookingOverlapError, overlapping_bookings, save_booking
 from .models import (
     ExternalContact,
     ExternalContactDetails,
@@ -167,6 +168,9 @@ class InstrumentSerializer(serializers.ModelSerializer):
             "metadata_table_name",
             "metadata_table_id",
             "maintenance_overdue",
+            "next_maintenance_due",
+            "maintenance_interval_days",
+            "warranty_expires_on",
             "created_at",
             "updated_at",
         ]
@@ -180,6 +184,9 @@ class InstrumentSerializer(serializers.ModelSerializer):
             "metadata_table_name",
             "metadata_table_id",
             "maintenance_overdue",
+            "next_maintenance_due",
+            "maintenance_interval_days",
+            "warranty_expires_on",
         ]
 
     def get_maintenance_overdue(self, obj):
@@ -513,21 +520,15 @@ class InstrumentUsageSerializer(serializers.ModelSerializer):
                         f"(exceeds {instrument.max_days_within_usage_pre_approval} day limit for pre-approval)"
                     )
 
-            overlapping_bookings = InstrumentUsage.objects.filter(
-                instrument=instrument, time_started__lt=time_ended, time_ended__gt=time_started
-            )
-
-            if self.instance:
-                overlapping_bookings = overlapping_bookings.exclude(id=self.instance.id)
+            overlap_count = overlapping_bookings(
+                instrument.id, time_started, time_ended, exclude_id=self.instance.id if self.instance else None
+            ).count()
 
-            if overlapping_bookings.exists():
+            if overlap_count:
                 if not instrument.allow_overlapping_bookings:
-                    raise serializers.ValidationError(
-                        "This instrument does not allow overlapping bookings. "
-                        f"There are {overlapping_bookings.count()} existing booking(s) during this time period."
-                    )
+                    raise serializers.ValidationError(str(BookingOverlapError(overlap_count)))
                 requires_approval = True
-                approval_reasons.append(f"overlaps with {overlapping_bookings.count()} existing booking(s)")
+                approval_reasons.append(f"overlaps with {overlap_count} existing booking(s)")
 
             if requires_approval and "approved" not in data:
                 data["approved"] = False
@@ -543,6 +544,34 @@ class InstrumentUsageSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Usage hours cannot be negative.")
         return value
 
+    def _save_booking(self, save, validated_data):
+        """
+        Write the booking with overlap enforcement.
+
+        ``validate`` rejects overlaps up front; this re-checks inside the
+        serialized booking transaction (or hits the PostgreSQL exclusion
+        constraint) so concurrent requests cannot both take the same slot.
+        """
+        instrument = validated_data.get("instrument") or (self.instance.instrument if self.instance else None)
+        time_started = validated_data.get("time_started") or (self.instance.time_started if self.instance else None)
+        time_ended = validated_data.get("time_ended") or (self.instance.time_ended if self.instance else None)
+        try:
+            return save_booking(
+                save, instrument, time_started, time_ended, exclude_id=self.instance.id if self.instance else None
+            )
+        except BookingOverlapError as e:
+            raise serializers.ValidationError(str(e))
+
+    def create(self, validated_data):
+        """Create the booking with overlap enforcement."""
+        return self._save_booking(lambda: super(InstrumentUsageSerializer, self).create(validated_data), validated_data)
+
+    def update(self, instance, validated_data):
+        """Update the booking with overlap enforcement."""
+        return self._save_booking(
+            lambda: super(InstrumentUsageSerializer, self).update(instance, validated_data), validated_data
+        )
+
 
 class MaintenanceLogSerializer(serializers.ModelSerializer):
     """Serializer for MaintenanceLog model."""
@@ -693,34 +722,16 @@ class StoredReagentSerializer(serializers.ModelSerializer):
 
     def get_current_quantity(self, obj):
         """
-        Calculate current quantity by summing initial quantity + reagent actions.
+        Return the running stock balance: initial quantity plus reagent actions.
 
         Action types:
         - 'add': positive quantity change (+)
         - 'reserve': negative quantity change (-)
-        """
-        from django.db.models import Case, F, Sum, When
-
-        from .models import ReagentAction
-
-        # Start with the initial/base quantity
-        current_qty = obj.quantity or 0.0
 
-        # Sum all reagent actions for this stored reagent
-        actions_sum = (
-            ReagentAction.objects.filter(reagent=obj).aggregate(
-                total_change=Sum(
-                    Case(
-                        When(action_type="add", then=F("quantity")),
-                        When(action_type="reserve", then=-F("quantity")),
-                        default=0.0,
-                    )
-                )
-            )["total_change"]
-            or 0.0
-        )
-
-        return round(current_qty + actions_sum, 2)
+        The balance is maintained on StoredReagent as actions change, so no
+        per-reagent aggregate is needed here.
+        """
+        return round(obj.current_quantity or 0.0, 2)
 
 
 class ExternalContactDetailsSerializer(serializers.ModelSerializer):
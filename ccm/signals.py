@@ -7,16 +7,96 @@ while maintaining optional functionality.
 
 import logging
 
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 
-from ccv.models import MetadataColumn, MetadataTable
+from ccc.signals import track_annotation_attachments
+from ccv.models import MetadataTable
 
 from .communication import is_ccmc_available, send_maintenance_alert, send_notification
-from .models import Instrument, InstrumentJobAnnotation, InstrumentUsage, MaintenanceLog, ReagentAction, StoredReagent
+from .metadata_merge import merge_instrument_metadata
+from .models import (
+    Instrument,
+    InstrumentAnnotation,
+    InstrumentJob,
+    InstrumentJobAnnotation,
+    InstrumentJobSuggestion,
+    InstrumentUsage,
+    MaintenanceLog,
+    MaintenanceLogAnnotation,
+    ReagentAction,
+    StoredReagent,
+    StoredReagentAnnotation,
+    SupportInformation,
+)
 
 logger = logging.getLogger(__name__)
 
+for junction_model in (InstrumentAnnotation, StoredReagentAnnotation, MaintenanceLogAnnotation):
+    track_annotation_attachments(junction_model)
+
+
+def rebuild_instrument_schedules(instrument_ids):
+    """Recompute the stored maintenance and warranty dates for the given instruments."""
+    instrument_ids = {instrument_id for instrument_id in instrument_ids if instrument_id}
+    if instrument_ids:
+        Instrument.rebuild_schedules(Instrument.objects.filter(id__in=instrument_ids))
+
+
+@receiver(pre_save, sender=MaintenanceLog)
+def remember_maintenance_log_instrument(sender, instance, raw=False, **kwargs):
+    """Record which instrument an edited log belonged to, in case it moves."""
+    instance._previous_instrument_id = None
+    if instance.pk and not raw:
+        instance._previous_instrument_id = (
+            MaintenanceLog.objects.filter(pk=instance.pk).values_list("instrument_id", flat=True).first()
+        )
+
+
+@receiver(post_save, sender=MaintenanceLog)
+@receiver(post_delete, sender=MaintenanceLog)
+def update_schedule_on_maintenance_log(sender, instance, raw=False, **kwargs):
+    """Recompute the instrument's next maintenance date when its maintenance history changes."""
+    if not raw:
+        rebuild_instrument_schedules([instance.instrument_id, getattr(instance, "_previous_instrument_id", None)])
+
+
+@receiver(post_save, sender=SupportInformation)
+def update_schedule_on_support_information(sender, instance, created, raw=False, **kwargs):
+    """Recompute schedules of instruments using this support information."""
+    if not raw and not created:
+        rebuild_instrument_schedules(instance.instrument_set.values_list("id", flat=True))
+
+
+@receiver(pre_delete, sender=SupportInformation)
+def remember_support_information_instruments(sender, instance, **kwargs):
+    """Record linked instruments before the deletion removes the links."""
+    instance._schedule_instrument_ids = list(instance.instrument_set.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=SupportInformation)
+def update_schedule_on_support_information_delete(sender, instance, **kwargs):
+    """Recompute schedules of instruments that used deleted support information."""
+    rebuild_instrument_schedules(getattr(instance, "_schedule_instrument_ids", []))
+
+
+@receiver(m2m_changed, sender=Instrument.support_information.through)
+def update_schedule_on_support_link(sender, instance, action, reverse, pk_set, **kwargs):
+    """Recompute schedules when support information is attached to or detached from instruments."""
+    if reverse and action == "pre_clear":
+        instance._schedule_instrument_ids = list(instance.instrument_set.values_list("id", flat=True))
+        return
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+
+    if not reverse:
+        rebuild_instrument_schedules([instance.pk])
+        instance.refresh_schedule()
+    elif action == "post_clear":
+        rebuild_instrument_schedules(getattr(instance, "_schedule_instrument_ids", []))
+    else:
+        rebuild_instrument_schedules(pk_set or [])
+
 
 @receiver(post_save, sender=MaintenanceLog)
 def maintenance_log_notification(sender, instance, created, **kwargs):
@@ -33,7 +113,10 @@ def maintenance_log_notification(sender, instance, created, **kwargs):
         }
 
         send_maintenance_alert(
-            instrument=instance.instrument, message_type="maintenance_completed", maintenance_info=maintenance_info
+            instrument=instance.instrument,
+            message_type="maintenance_completed",
+            maintenance_info=maintenance_info,
+            run_async=True,
         )
 
     elif not created and instance.status == "requested":
@@ -56,17 +139,79 @@ def maintenance_log_notification(sender, instance, created, **kwargs):
             )
 
 
+@receiver(pre_save, sender=ReagentAction)
+def remember_reagent_action_ledger_entry(sender, instance, **kwargs):
+    """Record what an edited action contributed to the stock balance before it changes."""
+    instance._previous_ledger_entry = None
+    if instance.pk:
+        previous = ReagentAction.objects.filter(pk=instance.pk).only("reagent_id", "action_type", "quantity").first()
+        if previous:
+            instance._previous_ledger_entry = (previous.reagent_id, previous.signed_quantity)
+
+
+@receiver(post_save, sender=ReagentAction)
+def update_stock_balance_on_save(sender, instance, created, **kwargs):
+    """Apply a created or edited action to the running stock balance."""
+    previous = getattr(instance, "_previous_ledger_entry", None)
+    if previous and previous[0] != instance.reagent_id:
+        StoredReagent.adjust_stock_balance(previous[0], -previous[1])
+        previous = None
+    delta = instance.signed_quantity - (previous[1] if previous else 0.0)
+    StoredReagent.adjust_stock_balance(instance.reagent_id, delta)
+
+
+@receiver(post_delete, sender=ReagentAction)
+def update_stock_balance_on_delete(sender, instance, **kwargs):
+    """Remove a deleted action from the running stock balance."""
+    StoredReagent.adjust_stock_balance(instance.reagent_id, -instance.signed_quantity)
+
+
 @receiver(post_save, sender=ReagentAction)
 def reagent_action_notification(sender, instance, created, **kwargs):
     """Trigger stock check notifications when reagent quantities change."""
     if not is_ccmc_available() or not created:
         return
 
-    # Check if this action results in low stock
+    # Check if this action results in low stock against the balance updated above
     if instance.action_type == "reserve" and instance.reagent:
-        # Update the reagent quantity (assuming this happens elsewhere)
-        # and check if we need to send low stock notifications
-        instance.reagent.check_low_stock()
+        instance.reagent.refresh_from_db(fields=["current_quantity"])
+        instance.reagent.check_low_stock(run_async=True)
+
+
+@receiver(pre_save, sender=InstrumentJob)
+def remember_instrument_job_suggestions(sender, instance, raw=False, **kwargs):
+    """Record the autocomplete values an edited job had before it changes."""
+    instance._previous_suggestion_entries = None
+    if instance.pk and not raw:
+        previous = (
+            InstrumentJob.objects.filter(pk=instance.pk)
+            .only("user_id", "funder", "cost_center", "search_engine", "search_engine_version")
+            .first()
+        )
+        if previous:
+            instance._previous_suggestion_entries = (previous.user_id, InstrumentJobSuggestion.job_entries(previous))
+
+
+@receiver(post_save, sender=InstrumentJob)
+def update_instrument_job_suggestions(sender, instance, created, raw=False, **kwargs):
+    """Count values a job gained and uncount values it lost in the owner's suggestion index."""
+    if raw:
+        return
+    entries = InstrumentJobSuggestion.job_entries(instance) if instance.user_id else set()
+    previous_user_id, previous_entries = getattr(instance, "_previous_suggestion_entries", None) or (None, set())
+    if previous_user_id == instance.user_id:
+        entries, previous_entries = entries - previous_entries, previous_entries - entries
+    if previous_user_id and previous_entries:
+        InstrumentJobSuggestion.forget(previous_user_id, previous_entries)
+    if entries:
+        InstrumentJobSuggestion.record(instance.user_id, entries)
+
+
+@receiver(post_delete, sender=InstrumentJob)
+def forget_instrument_job_suggestions(sender, instance, **kwargs):
+    """Uncount a deleted job's values in its owner's suggestion index."""
+    if instance.user_id:
+        InstrumentJobSuggestion.forget(instance.user_id, InstrumentJobSuggestion.job_entries(instance))
 
 
 @receiver(post_save, sender=InstrumentUsage)
@@ -184,6 +329,9 @@ def merge_instrument_metadata_on_booking(sender, instance, created, **kwargs):
        - If job has a column with the same name and type:
          - If job column is empty/blank/N/A, replace with instrument value
        - If job doesn't have this column, add it
+
+    The diff is computed up front and written in one transaction by
+    ``ccm.metadata_merge.merge_instrument_metadata``.
     """
     if not created:
         return
@@ -205,54 +353,12 @@ def merge_instrument_metadata_on_booking(sender, instance, created, **kwargs):
         return
 
     try:
-        instrument_columns = instrument.metadata_table.columns.all()
-        job_columns = instrument_job.metadata_table.columns.all()
-
-        job_columns_dict = {(col.name, col.type): col for col in job_columns}
-
-        columns_merged = 0
-        columns_added = 0
-
-        for inst_col in instrument_columns:
-            key = (inst_col.name, inst_col.type)
-
-            if key in job_columns_dict:
-                job_col = job_columns_dict[key]
-
-                should_replace = (
-                    not job_col.value or job_col.value.strip() == "" or job_col.not_applicable or job_col.not_available
-                )
-
-                if should_replace and inst_col.value:
-                    job_col.value = inst_col.value
-                    job_col.not_applicable = inst_col.not_applicable
-                    job_col.not_available = inst_col.not_available
-                    job_col.save(update_fields=["value", "not_applicable", "not_available"])
-                    columns_merged += 1
-                    logger.info(f"Merged instrument metadata column '{inst_col.name}' " f"into job {instrument_job.id}")
-            else:
-                MetadataColumn.objects.create(
-                    metadata_table=instrument_job.metadata_table,
-                    name=inst_col.name,
-                    type=inst_col.type,
-                    value=inst_col.value,
-                    not_applicable=inst_col.not_applicable,
-                    not_available=inst_col.not_available,
-                    column_position=inst_col.column_position,
-                    template=inst_col.template,
-                    mandatory=inst_col.mandatory,
-                    hidden=inst_col.hidden,
-                    readonly=inst_col.readonly,
-                    staff_only=inst_col.staff_only,
-                    ontology_type=inst_col.ontology_type,
-                )
-                columns_added += 1
-                logger.info(f"Added instrument metadata column '{inst_col.name}' " f"to job {instrument_job.id}")
-
-        if columns_merged > 0 or columns_added > 0:
+        plan = merge_instrument_metadata(instrument_job, user=instance.annotation.owner)
+
+        if plan:
             logger.info(
-                f"Booking annotation created: merged {columns_merged} columns, "
-                f"added {columns_added} columns from instrument {instrument.id} "
+                f"Booking annotation created: merged {len(plan.to_update)} columns, "
+                f"added {len(plan.to_create)} columns from instrument {instrument.id} "
                 f"to job {instrument_job.id}"
             )
 
@@ -0,0 +1,58 @@
+"""
+Notification fan-out tasks for CCM alerts.
+
+Queued by ``ccm.communication.enqueue_alert`` so alert fan-out (notification
+inserts and WebSocket delivery) runs on a worker instead of in the request.
+"""
+
+import logging
+
+from django.contrib.auth import get_user_model
+
+from django_rq import job
+
+from ccm.communication import send_maintenance_alert, send_reagent_alert
+from ccm.models import Instrument, StoredReagent
+
+logger = logging.getLogger(__name__)
+
+
+@job("default", timeout="10m")
+def send_maintenance_alert_task(instrument_id, message_type="maintenance_due", maintenance_info=None, user_ids=None):
+    """
+    Send an instrument maintenance/warranty alert.
+
+    Args:
+        instrument_id: Instrument ID
+        message_type: Type of maintenance message
+        maintenance_info: Details about the maintenance
+        user_ids: Users to notify, defaults to the instrument owner
+    """
+    instrument = Instrument.objects.select_related("user").filter(id=instrument_id).first()
+    if not instrument:
+        logger.warning(f"Instrument {instrument_id} not found - maintenance alert dropped")
+        return False
+
+    notify_users = list(get_user_model().objects.filter(id__in=user_ids)) if user_ids else None
+    return send_maintenance_alert(
+        instrument=instrument, message_type=message_type, maintenance_info=maintenance_info, notify_users=notify_users
+    )
+
+
+@job("default", timeout="10m")
+def send_reagent_alert_task(stored_reagent_id, alert_type="low_stock", user_ids=None):
+    """
+    Send a stored reagent alert.
+
+    Args:
+        stored_reagent_id: StoredReagent ID
+        alert_type: Type of alert (low_stock, expired, expiring_soon)
+        user_ids: Users to notify, defaults to subscribers or the owner
+    """
+    stored_reagent = StoredReagent.objects.select_related("reagent", "user").filter(id=stored_reagent_id).first()
+    if not stored_reagent:
+        logger.warning(f"Stored reagent {stored_reagent_id} not found - reagent alert dropped")
+        return False
+
+    notify_users = list(get_user_model().objects.filter(id__in=user_ids)) if user_ids else None
+    return send_reagent_alert(stored_reagent=stored_reagent, alert_type=alert_type, notify_users=notify_users)
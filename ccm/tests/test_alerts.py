@@ -0,0 +1,165 @@
+"""
+Tests for the set-based alert scanner used by check_ccm_alerts.
+"""
+
+from datetime import date, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from ccm.alerts import scan_alerts
+from ccm.models import Instrument, MaintenanceLog, Reagent, ReagentSubscription, StoredReagent, SupportInformation
+from ccmc.models import Notification
+
+User = get_user_model()
+
+
+class AlertScannerTest(TestCase):
+    """Test candidate selection, throttling and bulk delivery."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="alert-owner")
+        self.reagent = Reagent.objects.create(name="Buffer", unit="ml")
+
+    def _instrument(self, name, warranty_days=None, frequency=None, **kwargs):
+        instrument = Instrument.objects.create(instrument_name=name, user=self.user, enabled=True, **kwargs)
+        support = SupportInformation.objects.create(
+            warranty_end_date=date.today() + timedelta(days=warranty_days) if warranty_days is not None else None,
+            maintenance_frequency_days=frequency,
+        )
+        instrument.support_information.add(support)
+        return instrument
+
+    def _stored_reagent(self, **kwargs):
+        return StoredReagent.objects.create(reagent=self.reagent, user=self.user, **kwargs)
+
+    def test_warranty_window_and_throttle(self):
+        """Only warranties ending within the window alert, and recently notified instruments are skipped."""
+        expiring = self._instrument("Expiring", warranty_days=10)
+        self._instrument("Later", warranty_days=90)
+        self._instrument("Ended", warranty_days=-1)
+        self._instrument("Throttled", warranty_days=5, last_warranty_notification_sent=timezone.now())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            report = scan_alerts()
+
+        self.assertEqual(report.warranty, [expiring])
+        expiring.refresh_from_db()
+        self.assertIsNotNone(expiring.last_warranty_notification_sent)
+        notification = Notification.objects.get(object_id=expiring.id, notification_type="maintenance")
+        self.assertEqual(notification.data["days_remaining"], 10)
+        self.assertEqual(notification.delivery_status, "sent")
+
+    def test_maintenance_due_from_last_completed_log(self):
+        """Maintenance is due from the last completed log plus frequency, or immediately without history."""
+        due = self._instrument("Due", frequency=30)
+        MaintenanceLog.objects.create(
+            instrument=due,
+            status="completed",
+            maintenance_date=timezone.now() - timedelta(days=25),
+            created_by=self.user,
+        )
+        recent = self._instrument("Recent", frequency=30)
+        MaintenanceLog.objects.create(
+            instrument=recent, status="completed", maintenance_date=timezone.now(), created_by=self.user
+        )
+        MaintenanceLog.objects.create(
+            instrument=recent,
+            status="pending",
+            maintenance_date=timezone.now() - timedelta(days=60),
+            created_by=self.user,
+        )
+        initial = self._instrument("Initial", frequency=7)
+        self._instrument("Rare", frequency=365)
+
+        report = scan_alerts()
+
+        self.assertEqual(report.maintenance, [due, initial])
+        data = Notification.objects.get(object_id=due.id, title__startswith="Maintenance Due").data
+        self.assertEqual(data["days_remaining"], 5)
+        self.assertTrue(Notification.objects.get(object_id=initial.id).data["initial_maintenance"])
+
+    def test_low_stock_and_expiry(self):
+        """Low stock and expiry candidates are selected in SQL; low-stock alerts suppress expiry alerts."""
+        low = self._stored_reagent(
+            quantity=1, low_stock_threshold=5, notify_on_low_stock=True, expiration_date=date.today()
+        )
+        self._stored_reagent(quantity=10, low_stock_threshold=5, notify_on_low_stock=True)
+        self._stored_reagent(quantity=0, low_stock_threshold=0, notify_on_low_stock=True)
+        self._stored_reagent(quantity=1, low_stock_threshold=5, notify_on_low_stock=False)
+        expired = self._stored_reagent(quantity=10, expiration_date=date.today() - timedelta(days=1))
+        expiring = self._stored_reagent(quantity=10, expiration_date=date.today() + timedelta(days=3))
+        self._stored_reagent(
+            quantity=10,
+            expiration_date=date.today() + timedelta(days=3),
+            last_notification_sent=timezone.now() - timedelta(days=1),
+        )
+
+        report = scan_alerts()
+
+        self.assertEqual(report.low_stock, [low])
+        self.assertEqual(report.expiry, [expired, expiring])
+        titles = dict(
+            Notification.objects.filter(object_id__in=[expired.id, expiring.id]).values_list("object_id", "title")
+        )
+        self.assertEqual(titles[expired.id], "Expired Reagent: Buffer")
+        self.assertEqual(titles[expiring.id], "Reagent Expiring Soon: Buffer")
+        self.assertEqual(StoredReagent.objects.filter(last_notification_sent__isnull=False).count(), 4)
+
+    def test_reagent_subscribers_notified(self):
+        """Subscribers receive reagent alerts instead of the owner."""
+        stored_reagent = self._stored_reagent(quantity=1, low_stock_threshold=5, notify_on_low_stock=True)
+        subscribers = [User.objects.create_user(username=f"subscriber-{i}") for i in range(2)]
+        for subscriber in subscribers:
+            ReagentSubscription.objects.create(user=subscriber, stored_reagent=stored_reagent)
+
+        report = scan_alerts()
+
+        self.assertEqual(report.notifications_sent, 2)
+        self.assertEqual(
+            set(Notification.objects.values_list("recipient_id", flat=True)), {user.id for user in subscribers}
+        )
+
+    def test_query_count_independent_of_inventory_size(self):
+        """Scanning cost does not grow with the number of reagents that need no alert."""
+        for _ in range(3):
+            self._stored_reagent(quantity=10, low_stock_threshold=5, notify_on_low_stock=True)
+
+        with self.assertNumQueries(5) as small:
+            scan_alerts()
+
+        for _ in range(30):
+            self._stored_reagent(quantity=10, low_stock_threshold=5, notify_on_low_stock=True)
+
+        with self.assertNumQueries(len(small.captured_queries)):
+            scan_alerts()
+
+    @patch("ccm.communication.is_ccmc_available", return_value=False)
+    def test_reagents_not_throttled_when_undelivered(self, mock_available):
+        """Reagent throttle timestamps are only written when notifications were delivered."""
+        stored_reagent = self._stored_reagent(quantity=1, low_stock_threshold=5, notify_on_low_stock=True)
+        instrument = self._instrument("Expiring", warranty_days=10)
+
+        report = scan_alerts()
+
+        self.assertEqual(report.low_stock, [])
+        self.assertEqual(report.warranty, [instrument])
+        stored_reagent.refresh_from_db()
+        self.assertIsNone(stored_reagent.last_notification_sent)
+
+    def test_command_reports_timings(self):
+        """The management command prints per-phase timings."""
+        self._instrument("Expiring", warranty_days=10)
+        out = StringIO()
+
+        call_command("check_ccm_alerts", stdout=out)
+
+        output = out.getvalue()
+        self.assertIn("Warranty alert: Expiring", output)
+        self.assertIn("--- Timings ---", output)
+        self.assertIn("low_stock:", output)
+        self.assertIn("Total alerts sent: 1", output)
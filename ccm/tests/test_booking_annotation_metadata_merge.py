@@ -2,6 +2,7 @@ from django.contrib.auth import get_user_model
 from django.test import TestCase
 
 from ccc.models import Annotation, LabGroup
+from ccm.metadata_merge import MERGE_CHANGE_REASON, apply_metadata_merge, plan_metadata_merge
 from ccm.models import Instrument, InstrumentJob, InstrumentJobAnnotation
 from ccv.models import MetadataColumn, MetadataTable
 
@@ -515,3 +516,36 @@ class BookingAnnotationMetadataMergeTest(TestCase):
 
         job_col.refresh_from_db()
         self.assertEqual(job_col.value, "Original Instrument Value")
+
+    def test_merge_query_count_independent_of_column_count(self):
+        """Test that the merge is applied in bulk with history recorded for every change."""
+        for i in range(40):
+            MetadataColumn.objects.create(
+                metadata_table=self.instrument_metadata_table,
+                name=f"bulk_{i}",
+                type="characteristics",
+                value=f"Instrument {i}",
+            )
+            if i % 2 == 0:
+                MetadataColumn.objects.create(
+                    metadata_table=self.job_metadata_table,
+                    name=f"bulk_{i}",
+                    type="characteristics",
+                    value="",
+                )
+
+        plan = plan_metadata_merge(self.instrument_metadata_table, self.job_metadata_table)
+        self.assertEqual((len(plan.to_update), len(plan.to_create)), (20, 20))
+
+        with self.assertNumQueries(6):
+            apply_metadata_merge(plan, user=self.user)
+
+        job_values = dict(self.job_metadata_table.columns.values_list("name", "value"))
+        self.assertEqual(job_values["bulk_0"], "Instrument 0")
+        self.assertEqual(job_values["bulk_1"], "Instrument 1")
+
+        history = MetadataColumn.history.filter(history_change_reason=MERGE_CHANGE_REASON)
+        self.assertEqual(history.filter(history_type="~").count(), 20)
+        self.assertEqual(history.filter(history_type="+").count(), 20)
+        self.assertEqual(history.values("history_date").distinct().count(), 1)
+        self.assertEqual(set(history.values_list("history_user_id", flat=True)), {self.user.id})
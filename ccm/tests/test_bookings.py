@@ -0,0 +1,175 @@
+"""
+Tests for booking overlap enforcement and instrument availability.
+"""
+
+from datetime import datetime, timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ccm.bookings import BookingOverlapError, booking_availability, save_booking
+from ccm.models import Instrument, InstrumentUsage
+
+
+class BookingOverlapTestCase(TestCase):
+    """Test that overlapping bookings are rejected on exclusive instruments."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("booker", "booker@test.com", "password", is_staff=True)
+        self.instrument = Instrument.objects.create(instrument_name="Orbitrap", user=self.user)
+        self.shared = Instrument.objects.create(
+            instrument_name="Centrifuge", user=self.user, allow_overlapping_bookings=True
+        )
+        self.start = timezone.now() + timedelta(days=1)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _book(self, instrument, start_hours, end_hours):
+        return InstrumentUsage.objects.create(
+            instrument=instrument,
+            user=self.user,
+            time_started=self.start + timedelta(hours=start_hours),
+            time_ended=self.start + timedelta(hours=end_hours),
+        )
+
+    def test_exclusive_flag_follows_instrument(self):
+        """Bookings are exclusive only on instruments that disallow overlaps."""
+        self.assertTrue(self._book(self.instrument, 0, 1).exclusive)
+        self.assertFalse(self._book(self.shared, 0, 1).exclusive)
+
+    def test_save_booking_rechecks_overlap(self):
+        """The check inside the booking transaction rejects an overlap even when validation was skipped."""
+        self._book(self.instrument, 0, 2)
+
+        with self.assertRaises(BookingOverlapError):
+            save_booking(
+                lambda: self._book(self.instrument, 1, 3),
+                self.instrument,
+                self.start + timedelta(hours=1),
+                self.start + timedelta(hours=3),
+            )
+        self.assertEqual(InstrumentUsage.objects.filter(instrument=self.instrument).count(), 1)
+
+        adjacent = save_booking(
+            lambda: self._book(self.instrument, 2, 3),
+            self.instrument,
+            self.start + timedelta(hours=2),
+            self.start + timedelta(hours=3),
+        )
+        self.assertIsNotNone(adjacent.pk)
+
+    def test_api_rejects_overlapping_booking(self):
+        """Creating an overlapping booking through the API returns 400."""
+        self._book(self.instrument, 0, 2)
+
+        response = self.client.post(
+            reverse("ccm:instrumentusage-list"),
+            {
+                "instrument": self.instrument.id,
+                "time_started": (self.start + timedelta(hours=1)).isoformat(),
+                "time_ended": (self.start + timedelta(hours=3)).isoformat(),
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("does not allow overlapping bookings", str(response.data))
+
+    def test_shared_instrument_allows_overlap(self):
+        """Instruments allowing overlaps accept concurrent bookings."""
+        self._book(self.shared, 0, 2)
+
+        usage = save_booking(
+            lambda: self._book(self.shared, 1, 3),
+            self.shared,
+            self.start + timedelta(hours=1),
+            self.start + timedelta(hours=3),
+        )
+        self.assertIsNotNone(usage.pk)
+
+
+class BookingAvailabilityTestCase(TestCase):
+    """Test merged busy intervals and free gaps."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("viewer", "viewer@test.com", "password")
+        self.instrument = Instrument.objects.create(
+            instrument_name="Shared LC", user=self.user, allow_overlapping_bookings=True
+        )
+        self.idle = Instrument.objects.create(instrument_name="Idle LC", user=self.user)
+        self.day = timezone.make_aware(datetime(2030, 1, 1))
+        for start, end in [(-2, 1), (0, 3), (3, 4), (6, 8)]:
+            InstrumentUsage.objects.create(
+                instrument=self.instrument,
+                user=self.user,
+                time_started=self.day + timedelta(hours=start),
+                time_ended=self.day + timedelta(hours=end),
+            )
+
+    def test_availability_merges_and_clips(self):
+        """Overlapping and touching bookings merge, are clipped to the window and leave free gaps."""
+        window_end = self.day + timedelta(hours=10)
+
+        with self.assertNumQueries(1):
+            availability = booking_availability([self.instrument.id, self.idle.id], self.day, window_end)
+
+        busy = availability[self.instrument.id]["busy"]
+        self.assertEqual(
+            [(interval["start"], interval["end"], interval["bookings"]) for interval in busy],
+            [
+                (self.day, self.day + timedelta(hours=4), 3),
+                (self.day + timedelta(hours=6), self.day + timedelta(hours=8), 1),
+            ],
+        )
+        free = availability[self.instrument.id]["free"]
+        self.assertEqual(
+            [(interval["start"], interval["end"]) for interval in free],
+            [
+                (self.day + timedelta(hours=4), self.day + timedelta(hours=6)),
+                (self.day + timedelta(hours=8), window_end),
+            ],
+        )
+        self.assertEqual(availability[self.idle.id], {"busy": [], "free": [{"start": self.day, "end": window_end}]})
+
+    def test_availability_endpoint(self):
+        """The availability action validates its parameters and reports each instrument."""
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        url = reverse("ccm:instrumentusage-availability")
+
+        response = client.get(
+            url,
+            {
+                "instruments": f"{self.instrument.id},{self.idle.id}",
+                "start": self.day.isoformat(),
+                "end": (self.day + timedelta(hours=10)).isoformat(),
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [entry["instrument"] for entry in response.data["instruments"]], [self.instrument.id, self.idle.id]
+        )
+        self.assertEqual(len(response.data["instruments"][0]["busy"]), 2)
+
+        response = client.get(url, {"instruments": str(self.instrument.id), "start": self.day.isoformat()})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = client.get(
+            url,
+            {
+                "instruments": str(self.instrument.id),
+                "start": self.day.isoformat(),
+                "end": (self.day + timedelta(days=365)).isoformat(),
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = client.get(
+            url, {"instruments": str(self.instrument.id), "start": "2026-13-01T09:00:00", "end": self.day.isoformat()}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -94,12 +94,12 @@ class MaintenanceAlertIntegrationTest(TestCase):
 
         self.assertFalse(result)
 
-    @patch("ccm.communication.send_notification")
+    @patch("ccm.communication.send_notifications_bulk")
     @patch("ccm.communication.is_ccmc_available")
     def test_maintenance_due_alert(self, mock_available, mock_send):
         """Test maintenance due alert."""
         mock_available.return_value = True
-        mock_send.return_value = True
+        mock_send.return_value = [MagicMock()]
 
         result = send_maintenance_alert(
             instrument=self.instrument, message_type="maintenance_due", maintenance_info={"frequency_days": 30}
@@ -109,17 +109,17 @@ class MaintenanceAlertIntegrationTest(TestCase):
         mock_send.assert_called_once()
 
         # Check the call arguments
-        call_args = mock_send.call_args[1]
+        (call_args,) = mock_send.call_args[0][0]
         self.assertIn("Maintenance Due", call_args["title"])
         self.assertEqual(call_args["notification_type"], "maintenance")
         self.assertEqual(call_args["priority"], "high")
 
-    @patch("ccm.communication.send_notification")
+    @patch("ccm.communication.send_notifications_bulk")
     @patch("ccm.communication.is_ccmc_available")
     def test_warranty_expiring_alert(self, mock_available, mock_send):
         """Test warranty expiring alert."""
         mock_available.return_value = True
-        mock_send.return_value = True
+        mock_send.return_value = [MagicMock()]
 
         result = send_maintenance_alert(
             instrument=self.instrument, message_type="warranty_expiring", maintenance_info={"days_remaining": 15}
@@ -128,7 +128,7 @@ class MaintenanceAlertIntegrationTest(TestCase):
         self.assertTrue(result)
         mock_send.assert_called_once()
 
-        call_args = mock_send.call_args[1]
+        (call_args,) = mock_send.call_args[0][0]
         self.assertIn("Warranty Expiring", call_args["title"])
 
 
@@ -149,24 +149,97 @@ class ReagentAlertIntegrationTest(TestCase):
 
         self.assertFalse(result)
 
-    @patch("ccm.communication.send_notification")
+    @patch("ccm.communication.send_notifications_bulk")
     @patch("ccm.communication.is_ccmc_available")
     def test_low_stock_alert(self, mock_available, mock_send):
         """Test low stock alert."""
         mock_available.return_value = True
-        mock_send.return_value = True
+        mock_send.return_value = [MagicMock()]
 
         result = send_reagent_alert(stored_reagent=self.stored_reagent, alert_type="low_stock")
 
         self.assertTrue(result)
         mock_send.assert_called_once()
 
-        call_args = mock_send.call_args[1]
+        (call_args,) = mock_send.call_args[0][0]
         self.assertIn("Low Stock Alert", call_args["title"])
         self.assertEqual(call_args["notification_type"], "inventory")
         self.assertEqual(call_args["priority"], "high")
 
 
+class BulkFanOutTest(TestCase):
+    """Test bulk notification fan-out, deferred delivery and RQ offloading."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username="owner", email="owner@test.com")
+        self.users = [User.objects.create_user(username=f"member{i}") for i in range(5)]
+        self.instrument = Instrument.objects.create(instrument_name="Fan-out Instrument", user=self.owner)
+        self.reagent = Reagent.objects.create(name="Fan-out Reagent")
+        self.stored_reagent = StoredReagent.objects.create(reagent=self.reagent, quantity=1.0, user=self.owner)
+
+    def test_alert_fan_out_delivers_after_commit(self):
+        """A broadcast inserts every row at once and only marks them sent once the transaction commits."""
+        from ccmc.models import Notification
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            result = send_maintenance_alert(
+                instrument=self.instrument, message_type="maintenance_due", notify_users=self.users
+            )
+            statuses = set(Notification.objects.filter(object_id=self.instrument.id).values_list("delivery_status"))
+
+        self.assertTrue(result)
+        self.assertEqual(statuses, {("pending",)})
+        self.assertEqual(len(callbacks), 1)
+
+        with self.assertNumQueries(1):
+            callbacks[0]()
+        self.assertEqual(
+            Notification.objects.filter(object_id=self.instrument.id, delivery_status="sent").count(), len(self.users)
+        )
+
+    def test_deliver_notifications_in_batches(self):
+        """Deliveries are sent in concurrent batches and marked sent with one update."""
+        from ccm.communication import send_notifications_bulk
+        from ccmc.websocket_utils import deliver_notifications
+
+        created = send_notifications_bulk(
+            [{"title": "Hello", "message": "Batch", "recipient": user} for user in self.users]
+        )
+
+        with self.assertNumQueries(1):
+            delivered = deliver_notifications(created, batch_size=2)
+
+        self.assertEqual(delivered, len(self.users))
+
+    @patch("ccm.tasks.notification_tasks.send_reagent_alert_task.delay")
+    def test_run_async_queues_after_commit(self, mock_delay):
+        """With run_async the reagent alert is queued on RQ once the transaction commits."""
+        with self.captureOnCommitCallbacks(execute=True):
+            result = send_reagent_alert(
+                stored_reagent=self.stored_reagent, alert_type="expired", notify_users=self.users[:2], run_async=True
+            )
+            mock_delay.assert_not_called()
+
+        self.assertTrue(result)
+        mock_delay.assert_called_once_with(
+            stored_reagent_id=self.stored_reagent.id,
+            alert_type="expired",
+            user_ids=[self.users[0].id, self.users[1].id],
+        )
+
+    def test_reagent_alert_task_sends(self):
+        """The queued job reloads its objects and fans the alert out."""
+        from ccm.tasks.notification_tasks import send_reagent_alert_task
+        from ccmc.models import Notification
+
+        result = send_reagent_alert_task(
+            stored_reagent_id=self.stored_reagent.id, alert_type="low_stock", user_ids=[user.id for user in self.users]
+        )
+
+        self.assertTrue(result)
+        self.assertEqual(Notification.objects.filter(object_id=self.stored_reagent.id).count(), len(self.users))
+
+
 class InstrumentCommunicationTest(TestCase):
     """Test instrument communication methods."""
 
@@ -0,0 +1,140 @@
+"""
+Tests for the stored instrument maintenance and warranty schedule.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ccm.models import Instrument, MaintenanceLog, SupportInformation
+
+User = get_user_model()
+
+
+class InstrumentScheduleTestCase(TestCase):
+    """Test that signals keep the schedule dates current and the due soon endpoint reads them."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="schedule-owner", is_staff=True)
+        self.today = timezone.now().date()
+
+    def _instrument(self, name, warranty_days=None, frequency=None):
+        instrument = Instrument.objects.create(instrument_name=name, user=self.user, enabled=True)
+        if warranty_days is not None or frequency is not None:
+            support = SupportInformation.objects.create(
+                warranty_end_date=self.today + timedelta(days=warranty_days) if warranty_days is not None else None,
+                maintenance_frequency_days=frequency,
+            )
+            instrument.support_information.add(support)
+        instrument.refresh_from_db()
+        return instrument
+
+    def test_signals_maintain_schedule(self):
+        """Linking support, logging maintenance and editing or deleting either updates the stored schedule."""
+        instrument = self._instrument("Orbitrap", warranty_days=100, frequency=30)
+        self.assertEqual(instrument.warranty_expires_on, self.today + timedelta(days=100))
+        self.assertEqual((instrument.next_maintenance_due, instrument.maintenance_interval_days), (None, 30))
+
+        extended = SupportInformation.objects.create(
+            warranty_end_date=self.today + timedelta(days=400), maintenance_frequency_days=14
+        )
+        instrument.support_information.add(extended)
+        self.assertEqual(instrument.warranty_expires_on, self.today + timedelta(days=100))
+        self.assertEqual(instrument.maintenance_interval_days, 14)
+
+        log = MaintenanceLog.objects.create(
+            instrument=instrument,
+            status="completed",
+            maintenance_date=timezone.now() - timedelta(days=10),
+            created_by=self.user,
+        )
+        instrument.refresh_schedule()
+        self.assertEqual(instrument.next_maintenance_due, log.maintenance_date.date() + timedelta(days=14))
+
+        extended.maintenance_frequency_days = 60
+        extended.save()
+        instrument.refresh_schedule()
+        self.assertEqual(instrument.next_maintenance_due, log.maintenance_date.date() + timedelta(days=30))
+
+        extended.delete()
+        log.delete()
+        instrument.refresh_schedule()
+        self.assertEqual(instrument.warranty_expires_on, self.today + timedelta(days=100))
+        self.assertEqual((instrument.next_maintenance_due, instrument.maintenance_interval_days), (None, 30))
+
+        instrument.support_information.clear()
+        instrument.refresh_schedule()
+        self.assertIsNone(instrument.warranty_expires_on)
+        self.assertIsNone(instrument.maintenance_interval_days)
+
+    def test_earliest_warranty_alerts_and_moves_on_when_lapsed(self):
+        """The earliest future contract end is stored, and moves to the next contract once it passes."""
+        instrument = self._instrument("Orbitrap", warranty_days=10)
+        later = SupportInformation.objects.create(warranty_end_date=self.today + timedelta(days=400))
+        instrument.support_information.add(later)
+        self.assertEqual(instrument.warranty_expires_on, self.today + timedelta(days=10))
+        self.assertEqual(list(Instrument.due_soon(30, maintenance=False)), [instrument])
+
+        # Simulate the first contract ending without any write to the instrument
+        first = instrument.support_information.exclude(pk=later.pk).get()
+        SupportInformation.objects.filter(pk=first.pk).update(warranty_end_date=self.today - timedelta(days=1))
+        Instrument.objects.filter(pk=instrument.pk).update(warranty_expires_on=self.today - timedelta(days=1))
+
+        self.assertEqual(list(Instrument.due_soon(30, maintenance=False)), [])
+        instrument.refresh_schedule()
+        self.assertEqual(instrument.warranty_expires_on, self.today + timedelta(days=400))
+
+    def test_never_maintained_instruments_due_one_interval_from_today(self):
+        """Without completed maintenance, an instrument is due when its interval fits in the window."""
+        weekly = self._instrument("Weekly", frequency=7)
+        self._instrument("Yearly", frequency=365)
+        Instrument.objects.filter(pk=weekly.pk).update(created_at=timezone.now() - timedelta(days=400))
+        weekly.refresh_from_db()
+
+        self.assertEqual(list(Instrument.due_soon(14, warranty=False)), [weekly])
+        self.assertTrue(weekly.is_maintenance_overdue(14))
+        self.assertEqual(weekly.days_until_maintenance(), 7)
+        self.assertEqual(weekly.get_maintenance_info(), {"frequency_days": 7, "initial_maintenance": True})
+
+    def test_rebuild_and_due_soon(self):
+        """A rebuild restores drifted dates and the endpoint filters and orders by them."""
+        overdue = self._instrument("Overdue", frequency=30)
+        MaintenanceLog.objects.create(
+            instrument=overdue,
+            status="completed",
+            maintenance_date=timezone.now() - timedelta(days=40),
+            created_by=self.user,
+        )
+        expiring = self._instrument("Expiring", warranty_days=10)
+        self._instrument("Later", warranty_days=90, frequency=365)
+        self._instrument("Ended", warranty_days=-5)
+
+        Instrument.objects.update(next_maintenance_due=None, warranty_expires_on=None)
+        Instrument.rebuild_schedules()
+        self.assertEqual(
+            set(Instrument.due_soon(30).values_list("instrument_name", flat=True)), {"Overdue", "Expiring"}
+        )
+        self.assertTrue(Instrument.objects.get(pk=overdue.pk).is_maintenance_overdue())
+
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        url = reverse("ccm:instrument-due-soon")
+
+        response = client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["instrument_name"] for row in response.data["results"]], ["Overdue", "Expiring"])
+
+        response = client.get(url, {"kind": "warranty", "days": 100})
+        self.assertEqual([row["instrument_name"] for row in response.data["results"]], ["Expiring", "Later"])
+        self.assertEqual(response.data["results"][0]["warranty_expires_on"], str(expiring.warranty_expires_on))
+
+        response = client.get(url, {"days": 1000})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = client.get(url, {"kind": "calibration"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
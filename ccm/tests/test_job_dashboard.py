@@ -0,0 +1,134 @@
+"""
+Tests for instrument job visibility, project column values and the job dashboard.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ccc.models import LabGroup
+from ccm.job_dashboard import job_dashboard
+from ccm.models import Instrument, InstrumentJob
+from ccrv.models import Project
+from ccv.models import MetadataColumn, MetadataTable
+
+
+class InstrumentJobVisibilityTestCase(TestCase):
+    """Test the set-based job visibility used by the list and project endpoints."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user("owner", "owner@test.com", "password")
+        self.tech = User.objects.create_user("tech", "tech@test.com", "password")
+        self.other_tech = User.objects.create_user("tech2", "tech2@test.com", "password")
+        self.outsider = User.objects.create_user("outsider", "outsider@test.com", "password")
+        self.facility = LabGroup.objects.create(name="Facility")
+        self.team = LabGroup.objects.create(name="Team", parent_group=self.facility)
+        self.team.members.add(self.tech)
+
+        self.assigned = InstrumentJob.objects.create(user=self.owner, status="submitted", job_name="Assigned")
+        self.assigned.staff.add(self.tech, self.other_tech)
+        self.group_job = InstrumentJob.objects.create(
+            user=self.owner, status="submitted", lab_group=self.facility, job_name="Facility"
+        )
+        self.group_draft = InstrumentJob.objects.create(
+            user=self.owner, status="draft", lab_group=self.facility, job_name="Draft"
+        )
+
+    def test_accessible_jobs_match_can_view(self):
+        """Each visible job is listed once and visibility agrees with can_view."""
+        for user in [self.owner, self.tech, self.outsider]:
+            visible = list(InstrumentJob.get_accessible_jobs(user).values_list("id", flat=True))
+            self.assertEqual(len(visible), len(set(visible)))
+            for job in InstrumentJob.objects.all():
+                self.assertEqual(job.id in visible, job.can_view(user), f"{user.username}: {job.job_name}")
+
+        sql = str(InstrumentJob.get_accessible_jobs(self.tech).query).upper()
+        self.assertNotIn("DISTINCT", sql)
+
+    def test_project_column_values(self):
+        """Values are de-duplicated, newest first, and gated on seeing any job in the project."""
+        project = Project.objects.create(project_name="Study", owner=self.owner)
+        for name in ["First", "Second"]:
+            table = MetadataTable.objects.create(name=name, sample_count=1, owner=self.owner)
+            InstrumentJob.objects.create(user=self.owner, status="submitted", project=project, metadata_table=table)
+            for value in ["trypsin", "lys-c", ""]:
+                MetadataColumn.objects.create(metadata_table=table, name="enzyme", type="text", value=value)
+        MetadataColumn.objects.filter(value="lys-c").update(updated_at=timezone.now() + timedelta(minutes=1))
+
+        client = APIClient()
+        client.force_authenticate(user=self.owner)
+        url = reverse("ccm:instrumentjob-project-column-values")
+        response = client.get(url, {"project_id": project.id, "column_name": "Enzyme"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["values"], ["lys-c", "trypsin"])
+
+        client.force_authenticate(user=self.outsider)
+        response = client.get(url, {"project_id": project.id, "column_name": "enzyme"})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class JobDashboardTestCase(TestCase):
+    """Test dashboard aggregates."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("requester", "requester@test.com", "password")
+        self.tech = User.objects.create_user("tech", "tech@test.com", "password")
+        self.admin = User.objects.create_user("admin", "admin@test.com", "password", is_staff=True)
+        self.orbitrap = Instrument.objects.create(instrument_name="Orbitrap", user=self.admin)
+        self.timstof = Instrument.objects.create(instrument_name="timsTOF", user=self.admin)
+        submitted = timezone.now() - timedelta(days=2)
+
+        for hours in [2, 4]:
+            job = InstrumentJob.objects.create(
+                user=self.user,
+                instrument=self.orbitrap,
+                status="completed",
+                submitted_at=submitted,
+                completed_at=submitted + timedelta(hours=hours),
+            )
+            job.staff.add(self.tech, self.admin)
+        InstrumentJob.objects.create(user=self.user, instrument=self.timstof, status="submitted")
+        InstrumentJob.objects.create(user=self.user, status="draft")
+
+    def test_dashboard_aggregates(self):
+        """Counts and turnaround roll up exactly, in one query."""
+        with self.assertNumQueries(1):
+            dashboard = job_dashboard(InstrumentJob.objects.all())
+
+        self.assertEqual(dashboard["total"], 4)
+        by_status = {row["status"]: row for row in dashboard["by_status"]}
+        self.assertEqual(
+            {key: row["count"] for key, row in by_status.items()}, {"completed": 2, "submitted": 1, "draft": 1}
+        )
+        self.assertEqual(by_status["completed"]["avg_turnaround_hours"], 3.0)
+        self.assertIsNone(by_status["draft"]["avg_turnaround_hours"])
+
+        by_instrument = {row["instrument_name"]: row["count"] for row in dashboard["by_instrument"]}
+        self.assertEqual(by_instrument, {"Orbitrap": 2, "timsTOF": 1, None: 1})
+
+        by_assignee = {row["assignee_username"]: row for row in dashboard["by_assignee"]}
+        self.assertEqual(by_assignee["tech"]["count"], 2)
+        self.assertEqual(by_assignee["tech"]["avg_turnaround_hours"], 3.0)
+        self.assertEqual(by_assignee[None]["count"], 2)
+
+    def test_dashboard_endpoint_respects_visibility_and_filters(self):
+        """The endpoint counts only jobs the user can see and honours list filters."""
+        client = APIClient()
+        client.force_authenticate(user=self.tech)
+        url = reverse("ccm:instrumentjob-dashboard")
+
+        response = client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total"], 2)
+
+        client.force_authenticate(user=self.admin)
+        response = client.get(url, {"status": "submitted"})
+        self.assertEqual(response.data["total"], 1)
+        self.assertEqual(response.data["by_instrument"][0]["instrument"], self.timstof.id)
@@ -0,0 +1,98 @@
+"""
+Tests for the per-user instrument job autocomplete index.
+"""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ccm.models import InstrumentJob, InstrumentJobSuggestion
+
+
+class InstrumentJobSuggestionTestCase(TestCase):
+    """Test that saving jobs maintains the suggestion index and the endpoint reads it."""
+
+    def setUp(self):
+        self.user = User.objects.create_user("researcher", "researcher@test.com", "password")
+        self.other = User.objects.create_user("other", "other@test.com", "password")
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _job(self, user=None, **fields):
+        return InstrumentJob.objects.create(user=user or self.user, **fields)
+
+    def test_saving_jobs_counts_new_values_once(self):
+        """Creating jobs counts their values; re-saving without changes does not."""
+        job = self._job(funder="NIH", cost_center="CC-1", search_engine="MaxQuant", search_engine_version="2.4")
+        self._job(funder="NIH ")
+        job.job_name = "Renamed"
+        job.save()
+
+        funder = InstrumentJobSuggestion.objects.get(user=self.user, field="funder", value="NIH")
+        self.assertEqual(funder.use_count, 2)
+        self.assertTrue(
+            InstrumentJobSuggestion.objects.filter(field="search_engine", value="MaxQuant", version="2.4").exists()
+        )
+
+        job.search_engine_version = "2.5"
+        job.save()
+        self.assertEqual(
+            set(InstrumentJobSuggestion.objects.filter(field="search_engine").values_list("version", "use_count")),
+            {("2.5", 1)},
+        )
+
+    def test_edits_and_deletes_uncount_values(self):
+        """Values removed from a job or left by a deleted job are uncounted and pruned at zero."""
+        first = self._job(funder="NIH", cost_center="CC-1")
+        second = self._job(funder="NIH")
+
+        first.funder = "NSF"
+        first.save()
+        self.assertEqual(
+            dict(InstrumentJobSuggestion.objects.filter(field="funder").values_list("value", "use_count")),
+            {"NIH": 1, "NSF": 1},
+        )
+
+        second.delete()
+        first.user = self.other
+        first.save()
+        self.assertFalse(InstrumentJobSuggestion.objects.filter(user=self.user).exists())
+        self.assertEqual(
+            set(InstrumentJobSuggestion.objects.filter(user=self.other).values_list("value", flat=True)),
+            {"NSF", "CC-1"},
+        )
+
+        InstrumentJob.objects.filter(pk=first.pk).delete()
+        self.assertFalse(InstrumentJobSuggestion.objects.exists())
+
+    def test_ranking_prefix_and_limit(self):
+        """Suggestions are ranked by use then recency, filtered by prefix and bounded per field."""
+        for funder in ["Wellcome", "NIH", "NIH", "NSF"]:
+            self._job(funder=funder)
+        self._job(user=self.other, funder="Other Funder")
+        InstrumentJobSuggestion.objects.filter(value="NSF").update(last_used_at=timezone.now() + timedelta(days=1))
+        self._job(search_engine="DIA-NN", search_engine_version="1.8")
+        self._job(search_engine="DIA-NN", search_engine_version="1.9")
+        self._job(search_engine="FragPipe")
+
+        with self.assertNumQueries(1):
+            suggestions = InstrumentJobSuggestion.suggestions_for(self.user)
+        self.assertEqual(suggestions["funders"], ["NIH", "NSF", "Wellcome"])
+        self.assertEqual(suggestions["cost_centers"], [])
+        self.assertEqual(sorted(suggestions["search_engines"]["DIA-NN"]), ["1.8", "1.9"])
+        self.assertEqual(suggestions["search_engines"]["FragPipe"], [])
+
+        url = reverse("ccm:instrumentjob-autocomplete-fields")
+        response = self.client.get(url, {"q": "n", "limit": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["funders"], ["NIH"])
+        self.assertEqual(response.data["search_engines"], {})
+
+        response = self.client.get(url, {"limit": "many"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -3,8 +3,10 @@ Test cases for CUPCAKE Macaron (CCM) models
 """
 
 from datetime import timedelta
+from io import StringIO
 
 from django.contrib.auth.models import User
+from django.core.management import call_command
 from django.test import TestCase
 from django.utils import timezone
 
@@ -251,6 +253,45 @@ class ReagentModelTest(TestCase):
         self.assertTrue(subscription.notify_on_expiry)
         self.assertEqual(str(subscription), "testuser - Test Chemical")
 
+    def test_stock_balance_follows_actions(self):
+        """Test the running balance is updated as actions are created, edited and deleted"""
+        stored_reagent = StoredReagent.objects.create(
+            reagent=self.reagent, storage_object=self.storage, quantity=100.0, user=self.user
+        )
+        self.assertEqual(stored_reagent.current_quantity, 100.0)
+
+        ReagentAction.objects.create(reagent=stored_reagent, action_type="add", quantity=20.0, user=self.user)
+        reserve = ReagentAction.objects.create(
+            reagent=stored_reagent, action_type="reserve", quantity=30.0, user=self.user
+        )
+        stored_reagent.refresh_from_db()
+        self.assertEqual(stored_reagent.current_quantity, 90.0)
+
+        reserve.quantity = 50.0
+        reserve.save()
+        stored_reagent.refresh_from_db()
+        self.assertEqual(stored_reagent.current_quantity, 70.0)
+
+        reserve.delete()
+        stored_reagent.quantity = 110.0
+        stored_reagent.save()
+        self.assertEqual(stored_reagent.current_quantity, 130.0)
+
+    def test_rebuild_stock_balances_repairs_drift(self):
+        """Test reconcile_reagent_stock rebuilds the balance from the action ledger"""
+        stored_reagent = StoredReagent.objects.create(
+            reagent=self.reagent, storage_object=self.storage, quantity=100.0, user=self.user
+        )
+        ReagentAction.objects.create(reagent=stored_reagent, action_type="reserve", quantity=40.0, user=self.user)
+        StoredReagent.objects.filter(pk=stored_reagent.pk).update(current_quantity=0.0)
+
+        out = StringIO()
+        call_command("reconcile_reagent_stock", stdout=out)
+
+        stored_reagent.refresh_from_db()
+        self.assertEqual(stored_reagent.current_quantity, 60.0)
+        self.assertIn("1 corrected", out.getvalue())
+
 
 class MaintenanceLogModelTest(TestCase):
     def setUp(self):
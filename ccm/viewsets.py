@@ -4,11 +4,14 @@ Provides REST API endpoints for instrument management, jobs, usage tracking,
 and maintenance functionality.
 """
 
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
 import django_filters
 from django_filters.rest_framework import DjangoFilterBackend
@@ -25,7 +28,9 @@ from ccc.serializers import AnnotationFolderSerializer
 from ccv.models import LabGroup, MetadataColumn, MetadataTableTemplate
 from ccv.serializers import MetadataColumnSerializer, MetadataTableSerializer
 
+from .bookings import booking_availability
 from .communication import send_maintenance_alert, send_reagent_alert
+from .job_dashboard import job_dashboard
 from .models import (
     ExternalContact,
     ExternalContactDetails,
@@ -33,6 +38,7 @@ from .models import (
     InstrumentAnnotation,
     InstrumentJob,
     InstrumentJobAnnotation,
+    InstrumentJobSuggestion,
     InstrumentPermission,
     InstrumentUsage,
     InstrumentUsageJobAnnotation,
@@ -70,6 +76,8 @@ from .serializers import (
     SupportInformationSerializer,
 )
 
+AVAILABILITY_MAX_DAYS = 93
+
 
 class BaseViewSet(viewsets.ModelViewSet):
     """Base viewset with common functionality."""
@@ -112,7 +120,7 @@ class InstrumentViewSet(DeletionLogMixin, BaseViewSet):
         "updated_at": ["gte", "lte"],
     }
     search_fields = ["instrument_name", "instrument_description"]
-    ordering_fields = ["instrument_name", "created_at", "updated_at"]
+    ordering_fields = ["instrument_name", "created_at", "updated_at", "next_maintenance_due", "warranty_expires_on"]
     ordering = ["instrument_name"]
 
     def get_serializer_class(self):
@@ -158,6 +166,42 @@ class InstrumentViewSet(DeletionLogMixin, BaseViewSet):
             raise PermissionDenied("Only staff or admin users can delete instruments")
         super().perform_destroy(instance)
 
+    @action(detail=False, methods=["get"])
+    def due_soon(self, request):
+        """
+        List instruments with maintenance or warranty expiry coming up.
+
+        Query parameters:
+            days: Window in days from today (default 30, max 365)
+            kind: "maintenance", "warranty" or "all" (default)
+
+        Overdue maintenance is included. Results are ordered by the next due date.
+        """
+        try:
+            days = int(request.query_params.get("days", 30))
+        except ValueError:
+            raise ValidationError({"days": "Must be an integer"})
+        if not 0 <= days <= 365:
+            raise ValidationError({"days": "Must be between 0 and 365"})
+        kind = request.query_params.get("kind", "all")
+        if kind not in ("maintenance", "warranty", "all"):
+            raise ValidationError({"kind": "Must be one of: maintenance, warranty, all"})
+
+        instruments = Instrument.due_soon(
+            days,
+            self.filter_queryset(self.get_queryset()),
+            maintenance=kind in ("maintenance", "all"),
+            warranty=kind in ("warranty", "all"),
+        )
+        due_fields = ["next_maintenance_due", "warranty_expires_on"]
+        if kind == "warranty":
+            due_fields.reverse()
+        instruments = instruments.order_by(*[models.F(field).asc(nulls_last=True) for field in due_fields], "id")
+        page = self.paginate_queryset(instruments)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(instruments, many=True).data)
+
     @action(detail=True, methods=["post"])
     def check_warranty(self, request, pk=None):
         """Check warranty status for an instrument."""
@@ -407,24 +451,8 @@ class InstrumentJobViewSet(BaseViewSet):
     ordering = ["-created_at"]
 
     def get_queryset(self):
-        """
-        Filter jobs visible to the current user, matching InstrumentJob.check_job_permissions:
-        - Staff/superuser: everything
-        - Owner: their own jobs, any status
-        - Assigned staff: jobs they're assigned to
-        - Lab group members: jobs assigned to their lab group, but only once submitted (not draft)
-        """
-        queryset = InstrumentJob.objects.all()
-        user = self.request.user
-
-        if user.is_staff or user.is_superuser:
-            return queryset
-
-        my_lab_group_ids = LabGroup.objects.filter(Q(members=user) | Q(creator=user)).values_list("id", flat=True)
-
-        return queryset.filter(
-            Q(user=user) | Q(staff=user) | (Q(lab_group_id__in=my_lab_group_ids) & ~Q(status="draft"))
-        ).distinct()
+        """Filter jobs visible to the current user (see InstrumentJob.get_accessible_jobs)."""
+        return InstrumentJob.get_accessible_jobs(self.request.user)
 
     def get_serializer_class(self):
         """Use detailed serializer for retrieve action."""
@@ -556,53 +584,22 @@ class InstrumentJobViewSet(BaseViewSet):
     @action(detail=False, methods=["get"])
     def autocomplete_fields(self, request):
         """
-        Get distinct field values from user's existing jobs for autocomplete.
+        Get field values from the user's existing jobs for autocomplete.
 
-        Returns unique, non-null values that the current user has used in their previous jobs.
+        Served from the user's suggestion index, most used values first.
         Includes: funders, cost_centers, search_engines (with their versions)
-        """
-        user_jobs = self.get_queryset().filter(user=request.user)
-
-        funders = (
-            user_jobs.exclude(funder__isnull=True)
-            .exclude(funder__exact="")
-            .values_list("funder", flat=True)
-            .distinct()
-            .order_by("funder")
-        )
 
-        cost_centers = (
-            user_jobs.exclude(cost_center__isnull=True)
-            .exclude(cost_center__exact="")
-            .values_list("cost_center", flat=True)
-            .distinct()
-            .order_by("cost_center")
-        )
-
-        search_engines_data = (
-            user_jobs.exclude(search_engine__isnull=True)
-            .exclude(search_engine__exact="")
-            .values("search_engine", "search_engine_version")
-            .distinct()
-            .order_by("search_engine", "search_engine_version")
-        )
-
-        search_engines = {}
-        for item in search_engines_data:
-            engine = item["search_engine"]
-            version = item.get("search_engine_version") or ""
-
-            if engine not in search_engines:
-                search_engines[engine] = []
-
-            if version and version not in search_engines[engine]:
-                search_engines[engine].append(version)
-
-        for engine in search_engines:
-            search_engines[engine].sort()
+        Query parameters:
+            q: Only return values starting with this text
+            limit: Maximum suggestions per field (default 20, max 100)
+        """
+        try:
+            limit = max(1, min(int(request.query_params.get("limit", 20)), 100))
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer"})
 
         return Response(
-            {"funders": list(funders), "cost_centers": list(cost_centers), "search_engines": search_engines}
+            InstrumentJobSuggestion.suggestions_for(request.user, request.query_params.get("q", "").strip(), limit)
         )
 
     @action(detail=False, methods=["get"])
@@ -619,27 +616,35 @@ class InstrumentJobViewSet(BaseViewSet):
         if not project_jobs.exists():
             return Response({"error": "Project not found or has no jobs"}, status=status.HTTP_404_NOT_FOUND)
 
-        if not any(job.can_view(request.user) for job in project_jobs):
+        if not InstrumentJob.get_accessible_jobs(request.user, project_jobs).exists():
             return Response(
                 {"error": "Permission denied: cannot view this project's jobs"}, status=status.HTTP_403_FORBIDDEN
             )
 
-        job_table_ids = project_jobs.exclude(metadata_table__isnull=True).values_list("metadata_table_id", flat=True)
+        job_table_ids = project_jobs.exclude(metadata_table__isnull=True).values("metadata_table_id")
 
+        # Distinct values, most recently used first
         values = (
             MetadataColumn.objects.filter(metadata_table_id__in=job_table_ids, name__iexact=column_name)
             .exclude(value__isnull=True)
             .exclude(value__exact="")
-            .order_by("-updated_at")
+            .values("value")
+            .annotate(last_used=models.Max("updated_at"))
+            .order_by("-last_used", "value")
             .values_list("value", flat=True)
         )
 
-        seen = []
-        for value in values:
-            if value not in seen:
-                seen.append(value)
+        return Response({"values": list(values)})
 
-        return Response({"values": seen})
+    @action(detail=False, methods=["get"])
+    def dashboard(self, request):
+        """
+        Job counts and average turnaround by status, instrument and assignee.
+
+        Accepts the same filters as the list endpoint and counts every matching
+        job visible to the user, without paging through them.
+        """
+        return Response(job_dashboard(self.filter_queryset(self.get_queryset())))
 
     @action(detail=True, methods=["post"])
     def create_metadata_from_template(self, request, pk=None):
@@ -748,6 +753,55 @@ class InstrumentUsageViewSet(DeletionLogMixin, BaseViewSet):
         """Set the user when creating usage record."""
         serializer.save(user=self.request.user)
 
+    @action(detail=False, methods=["get"])
+    def availability(self, request):
+        """
+        Get merged busy intervals and the free gaps between them for instruments over a window.
+
+        Query parameters:
+        - instruments: Comma-separated instrument IDs (required)
+        - start: Window start, ISO 8601 datetime (required)
+        - end: Window end, ISO 8601 datetime (required, at most AVAILABILITY_MAX_DAYS after start)
+        """
+        try:
+            instrument_ids = [int(value) for value in request.query_params.get("instruments", "").split(",") if value]
+        except ValueError:
+            return Response(
+                {"error": "instruments must be a comma-separated list of IDs"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if not instrument_ids:
+            return Response({"error": "instruments parameter is required"}, status=status.HTTP_400_BAD_REQUEST)
+
+        window = []
+        for name in ("start", "end"):
+            try:
+                value = parse_datetime(request.query_params.get(name, ""))
+            except ValueError:
+                value = None
+            if value is None:
+                return Response({"error": f"{name} must be an ISO 8601 datetime"}, status=status.HTTP_400_BAD_REQUEST)
+            window.append(timezone.make_aware(value) if timezone.is_naive(value) else value)
+        window_start, window_end = window
+
+        if window_end <= window_start:
+            return Response({"error": "end must be after start"}, status=status.HTTP_400_BAD_REQUEST)
+        if window_end - window_start > timedelta(days=AVAILABILITY_MAX_DAYS):
+            return Response(
+                {"error": f"The window may span at most {AVAILABILITY_MAX_DAYS} days"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        availability = booking_availability(instrument_ids, window_start, window_end)
+        return Response(
+            {
+                "start": window_start,
+                "end": window_end,
+                "instruments": [
+                    {"instrument": instrument_id, **intervals} for instrument_id, intervals in availability.items()
+                ],
+            }
+        )
+
     @action(detail=False, methods=["get"])
     def my_usage(self, request):
         """Get current user's usage records."""
@@ -887,12 +941,13 @@ class StoredReagentViewSet(DeletionLogMixin, BaseViewSet):
     filterset_fields = {
         "reagent": ["exact"],
         "quantity": ["exact", "gte", "lte", "gt", "lt"],
+        "current_quantity": ["gte", "lte", "gt", "lt"],
         "molecular_weight": ["exact", "gte", "lte", "gt", "lt", "isnull"],
         "expiration_date": ["exact", "gte", "lte", "gt", "lt", "isnull"],
         "updated_at": ["gte", "lte"],
     }
     search_fields = ["reagent__name", "notes", "reagent__unit", "barcode"]
-    ordering_fields = ["quantity", "molecular_weight", "expiration_date", "created_at"]
+    ordering_fields = ["quantity", "current_quantity", "molecular_weight", "expiration_date", "created_at"]
     ordering = ["-created_at"]
 
     def get_queryset(self):
@@ -944,7 +999,9 @@ class StoredReagentViewSet(DeletionLogMixin, BaseViewSet):
     def low_stock(self, request):
         """Get stored reagents with low stock based on individual threshold."""
         low_stock_reagents = self.get_queryset().filter(
-            quantity__lte=models.F("low_stock_threshold"), low_stock_threshold__isnull=False, quantity__gt=0
+            current_quantity__lte=models.F("low_stock_threshold"),
+            low_stock_threshold__isnull=False,
+            current_quantity__gt=0,
         )
 
         serializer = self.get_serializer(low_stock_reagents, many=True)
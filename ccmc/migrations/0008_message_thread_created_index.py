@@ -0,0 +1,19 @@
+# Generated by Django 6.0.5 on 2026-10-19 00:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ccc", "0024_annotation_is_attached"),
+        ("ccmc", "0007_historicalwebrtcpeer_client_peer_id_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(fields=["thread", "created_at", "id"], name="ccmc_messag_thread__f2ffec_idx"),
+        ),
+    ]
@@ -0,0 +1,133 @@
+# Generated by Django 6.0.5 on 2026-10-19 00:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Coalesce, Substr
+
+
+def rebuild_thread_summaries(apps, schema_editor):
+    """Recompute each thread's message summary and each participant's unread count."""
+    MessageThread = apps.get_model("ccmc", "MessageThread")
+    ThreadParticipant = apps.get_model("ccmc", "ThreadParticipant")
+    Message = apps.get_model("ccmc", "Message")
+
+    visible = Message.objects.filter(thread=models.OuterRef("pk"), is_deleted=False)
+    latest = visible.order_by("-created_at", "-id")
+    count = visible.values("thread").annotate(total=models.Count("id")).values("total")
+    MessageThread.objects.update(
+        message_count=Coalesce(models.Subquery(count, output_field=models.IntegerField()), 0),
+        latest_message=models.Subquery(latest.values("id")[:1]),
+        latest_message_sender=models.Subquery(latest.values("sender")[:1]),
+        latest_message_preview=Coalesce(
+            Substr(models.Subquery(latest.values("content")[:1]), 1, 101), models.Value("")
+        ),
+        last_message_at=Coalesce(models.Subquery(latest.values("created_at")[:1]), models.F("created_at")),
+    )
+
+    unread = (
+        Message.objects.filter(
+            thread=models.OuterRef("thread"), is_deleted=False, created_at__gt=models.OuterRef("last_read_at")
+        )
+        .exclude(sender=models.OuterRef("user"))
+        .values("thread")
+        .annotate(total=models.Count("id"))
+        .values("total")
+    )
+    ThreadParticipant.objects.update(
+        unread_count=Coalesce(models.Subquery(unread, output_field=models.IntegerField()), 0)
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ccmc", "0008_message_thread_created_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="historicalmessagethread",
+            name="latest_message",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="ccmc.message",
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicalmessagethread",
+            name="latest_message_preview",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Start of the latest message; one character longer than shown so truncation can be detected",
+                max_length=101,
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicalmessagethread",
+            name="latest_message_sender",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicalmessagethread",
+            name="message_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="messagethread",
+            name="latest_message",
+            field=models.ForeignKey(
+                blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="+", to="ccmc.message"
+            ),
+        ),
+        migrations.AddField(
+            model_name="messagethread",
+            name="latest_message_preview",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Start of the latest message; one character longer than shown so truncation can be detected",
+                max_length=101,
+            ),
+        ),
+        migrations.AddField(
+            model_name="messagethread",
+            name="latest_message_sender",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddField(
+            model_name="messagethread",
+            name="message_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="threadparticipant",
+            name="unread_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Messages from other participants posted since last_read_at"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="threadparticipant",
+            index=models.Index(fields=["user", "unread_count"], name="ccmc_thread_user_id_c6b9aa_idx"),
+        ),
+        migrations.RunPython(rebuild_thread_summaries, migrations.RunPython.noop),
+    ]
@@ -14,10 +14,13 @@ from django.conf import settings
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.db.models.functions import Coalesce, Substr
 from django.utils import timezone
 
 from simple_history.models import HistoricalRecords
 
+PREVIEW_LENGTH = 100
+
 
 class NotificationType(models.TextChoices):
     """Types of system notifications."""
@@ -171,6 +174,19 @@ class MessageThread(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     last_message_at = models.DateTimeField(auto_now_add=True)
 
+    # Summary of the visible messages, maintained as messages are posted, edited and deleted
+    message_count = models.PositiveIntegerField(default=0)
+    latest_message = models.ForeignKey("Message", on_delete=models.SET_NULL, blank=True, null=True, related_name="+")
+    latest_message_sender = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, blank=True, null=True, related_name="+"
+    )
+    latest_message_preview = models.CharField(
+        max_length=PREVIEW_LENGTH + 1,
+        blank=True,
+        default="",
+        help_text="Start of the latest message; one character longer than shown so truncation can be detected",
+    )
+
     class Meta:
         app_label = "ccmc"
         ordering = ["-last_message_at"]
@@ -178,6 +194,46 @@ class MessageThread(models.Model):
     def __str__(self):
         return self.title
 
+    @classmethod
+    def record_message(cls, message):
+        """
+        Fold a newly posted message into its thread's summary and participants' unread counts.
+
+        Two UPDATEs regardless of thread size; no history rows are written.
+        """
+        cls.objects.filter(pk=message.thread_id).update(
+            message_count=models.F("message_count") + 1,
+            latest_message=message,
+            latest_message_sender=message.sender_id,
+            latest_message_preview=message.content[: PREVIEW_LENGTH + 1],
+            last_message_at=message.created_at,
+        )
+        ThreadParticipant.objects.filter(thread_id=message.thread_id).exclude(user_id=message.sender_id).update(
+            unread_count=models.F("unread_count") + 1
+        )
+
+    @classmethod
+    def rebuild_summaries(cls, queryset=None):
+        """
+        Recompute message summaries and unread counts from the messages themselves.
+
+        Used after edits and deletions and to backfill existing threads.
+        """
+        queryset = cls.objects.all() if queryset is None else queryset
+        visible = Message.objects.filter(thread=models.OuterRef("pk"), is_deleted=False)
+        latest = visible.order_by("-created_at", "-id")
+        count = visible.values("thread").annotate(total=models.Count("id")).values("total")
+        queryset.update(
+            message_count=Coalesce(models.Subquery(count, output_field=models.IntegerField()), 0),
+            latest_message=models.Subquery(latest.values("id")[:1]),
+            latest_message_sender=models.Subquery(latest.values("sender")[:1]),
+            latest_message_preview=Coalesce(
+                Substr(models.Subquery(latest.values("content")[:1]), 1, PREVIEW_LENGTH + 1), models.Value("")
+            ),
+            last_message_at=Coalesce(models.Subquery(latest.values("created_at")[:1]), models.F("created_at")),
+        )
+        ThreadParticipant.rebuild_unread_counts(ThreadParticipant.objects.filter(thread__in=queryset.values("pk")))
+
 
 class ThreadParticipant(models.Model):
     """
@@ -190,16 +246,43 @@ class ThreadParticipant(models.Model):
     # Participation metadata
     joined_at = models.DateTimeField(auto_now_add=True)
     last_read_at = models.DateTimeField(auto_now_add=True)
+    unread_count = models.PositiveIntegerField(
+        default=0, help_text="Messages from other participants posted since last_read_at"
+    )
     is_moderator = models.BooleanField(default=False)
     notifications_enabled = models.BooleanField(default=True)
 
     class Meta:
         app_label = "ccmc"
         unique_together = ["thread", "user"]
+        indexes = [
+            models.Index(fields=["user", "unread_count"]),
+        ]
 
     def __str__(self):
         return f"{self.user.username} in {self.thread.title}"
 
+    def mark_read(self):
+        """Mark the thread as read up to now."""
+        self.last_read_at = timezone.now()
+        self.unread_count = 0
+        self.save(update_fields=["last_read_at", "unread_count"])
+
+    @classmethod
+    def rebuild_unread_counts(cls, queryset=None):
+        """Recompute unread counts from messages newer than each participant's last_read_at."""
+        queryset = cls.objects.all() if queryset is None else queryset
+        unread = (
+            Message.objects.filter(
+                thread=models.OuterRef("thread"), is_deleted=False, created_at__gt=models.OuterRef("last_read_at")
+            )
+            .exclude(sender=models.OuterRef("user"))
+            .values("thread")
+            .annotate(total=models.Count("id"))
+            .values("total")
+        )
+        queryset.update(unread_count=Coalesce(models.Subquery(unread, output_field=models.IntegerField()), 0))
+
 
 class Message(models.Model):
     """
@@ -240,6 +323,9 @@ class Message(models.Model):
     class Meta:
         app_label = "ccmc"
         ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["thread", "created_at", "id"]),
+        ]
 
     def __str__(self):
         return f"Message from {self.sender.username} in {self.thread.title}"
@@ -0,0 +1,118 @@
+"""
+Keyset pagination for chat history.
+
+Messages are paged on ``(created_at, id)`` within a thread, backed by the
+``(thread, created_at, id)`` index on ``Message``. A cursor names the message a
+page starts after (or ends before), so every page is an index range scan no
+matter how far back the user has scrolled, unlike offset pages which re-read
+all skipped rows.
+"""
+
+import base64
+import uuid
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+
+
+def encode_message_cursor(message):
+    """Return the opaque cursor for a message's position in its thread."""
+    position = f"{message.created_at.isoformat()}|{message.id}"
+    return base64.urlsafe_b64encode(position.encode("utf-8")).decode("ascii")
+
+
+def decode_message_cursor(cursor):
+    """
+    Decode a cursor into ``(created_at, id)``.
+
+    Raises:
+        ValidationError: If the cursor is malformed
+    """
+    try:
+        created_at, message_id = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8").split("|")
+        created_at = parse_datetime(created_at)
+        message_id = uuid.UUID(message_id)
+    except (ValueError, UnicodeError):
+        raise ValidationError({"cursor": "Invalid cursor"})
+    if created_at is None:
+        raise ValidationError({"cursor": "Invalid cursor"})
+    return created_at, message_id
+
+
+def messages_before(queryset, created_at, message_id):
+    """Filter ``queryset`` to messages strictly older than the given position."""
+    return queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=message_id))
+
+
+def messages_after(queryset, created_at, message_id):
+    """Filter ``queryset`` to messages strictly newer than the given position."""
+    return queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=message_id))
+
+
+def message_tail(queryset, limit):
+    """
+    Return the newest ``limit`` messages in chronological order and whether older ones exist.
+
+    Fetches ``limit + 1`` rows newest-first so the check costs no extra query.
+    """
+    rows = list(queryset.order_by("-created_at", "-id")[: limit + 1])
+    has_older = len(rows) > limit
+    return rows[:limit][::-1], has_older
+
+
+class MessageKeysetPagination(BasePagination):
+    """
+    Cursor pagination for messages in one thread.
+
+    Without a cursor the newest page is returned. ``before=<cursor>`` pages
+    towards older messages (infinite scroll up) and ``after=<cursor>`` towards
+    newer ones. Results are always in chronological order.
+    """
+
+    page_size = 50
+    max_page_size = 200
+    limit_query_param = "limit"
+
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get(self.limit_query_param, self.page_size))
+        except ValueError:
+            raise ValidationError({self.limit_query_param: "Must be an integer"})
+        return max(1, min(limit, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        limit = self.get_limit(request)
+        before = request.query_params.get("before")
+        after = request.query_params.get("after")
+        if before and after:
+            raise ValidationError({"cursor": "Use either before or after, not both"})
+
+        self.after = after
+        if after:
+            rows = list(
+                messages_after(queryset, *decode_message_cursor(after)).order_by("created_at", "id")[: limit + 1]
+            )
+            self.has_newer = len(rows) > limit
+            self.has_older = True
+            self.page = rows[:limit]
+        else:
+            if before:
+                queryset = messages_before(queryset, *decode_message_cursor(before))
+            self.page, self.has_older = message_tail(queryset, limit)
+            self.has_newer = bool(before)
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "results": data,
+                "older_cursor": encode_message_cursor(self.page[0]) if self.page and self.has_older else None,
+                "newer_cursor": encode_message_cursor(self.page[-1]) if self.page else self.after,
+                "has_older": self.has_older,
+                "has_newer": self.has_newer,
+            }
+        )
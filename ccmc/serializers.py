@@ -8,10 +8,13 @@ from django.contrib.auth import get_user_model
 
 from rest_framework import serializers
 
-from .models import Message, MessageThread, Notification, ThreadParticipant, WebRTCPeer, WebRTCSession
+from .models import PREVIEW_LENGTH, Message, MessageThread, Notification, ThreadParticipant, WebRTCPeer, WebRTCSession
+from .pagination import encode_message_cursor, message_tail
 
 User = get_user_model()
 
+RECENT_MESSAGES_LIMIT = 50
+
 
 class UserBasicSerializer(serializers.ModelSerializer):
     """Basic user serializer for nested relationships."""
@@ -135,10 +138,11 @@ class ThreadParticipantSerializer(serializers.ModelSerializer):
             "user_details",
             "joined_at",
             "last_read_at",
+            "unread_count",
             "is_moderator",
             "notifications_enabled",
         ]
-        read_only_fields = ["id", "joined_at", "username", "user_details"]
+        read_only_fields = ["id", "joined_at", "username", "user_details", "unread_count"]
 
 
 class MessageSerializer(serializers.ModelSerializer):
@@ -209,12 +213,13 @@ class MessageThreadSerializer(serializers.ModelSerializer):
 
     creator_details = UserBasicSerializer(source="creator", read_only=True)
     creator_username = serializers.CharField(source="creator.username", read_only=True)
-    participants_count = serializers.IntegerField(source="participants.count", read_only=True)
-    messages_count = serializers.IntegerField(source="messages.count", read_only=True)
+    participants_count = serializers.SerializerMethodField()
+    messages_count = serializers.IntegerField(source="message_count", read_only=True)
     participants_list = ThreadParticipantSerializer(source="threadparticipant_set", many=True, read_only=True)
     related_object_type = serializers.CharField(source="content_type.model", read_only=True)
     related_object_app = serializers.CharField(source="content_type.app_label", read_only=True)
     latest_message = serializers.SerializerMethodField()
+    unread_count = serializers.SerializerMethodField()
 
     class Meta:
         model = MessageThread
@@ -238,6 +243,7 @@ class MessageThreadSerializer(serializers.ModelSerializer):
             "updated_at",
             "last_message_at",
             "latest_message",
+            "unread_count",
         ]
         read_only_fields = [
             "id",
@@ -252,37 +258,62 @@ class MessageThreadSerializer(serializers.ModelSerializer):
             "updated_at",
             "last_message_at",
             "latest_message",
+            "unread_count",
         ]
 
+    def get_participants_count(self, obj):
+        """Count participants from the prefetched participant list."""
+        return len(obj.threadparticipant_set.all())
+
     def get_latest_message(self, obj):
-        """Get the latest message in the thread."""
-        latest = obj.messages.filter(is_deleted=False).order_by("-created_at").first()
-        if latest:
-            return {
-                "id": latest.id,
-                "content": latest.content[:100] + "..." if len(latest.content) > 100 else latest.content,
-                "sender_username": latest.sender.username,
-                "created_at": latest.created_at,
-            }
-        return None
+        """Get the latest message in the thread from the maintained summary."""
+        if not obj.latest_message_id:
+            return None
+        preview = obj.latest_message_preview
+        return {
+            "id": obj.latest_message_id,
+            "content": preview[:PREVIEW_LENGTH] + "..." if len(preview) > PREVIEW_LENGTH else preview,
+            "sender_username": obj.latest_message_sender.username if obj.latest_message_sender else None,
+            "created_at": obj.last_message_at,
+        }
+
+    def get_unread_count(self, obj):
+        """Unread messages for the requesting user, from the prefetched participant list."""
+        request = self.context.get("request")
+        if not request or not request.user.is_authenticated:
+            return 0
+        for participant in obj.threadparticipant_set.all():
+            if participant.user_id == request.user.id:
+                return participant.unread_count
+        return 0
 
 
 class MessageThreadDetailSerializer(MessageThreadSerializer):
-    """Detailed serializer for MessageThread with recent messages."""
+    """Detailed serializer for MessageThread with its most recent messages."""
 
-    recent_messages = MessageSerializer(source="messages", many=True, read_only=True)
+    recent_messages = serializers.SerializerMethodField()
+    older_messages_cursor = serializers.SerializerMethodField()
     annotations_count = serializers.IntegerField(source="annotations.count", read_only=True)
 
     class Meta(MessageThreadSerializer.Meta):
-        fields = MessageThreadSerializer.Meta.fields + ["recent_messages", "annotations_count"]
-
-    def to_representation(self, instance):
-        """Limit recent messages to last 50."""
-        data = super().to_representation(instance)
-        if "recent_messages" in data:
-            # Limit to 50 most recent messages
-            data["recent_messages"] = data["recent_messages"][-50:]
-        return data
+        fields = MessageThreadSerializer.Meta.fields + ["recent_messages", "older_messages_cursor", "annotations_count"]
+
+    def _recent_messages(self, obj):
+        """Fetch the last RECENT_MESSAGES_LIMIT messages once per thread."""
+        if not hasattr(obj, "_recent_messages"):
+            queryset = obj.messages.select_related("sender", "reply_to__sender")
+            obj._recent_messages = message_tail(queryset, RECENT_MESSAGES_LIMIT)
+        return obj._recent_messages
+
+    def get_recent_messages(self, obj):
+        """Serialize the bounded tail of the thread in chronological order."""
+        messages, _ = self._recent_messages(obj)
+        return MessageSerializer(messages, many=True, context=self.context).data
+
+    def get_older_messages_cursor(self, obj):
+        """Cursor for loading earlier messages via ``thread_messages?before=``, or None at the start."""
+        messages, has_older = self._recent_messages(obj)
+        return encode_message_cursor(messages[0]) if has_older else None
 
 
 class MessageThreadCreateSerializer(serializers.ModelSerializer):
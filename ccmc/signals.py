@@ -4,14 +4,15 @@ Signal handlers for CCMC real-time notifications.
 
 import logging
 
-from django.db.models.signals import post_save
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
 from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 
-from .models import Message, Notification
+from .models import Message, MessageThread, Notification
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +57,47 @@ def notification_created(sender, instance, created, **kwargs):
         logger.error(f"Error sending WebSocket notification: {e}")
 
 
+@receiver(post_save, sender=Message)
+def update_thread_summary(sender, instance, created, **kwargs):
+    """
+    Keep the thread summary and unread counts in step with its messages.
+
+    New messages are folded in incrementally; edits and soft deletes of
+    messages that affect the summary trigger a recount of that thread.
+    """
+    if created:
+        MessageThread.record_message(instance)
+        return
+
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and not {"content", "is_deleted"} & set(update_fields):
+        return
+    if instance.is_deleted or MessageThread.objects.filter(pk=instance.thread_id, latest_message=instance).exists():
+        MessageThread.rebuild_summaries(MessageThread.objects.filter(pk=instance.thread_id))
+
+
+@receiver(post_delete, sender=Message)
+def message_deleted(sender, instance, origin=None, **kwargs):
+    """
+    Recount the thread summary after a message is removed.
+
+    Cascades from deleting threads are skipped. Every message in one delete is
+    gone before post_delete fires, so other bulk deletes (a message queryset or
+    a user's messages) recount each affected thread once.
+    """
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is MessageThread:
+        return
+    if origin is not None:
+        recounted = getattr(origin, "_recounted_thread_ids", None)
+        if recounted is None:
+            recounted = origin._recounted_thread_ids = set()
+        if instance.thread_id in recounted:
+            return
+        recounted.add(instance.thread_id)
+    MessageThread.rebuild_summaries(MessageThread.objects.filter(pk=instance.thread_id))
+
+
 @receiver(post_save, sender=Message)
 def message_created(sender, instance, created, **kwargs):
     """
@@ -85,9 +127,6 @@ def message_created(sender, instance, created, **kwargs):
 
         async_to_sync(channel_layer.group_send)(thread_group_name, message_data)
 
-        instance.thread.last_message_at = timezone.now()
-        instance.thread.save(update_fields=["last_message_at"])
-
         logger.info(f"WebSocket message sent to thread {instance.thread.id} from {instance.sender.username}")
 
     except Exception as e:
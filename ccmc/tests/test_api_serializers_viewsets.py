@@ -6,8 +6,12 @@ and thread management functionality.
 """
 
 
+from datetime import timedelta
+
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from rest_framework import status
@@ -453,3 +457,206 @@ class CCMCViewSetTests(APITestCase):
         self.assertIn("by_priority", stats)
         self.assertEqual(stats["by_type"]["System"], 1)
         self.assertEqual(stats["by_type"]["Maintenance"], 1)
+
+
+class MessageKeysetPaginationTests(APITestCase):
+    """Test cursor-paginated chat history and the bounded thread detail tail."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="chatter", email="chatter@example.com", password="testpass123")
+        self.client.force_authenticate(user=self.user)
+        self.thread = MessageThread.objects.create(title="Long Thread", creator=self.user)
+        ThreadParticipant.objects.create(thread=self.thread, user=self.user, is_moderator=True)
+
+    def _create_messages(self, count, tie_every=None):
+        """Create messages one minute apart; with ``tie_every`` pairs share a timestamp."""
+        base = timezone.now() - timedelta(days=1)
+        messages = Message.objects.bulk_create(
+            [Message(thread=self.thread, content=f"Message {i}", sender=self.user) for i in range(count)]
+        )
+        for i, message in enumerate(messages):
+            minute = i - (i % tie_every) if tie_every else i
+            Message.objects.filter(id=message.id).update(created_at=base + timedelta(minutes=minute))
+        return list(Message.objects.filter(thread=self.thread).order_by("created_at", "id"))
+
+    def _page(self, **params):
+        response = self.client.get("/api/v1/messages/thread_messages/", {"thread_id": str(self.thread.id), **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_scrolls_back_and_forward_with_cursors(self):
+        """Pages follow (created_at, id) order, including messages sharing a timestamp."""
+        ordered = [str(message.id) for message in self._create_messages(7, tie_every=2)]
+
+        newest = self._page(limit=3)
+        self.assertEqual([m["id"] for m in newest["results"]], ordered[4:])
+        self.assertTrue(newest["has_older"])
+        self.assertFalse(newest["has_newer"])
+
+        middle = self._page(limit=3, before=newest["older_cursor"])
+        self.assertEqual([m["id"] for m in middle["results"]], ordered[1:4])
+        self.assertTrue(middle["has_newer"])
+
+        oldest = self._page(limit=3, before=middle["older_cursor"])
+        self.assertEqual([m["id"] for m in oldest["results"]], ordered[:1])
+        self.assertFalse(oldest["has_older"])
+        self.assertIsNone(oldest["older_cursor"])
+
+        forward = self._page(limit=3, after=oldest["newer_cursor"])
+        self.assertEqual([m["id"] for m in forward["results"]], ordered[1:4])
+        self.assertTrue(forward["has_newer"])
+
+        caught_up = self._page(after=newest["newer_cursor"])
+        self.assertEqual(caught_up["results"], [])
+        self.assertEqual(caught_up["newer_cursor"], newest["newer_cursor"])
+
+    def test_invalid_cursor_rejected(self):
+        """A malformed cursor is a 400, not a server error."""
+        response = self.client.get(
+            "/api/v1/messages/thread_messages/", {"thread_id": str(self.thread.id), "before": "not-a-cursor"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_thread_detail_returns_bounded_tail(self):
+        """The thread detail carries only the newest messages plus a cursor for older history."""
+        ordered = self._create_messages(55)
+
+        response = self.client.get(f"/api/v1/threads/{self.thread.id}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        recent = response.data["recent_messages"]
+        self.assertEqual(len(recent), 50)
+        self.assertEqual(recent[0]["id"], str(ordered[5].id))
+        self.assertEqual(recent[-1]["id"], str(ordered[-1].id))
+
+        older = self._page(before=response.data["older_messages_cursor"])
+        self.assertEqual([m["id"] for m in older["results"]], [str(message.id) for message in ordered[:5]])
+
+
+class ThreadSummaryTests(APITestCase):
+    """Test maintained thread summaries and per-participant unread counts."""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username="author", email="author@example.com", password="testpass123")
+        self.reader = User.objects.create_user(username="reader", email="reader@example.com", password="testpass123")
+        self.thread = self._thread("Summary Thread")
+
+    def _thread(self, title):
+        thread = MessageThread.objects.create(title=title, creator=self.author)
+        ThreadParticipant.objects.create(thread=thread, user=self.author, is_moderator=True)
+        ThreadParticipant.objects.create(thread=thread, user=self.reader)
+        return thread
+
+    def _participant(self, user):
+        return ThreadParticipant.objects.get(thread=self.thread, user=user)
+
+    def test_new_messages_update_summary_and_unread(self):
+        """Each message bumps the count, latest preview and other participants' unread counts."""
+        Message.objects.create(thread=self.thread, content="First", sender=self.author)
+        Message.objects.create(thread=self.thread, content="x" * 150, sender=self.author)
+        Message.objects.create(thread=self.thread, content="Reply", sender=self.reader)
+        latest = Message.objects.filter(thread=self.thread).order_by("-created_at", "-id").first()
+
+        self.thread.refresh_from_db()
+        self.assertEqual(self.thread.message_count, 3)
+        self.assertEqual(self.thread.latest_message_id, latest.id)
+        self.assertEqual(self.thread.latest_message_sender, self.reader)
+        self.assertEqual(self.thread.last_message_at, latest.created_at)
+        self.assertEqual(self._participant(self.reader).unread_count, 2)
+        self.assertEqual(self._participant(self.author).unread_count, 1)
+
+    def test_soft_delete_recounts_summary(self):
+        """Soft-deleting the latest message falls back to the previous one."""
+        first = Message.objects.create(thread=self.thread, content="First", sender=self.author)
+        second = Message.objects.create(thread=self.thread, content="Second", sender=self.author)
+
+        self.client.force_authenticate(user=self.author)
+        response = self.client.post(f"/api/v1/messages/{second.id}/soft_delete/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.thread.refresh_from_db()
+        self.assertEqual(self.thread.message_count, 1)
+        self.assertEqual(self.thread.latest_message_id, first.id)
+        self.assertEqual(self._participant(self.reader).unread_count, 1)
+
+    def test_mark_read_and_unread_summary(self):
+        """Marking a thread read clears its unread count, and the summary counts unread threads."""
+        other = self._thread("Other Thread")
+        Message.objects.create(thread=self.thread, content="One", sender=self.author)
+        Message.objects.create(thread=self.thread, content="Two", sender=self.author)
+        Message.objects.create(thread=other, content="Three", sender=self.author)
+        self.client.force_authenticate(user=self.reader)
+
+        response = self.client.get("/api/v1/threads/unread_summary/")
+        self.assertEqual(response.data, {"threads": 2, "messages": 3})
+
+        participant = self._participant(self.reader)
+        response = self.client.post(f"/api/v1/participants/{participant.id}/mark_read/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        participant.refresh_from_db()
+        self.assertEqual(participant.unread_count, 0)
+        response = self.client.get("/api/v1/threads/unread_summary/")
+        self.assertEqual(response.data, {"threads": 1, "messages": 1})
+
+    def test_thread_list_reads_summary(self):
+        """The inbox list serves counts and previews without per-thread queries."""
+        Message.objects.create(thread=self.thread, content="y" * 150, sender=self.author)
+        self.client.force_authenticate(user=self.reader)
+
+        with CaptureQueriesContext(connection) as single:
+            response = self.client.get("/api/v1/threads/")
+        for index in range(4):
+            Message.objects.create(thread=self._thread(f"Thread {index}"), content="Hi", sender=self.author)
+        with CaptureQueriesContext(connection) as many:
+            self.client.get("/api/v1/threads/")
+
+        self.assertEqual(len(single), len(many))
+        (thread,) = response.data["results"]
+        self.assertEqual(thread["messages_count"], 1)
+        self.assertEqual(thread["participants_count"], 2)
+        self.assertEqual(thread["unread_count"], 1)
+        self.assertEqual(thread["latest_message"]["content"], "y" * 100 + "...")
+        self.assertEqual(thread["latest_message"]["sender_username"], "author")
+
+    def test_bulk_deletes_recount_each_thread_once(self):
+        """Deleting a thread skips recounts and deleting many messages recounts each thread once."""
+        for index in range(50):
+            Message.objects.create(thread=self.thread, content=f"Message {index}", sender=self.author)
+        with CaptureQueriesContext(connection) as queries:
+            self.thread.delete()
+        statements = [q["sql"] for q in queries if "_historical" not in q["sql"]]
+        thread_updates = [sql for sql in statements if sql.startswith('UPDATE "ccmc_messagethread"')]
+        self.assertEqual(len(thread_updates), 1)
+        self.assertLess(len(statements), 15)
+
+        self.thread = self._thread("Remaining")
+        other = self._thread("Other")
+        for index in range(10):
+            Message.objects.create(thread=self.thread, content=f"Author {index}", sender=self.author)
+            Message.objects.create(thread=other, content=f"Author {index}", sender=self.author)
+        kept = Message.objects.create(thread=other, content="Reader", sender=self.reader)
+        with CaptureQueriesContext(connection) as queries:
+            Message.objects.filter(sender=self.author).delete()
+        rebuilds = [q["sql"] for q in queries if q["sql"].startswith('UPDATE "ccmc_messagethread" SET "message_count"')]
+        self.assertEqual(len(rebuilds), 2)
+
+        other.refresh_from_db()
+        self.assertEqual((other.message_count, other.latest_message_id), (1, kept.id))
+        self.thread.refresh_from_db()
+        self.assertEqual(self.thread.message_count, 0)
+
+    def test_rebuild_summaries_matches_incremental(self):
+        """Recounting from scratch gives the same summary as incremental maintenance."""
+        Message.objects.create(thread=self.thread, content="One", sender=self.author)
+        Message.objects.create(thread=self.thread, content="Two", sender=self.reader)
+        MessageThread.objects.filter(pk=self.thread.pk).update(message_count=0, latest_message=None)
+        ThreadParticipant.objects.filter(thread=self.thread).update(unread_count=0)
+
+        MessageThread.rebuild_summaries()
+
+        self.thread.refresh_from_db()
+        self.assertEqual(self.thread.message_count, 2)
+        self.assertEqual(self.thread.latest_message_preview, "Two")
+        self.assertEqual(self._participant(self.author).unread_count, 1)
+        self.assertEqual(self._participant(self.reader).unread_count, 1)
@@ -4,7 +4,7 @@ ViewSets for CUPCAKE Core Macaron Communication (CCMC) models.
 Provides REST API endpoints for messaging, notifications, and communication functionality.
 """
 
-from django.db.models import Q
+from django.db.models import Count, Q, Sum
 from django.utils import timezone
 
 from django_filters.rest_framework import DjangoFilterBackend
@@ -23,6 +23,7 @@ from .models import (
     ThreadParticipant,
     WebRTCSession,
 )
+from .pagination import MessageKeysetPagination
 from .serializers import (
     MessageDetailSerializer,
     MessageSerializer,
@@ -167,12 +168,11 @@ class MessageThreadViewSet(viewsets.ModelViewSet):
         """Filter threads based on user participation."""
         user = self.request.user
 
-        # Users can see threads they participate in
+        # Users can see threads they participate in; (thread, user) is unique so no DISTINCT is needed
         return (
-            MessageThread.objects.filter(participants=user)
-            .select_related("creator", "content_type")
-            .prefetch_related("participants", "threadparticipant_set__user")
-            .distinct()
+            MessageThread.objects.filter(threadparticipant__user=user)
+            .select_related("creator", "content_type", "latest_message_sender")
+            .prefetch_related("threadparticipant_set__user")
         )
 
     def create(self, request, *args, **kwargs):
@@ -186,6 +186,14 @@ class MessageThreadViewSet(viewsets.ModelViewSet):
         headers = self.get_success_headers(output_serializer.data)
         return Response(output_serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
+    @action(detail=False, methods=["get"])
+    def unread_summary(self, request):
+        """Get how many threads (and messages in them) are unread for the current user."""
+        summary = ThreadParticipant.objects.filter(user=request.user, unread_count__gt=0).aggregate(
+            threads=Count("id"), messages=Sum("unread_count")
+        )
+        return Response({"threads": summary["threads"], "messages": summary["messages"] or 0})
+
     @action(detail=True, methods=["post"])
     def add_participant(self, request, pk=None):
         """Add participant to thread."""
@@ -322,14 +330,8 @@ class MessageViewSet(viewsets.ModelViewSet):
         )
 
     def perform_create(self, serializer):
-        """Set sender and update thread timestamp."""
-        message = serializer.save(sender=self.request.user)
-
-        # Update thread last_message_at
-        message.thread.last_message_at = timezone.now()
-        message.thread.save(update_fields=["last_message_at"])
-
-        return message
+        """Set sender; the thread summary is updated by the message_created signal."""
+        return serializer.save(sender=self.request.user)
 
     def perform_update(self, serializer):
         """Mark message as edited when updated."""
@@ -352,7 +354,17 @@ class MessageViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=["get"])
     def thread_messages(self, request):
-        """Get messages for a specific thread."""
+        """
+        Get messages for a specific thread with keyset pagination.
+
+        Query parameters:
+        - thread_id: Thread UUID (required)
+        - before: Cursor; return messages older than it
+        - after: Cursor; return messages newer than it
+        - limit: Page size (default 50, max 200)
+
+        Without a cursor the newest page is returned. Results are chronological.
+        """
         thread_id = request.query_params.get("thread_id")
 
         if not thread_id:
@@ -369,13 +381,10 @@ class MessageViewSet(viewsets.ModelViewSet):
 
         messages = self.get_queryset().filter(thread=thread)
 
-        page = self.paginate_queryset(messages)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-
-        serializer = self.get_serializer(messages, many=True)
-        return Response(serializer.data)
+        paginator = MessageKeysetPagination()
+        page = paginator.paginate_queryset(messages, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
 
 class ThreadParticipantViewSet(viewsets.ReadOnlyModelViewSet):
@@ -422,8 +431,7 @@ class ThreadParticipantViewSet(viewsets.ReadOnlyModelViewSet):
         if participant.user != request.user:
             return Response({"error": "Can only update your own read status"}, status=status.HTTP_403_FORBIDDEN)
 
-        participant.last_read_at = timezone.now()
-        participant.save(update_fields=["last_read_at"])
+        participant.mark_read()
 
         return Response({"message": "Thread marked as read", "last_read_at": participant.last_read_at})
 
@@ -2,6 +2,7 @@
 Utility functions for sending WebSocket messages through CCMC.
 """
 
+import asyncio
 import logging
 
 from django.utils import timezone
@@ -11,6 +12,8 @@ from channels.layers import get_channel_layer
 
 logger = logging.getLogger(__name__)
 
+NOTIFICATION_DELIVERY_BATCH_SIZE = 100
+
 
 def send_notification_to_user(user_id, notification_data):
     """
@@ -49,6 +52,76 @@ def send_notification_to_user(user_id, notification_data):
         return False
 
 
+def deliver_notifications(notifications, batch_size=NOTIFICATION_DELIVERY_BATCH_SIZE):
+    """
+    Push many freshly created notifications over WebSocket and mark them sent.
+
+    Used after ``bulk_create`` (which does not fire ``post_save``). All group
+    sends run inside a single event-loop hop, ``batch_size`` at a time
+    concurrently so the channel layer can pipeline them, and the delivery status
+    of the delivered rows is updated with one query.
+
+    Args:
+        notifications: Iterable of Notification instances
+        batch_size: Group sends in flight at once
+
+    Returns:
+        int: Number of notifications delivered
+    """
+    notifications = list(notifications)
+    if not notifications:
+        return 0
+
+    channel_layer = get_channel_layer()
+    if not channel_layer:
+        logger.warning("Channel layer not configured - WebSocket notifications not sent")
+        return 0
+
+    def _message(notification):
+        return {
+            "type": "new_notification",
+            "notification_id": str(notification.id),
+            "title": notification.title,
+            "message": notification.message,
+            "notification_type": notification.notification_type,
+            "priority": notification.priority,
+            "data": notification.data,
+            "timestamp": notification.created_at.isoformat(),
+        }
+
+    async def _send_all():
+        delivered = []
+        for start in range(0, len(notifications), batch_size):
+            batch = notifications[start : start + batch_size]
+            results = await asyncio.gather(
+                *(
+                    channel_layer.group_send(f"ccmc_user_{notification.recipient_id}", _message(notification))
+                    for notification in batch
+                ),
+                return_exceptions=True,
+            )
+            for notification, result in zip(batch, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error sending WebSocket notification to user {notification.recipient_id}: {result}")
+                else:
+                    delivered.append(notification.id)
+        return delivered
+
+    try:
+        delivered = async_to_sync(_send_all)()
+    except Exception as e:
+        logger.error(f"Error sending WebSocket notifications: {e}")
+        return 0
+
+    if delivered:
+        from .models import Notification
+
+        Notification.objects.filter(id__in=delivered).exclude(delivery_status="read").update(
+            delivery_status="sent", sent_at=timezone.now()
+        )
+    return len(delivered)
+
+
 def send_message_to_thread(thread_id, message_data):
     """
     Send a real-time message notification to all thread participants via WebSocket.
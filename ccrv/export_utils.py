@@ -1,7 +1,9 @@
 import base64
 import mimetypes
 import os
+import re
 import uuid
+import zipfile
 from datetime import datetime
 from pathlib import Path
 
@@ -525,8 +527,56 @@ def get_html_template():
     """
 
 
-def _process_annotation_file(annotation):
-    """Process annotation file and return HTML for display."""
+def iter_html_document(protocols_html, **context):
+    """
+    Yield the export HTML document in parts.
+
+    The template head and tail are formatted separately so the protocol
+    sections can be produced lazily and written one at a time.
+
+    Args:
+        protocols_html: Iterable of protocol HTML fragments
+        **context: Template placeholders other than ``protocols_html``
+
+    Yields:
+        str: Consecutive parts of the document
+    """
+    head, tail = get_html_template().split("{protocols_html}")
+    yield head.format(**context)
+    yield from protocols_html
+    yield tail.format(**context)
+
+
+class ExportMediaBundle:
+    """
+    Annotation files referenced by an HTML export that are shipped alongside it.
+
+    Files are given a stable relative path under ``media/`` that the HTML links
+    to; the files themselves are copied into the bundle by ``write_export_zip``.
+    """
+
+    def __init__(self, directory="media"):
+        """Initialize an empty bundle whose files live under ``directory`` in the archive."""
+        self.directory = directory
+        self.files = {}
+
+    def add(self, annotation, file_path):
+        """Register an annotation file and return its relative path in the bundle."""
+        safe_name = re.sub(r"[^A-Za-z0-9._-]", "_", os.path.basename(file_path))
+        arcname = f"{self.directory}/{annotation.id}_{safe_name}"
+        self.files[arcname] = file_path
+        return arcname
+
+
+def _process_annotation_file(annotation, media=None):
+    """
+    Process annotation file and return HTML for display.
+
+    Args:
+        annotation: Annotation instance
+        media: Optional ExportMediaBundle; when given, media is linked by
+            relative path instead of embedded as a base64 data URI
+    """
     if not annotation.file:
         return None
 
@@ -537,6 +587,16 @@ def _process_annotation_file(annotation):
     annotation_type = annotation.annotation_type
     file_name = os.path.basename(annotation.file.name)
 
+    if media is not None:
+        src = escape(media.add(annotation, file_path))
+        if annotation_type == "image":
+            return f'<img src="{src}" alt="{escape(file_name)}" />'
+        if annotation_type == "video":
+            return f'<video controls preload="metadata"><source src="{src}" /></video>'
+        if annotation_type == "audio":
+            return f'<audio controls preload="metadata"><source src="{src}" /></audio>'
+        return f'<a href="{src}"><strong>File:</strong> {escape(file_name)}</a>'
+
     if annotation_type == "image":
         data_uri = encode_file_to_base64(file_path)
         if data_uri:
@@ -560,6 +620,88 @@ def _process_annotation_file(annotation):
     return f'<a href="#" onclick="return false;"><strong>File:</strong> {escape(file_name)}</a>'
 
 
+def write_export_zip(zip_path, html_name, html_parts, media, progress=None):
+    """
+    Write an HTML export and its media files to a ZIP archive on disk.
+
+    The HTML is written part by part into a deflated entry and each media file
+    is copied in as a stored entry (media is already compressed), so memory use
+    is bounded by the largest HTML part rather than by the total media size.
+
+    Args:
+        zip_path: Destination path of the archive
+        html_name: Name of the HTML entry inside the archive
+        html_parts: Iterable of HTML strings (consumed once)
+        media: ExportMediaBundle filled while ``html_parts`` is consumed
+        progress: Optional callable ``(current, total, description)``
+
+    Returns:
+        int: Number of media files written
+    """
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as archive:
+        with archive.open(html_name, "w", force_zip64=True) as entry:
+            for part in html_parts:
+                entry.write(part.encode("utf-8"))
+
+        total = len(media.files)
+        for index, (arcname, file_path) in enumerate(media.files.items(), start=1):
+            if progress:
+                progress(index, total, f"Adding media file {index} of {total}")
+            archive.write(file_path, arcname, compress_type=zipfile.ZIP_STORED)
+    return total
+
+
+def _temp_export_dir():
+    temp_dir = Path(settings.MEDIA_ROOT) / "temp" / "exports"
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    return temp_dir
+
+
+def export_bundle_filename(protocol=None, session=None):
+    """Build the ZIP filename for a protocol and/or session export."""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    if protocol and session:
+        return f"protocol_{protocol.id}_session_{session.id}_{timestamp}.zip"
+    if protocol:
+        return f"protocol_{protocol.id}_{timestamp}.zip"
+    return f"session_{session.id}_{timestamp}.zip"
+
+
+def write_session_export_zip(session, zip_path, progress=None):
+    """
+    Write a session export bundle (index.html plus media/) to ``zip_path``.
+
+    Returns:
+        int: Number of media files written
+    """
+    media = ExportMediaBundle()
+    protocols_total = session.protocols.count()
+
+    def html_parts():
+        for index, part in enumerate(session.iter_export_html(media=media)):
+            # Parts are the document head, one per protocol, then the tail
+            if progress and 0 < index <= protocols_total:
+                progress(index, protocols_total, f"Rendering protocol {index} of {protocols_total}")
+            yield part
+
+    return write_export_zip(zip_path, "index.html", html_parts(), media, progress=progress)
+
+
+def write_protocol_export_zip(protocol, zip_path, session=None, progress=None):
+    """
+    Write a protocol export bundle (index.html plus media/) to ``zip_path``.
+
+    Returns:
+        int: Number of media files written
+    """
+    media = ExportMediaBundle()
+    if progress:
+        progress(0, 1, "Rendering protocol")
+    return write_export_zip(
+        zip_path, "index.html", protocol.iter_export_html(session=session, media=media), media, progress=progress
+    )
+
+
 def save_session_export_to_temp(session):
     """
     Generate HTML export for session and save to temporary file.
@@ -570,11 +712,7 @@ def save_session_export_to_temp(session):
     Returns:
         tuple: (relative_path, filename) for X-Accel-Redirect
     """
-    html_content = session.export_protocols_html()
-
-    media_root = Path(settings.MEDIA_ROOT)
-    temp_dir = media_root / "temp" / "exports"
-    temp_dir.mkdir(parents=True, exist_ok=True)
+    temp_dir = _temp_export_dir()
 
     unique_id = uuid.uuid4().hex[:8]
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -582,7 +720,7 @@ def save_session_export_to_temp(session):
     temp_file_path = temp_dir / filename
 
     with open(temp_file_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
+        f.writelines(session.iter_export_html())
 
     relative_path = f"temp/exports/{filename}"
 
@@ -600,11 +738,7 @@ def save_protocol_export_to_temp(protocol, session=None):
     Returns:
         tuple: (relative_path, filename) for X-Accel-Redirect
     """
-    html_content = protocol.export_html(session=session)
-
-    media_root = Path(settings.MEDIA_ROOT)
-    temp_dir = media_root / "temp" / "exports"
-    temp_dir.mkdir(parents=True, exist_ok=True)
+    temp_dir = _temp_export_dir()
 
     unique_id = uuid.uuid4().hex[:8]
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -617,7 +751,7 @@ def save_protocol_export_to_temp(protocol, session=None):
     temp_file_path = temp_dir / filename
 
     with open(temp_file_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
+        f.writelines(protocol.iter_export_html(session=session))
 
     relative_path = f"temp/exports/{filename}"
 
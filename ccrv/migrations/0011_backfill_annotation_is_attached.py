@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+def mark_attached_annotations(apps, schema_editor):
+    """Flag annotations already linked through session and step attachments as attached."""
+    Annotation = apps.get_model("ccc", "Annotation")
+    for relation in ("session_attachments", "step_attachments"):
+        attached = Annotation.objects.filter(**{f"{relation}__isnull": False}).values("pk")
+        Annotation.objects.filter(pk__in=attached, is_attached=False).update(is_attached=True)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ccc", "0024_annotation_is_attached"),
+        ("ccrv", "0010_historicalstepvariation_session_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(mark_attached_annotations, migrations.RunPython.noop),
+    ]
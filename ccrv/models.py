@@ -207,11 +207,14 @@ class ProtocolModel(AbstractResource):
                         protocol_step.save()
 
                 with transaction.atomic():
+                    steps_by_remote_id = {step.step_id: step for step in protocol.steps.all()}
+                    linked_steps = []
                     for step in protocol_meta["protocol"]["steps"]:
-                        protocol_step = protocol.steps.get(step_id=step["id"])
                         if step["previous_id"] != 0:
-                            protocol_step.previous_step = protocol.steps.get(step_id=step["previous_id"])
-                        protocol_step.save()
+                            protocol_step = steps_by_remote_id[step["id"]]
+                            protocol_step.previous_step = steps_by_remote_id[step["previous_id"]]
+                            linked_steps.append(protocol_step)
+                    ProtocolStep.objects.bulk_update(linked_steps, ["previous_step"])
                 return protocol
         else:
             raise ValueError(f"Could not find protocol.io protocol with url {url}")
@@ -231,19 +234,13 @@ class ProtocolModel(AbstractResource):
         from ccrv.models import StepAnnotation
 
         step_annotations = {}
-        protocol_steps = ProtocolStep.objects.filter(step_section__protocol=self).prefetch_related(
-            "step_annotations__annotation__owner"
+        annotations = (
+            StepAnnotation.objects.filter(session=session, step__step_section__protocol=self)
+            .select_related("annotation", "annotation__owner")
+            .order_by("order")
         )
-
-        for step in protocol_steps:
-            annotations = (
-                StepAnnotation.objects.filter(session=session, step=step)
-                .select_related("annotation", "annotation__owner")
-                .order_by("order")
-            )
-
-            if annotations.exists():
-                step_annotations[step.id] = list(annotations)
+        for step_annotation in annotations:
+            step_annotations.setdefault(step_annotation.step_id, []).append(step_annotation)
 
         return step_annotations
 
@@ -442,17 +439,21 @@ class ProtocolModel(AbstractResource):
         </div>
         """
 
-    def generate_html_for_session(self, session):
+    def generate_html_for_session(self, session, media=None, step_annotations=None):
         """
         Generate HTML representation of this protocol for a specific session.
 
         Args:
             session: Session instance
+            media: Optional ExportMediaBundle; annotation files are linked by
+                relative path instead of embedded as base64
+            step_annotations: Optional prefetched mapping of step_id to StepAnnotation list
 
         Returns:
             str: HTML content for this protocol with session-specific annotations
         """
-        step_annotations = self.get_session_annotations(session)
+        if step_annotations is None:
+            step_annotations = self.get_session_annotations(session)
 
         sections_html = []
 
@@ -484,7 +485,7 @@ class ProtocolModel(AbstractResource):
                         from ccrv.export_utils import _process_annotation_file
 
                         annotation = step_ann.annotation
-                        file_html = _process_annotation_file(annotation) or ""
+                        file_html = _process_annotation_file(annotation, media) or ""
 
                         from django.utils.html import escape
 
@@ -679,14 +680,27 @@ class ProtocolModel(AbstractResource):
         Returns:
             str: Complete HTML document
         """
+        return "".join(self.iter_export_html(session=session))
+
+    def iter_export_html(self, session=None, media=None):
+        """
+        Yield the protocol HTML export document in parts.
+
+        Args:
+            session: Optional Session instance. If provided, includes session-specific annotations.
+            media: Optional ExportMediaBundle collecting annotation files to link instead of embed
+
+        Yields:
+            str: Consecutive parts of the HTML document
+        """
         from datetime import datetime
 
         from django.utils.html import escape
 
-        from ccrv.export_utils import get_html_template
+        from ccrv.export_utils import iter_html_document
 
         if session:
-            protocol_html = self.generate_html_for_session(session)
+            protocol_html = self.generate_html_for_session(session, media=media)
             session_name = escape(session.name)
             owner_name = escape(session.owner.get_full_name() or session.owner.username)
             started_at_html = (
@@ -710,20 +724,16 @@ class ProtocolModel(AbstractResource):
 
         export_date = datetime.now().strftime("%B %d, %Y, %I:%M %p")
 
-        template = get_html_template()
-
-        html_content = template.format(
+        yield from iter_html_document(
+            [protocol_html],
             session_name=session_name,
             owner_name=owner_name,
             started_at_html=started_at_html,
             ended_at_html=ended_at_html,
             export_date=export_date,
             session_annotations_section=session_annotations_section,
-            protocols_html=protocol_html,
         )
 
-        return html_content
-
     def generate_export_token(self, user, session_id=None):
         """
         Generate a signed export token for this protocol.
@@ -966,18 +976,51 @@ class Session(AbstractResource):
         Returns:
             str: Complete HTML document with all protocols and annotations
         """
+        return "".join(self.iter_export_html())
+
+    def get_step_annotations_by_protocol(self):
+        """
+        Fetch the step annotations of every protocol in this session in one query.
+
+        Returns:
+            dict: protocol_id to a mapping of step_id to ordered StepAnnotation list
+        """
+        from ccrv.models import StepAnnotation
+
+        by_protocol = {}
+        annotations = (
+            StepAnnotation.objects.filter(session=self, step__step_section__protocol__in=self.protocols.all())
+            .select_related("annotation", "annotation__owner")
+            .annotate(export_protocol_id=models.F("step__step_section__protocol_id"))
+            .order_by("order")
+        )
+        for step_annotation in annotations:
+            steps = by_protocol.setdefault(step_annotation.export_protocol_id, {})
+            steps.setdefault(step_annotation.step_id, []).append(step_annotation)
+        return by_protocol
+
+    def iter_export_html(self, media=None):
+        """
+        Yield the session HTML export document in parts, one protocol at a time.
+
+        Args:
+            media: Optional ExportMediaBundle collecting annotation files to link instead of embed
+
+        Yields:
+            str: Consecutive parts of the HTML document
+        """
         from datetime import datetime
 
         from django.utils.html import escape
 
-        from ccrv.export_utils import get_html_template
+        from ccrv.export_utils import iter_html_document
 
         session_annotations_html = []
         for sa in self.get_session_annotations():
             from ccrv.export_utils import _process_annotation_file
 
             annotation = sa.annotation
-            file_html = _process_annotation_file(annotation) or ""
+            file_html = _process_annotation_file(annotation, media) or ""
 
             transcription_html = ""
             if annotation.transcription:
@@ -1015,9 +1058,13 @@ class Session(AbstractResource):
         </div>
             """
 
-        protocols_html = []
-        for protocol in self.protocols.all():
-            protocols_html.append(protocol.generate_html_for_session(self))
+        step_annotations = self.get_step_annotations_by_protocol()
+        protocols_html = (
+            protocol.generate_html_for_session(
+                self, media=media, step_annotations=step_annotations.get(protocol.id, {})
+            )
+            for protocol in self.protocols.all()
+        )
 
         session_name = escape(self.name)
         owner_name = escape(self.owner.get_full_name() or self.owner.username)
@@ -1035,20 +1082,16 @@ class Session(AbstractResource):
 
         export_date = datetime.now().strftime("%B %d, %Y, %I:%M %p")
 
-        template = get_html_template()
-
-        html_content = template.format(
+        yield from iter_html_document(
+            protocols_html,
             session_name=session_name,
             owner_name=owner_name,
             started_at_html=started_at_html,
             ended_at_html=ended_at_html,
             export_date=export_date,
             session_annotations_section=session_annotations_section,
-            protocols_html="".join(protocols_html),
         )
 
-        return html_content
-
     def generate_export_token(self, user):
         """
         Generate a signed export token for this session.
@@ -1188,11 +1231,9 @@ class ProtocolSection(models.Model):
 
     def reorder_steps(self):
         """Reorder steps based on their order attribute values."""
-        steps = self.get_steps_by_order()
-        for index, step in enumerate(steps, 1):
-            if step.order != index:
-                step.order = index
-                step.save(update_fields=["order"])
+        from .ordering import renumber
+
+        renumber(ProtocolStep, self.steps.all(), start=1)
 
     def move_to_order(self, new_order):
         """
@@ -1216,11 +1257,9 @@ class ProtocolSection(models.Model):
 
         Ensures sequential ordering starting from 0.
         """
-        sections = cls.objects.filter(protocol=protocol).order_by("order", "id")
-        for index, section in enumerate(sections):
-            if section.order != index:
-                section.order = index
-                section.save(update_fields=["order"])
+        from .ordering import renumber
+
+        renumber(cls, cls.objects.filter(protocol=protocol))
 
 
 class ProtocolStep(models.Model):
@@ -1370,24 +1409,10 @@ class ProtocolStep(models.Model):
         This method should be run once to populate order fields for existing data,
         then the efficient order-based methods can be used going forward.
         """
-        protocols = ProtocolModel.objects.all()
-
-        for protocol in protocols:
-            # Handle steps without sections first
-            root_steps = cls.objects.filter(protocol=protocol, step_section__isnull=True, previous_step__isnull=True)
-
-            order = 0
-            for root_step in root_steps:
-                order = cls._traverse_and_order(root_step, order)
-
-            # Handle sections
-            sections = protocol.sections.all().order_by("id")
-            for section in sections:
-                section_root_steps = cls.objects.filter(step_section=section, previous_step__isnull=True)
+        from .ordering import apply_protocol_order
 
-                section_order = 0
-                for root_step in section_root_steps:
-                    section_order = cls._traverse_and_order(root_step, section_order, section_context=True)
+        for protocol in ProtocolModel.objects.all():
+            apply_protocol_order(protocol)
 
     @classmethod
     def _traverse_and_order(cls, step, start_order, section_context=False):
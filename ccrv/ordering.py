@@ -0,0 +1,117 @@
+"""
+Bulk ordering of protocol sections and steps.
+
+Steps form a linked list through ``previous_step`` (with branches where a step
+has several next steps), while reads use the denormalised ``order`` columns.
+The functions here load every section and step of a protocol once, compute the
+``order`` values in memory and write only the changed rows with ``bulk_update``,
+instead of following ``next_step`` and saving one row per query.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+
+from .models import ProtocolSection, ProtocolStep
+
+
+def compute_step_order(steps):
+    """
+    Compute step ``order`` values from the linked list.
+
+    Mirrors the legacy traversal: steps without a section are walked first from
+    their roots with one running counter starting at 0, then each section (by
+    id) is walked from its own roots with a counter restarting at 0. A walk
+    follows ``next_step`` across section boundaries, and a step reached by a
+    later walk takes that walk's value. The first next step continues the chain;
+    other next steps (branches) are numbered after the chain they branch from.
+
+    Args:
+        steps: ProtocolStep instances with ``id``, ``order``, ``previous_step_id``
+            and ``step_section_id`` loaded
+
+    Returns:
+        dict: Step id to computed order (steps unreachable from a root are omitted)
+    """
+    children = defaultdict(list)
+    for step in sorted(steps, key=lambda s: (s.order, s.id)):
+        if step.previous_step_id is not None:
+            children[step.previous_step_id].append(step)
+
+    roots_by_section = defaultdict(list)
+    for step in sorted(steps, key=lambda s: (s.order, s.id)):
+        if step.previous_step_id is None:
+            roots_by_section[step.step_section_id].append(step)
+
+    orders = {}
+    groups = [roots_by_section.pop(None, [])] + [roots_by_section[key] for key in sorted(roots_by_section)]
+    for roots in groups:
+        counter = 0
+        for root in roots:
+            visited = set()
+            stack = [root]
+            while stack:
+                step = stack.pop()
+                if step.id in visited:
+                    continue
+                visited.add(step.id)
+                orders[step.id] = counter
+                counter += 1
+                stack.extend(reversed(children.get(step.id, [])))
+    return orders
+
+
+def _write_orders(model, instances, orders):
+    changed = []
+    for instance in instances:
+        order = orders.get(instance.id)
+        if order is not None and instance.order != order:
+            instance.order = order
+            changed.append(instance)
+    if changed:
+        model.objects.bulk_update(changed, ["order"])
+    return len(changed)
+
+
+def apply_protocol_order(protocol):
+    """
+    Recompute and store the order of every section and step of a protocol.
+
+    Sections are numbered from 0 by their current (order, id); steps follow
+    ``compute_step_order``. Each table is written with one ``bulk_update``.
+
+    Args:
+        protocol: ProtocolModel instance
+
+    Returns:
+        dict: Number of sections and steps whose order changed
+    """
+    sections = list(ProtocolSection.objects.filter(protocol=protocol).order_by("order", "id").only("id", "order"))
+    steps = list(
+        ProtocolStep.objects.filter(protocol=protocol).only("id", "order", "previous_step_id", "step_section_id")
+    )
+
+    section_orders = {section.id: index for index, section in enumerate(sections)}
+    step_orders = compute_step_order(steps)
+
+    with transaction.atomic():
+        sections_updated = _write_orders(ProtocolSection, sections, section_orders)
+        steps_updated = _write_orders(ProtocolStep, steps, step_orders)
+    return {"sections_updated": sections_updated, "steps_updated": steps_updated}
+
+
+def renumber(model, queryset, start=0):
+    """
+    Renumber rows sequentially by their current (order, id), writing only changed rows.
+
+    Args:
+        model: ProtocolSection or ProtocolStep
+        queryset: Rows to renumber
+        start: First order value
+
+    Returns:
+        int: Number of rows whose order changed
+    """
+    instances = list(queryset.order_by("order", "id").only("id", "order"))
+    orders = {instance.id: index for index, instance in enumerate(instances, start)}
+    return _write_orders(model, instances, orders)
@@ -0,0 +1,155 @@
+"""
+Read path for a protocol's section/step tree.
+
+``ProtocolModelSerializer`` nests section and step serializers whose method
+fields query per section and per step, and ``ProtocolSection.get_step_in_order``
+follows the ``next_step`` linked list one query per hop. The tree built here
+loads all sections and steps of a protocol in two queries, derives the
+next-step edges from ``previous_step_id`` and orders everything in memory.
+
+Payloads are cached under a key made of the protocol's ``model_hash``, its
+``updated_at`` and a fingerprint hashing every section and step row's id,
+position, links and ``updated_at`` in id order, so queryset ``update()`` and
+``bulk_update()`` calls that reorder rows without touching timestamps still
+produce a new key.
+"""
+
+import hashlib
+from collections import defaultdict
+
+from ccv.cache_utils import cache_get, cache_set, get_cache_key
+
+from .models import ProtocolSection, ProtocolStep
+
+PROTOCOL_TREE_CACHE_TIMEOUT = 60 * 60
+DESCRIPTION_PREVIEW_LENGTH = 100
+
+
+def _preview(text):
+    text = text or ""
+    return text[:DESCRIPTION_PREVIEW_LENGTH] + "..." if len(text) > DESCRIPTION_PREVIEW_LENGTH else text
+
+
+def _fingerprint(queryset, *fields):
+    digest = hashlib.md5()
+    for row in queryset.order_by("id").values_list("id", "updated_at", *fields):
+        digest.update(repr(row).encode())
+    return digest.hexdigest()
+
+
+def get_protocol_tree_version(protocol):
+    """
+    Return a string that changes whenever the protocol or any of its sections or steps changes.
+
+    Args:
+        protocol: ProtocolModel instance
+
+    Returns:
+        str: Version hash used in cache keys and ETags
+    """
+    sections = _fingerprint(ProtocolSection.objects.filter(protocol=protocol), "order")
+    steps = _fingerprint(ProtocolStep.objects.filter(protocol=protocol), "order", "previous_step_id", "step_section_id")
+    updated_at = protocol.updated_at.isoformat() if protocol.updated_at else ""
+    return hashlib.md5(f"{protocol.model_hash or ''}|{updated_at}|{sections}|{steps}".encode()).hexdigest()
+
+
+def _first_and_last(steps, step_ids):
+    """Find the first and last step of a section using the linked-list rules of ProtocolSection."""
+    first = next((step for step in steps if step["previous_step"] not in step_ids), None)
+    last = next(
+        (step for step in steps if not step["next_steps"] or all(n["id"] not in step_ids for n in step["next_steps"])),
+        None,
+    )
+    return first, last
+
+
+def build_protocol_tree(protocol, summary=False):
+    """
+    Build the nested section/step payload for a protocol.
+
+    Args:
+        protocol: ProtocolModel instance
+        summary: Only include step ids, previews and counts (for list views)
+
+    Returns:
+        dict: Protocol fields with ``sections`` ordered by (order, id), each with
+            its steps ordered the same way, plus ``unsectioned_steps``
+    """
+    sections = list(
+        ProtocolSection.objects.filter(protocol=protocol)
+        .order_by("order", "id")
+        .values("id", "section_description", "section_duration", "order", "updated_at")
+    )
+    step_fields = ["id", "step_section", "order", "previous_step", "step_duration"]
+    if not summary:
+        step_fields += ["step_id", "original", "branch_from", "remote_id", "remote_host", "created_at", "updated_at"]
+    steps = list(
+        ProtocolStep.objects.filter(protocol=protocol).order_by("order", "id").values("step_description", *step_fields)
+    )
+
+    next_steps = defaultdict(list)
+    for step in steps:
+        if step["previous_step"] is not None:
+            next_steps[step["previous_step"]].append(
+                {"id": step["id"], "step_description": _preview(step["step_description"])}
+            )
+
+    steps_by_section = defaultdict(list)
+    for step in steps:
+        step["next_steps"] = next_steps.get(step["id"], [])
+        step["has_next"] = bool(step["next_steps"])
+        step["has_previous"] = step["previous_step"] is not None
+        if summary:
+            step["step_description"] = _preview(step["step_description"])
+        steps_by_section[step["step_section"]].append(step)
+
+    tree_sections = []
+    for section in sections:
+        section_steps = steps_by_section.get(section["id"], [])
+        step_ids = {step["id"] for step in section_steps}
+        first, last = _first_and_last(section_steps, step_ids)
+        section.update(
+            {
+                "steps_count": len(section_steps),
+                "duration": sum(step["step_duration"] or 0 for step in section_steps),
+                "first_step": first["id"] if first else None,
+                "last_step": last["id"] if last else None,
+                "steps": section_steps,
+            }
+        )
+        tree_sections.append(section)
+
+    return {
+        "id": protocol.id,
+        "protocol_title": protocol.protocol_title,
+        "protocol_description": None if summary else protocol.protocol_description,
+        "model_hash": protocol.model_hash,
+        "updated_at": protocol.updated_at,
+        "summary": summary,
+        "steps_count": len(steps),
+        "sections_count": len(sections),
+        "sections": tree_sections,
+        "unsectioned_steps": steps_by_section.get(None, []),
+    }
+
+
+def get_protocol_tree(protocol, summary=False, version=None):
+    """
+    Return the protocol tree, served from cache when the protocol has not changed.
+
+    Args:
+        protocol: ProtocolModel instance
+        summary: Build the summary payload
+        version: Precomputed ``get_protocol_tree_version`` result
+
+    Returns:
+        dict: Tree payload (see ``build_protocol_tree``)
+    """
+    version = version or get_protocol_tree_version(protocol)
+    key = get_cache_key("protocol_tree", protocol.id, "summary" if summary else "full", version, prefix="cupcake")
+
+    tree = cache_get(key)
+    if tree is None:
+        tree = build_protocol_tree(protocol, summary=summary)
+        cache_set(key, tree, PROTOCOL_TREE_CACHE_TIMEOUT)
+    return tree
@@ -1,5 +1,5 @@
 """
-Django signals for CCRV real-time WebSocket notifications.
+Django signals for CCRV real-time WebSocket notifications and annotation attachment state.
 """
 
 import logging
@@ -8,11 +8,16 @@ from django.db.models.signals import post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
-from .models import TimeKeeper, TimeKeeperEvent
+from ccc.signals import track_annotation_attachments
+
+from .models import SessionAnnotation, StepAnnotation, TimeKeeper, TimeKeeperEvent
 from .websocket_utils import format_duration, send_timekeeper_started, send_timekeeper_stopped, send_timekeeper_updated
 
 logger = logging.getLogger(__name__)
 
+track_annotation_attachments(SessionAnnotation)
+track_annotation_attachments(StepAnnotation)
+
 
 @receiver(post_save, sender=TimeKeeper)
 def timekeeper_updated_signal(sender, instance, created, **kwargs):
@@ -0,0 +1,104 @@
+"""
+Protocol and session export tasks for CCRV.
+"""
+
+import logging
+import os
+import traceback
+from typing import Any, Dict, Optional
+
+from django.core.files.storage import default_storage
+
+from django_rq import job
+
+from ccc.models import AsyncTaskStatus, TaskResult, task_result_upload_path
+from ccrv.export_utils import export_bundle_filename, write_protocol_export_zip, write_session_export_zip
+from ccrv.models import ProtocolModel, Session
+
+logger = logging.getLogger(__name__)
+
+
+def export_html_bundle_sync(
+    task_status: AsyncTaskStatus, protocol_id: Optional[int] = None, session_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Write a protocol or session HTML export bundle as the task's file result.
+
+    The ZIP is written directly at the TaskResult's storage path so it is never
+    held in memory or copied after being built. A partially written ZIP is
+    removed if the export fails.
+
+    Args:
+        task_status: AsyncTaskStatus that owns the result file and receives progress
+        protocol_id: Protocol to export (optionally within ``session_id``)
+        session_id: Session to export (all of its protocols when ``protocol_id`` is not given)
+
+    Returns:
+        dict: filename, file_size, content_type and media_count
+    """
+    protocol = ProtocolModel.objects.get(id=protocol_id) if protocol_id else None
+    session = Session.objects.get(id=session_id) if session_id else None
+    filename = export_bundle_filename(protocol=protocol, session=session)
+
+    task_result = TaskResult(task=task_status, file_name=filename, content_type="application/zip")
+    stored_name = task_result_upload_path(task_result, filename)
+    zip_path = default_storage.path(stored_name)
+    os.makedirs(os.path.dirname(zip_path), exist_ok=True)
+
+    def progress(current, total, description):
+        task_status.update_progress(current, total, description)
+
+    try:
+        if protocol:
+            media_count = write_protocol_export_zip(protocol, zip_path, session=session, progress=progress)
+        else:
+            media_count = write_session_export_zip(session, zip_path, progress=progress)
+    except BaseException:
+        if os.path.exists(zip_path):
+            os.remove(zip_path)
+        raise
+
+    task_result.file.name = stored_name
+    task_result.file_size = os.path.getsize(zip_path)
+    task_result.save()
+
+    return {
+        "filename": filename,
+        "file_size": task_result.file_size,
+        "content_type": task_result.content_type,
+        "media_count": media_count,
+    }
+
+
+@job("default", timeout=3600)
+def export_html_bundle_task(
+    user_id: int,
+    protocol_id: Optional[int] = None,
+    session_id: Optional[int] = None,
+    task_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Export a protocol or session as a ZIP of HTML and media files in the background.
+
+    Args:
+        user_id: ID of the user who requested the export
+        protocol_id: Protocol to export
+        session_id: Session to export or to scope protocol annotations to
+        task_id: AsyncTaskStatus UUID for tracking
+    """
+    try:
+        task_status = AsyncTaskStatus.objects.get(id=task_id)
+    except AsyncTaskStatus.DoesNotExist:
+        logger.warning(f"Task status {task_id} not found")
+        return {"success": False, "error": "Task not found", "task_id": task_id}
+
+    task_status.mark_started()
+    try:
+        result = export_html_bundle_sync(task_status, protocol_id=protocol_id, session_id=session_id)
+    except Exception as e:
+        logger.error(f"HTML bundle export for user {user_id} failed: {e}")
+        task_status.mark_failure(str(e), traceback.format_exc())
+        return {"success": False, "error": str(e), "task_id": task_id}
+
+    task_status.mark_success(result)
+    return {"success": True, "result": result, "task_id": task_id}
@@ -0,0 +1,94 @@
+"""
+Protocol import tasks for CCRV.
+"""
+
+import logging
+import traceback
+from typing import Any, Dict, Optional
+
+from django.contrib.auth import get_user_model
+
+from django_rq import job
+
+from ccc.models import AsyncTaskStatus
+from ccrv.models import ProtocolModel
+from ccrv.notification_service import ccrv_notification_service
+from ccrv.ordering import apply_protocol_order
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+def import_protocol_from_url_sync(url: str, user_id: int, task_status: Optional[AsyncTaskStatus] = None) -> Dict:
+    """
+    Import a protocols.io protocol, assign it to a user and compute its section and step order.
+
+    Args:
+        url: protocols.io URL
+        user_id: ID of the user who will own the protocol
+        task_status: AsyncTaskStatus to report progress on
+
+    Returns:
+        dict: protocol_id, steps and sections counts and ordering changes
+    """
+    if task_status:
+        task_status.update_progress(10, 100, "Fetching protocol from protocols.io")
+
+    protocol = ProtocolModel.create_protocol_from_url(url)
+    protocol.owner = User.objects.get(id=user_id)
+    protocol.save()
+
+    if task_status:
+        task_status.update_progress(70, description="Ordering sections and steps")
+
+    ordering = apply_protocol_order(protocol)
+
+    return {
+        "protocol_id": protocol.id,
+        "protocol_title": protocol.protocol_title,
+        "steps_count": protocol.steps.count(),
+        "sections_count": protocol.sections.count(),
+        **ordering,
+    }
+
+
+@job("default", timeout=1800)
+def import_protocol_from_url_task(url: str, user_id: int, task_id: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Import a protocols.io protocol in the background.
+
+    Args:
+        url: protocols.io URL
+        user_id: ID of the user who will own the protocol
+        task_id: AsyncTaskStatus UUID for tracking
+    """
+    task_status = None
+    if task_id:
+        try:
+            task_status = AsyncTaskStatus.objects.get(id=task_id)
+            task_status.mark_started()
+        except AsyncTaskStatus.DoesNotExist:
+            logger.warning(f"Task status {task_id} not found")
+
+    try:
+        result = import_protocol_from_url_sync(url, user_id, task_status=task_status)
+    except Exception as e:
+        logger.error(f"Protocol import from {url} failed: {e}")
+        if task_status:
+            task_status.mark_failure(str(e), traceback.format_exc())
+        ccrv_notification_service.notify_user(
+            user_id, "protocol_import.failed", f"Protocol import failed: {e}", url=url, task_id=task_id
+        )
+        return {"success": False, "error": str(e), "task_id": task_id}
+
+    if task_status:
+        task_status.mark_success(result)
+    ccrv_notification_service.notify_user(
+        user_id,
+        "protocol_import.completed",
+        f"Imported protocol '{result['protocol_title']}'",
+        protocol_id=result["protocol_id"],
+        task_id=task_id,
+    )
+    return {"success": True, "result": result, "task_id": task_id}
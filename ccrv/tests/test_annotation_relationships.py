@@ -7,8 +7,11 @@ to CCC Annotations, including file upload functionality.
 
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from django.urls import reverse
 
-from ccc.models import Annotation, AnnotationFolder
+from rest_framework.test import APIClient
+
+from ccc.models import Annotation, AnnotationFolder, LabGroup
 from ccrv.models import (
     ProtocolModel,
     ProtocolSection,
@@ -451,3 +454,51 @@ class IntegratedAnnotationWorkflowTestCase(TestCase):
         self.assertNotEqual(
             session1_annotations.first().annotation.annotation, session2_annotations.first().annotation.annotation
         )
+
+
+class AnnotationAttachmentStateTestCase(TestCase):
+    """Test that junction models maintain Annotation.is_attached for the standalone listing."""
+
+    def setUp(self):
+        import uuid
+
+        self.user = UserFactory.create_user()
+        self.other_user = UserFactory.create_user()
+        self.session = Session.objects.create(unique_id=uuid.uuid4(), name="Test Session", owner=self.user)
+        self.annotation = Annotation.objects.create(annotation="Note", annotation_type="text", owner=self.user)
+
+    def test_attach_and_detach_update_state(self):
+        """Creating a junction row marks the annotation attached; deleting the last one clears it."""
+        session_annotation = SessionAnnotation.objects.create(session=self.session, annotation=self.annotation)
+        self.annotation.refresh_from_db()
+        self.assertTrue(self.annotation.is_attached)
+
+        session_annotation.delete()
+        self.annotation.refresh_from_db()
+        self.assertFalse(self.annotation.is_attached)
+
+    def test_refresh_attachment_state_repairs_flag(self):
+        """refresh_attachment_state recomputes the flag from junction rows."""
+        SessionAnnotation.objects.create(session=self.session, annotation=self.annotation)
+        Annotation.objects.filter(pk=self.annotation.pk).update(is_attached=False)
+
+        changed = Annotation.refresh_attachment_state([self.annotation.pk])
+
+        self.assertEqual(changed, 1)
+        self.assertTrue(Annotation.objects.get(pk=self.annotation.pk).is_attached)
+
+    def test_standalone_listing_excludes_attached_without_duplicates(self):
+        """The annotation list hides attached annotations and returns group annotations once."""
+        lab_group = LabGroup.objects.create(name="Lab", creator=self.other_user)
+        lab_group.members.add(self.user, self.other_user)
+        shared = Annotation.objects.create(
+            annotation="Shared", annotation_type="text", owner=self.other_user, visibility="group", lab_group=lab_group
+        )
+        SessionAnnotation.objects.create(session=self.session, annotation=self.annotation)
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.get(reverse("ccc:annotation-list"))
+
+        ids = [item["id"] for item in response.data["results"]]
+        self.assertEqual(ids, [shared.id])
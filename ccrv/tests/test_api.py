@@ -9,7 +9,9 @@ from datetime import timedelta
 
 from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.db import connection
+from django.test import override_settings
 from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
@@ -257,6 +259,89 @@ class ProtocolModelAPITests(CCRVAPITestCase):
         )
         self.assertEqual(log.deleted_by, self.regular_user)
 
+    def _add_steps(self, count):
+        previous = ProtocolStep.objects.filter(protocol=self.protocol).order_by("-order", "-id").first()
+        start = previous.order + 1
+        for i in range(start, start + count):
+            previous = ProtocolStep.objects.create(
+                protocol=self.protocol,
+                step_section=self.section,
+                step_description=f"Step {i} " + "x" * 120,
+                step_duration=5,
+                order=i,
+                previous_step=previous,
+            )
+        return previous
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_tree_action_orders_steps_in_constant_queries(self):
+        """Test the protocol tree is built in the same number of queries regardless of step count."""
+        self.client.force_authenticate(user=self.regular_user)
+        url = reverse("ccrv:protocolmodel-tree", kwargs={"pk": self.protocol.pk})
+        self._add_steps(3)
+
+        with CaptureQueriesContext(connection) as small:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        last = self._add_steps(30)
+        cache.clear()
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(url)
+
+        self.assertEqual(len(large), len(small))
+        section = response.data["sections"][0]
+        self.assertEqual(section["steps_count"], 34)
+        self.assertEqual(section["first_step"], self.step.id)
+        self.assertEqual(section["last_step"], last.id)
+        steps = section["steps"]
+        self.assertEqual(steps[0]["id"], self.step.id)
+        self.assertEqual(steps[0]["next_steps"][0]["id"], steps[1]["id"])
+        self.assertFalse(steps[0]["has_previous"])
+        self.assertFalse(steps[-1]["has_next"])
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_tree_action_summary_and_etag(self):
+        """Test summary mode previews descriptions and unchanged trees return 304."""
+        self.client.force_authenticate(user=self.regular_user)
+        url = reverse("ccrv:protocolmodel-tree", kwargs={"pk": self.protocol.pk})
+        self._add_steps(2)
+
+        response = self.client.get(url, {"summary": "true"})
+
+        self.assertTrue(response.data["summary"])
+        self.assertTrue(response.data["sections"][0]["steps"][1]["step_description"].endswith("..."))
+        self.assertNotIn("created_at", response.data["sections"][0]["steps"][0])
+
+        etag = response["ETag"]
+        response = self.client.get(url, {"summary": "true"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        ProtocolStep.objects.filter(pk=self.step.pk).update(order=99)
+        response = self.client.get(url, {"summary": "true"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["sections"][0]["steps"][-1]["id"], self.step.id)
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_tree_etag_changes_when_sections_swap(self):
+        """Test swapping section positions without touching timestamps invalidates the cached tree."""
+        self.client.force_authenticate(user=self.regular_user)
+        url = reverse("ccrv:protocolmodel-tree", kwargs={"pk": self.protocol.pk})
+        ProtocolSection.objects.filter(pk=self.section.pk).update(order=0)
+        second = ProtocolSection.objects.create(protocol=self.protocol, section_description="Second", order=1)
+
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertEqual([section["id"] for section in response.data["sections"]], [self.section.id, second.id])
+
+        second.move_to_order(0)
+        ProtocolSection.objects.filter(pk=self.section.pk).update(order=1)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual([section["id"] for section in response.data["sections"]], [second.id, self.section.id])
+
 
 class SessionAPITests(CCRVAPITestCase):
     """Test Session API endpoints."""
@@ -0,0 +1,157 @@
+"""
+Tests for protocol and session HTML exports and ZIP bundles.
+"""
+
+import os
+import shutil
+import tempfile
+import uuid
+import zipfile
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ccc.models import Annotation, AsyncTaskStatus
+from ccrv.export_utils import write_session_export_zip
+from ccrv.models import ProtocolModel, ProtocolSection, ProtocolStep, Session, SessionAnnotation, StepAnnotation
+
+IMAGE_CONTENT = b"\x89PNG" + b"\x00" * 2048
+
+
+class ExportBundleTestCase(TestCase):
+    """Test media-externalising exports built from prefetched annotations."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+        self.user = User.objects.create_user(username="exporter", password="testpass")
+        self.session = Session.objects.create(name="Run 1", owner=self.user, unique_id=uuid.uuid4())
+        for index in range(2):
+            protocol = ProtocolModel.objects.create(protocol_title=f"Protocol {index}", owner=self.user)
+            self.session.protocols.add(protocol)
+            section = ProtocolSection.objects.create(protocol=protocol, section_description="Prep", order=0)
+            previous = None
+            for order in range(3):
+                previous = ProtocolStep.objects.create(
+                    protocol=protocol,
+                    step_section=section,
+                    step_description=f"Step {order}",
+                    previous_step=previous,
+                    order=order,
+                )
+                StepAnnotation.objects.create(
+                    session=self.session, step=previous, annotation=self._annotation(f"p{index}s{order}.png")
+                )
+        SessionAnnotation.objects.create(session=self.session, annotation=self._annotation("overview.png"))
+        self.protocol = self.session.protocols.order_by("id").first()
+
+    def _annotation(self, name):
+        return Annotation.objects.create(
+            annotation=name,
+            annotation_type="image",
+            owner=self.user,
+            file=SimpleUploadedFile(name, IMAGE_CONTENT, content_type="image/png"),
+        )
+
+    def test_session_bundle_links_media(self):
+        """The bundle's HTML links each media file by relative path instead of embedding it."""
+        zip_path = f"{self.media_root}/bundle.zip"
+        progress = Mock()
+
+        media_count = write_session_export_zip(self.session, zip_path, progress=progress)
+
+        self.assertEqual(media_count, 7)
+        with zipfile.ZipFile(zip_path) as archive:
+            html = archive.read("index.html").decode("utf-8")
+            media_names = [name for name in archive.namelist() if name.startswith("media/")]
+            self.assertEqual(len(media_names), 7)
+            self.assertEqual(archive.read(media_names[0]), IMAGE_CONTENT)
+            self.assertEqual(archive.getinfo(media_names[0]).compress_type, zipfile.ZIP_STORED)
+        self.assertNotIn("base64,", html)
+        for name in media_names:
+            self.assertIn(f'src="{name}"', html)
+        self.assertIn("Protocol 1", html)
+        progress.assert_any_call(2, 2, "Rendering protocol 2 of 2")
+        progress.assert_any_call(7, 7, "Adding media file 7 of 7")
+
+    def test_inline_export_unchanged(self):
+        """The single-file HTML export still embeds media as base64."""
+        html = self.session.export_protocols_html()
+
+        self.assertEqual(html.count("data:image/png;base64,"), 7)
+        self.assertIn("<h1>Run 1</h1>", html)
+
+    def test_step_annotations_fetched_in_one_query(self):
+        """Step annotations for every protocol in a session are loaded in a single query."""
+        with self.assertNumQueries(1):
+            by_protocol = self.session.get_step_annotations_by_protocol()
+            counts = {protocol_id: sum(map(len, steps.values())) for protocol_id, steps in by_protocol.items()}
+
+        self.assertEqual(sorted(counts.values()), [3, 3])
+        self.assertEqual(len(self.protocol.get_session_annotations(self.session)), 3)
+
+    @override_settings(SYNC_OPERATIONS_ONLY=True)
+    def test_export_bundle_endpoint_sync(self):
+        """In desktop mode the bundle is built in the request and attached to the task."""
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.post(reverse("ccrv:session-export-bundle", args=[self.session.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        task = AsyncTaskStatus.objects.get(id=response.data["task_id"])
+        self.assertEqual(task.status, "SUCCESS")
+        self.assertEqual(task.result["media_count"], 7)
+        self.assertTrue(zipfile.is_zipfile(task.file_result.file.path))
+
+    @override_settings(SYNC_OPERATIONS_ONLY=True)
+    def test_export_bundle_endpoint_sync_failure(self):
+        """A failed in-request export marks the task failed and removes the partial ZIP."""
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        written = []
+
+        def fail_midway(session, zip_path, progress=None):
+            with open(zip_path, "wb") as f:
+                f.write(b"PK partial")
+            written.append(zip_path)
+            raise OSError("Disk full")
+
+        with patch("ccrv.tasks.export_tasks.write_session_export_zip", side_effect=fail_midway):
+            response = client.post(reverse("ccrv:session-export-bundle", args=[self.session.id]))
+
+        self.assertEqual(response.status_code, status.HTTP_500_INTERNAL_SERVER_ERROR)
+        self.assertEqual(response.data["error"], "Disk full")
+        task = AsyncTaskStatus.objects.get(id=response.data["task_id"])
+        self.assertEqual(task.status, "FAILURE")
+        self.assertFalse(os.path.exists(written[0]))
+
+    @patch("ccrv.viewsets.export_html_bundle_task.delay")
+    def test_protocol_export_bundle_queues_job(self, mock_delay):
+        """The protocol bundle export queues a job scoped to the requested session."""
+        mock_delay.return_value = Mock(id="job-1")
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.post(
+            reverse("ccrv:protocolmodel-export-bundle", args=[self.protocol.id]),
+            {"session": self.session.id},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        task = AsyncTaskStatus.objects.get(id=response.data["task_id"])
+        self.assertEqual(task.task_type, "EXPORT_HTML_BUNDLE")
+        mock_delay.assert_called_once_with(
+            user_id=self.user.id, task_id=str(task.id), protocol_id=self.protocol.id, session_id=self.session.id
+        )
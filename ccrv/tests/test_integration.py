@@ -10,9 +10,15 @@ from unittest.mock import Mock, patch
 
 from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
 
-from ccc.models import RemoteHost
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ccc.models import AsyncTaskStatus, RemoteHost
 from ccrv.models import Project, ProtocolModel, ProtocolRating, ProtocolSection, ProtocolStep, Session
+from ccrv.ordering import apply_protocol_order
+from ccrv.tasks.import_tasks import import_protocol_from_url_task
 from tests.factories import UserFactory
 
 User = get_user_model()
@@ -489,3 +495,111 @@ class ProtocolOrderingTests(TestCase):
 
         # Should complete without error
         self.assertEqual(order, 0)  # No steps processed
+
+    def test_apply_protocol_order_matches_traversal_and_orders_branches(self):
+        """Test the bulk ordering engine numbers the main chain like the traversal and branches after it."""
+        protocol = ProtocolModel.objects.create(protocol_title="Branched Protocol", owner=self.user)
+        section = ProtocolSection.objects.create(protocol=protocol, section_description="Section", order=5)
+        step1 = ProtocolStep.objects.create(protocol=protocol, step_section=section, step_description="1", order=9)
+        step2 = ProtocolStep.objects.create(
+            protocol=protocol, step_section=section, step_description="2", previous_step=step1, order=9
+        )
+        branch = ProtocolStep.objects.create(
+            protocol=protocol, step_section=section, step_description="branch", previous_step=step1, order=10
+        )
+        step3 = ProtocolStep.objects.create(
+            protocol=protocol, step_section=section, step_description="3", previous_step=step2, order=9
+        )
+
+        with self.assertNumQueries(6):
+            result = apply_protocol_order(protocol)
+
+        orders = dict(ProtocolStep.objects.filter(protocol=protocol).values_list("id", "order"))
+        self.assertEqual([orders[s.id] for s in (step1, step2, step3, branch)], [0, 1, 2, 3])
+        section.refresh_from_db()
+        self.assertEqual(section.order, 0)
+        self.assertEqual(result, {"sections_updated": 1, "steps_updated": 4})
+
+        with self.assertNumQueries(4):
+            self.assertEqual(apply_protocol_order(protocol), {"sections_updated": 0, "steps_updated": 0})
+
+
+class ProtocolImportTaskTests(TestCase):
+    """Test the background protocols.io import."""
+
+    def setUp(self):
+        self.user = UserFactory.create_user()
+
+    def _imported_protocol(self, url):
+        protocol = ProtocolModel.objects.create(protocol_title="Imported")
+        previous = None
+        for i in range(3):
+            previous = ProtocolStep.objects.create(
+                protocol=protocol, step_description=f"Step {i}", previous_step=previous
+            )
+        return protocol
+
+    @patch("ccrv.tasks.import_tasks.ProtocolModel.create_protocol_from_url")
+    def test_import_task_orders_steps_and_reports_progress(self, mock_create):
+        """Test the import job assigns the owner, orders steps and completes its task status."""
+        mock_create.side_effect = self._imported_protocol
+        task = AsyncTaskStatus.objects.create(task_type="IMPORT_PROTOCOL", user=self.user)
+
+        result = import_protocol_from_url_task("https://protocols.io/view/test", self.user.id, task_id=str(task.id))
+
+        self.assertTrue(result["success"])
+        protocol = ProtocolModel.objects.get(id=result["result"]["protocol_id"])
+        self.assertEqual(protocol.owner, self.user)
+        self.assertEqual(list(protocol.steps.order_by("order").values_list("order", flat=True)), [0, 1, 2])
+        task.refresh_from_db()
+        self.assertEqual(task.status, "SUCCESS")
+        self.assertEqual(task.result["steps_count"], 3)
+
+    @patch("ccrv.tasks.import_tasks.ProtocolModel.create_protocol_from_url", side_effect=ValueError("not found"))
+    def test_import_task_failure_marks_task(self, mock_create):
+        """Test a failed import marks the task as failed."""
+        task = AsyncTaskStatus.objects.create(task_type="IMPORT_PROTOCOL", user=self.user)
+
+        result = import_protocol_from_url_task("https://protocols.io/view/missing", self.user.id, task_id=str(task.id))
+
+        self.assertFalse(result["success"])
+        task.refresh_from_db()
+        self.assertEqual(task.status, "FAILURE")
+        self.assertEqual(task.error_message, "not found")
+
+    @patch("ccrv.viewsets.import_protocol_from_url_task.delay")
+    def test_import_endpoint_queues_job(self, mock_delay):
+        """Test the import endpoint queues a job and returns its task id."""
+        mock_delay.return_value = Mock(id="job-1")
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.post(
+            reverse("ccrv:protocolmodel-import-from-protocols-io"),
+            {"url": "https://protocols.io/view/x"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        task = AsyncTaskStatus.objects.get(id=response.data["task_id"])
+        self.assertEqual(task.rq_job_id, "job-1")
+        mock_delay.assert_called_once_with(
+            url="https://protocols.io/view/x", user_id=self.user.id, task_id=str(task.id)
+        )
+
+    @patch("ccrv.viewsets.import_protocol_from_url_sync", side_effect=ValueError("not found"))
+    @patch("ccrv.viewsets.import_protocol_from_url_task.delay")
+    def test_import_endpoint_form_opt_out_of_async(self, mock_delay, mock_sync):
+        """Test a form-encoded async_processing=false runs the import in the request."""
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        url = reverse("ccrv:protocolmodel-import-from-protocols-io")
+
+        response = client.post(url, {"url": "https://protocols.io/view/x", "async_processing": "false"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        mock_sync.assert_called_once_with("https://protocols.io/view/x", self.user.id)
+        mock_delay.assert_not_called()
+
+        response = client.post(url, {"url": "https://protocols.io/view/x", "async_processing": "maybe"})
+        self.assertEqual(response.data["error"], "async_processing must be a boolean")
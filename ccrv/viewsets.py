@@ -5,8 +5,10 @@ Django REST Framework viewsets for project and protocol management API endpoints
 faithfully representing the migrated functionality.
 """
 
+import traceback
 from pathlib import Path
 
+from django.conf import settings
 from django.db.models import Q
 from django.utils import timezone
 
@@ -14,14 +16,15 @@ import django_filters
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, permissions, status, viewsets
 from rest_framework.decorators import action
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.fields import BooleanField
 from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
 from ccc.mixins import DeletionLogMixin
-from ccc.models import LabGroup, RemoteHost
+from ccc.models import AsyncTaskStatus, LabGroup, RemoteHost
 from ccc.permissions import IsAdminUser, IsOwnerEditorViewerOrNoAccess, IsOwnerOrReadOnly
 from ccc.serializers import AnnotationFolderSerializer
 from ccv.serializers import MetadataColumnSerializer, MetadataTableSerializer
@@ -44,6 +47,7 @@ from .models import (
     TimeKeeper,
     TimeKeeperEvent,
 )
+from .protocol_tree import get_protocol_tree, get_protocol_tree_version
 from .serializers import (
     InstrumentUsageSessionAnnotationSerializer,
     InstrumentUsageStepAnnotationSerializer,
@@ -65,6 +69,37 @@ from .serializers import (
     StepVariationSerializer,
     TimeKeeperSerializer,
 )
+from .tasks.export_tasks import export_html_bundle_sync, export_html_bundle_task
+from .tasks.import_tasks import import_protocol_from_url_sync, import_protocol_from_url_task
+
+
+def _start_html_bundle_export(user, protocol=None, session=None):
+    """
+    Start a ZIP export of protocol/session HTML with media files alongside.
+
+    The bundle is built by an RQ job and downloaded through the async task
+    download endpoints. With SYNC_OPERATIONS_ONLY it is built in the request.
+    """
+    parameters = {"protocol_id": protocol.id if protocol else None, "session_id": session.id if session else None}
+    task = AsyncTaskStatus.objects.create(task_type="EXPORT_HTML_BUNDLE", user=user, parameters=parameters)
+
+    if getattr(settings, "SYNC_OPERATIONS_ONLY", False):
+        task.mark_started()
+        try:
+            result = export_html_bundle_sync(task, **parameters)
+        except Exception as e:
+            task.mark_failure(str(e), traceback.format_exc())
+            return Response({"task_id": str(task.id), "error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        task.mark_success(result)
+        return Response({"task_id": str(task.id), "message": "Export completed", **result}, status=status.HTTP_200_OK)
+
+    job = export_html_bundle_task.delay(user_id=user.id, task_id=str(task.id), **parameters)
+    if job:
+        task.rq_job_id = job.id
+        task.save(update_fields=["rq_job_id"])
+    return Response(
+        {"task_id": str(task.id), "message": "Export task queued successfully"}, status=status.HTTP_202_ACCEPTED
+    )
 
 
 class ProjectViewSet(viewsets.ModelViewSet):
@@ -202,6 +237,29 @@ class ProtocolModelViewSet(DeletionLogMixin, viewsets.ModelViewSet):
         serializer = ProtocolSectionSerializer(sections, many=True, context={"request": request})
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"])
+    def tree(self, request, pk=None):
+        """
+        Get the protocol's sections and steps as an ordered tree in a constant number of queries.
+
+        Query parameters:
+        - summary: If true, return step previews and counts only (for list views)
+
+        Responses carry an ETag derived from the protocol's model_hash and the
+        update timestamps of its sections and steps; a matching If-None-Match
+        returns 304.
+        """
+        protocol = self.get_object()
+        summary = request.query_params.get("summary", "").lower() in ("1", "true", "yes")
+
+        version = get_protocol_tree_version(protocol)
+        etag = '"{}-{}"'.format(version, "summary" if summary else "full")
+        if request.headers.get("If-None-Match") == etag:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        tree = get_protocol_tree(protocol, summary=summary, version=version)
+        return Response(tree, headers={"ETag": etag})
+
     @action(detail=True, methods=["get"])
     def ratings(self, request, pk=None):
         """Get all ratings for this protocol."""
@@ -258,32 +316,38 @@ class ProtocolModelViewSet(DeletionLogMixin, viewsets.ModelViewSet):
 
     @action(detail=False, methods=["post"])
     def import_from_protocols_io(self, request):
-        """Import a protocol from protocols.io using the original integration."""
+        """
+        Import a protocol from protocols.io using the original integration.
+
+        The import runs as a background job and returns a task id whose
+        AsyncTaskStatus reports progress. With SYNC_OPERATIONS_ONLY (desktop
+        builds) or ``async_processing: false`` the import runs in the request.
+        """
         url = request.data.get("url")
         if not url:
             return Response({"error": "URL is required"}, status=status.HTTP_400_BAD_REQUEST)
 
         try:
-            protocol = ProtocolModel.create_protocol_from_url(url)
-            protocol.owner = request.user
-            protocol.save()
-
-            root_steps = ProtocolStep.objects.filter(
-                protocol=protocol, step_section__isnull=True, previous_step__isnull=True
+            async_processing = BooleanField().to_internal_value(request.data.get("async_processing", True))
+        except ValidationError:
+            return Response({"error": "async_processing must be a boolean"}, status=status.HTTP_400_BAD_REQUEST)
+        run_async = async_processing and not getattr(settings, "SYNC_OPERATIONS_ONLY", False)
+        if run_async:
+            task = AsyncTaskStatus.objects.create(
+                task_type="IMPORT_PROTOCOL", user=request.user, parameters={"url": url}
+            )
+            job = import_protocol_from_url_task.delay(url=url, user_id=request.user.id, task_id=str(task.id))
+            if job:
+                task.rq_job_id = job.id
+                task.save(update_fields=["rq_job_id"])
+            return Response(
+                {"task_id": str(task.id), "message": "Protocol import task queued successfully"},
+                status=status.HTTP_202_ACCEPTED,
             )
 
-            order = 0
-            for root_step in root_steps:
-                order = ProtocolStep._traverse_and_order(root_step, order)
-
-            sections = protocol.sections.all().order_by("id")
-            for section in sections:
-                section_root_steps = ProtocolStep.objects.filter(step_section=section, previous_step__isnull=True)
-
-                section_order = 0
-                for root_step in section_root_steps:
-                    section_order = ProtocolStep._traverse_and_order(root_step, section_order, section_context=True)
-
+        try:
+            result = import_protocol_from_url_sync(url, request.user.id)
+            protocol = ProtocolModel.objects.get(id=result["protocol_id"])
             serializer = self.get_serializer(protocol)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         except ValueError as e:
@@ -394,6 +458,32 @@ class ProtocolModelViewSet(DeletionLogMixin, viewsets.ModelViewSet):
 
         return response
 
+    @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
+    def export_bundle(self, request, pk=None):
+        """
+        Export the protocol as a ZIP of HTML with annotation media as separate files.
+
+        Request body:
+            session: Optional session ID to include session-specific annotations
+
+        Returns a task id; the ZIP is downloaded from the async task endpoints.
+        Viewers may export, so view permission is checked instead of edit permission.
+        """
+        protocol = self.get_object()
+        if not protocol.can_view(request.user):
+            return Response({"error": "Permission denied"}, status=status.HTTP_403_FORBIDDEN)
+        session = None
+        session_id = request.data.get("session")
+        if session_id:
+            try:
+                session = Session.objects.get(id=session_id, protocols=protocol)
+            except (Session.DoesNotExist, ValueError):
+                return Response({"error": "Session not found"}, status=status.HTTP_404_NOT_FOUND)
+            if not session.can_view(request.user):
+                return Response({"error": "Permission denied for session"}, status=status.HTTP_403_FORBIDDEN)
+
+        return _start_html_bundle_export(request.user, protocol=protocol, session=session)
+
 
 class SessionViewSet(DeletionLogMixin, viewsets.ModelViewSet):
     """
@@ -632,6 +722,19 @@ class SessionViewSet(DeletionLogMixin, viewsets.ModelViewSet):
 
         return response
 
+    @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
+    def export_bundle(self, request, pk=None):
+        """
+        Export the session's protocols as a ZIP of HTML with annotation media as separate files.
+
+        Returns a task id; the ZIP is downloaded from the async task endpoints.
+        Viewers may export, so view permission is checked instead of edit permission.
+        """
+        session = self.get_object()
+        if not session.can_view(request.user):
+            return Response({"error": "Permission denied"}, status=status.HTTP_403_FORBIDDEN)
+        return _start_html_bundle_export(request.user, session=session)
+
 
 class ProtocolRatingViewSet(viewsets.ModelViewSet):
     """
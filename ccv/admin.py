@@ -33,6 +33,7 @@ from .models import (
     UberonAnatomy,
     Unimod,
 )
+from .ontology_cache import invalidate_ontology_model
 
 
 @admin.register(MetadataTable)
@@ -270,8 +271,25 @@ class FavouriteMetadataOptionAdmin(SimpleHistoryAdmin):
 # ===================================================================
 
 
+class OntologyCacheInvalidationMixin:
+    """
+    Invalidate cached ontology lookups after admin deletes.
+
+    Ontology models have no delete signal receivers, so the loader commands keep
+    Django's fast bulk-delete path and invalidate explicitly; admin deletes do the same.
+    """
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_ontology_model(self.model)
+
+    def delete_queryset(self, request, queryset):
+        super().delete_queryset(request, queryset)
+        invalidate_ontology_model(self.model)
+
+
 @admin.register(Species)
-class SpeciesAdmin(admin.ModelAdmin):
+class SpeciesAdmin(OntologyCacheInvalidationMixin, admin.ModelAdmin):
     """Admin interface for Species model."""
 
     list_display = ["code", "official_name", "common_name", "taxon"]
@@ -290,7 +308,7 @@ class SpeciesAdmin(admin.ModelAdmin):
 
 
 @admin.register(Tissue)
-class TissueAdmin(admin.ModelAdmin):
+class TissueAdmin(OntologyCacheInvalidationMixin, admin.ModelAdmin):
     """Admin interface for Tissue model."""
 
     list_display = ["identifier", "accession", "synonyms_preview"]
@@ -315,7 +333,7 @@ class TissueAdmin(admin.ModelAdmin):
 
 
 @admin.register(HumanDisease)
-class HumanDiseaseAdmin(admin.ModelAdmin):
+class HumanDiseaseAdmin(OntologyCacheInvalidationMixin, admin.ModelAdmin):
     """Admin interface for HumanDisease model."""
 
     list_display = ["identifier", "acronym", "accession", "definition_preview"]
@@ -342,7 +360,7 @@ class HumanDiseaseAdmin(admin.ModelAdmin):
 
 
 @admin.register(SubcellularLocation)
-class SubcellularLocationAdmin(admin.ModelAdmin):
+class SubcellularLocationAdmin(OntologyCacheInvalidationMixin, admin.ModelAdmin):
     """Admin interface for SubcellularLocation model."""
 
     list_display = ["accession", "location_identifier", "definition_preview"]
@@ -388,7 +406,7 @@ class SubcellularLocationAdmin(admin.ModelAdmin):
 
 
 @admin.register(MSUniqueVocabularies)
-class MSUniqueVocabulariesAdmin(admin.ModelAdmin):
+class MSUniqueVocabulariesAdmin(OntologyCacheInvalidationMixin, admin.ModelAdmin):
     """Admin interface for MSUniqueVocabularies model."""
 
     list_display = ["accession", "name", "term_type", "definition_preview"]
@@ -411,7 +429,7 @@ class MSUniqueVocabulariesAdmin(admin.ModelAdmin):
 
 
 @admin.register(Unimod)
-class UnimodAdmin(admin.ModelAdmin):
+class UnimodAdmin(OntologyCacheInvalidationMixin, admin.ModelAdmin):
     """Admin interface for Unimod model."""
 
     list_display = ["accession", "name", "definition_preview", "has_additional_data"]
@@ -446,7 +464,7 @@ class UnimodAdmin(admin.ModelAdmin):
 
 
 @admin.register(MondoDisease)
-class MondoDiseaseAdmin(admin.ModelAdmin):
+class MondoDiseaseAdmin(OntologyCacheInvalidationMixin, admin.ModelAdmin):
     """Admin interface for MONDO Disease Ontology."""
 
     list_display = ["identifier", "name", "obsolete", "definition_preview", "created_at"]
@@ -472,7 +490,7 @@ class MondoDiseaseAdmin(admin.ModelAdmin):
 
 
 @admin.register(UberonAnatomy)
-class UberonAnatomyAdmin(admin.ModelAdmin):
+class UberonAnatomyAdmin(OntologyCacheInvalidationMixin, admin.ModelAdmin):
     """Admin interface for UBERON Anatomy Ontology."""
 
     list_display = ["identifier", "name", "obsolete", "definition_preview", "created_at"]
@@ -498,7 +516,7 @@ class UberonAnatomyAdmin(admin.ModelAdmin):
 
 
 @admin.register(NCBITaxonomy)
-class NCBITaxonomyAdmin(admin.ModelAdmin):
+class NCBITaxonomyAdmin(OntologyCacheInvalidationMixin, admin.ModelAdmin):
     """Admin interface for NCBI Taxonomy."""
 
     list_display = ["tax_id", "scientific_name", "common_name", "rank", "created_at"]
@@ -516,7 +534,7 @@ class NCBITaxonomyAdmin(admin.ModelAdmin):
 
 
 @admin.register(ChEBICompound)
-class ChEBICompoundAdmin(admin.ModelAdmin):
+class ChEBICompoundAdmin(OntologyCacheInvalidationMixin, admin.ModelAdmin):
     """Admin interface for ChEBI Chemical Compounds."""
 
     list_display = ["identifier", "name", "formula", "mass", "charge", "has_structure", "obsolete", "created_at"]
@@ -543,7 +561,7 @@ class ChEBICompoundAdmin(admin.ModelAdmin):
 
 
 @admin.register(PSIMSOntology)
-class PSIMSOntologyAdmin(admin.ModelAdmin):
+class PSIMSOntologyAdmin(OntologyCacheInvalidationMixin, admin.ModelAdmin):
     """Admin interface for PSI-MS Ontology."""
 
     list_display = ["identifier", "name", "category", "obsolete", "definition_preview", "created_at"]
@@ -569,7 +587,7 @@ class PSIMSOntologyAdmin(admin.ModelAdmin):
 
 
 @admin.register(CellOntology)
-class CellOntologyAdmin(admin.ModelAdmin):
+class CellOntologyAdmin(OntologyCacheInvalidationMixin, admin.ModelAdmin):
     """Admin interface for Cell Ontology."""
 
     list_display = ["identifier", "name", "cell_line", "organism", "source", "obsolete", "created_at"]
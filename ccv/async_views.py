@@ -12,6 +12,7 @@ from rest_framework.filters import SearchFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from ccc.file_serving import serve_file
 from ccc.models import AsyncTaskStatus, TaskResult
 from ccv.models import MetadataTable
 from ccv.serializers import (
@@ -226,42 +227,12 @@ class AsyncTaskViewSet(viewsets.ReadOnlyModelViewSet):
         # Record download
         task_result.record_download()
 
-        # Check if running in Electron environment (no nginx)
-        from django.conf import settings
-
-        is_electron = getattr(settings, "IS_ELECTRON_ENVIRONMENT", False)
-        print(f"ELECTRON_DEBUG: IS_ELECTRON_ENVIRONMENT = {is_electron}")
-
-        if is_electron:
-            # Use simple HttpResponse with file content for Electron to avoid all Content-Length issues
-            import os
-
-            file_path = task_result.get_file_path()
-            if not os.path.exists(file_path):
-                return HttpResponse("File not found", status=404)
-
-            # Read file and return with gzip compression disabled
-            with open(file_path, "rb") as f:
-                file_content = f.read()
-
-            response = HttpResponse(file_content, content_type=task_result.content_type or "application/octet-stream")
-            response["Content-Disposition"] = f'attachment; filename="{task_result.file_name}"'
-
-            # Disable gzip compression to prevent Content-Length mismatch
-            response["Content-Encoding"] = "identity"
-        else:
-            # Use nginx X-Accel-Redirect for production with nginx
-            response = HttpResponse()
-            response["X-Accel-Redirect"] = f"/internal/media/{task_result.file.name}"
-            response["Content-Type"] = task_result.content_type or "application/octet-stream"
-            response["Content-Disposition"] = f'attachment; filename="{task_result.file_name}"'
-            # Add cache headers (short cache since files are temporary)
-            response["Cache-Control"] = "private, max-age=300"  # 5 minutes
-            # Add security headers
-            response["X-Content-Type-Options"] = "nosniff"
-            response["X-Download-Options"] = "noopen"
-
-        return response
+        return serve_file(
+            request,
+            task_result.file,
+            filename=task_result.file_name,
+            content_type=task_result.content_type,
+        )
 
 
 class AsyncExportViewSet(viewsets.GenericViewSet):
@@ -1,22 +1,131 @@
 """
 Cache utilities for CUPCAKE Vanilla application using Redis.
+
+Groups of related keys are invalidated through namespaces: every key built
+with ``get_cache_key(..., namespace=...)`` embeds the namespace's current
+version, so bumping the version (``invalidate_namespace``) orphans the whole
+group in O(1) and the stale entries simply expire. This avoids Redis ``KEYS``,
+which blocks the server (and the sessions stored in it) while it walks the
+whole keyspace.
+
+Cache errors never propagate to callers; they are logged and counted in
+``get_cache_metrics()``.
 """
 
 import hashlib
-from typing import Any, List, Optional
+import logging
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
 
 from django.conf import settings
 from django.core.cache import cache
 from django.utils.encoding import force_str
 
+logger = logging.getLogger(__name__)
+
+NAMESPACE_KEY_PREFIX = "ns"
+DELETE_PATTERN_BATCH_SIZE = 500
+
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+
+def _record(metric: str, count: int = 1) -> None:
+    with _metrics_lock:
+        _metrics[metric] += count
+
+
+def _record_error(operation: str, target: Any, exc: Exception) -> None:
+    _record("errors")
+    _record(f"{operation}_errors")
+    logger.warning("Cache %s error for %r: %s", operation, target, exc)
+
+
+def get_cache_metrics() -> Dict[str, Any]:
+    """
+    Return cache hit/miss/error counters for this process.
+
+    Returns:
+        dict: Counters plus the overall hit rate of ``cache_get``/``cache_get_many``
+    """
+    with _metrics_lock:
+        metrics = dict(_metrics)
+    lookups = metrics.get("hits", 0) + metrics.get("misses", 0)
+    metrics["hit_rate"] = round(metrics.get("hits", 0) / lookups, 4) if lookups else 0.0
+    return metrics
+
+
+def reset_cache_metrics() -> None:
+    """Reset the cache counters."""
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def _namespace_version_key(namespace: str) -> str:
+    return f"{NAMESPACE_KEY_PREFIX}:{namespace}"
+
+
+def get_namespace_version(namespace: str) -> int:
+    """
+    Get the current version of a cache namespace, initialising it if needed.
+
+    New namespaces start from the current timestamp rather than 0 so that a
+    version key evicted from Redis can never resurrect entries written under an
+    earlier version.
 
-def get_cache_key(*args: Any, prefix: str = "") -> str:
+    Args:
+        namespace: Namespace name, e.g. "cupcake:user:42"
+
+    Returns:
+        int: Current namespace version
+    """
+    key = _namespace_version_key(namespace)
+    try:
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, int(time.time()), None)
+            version = cache.get(key)
+        return int(version)
+    except Exception as e:
+        _record_error("namespace", namespace, e)
+        return 0
+
+
+def invalidate_namespace(namespace: str) -> int:
+    """
+    Invalidate every key in a namespace by bumping its version.
+
+    Args:
+        namespace: Namespace name
+
+    Returns:
+        int: The new namespace version (0 if the cache is unavailable)
+    """
+    key = _namespace_version_key(namespace)
+    try:
+        try:
+            version = cache.incr(key)
+        except ValueError:
+            version = int(time.time())
+            cache.set(key, version, None)
+        _record("namespace_invalidations")
+        return version
+    except Exception as e:
+        _record_error("namespace", namespace, e)
+        return 0
+
+
+def get_cache_key(*args: Any, prefix: str = "", namespace: Optional[str] = None) -> str:
     """
     Generate a cache key from arguments.
 
     Args:
         *args: Arguments to create key from
         prefix: Optional prefix for the key
+        namespace: Optional namespace; its current version is baked into the key
+            so ``invalidate_namespace`` drops the key together with the namespace
 
     Returns:
         str: Generated cache key
@@ -24,6 +133,9 @@ def get_cache_key(*args: Any, prefix: str = "") -> str:
     key_parts = [force_str(arg) for arg in args if arg is not None]
     key_string = ":".join(key_parts)
 
+    if namespace:
+        key_string = f"{namespace}:v{get_namespace_version(namespace)}:{key_string}"
+
     if prefix:
         key_string = f"{prefix}:{key_string}"
 
@@ -45,11 +157,35 @@ def cache_get(key: str) -> Optional[Any]:
         Cached value or None if not found
     """
     try:
-        return cache.get(key)
+        value = cache.get(key)
     except Exception as e:
-        # Log error in production
-        print(f"Cache get error for key '{key}': {e}")
+        _record_error("get", key, e)
         return None
+    _record("hits" if value is not None else "misses")
+    return value
+
+
+def cache_get_many(keys: Iterable[str]) -> Dict[str, Any]:
+    """
+    Get several values from cache in one round trip.
+
+    Args:
+        keys: Cache keys
+
+    Returns:
+        dict: Mapping of found keys to their values (missing keys are omitted)
+    """
+    keys = list(keys)
+    if not keys:
+        return {}
+    try:
+        values = cache.get_many(keys)
+    except Exception as e:
+        _record_error("get_many", keys, e)
+        return {}
+    _record("hits", len(values))
+    _record("misses", len(keys) - len(values))
+    return values
 
 
 def cache_set(key: str, value: Any, timeout: Optional[int] = None) -> bool:
@@ -71,8 +207,31 @@ def cache_set(key: str, value: Any, timeout: Optional[int] = None) -> bool:
         cache.set(key, value, timeout)
         return True
     except Exception as e:
-        # Log error in production
-        print(f"Cache set error for key '{key}': {e}")
+        _record_error("set", key, e)
+        return False
+
+
+def cache_set_many(data: Dict[str, Any], timeout: Optional[int] = None) -> bool:
+    """
+    Set several values in cache in one round trip.
+
+    Args:
+        data: Mapping of cache keys to values
+        timeout: Timeout in seconds (uses CACHE_TTL if not provided)
+
+    Returns:
+        bool: True if every key was stored, False otherwise
+    """
+    if not data:
+        return True
+    try:
+        if timeout is None:
+            timeout = getattr(settings, "CACHE_TTL", 900)
+
+        failed = cache.set_many(data, timeout)
+        return not failed
+    except Exception as e:
+        _record_error("set_many", list(data), e)
         return False
 
 
@@ -90,27 +249,61 @@ def cache_delete(key: str) -> bool:
         cache.delete(key)
         return True
     except Exception as e:
-        # Log error in production
-        print(f"Cache delete error for key '{key}': {e}")
+        _record_error("delete", key, e)
+        return False
+
+
+def cache_delete_many(keys: Iterable[str]) -> bool:
+    """
+    Delete several values from cache in one round trip.
+
+    Args:
+        keys: Cache keys to delete
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    keys = list(keys)
+    if not keys:
+        return True
+    try:
+        cache.delete_many(keys)
+        return True
+    except Exception as e:
+        _record_error("delete_many", keys, e)
         return False
 
 
 def cache_delete_pattern(pattern: str) -> bool:
     """
-    Delete cache keys matching pattern.
+    Delete cache keys matching pattern using incremental ``SCAN`` batches.
+
+    Prefer namespaces (``invalidate_namespace``) for new code; this is a fallback
+    for keys that were not built with one. Keys are walked with ``SCAN`` and
+    deleted in batches, so Redis is never blocked for a full keyspace walk.
 
     Args:
         pattern: Pattern to match (e.g., "user:*", "template:123:*")
 
     Returns:
-        bool: True if successful, False otherwise
+        bool: True if successful, False if the backend cannot iterate keys or errored
     """
+    if not hasattr(cache, "iter_keys"):
+        _record_error("delete_pattern", pattern, NotImplementedError("cache backend cannot iterate keys"))
+        return False
+
     try:
-        cache.delete_many(cache.keys(pattern))
+        batch = []
+        for key in cache.iter_keys(pattern, itersize=DELETE_PATTERN_BATCH_SIZE):
+            batch.append(key)
+            if len(batch) >= DELETE_PATTERN_BATCH_SIZE:
+                cache.delete_many(batch)
+                batch = []
+        if batch:
+            cache.delete_many(batch)
         return True
     except Exception as e:
-        # Log error in production
-        print(f"Cache delete pattern error for pattern '{pattern}': {e}")
+        _record_error("delete_pattern", pattern, e)
         return False
 
 
@@ -135,48 +328,55 @@ def cache_get_or_set(key: str, default_callable, timeout: Optional[int] = None)
         cache_set(key, value, timeout)
         return value
     except Exception as e:
-        # Log error in production and return computed value
-        print(f"Cache get_or_set error for key '{key}': {e}")
+        _record_error("get_or_set", key, e)
         return default_callable()
 
 
 # Specific cache functions for common use cases
 
 
+def user_cache_namespace(user_id: int) -> str:
+    """Namespace holding every cache entry for a user."""
+    return f"cupcake:user:{user_id}"
+
+
+def template_cache_namespace(template_id: int) -> str:
+    """Namespace holding every cache entry for a metadata template."""
+    return f"cupcake:template:{template_id}"
+
+
 def cache_user_data(user_id: int, data: Any, timeout: Optional[int] = None) -> bool:
     """Cache user-specific data."""
-    key = get_cache_key("user", user_id, "data", prefix="cupcake")
+    key = get_cache_key("user", user_id, "data", prefix="cupcake", namespace=user_cache_namespace(user_id))
     return cache_set(key, data, timeout)
 
 
 def get_cached_user_data(user_id: int) -> Optional[Any]:
     """Get cached user-specific data."""
-    key = get_cache_key("user", user_id, "data", prefix="cupcake")
+    key = get_cache_key("user", user_id, "data", prefix="cupcake", namespace=user_cache_namespace(user_id))
     return cache_get(key)
 
 
 def cache_template_data(template_id: int, data: Any, timeout: Optional[int] = None) -> bool:
     """Cache metadata template data."""
-    key = get_cache_key("template", template_id, prefix="cupcake")
+    key = get_cache_key("template", template_id, prefix="cupcake", namespace=template_cache_namespace(template_id))
     return cache_set(key, data, timeout)
 
 
 def get_cached_template_data(template_id: int) -> Optional[Any]:
     """Get cached metadata template data."""
-    key = get_cache_key("template", template_id, prefix="cupcake")
+    key = get_cache_key("template", template_id, prefix="cupcake", namespace=template_cache_namespace(template_id))
     return cache_get(key)
 
 
 def invalidate_user_cache(user_id: int) -> bool:
     """Invalidate all cache entries for a user."""
-    pattern = get_cache_key("user", user_id, "*", prefix="cupcake")
-    return cache_delete_pattern(pattern)
+    return bool(invalidate_namespace(user_cache_namespace(user_id)))
 
 
 def invalidate_template_cache(template_id: int) -> bool:
     """Invalidate cache entries for a template."""
-    pattern = get_cache_key("template", template_id, "*", prefix="cupcake")
-    return cache_delete_pattern(pattern)
+    return bool(invalidate_namespace(template_cache_namespace(template_id)))
 
 
 def cache_ontology_suggestions(
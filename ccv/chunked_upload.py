@@ -7,14 +7,13 @@ import os
 from typing import Any, Dict, List
 
 from drf_chunked_upload.serializers import ChunkedUploadSerializer
-from drf_chunked_upload.views import ChunkedUploadView
 from openpyxl import load_workbook
 from rest_framework import serializers, status
 from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from ccc.chunked_upload import BaseChunkedUpload
+from ccc.chunked_upload import BaseChunkedUpload, BaseChunkedUploadView
 from ccc.models import AsyncTaskStatus
 
 from .models import MetadataColumn, MetadataTable, SamplePool
@@ -72,7 +71,7 @@ class MetadataFileUploadSerializer(ChunkedUploadSerializer):
         read_only_fields = ("id", "created_at", "status", "completed_at")
 
 
-class MetadataChunkedUploadView(ChunkedUploadView):
+class MetadataChunkedUploadView(BaseChunkedUploadView):
     """
     Chunked upload view for metadata files (SDRF, Excel, TSV).
     Supports large file uploads with progress tracking.
@@ -0,0 +1,205 @@
+"""
+Cached favourites index for CUPCAKE Vanilla dropdowns and typeahead.
+
+Favourite metadata options are grouped into scopes (personal, lab group and
+global). Each scope is cached in Redis as a mapping of normalised column name
+to the ordered list of favourite entries for that name, so resolving the
+dropdown options for every column of a table costs a handful of cache reads
+instead of one regex query per scope. ``FavouriteMetadataOption`` signals drop
+the affected scopes whenever a favourite is created, changed or deleted.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+
+from .cache_utils import cache_delete_many, cache_get, cache_get_many, cache_set, cache_set_many, get_cache_key
+from .models import FavouriteMetadataOption
+
+SCOPE_USER = "user"
+SCOPE_LAB_GROUP = "lab_group"
+SCOPE_ALL_LAB_GROUPS = "lab_group_all"
+SCOPE_GLOBAL = "global"
+
+PROVENANCE_MARKERS = {
+    SCOPE_USER: "[*]",
+    SCOPE_LAB_GROUP: "[**]",
+    SCOPE_GLOBAL: "[***]",
+}
+
+# Columns whose lab group favourites are always offered alongside "not applicable"
+NOT_APPLICABLE_LAB_COLUMNS = ("tissue", "organism part")
+
+ENTRY_FIELDS = ("id", "name", "type", "value", "display_value", "is_global", "lab_group_id")
+
+
+def normalise_favourite_name(name: str) -> str:
+    """
+    Return the inner column name used as the index key.
+
+    Handles both 'characteristics[organism]' → 'organism' and plain 'organism'.
+    """
+    raw = (name or "").lower()
+    if "[" in raw and raw.endswith("]"):
+        return raw.split("[", 1)[1][:-1]
+    return raw
+
+
+def _index_timeout() -> int:
+    return getattr(settings, "FAVOURITE_INDEX_CACHE_TTL", 60 * 60 * 24)
+
+
+def _scope_cache_key(scope: str, scope_id: Any = None) -> str:
+    return get_cache_key("favourites", scope, scope_id, prefix="cupcake")
+
+
+def _scope_queryset(scope: str, scope_id: Any = None):
+    if scope == SCOPE_USER:
+        return FavouriteMetadataOption.objects.filter(user_id=scope_id, lab_group__isnull=True)
+    if scope == SCOPE_LAB_GROUP:
+        return FavouriteMetadataOption.objects.filter(lab_group_id=scope_id)
+    if scope == SCOPE_ALL_LAB_GROUPS:
+        return FavouriteMetadataOption.objects.filter(lab_group__isnull=False)
+    if scope == SCOPE_GLOBAL:
+        return FavouriteMetadataOption.objects.filter(is_global=True)
+    raise ValueError(f"Unknown favourite scope: {scope}")
+
+
+def build_scope_index(scope: str, scope_id: Any = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Build the favourites index for a scope straight from the database.
+
+    Args:
+        scope: One of the SCOPE_* constants
+        scope_id: User or lab group ID for scoped indexes
+
+    Returns:
+        Dict mapping normalised column name to ordered favourite entries
+    """
+    index = {}
+    for entry in _scope_queryset(scope, scope_id).values(*ENTRY_FIELDS):
+        entry["name"] = (entry["name"] or "").lower()
+        index.setdefault(normalise_favourite_name(entry["name"]), []).append(entry)
+    return index
+
+
+def get_scope_index(scope: str, scope_id: Any = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Get the favourites index for a scope, building and caching it on a miss."""
+    key = _scope_cache_key(scope, scope_id)
+    index = cache_get(key)
+    if index is None:
+        index = build_scope_index(scope, scope_id)
+        cache_set(key, index, _index_timeout())
+    return index
+
+
+def get_lab_group_index(lab_group_ids: Optional[List[int]]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Get the merged favourites index for a set of lab groups.
+
+    An empty list means "all lab groups", matching the export API semantics.
+    """
+    if lab_group_ids == []:
+        return get_scope_index(SCOPE_ALL_LAB_GROUPS)
+
+    group_ids = list(dict.fromkeys(lab_group_ids or []))
+    if len(group_ids) == 1:
+        return get_scope_index(SCOPE_LAB_GROUP, group_ids[0])
+
+    keys = {group_id: _scope_cache_key(SCOPE_LAB_GROUP, group_id) for group_id in group_ids}
+    cached = cache_get_many(keys.values())
+    missing = {
+        keys[group_id]: build_scope_index(SCOPE_LAB_GROUP, group_id)
+        for group_id in group_ids
+        if keys[group_id] not in cached
+    }
+    if missing:
+        cache_set_many(missing, _index_timeout())
+        cached.update(missing)
+
+    merged = {}
+    for group_id in group_ids:
+        for key, entries in cached[keys[group_id]].items():
+            merged.setdefault(key, []).extend(entries)
+    for entries in merged.values():
+        entries.sort(key=lambda e: (e["name"], e["type"] or "", e["display_value"] or ""))
+    return merged
+
+
+def resolve_table_favourites(
+    column_names: Iterable[str],
+    user,
+    lab_group_ids: Optional[List[int]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Resolve favourite options for every column of a table in one pass.
+
+    A favourite matches when its stored name equals either the inner column name
+    ('organism') or the full SDRF name ('characteristics[organism]') of one of
+    the requested columns.
+
+    Args:
+        column_names: Names of the metadata columns to resolve
+        user: User whose personal favourites are included
+        lab_group_ids: Lab group IDs for group favourites (None skips, [] means all)
+
+    Returns:
+        Dict mapping normalised column name to ordered favourite entries, each
+        carrying a ``source`` of user, lab_group or global
+    """
+    full_names = {name.lower() for name in column_names if name}
+    inner_names = {normalise_favourite_name(name) for name in full_names}
+    if not inner_names:
+        return {}
+    name_variants = inner_names | full_names
+
+    scopes = [(SCOPE_USER, get_scope_index(SCOPE_USER, user.pk))]
+    if lab_group_ids is not None:
+        scopes.append((SCOPE_LAB_GROUP, get_lab_group_index(lab_group_ids)))
+    scopes.append((SCOPE_GLOBAL, get_scope_index(SCOPE_GLOBAL)))
+
+    resolved = {}
+    for source, index in scopes:
+        for key in inner_names:
+            for entry in index.get(key, ()):
+                if entry["name"] in name_variants:
+                    resolved.setdefault(key, []).append({**entry, "source": source})
+    return resolved
+
+
+def format_excel_favourites(resolved: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[str]]:
+    """
+    Format resolved favourites as Excel dropdown options with provenance markers.
+
+    Args:
+        resolved: Output of resolve_table_favourites
+
+    Returns:
+        Dict mapping normalised column name to dropdown option strings
+    """
+    favourites = {}
+    for key, entries in resolved.items():
+        options = favourites.setdefault(key, [])
+        for entry in entries:
+            options.append(f"[{entry['id']}] {entry['display_value']}{PROVENANCE_MARKERS[entry['source']]}")
+            if entry["source"] == SCOPE_LAB_GROUP and key in NOT_APPLICABLE_LAB_COLUMNS:
+                options.append("not applicable")
+    return favourites
+
+
+def favourite_scope_keys(user_id: Optional[int], lab_group_id: Optional[int], is_global: bool) -> List[str]:
+    """Return the cache keys of every scope index a favourite belongs to."""
+    keys = []
+    if user_id is not None and lab_group_id is None:
+        keys.append(_scope_cache_key(SCOPE_USER, user_id))
+    if lab_group_id is not None:
+        keys.append(_scope_cache_key(SCOPE_LAB_GROUP, lab_group_id))
+        keys.append(_scope_cache_key(SCOPE_ALL_LAB_GROUPS))
+    if is_global:
+        keys.append(_scope_cache_key(SCOPE_GLOBAL))
+    return keys
+
+
+def invalidate_favourite_index(user_id: Optional[int], lab_group_id: Optional[int], is_global: bool) -> None:
+    """Drop the cached scope indexes a favourite belongs to."""
+    cache_delete_many(favourite_scope_keys(user_id, lab_group_id, is_global))
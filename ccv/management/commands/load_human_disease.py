@@ -7,6 +7,7 @@ from django.core.management.base import BaseCommand
 import requests
 
 from ccv.models import HumanDisease
+from ccv.ontology_cache import invalidate_ontology_model, ontology_cache
 
 
 def parse_human_disease_file(filename=None):
@@ -87,10 +88,12 @@ class Command(BaseCommand):
         file_path = options.get("file")
 
         self.stdout.write("Loading UniProt human disease data...")
-        try:
-            HumanDisease.objects.all().delete()
-            parse_human_disease_file(file_path)
-            count = HumanDisease.objects.count()
-            self.stdout.write(self.style.SUCCESS(f"Successfully loaded {count} human disease records."))
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f"Error loading human disease data: {str(e)}"))
+        with ontology_cache.suspend_invalidation():
+            try:
+                HumanDisease.objects.all().delete()
+                parse_human_disease_file(file_path)
+                count = HumanDisease.objects.count()
+                self.stdout.write(self.style.SUCCESS(f"Successfully loaded {count} human disease records."))
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"Error loading human disease data: {str(e)}"))
+        invalidate_ontology_model(HumanDisease)
@@ -9,6 +9,7 @@ from django.core.management.base import BaseCommand
 import requests
 
 from ccv.models import Unimod
+from ccv.ontology_cache import invalidate_ontology_model, ontology_cache
 
 
 def load_unimod_data():
@@ -82,15 +83,19 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         self.stdout.write("Loading Unimod modification data...")
 
-        try:
-            if options["clear_existing"]:
-                deleted_count = Unimod.objects.count()
-                Unimod.objects.all().delete()
-                self.stdout.write(f"Cleared {deleted_count} existing Unimod records.")
-
-            created_count = load_unimod_data()
-            self.stdout.write(self.style.SUCCESS(f"Successfully loaded {created_count} Unimod modification records."))
-        except ImportError as e:
-            self.stdout.write(self.style.ERROR(str(e)))
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f"Error loading Unimod data: {str(e)}"))
+        with ontology_cache.suspend_invalidation():
+            try:
+                if options["clear_existing"]:
+                    deleted_count = Unimod.objects.count()
+                    Unimod.objects.all().delete()
+                    self.stdout.write(f"Cleared {deleted_count} existing Unimod records.")
+
+                created_count = load_unimod_data()
+                self.stdout.write(
+                    self.style.SUCCESS(f"Successfully loaded {created_count} Unimod modification records.")
+                )
+            except ImportError as e:
+                self.stdout.write(self.style.ERROR(str(e)))
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"Error loading Unimod data: {str(e)}"))
+        invalidate_ontology_model(Unimod)
@@ -8,6 +8,7 @@ from django.db import transaction
 import requests
 
 from ccv.models import MSUniqueVocabularies
+from ccv.ontology_cache import invalidate_ontology_model, ontology_cache
 
 
 def load_ms_ontology_data():
@@ -204,15 +205,17 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         self.stdout.write("Loading MS controlled vocabulary data...")
 
-        try:
-            if options["clear_existing"]:
-                deleted_count = MSUniqueVocabularies.objects.count()
-                MSUniqueVocabularies.objects.all().delete()
-                self.stdout.write(f"Cleared {deleted_count} existing MS vocabulary records.")
-
-            created_count = load_ms_ontology_data()
-            self.stdout.write(self.style.SUCCESS(f"Successfully loaded {created_count} MS vocabulary records."))
-        except ImportError as e:
-            self.stdout.write(self.style.ERROR(str(e)))
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f"Error loading MS vocabulary data: {str(e)}"))
+        with ontology_cache.suspend_invalidation():
+            try:
+                if options["clear_existing"]:
+                    deleted_count = MSUniqueVocabularies.objects.count()
+                    MSUniqueVocabularies.objects.all().delete()
+                    self.stdout.write(f"Cleared {deleted_count} existing MS vocabulary records.")
+
+                created_count = load_ms_ontology_data()
+                self.stdout.write(self.style.SUCCESS(f"Successfully loaded {created_count} MS vocabulary records."))
+            except ImportError as e:
+                self.stdout.write(self.style.ERROR(str(e)))
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"Error loading MS vocabulary data: {str(e)}"))
+        invalidate_ontology_model(MSUniqueVocabularies)
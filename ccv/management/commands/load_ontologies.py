@@ -33,7 +33,17 @@ from django.core.management.base import BaseCommand
 import requests
 from tqdm import tqdm
 
-from ccv.models import BTOTerm, CellOntology, DiseaseOntologyTerm, MondoDisease, PSIMSOntology, UberonAnatomy
+from ccv.models import (
+    BTOTerm,
+    CellOntology,
+    ChEBICompound,
+    DiseaseOntologyTerm,
+    MondoDisease,
+    NCBITaxonomy,
+    PSIMSOntology,
+    UberonAnatomy,
+)
+from ccv.ontology_cache import invalidate_ontology_model, ontology_cache
 
 
 class OBOParser:
@@ -156,46 +166,60 @@ class Command(BaseCommand):
 
         total_created = 0
         total_updated = 0
-
-        if ontology in ["all", "mondo"]:
-            created, updated = self.load_mondo_disease(update_existing, limit)
-            total_created += created
-            total_updated += updated
-
-        if ontology in ["all", "uberon"]:
-            created, updated = self.load_uberon_anatomy(update_existing, limit)
-            total_created += created
-            total_updated += updated
-
-        if ontology in ["all", "ncbi"] and not skip_large:
-            created, updated = self.load_ncbi_taxonomy(update_existing, limit)
-            total_created += created
-            total_updated += updated
-
-        if ontology in ["all", "chebi"] and not skip_large:
-            created, updated = self.load_chebi_compounds(update_existing, limit, chebi_filter)
-            total_created += created
-            total_updated += updated
-
-        if ontology in ["all", "psims"]:
-            created, updated = self.load_psims_ontology(update_existing, limit)
-            total_created += created
-            total_updated += updated
-
-        if ontology in ["all", "cell"]:
-            created, updated = self.load_cell_ontology(update_existing, limit)
-            total_created += created
-            total_updated += updated
-
-        if ontology in ["all", "bto"]:
-            created, updated = self.load_bto(update_existing, limit)
-            total_created += created
-            total_updated += updated
-
-        if ontology in ["all", "doid"]:
-            created, updated = self.load_doid(update_existing, limit)
-            total_created += created
-            total_updated += updated
+        loaded_models = []
+
+        # Terms are saved one by one; invalidate the ontology cache once per ontology instead of per row.
+        with ontology_cache.suspend_invalidation():
+            if ontology in ["all", "mondo"]:
+                created, updated = self.load_mondo_disease(update_existing, limit)
+                total_created += created
+                total_updated += updated
+                loaded_models.append(MondoDisease)
+
+            if ontology in ["all", "uberon"]:
+                created, updated = self.load_uberon_anatomy(update_existing, limit)
+                total_created += created
+                total_updated += updated
+                loaded_models.append(UberonAnatomy)
+
+            if ontology in ["all", "ncbi"] and not skip_large:
+                created, updated = self.load_ncbi_taxonomy(update_existing, limit)
+                total_created += created
+                total_updated += updated
+                loaded_models.append(NCBITaxonomy)
+
+            if ontology in ["all", "chebi"] and not skip_large:
+                created, updated = self.load_chebi_compounds(update_existing, limit, chebi_filter)
+                total_created += created
+                total_updated += updated
+                loaded_models.append(ChEBICompound)
+
+            if ontology in ["all", "psims"]:
+                created, updated = self.load_psims_ontology(update_existing, limit)
+                total_created += created
+                total_updated += updated
+                loaded_models.append(PSIMSOntology)
+
+            if ontology in ["all", "cell"]:
+                created, updated = self.load_cell_ontology(update_existing, limit)
+                total_created += created
+                total_updated += updated
+                loaded_models.append(CellOntology)
+
+            if ontology in ["all", "bto"]:
+                created, updated = self.load_bto(update_existing, limit)
+                total_created += created
+                total_updated += updated
+                loaded_models.append(BTOTerm)
+
+            if ontology in ["all", "doid"]:
+                created, updated = self.load_doid(update_existing, limit)
+                total_created += created
+                total_updated += updated
+                loaded_models.append(DiseaseOntologyTerm)
+
+        for model in loaded_models:
+            invalidate_ontology_model(model)
 
         self.stdout.write(
             self.style.SUCCESS(f"Successfully loaded {total_created} new and updated {total_updated} existing terms.")
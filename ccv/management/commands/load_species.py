@@ -9,6 +9,7 @@ from django.core.management.base import BaseCommand
 import requests
 
 from ccv.models import Species
+from ccv.ontology_cache import invalidate_ontology_model, ontology_cache
 
 
 def parse_uniprot_species(file_path: str = None):
@@ -69,9 +70,11 @@ class Command(BaseCommand):
         file_path = options["file"]
 
         self.stdout.write("Loading UniProt species data...")
-        try:
-            parse_uniprot_species(file_path)
-            count = Species.objects.count()
-            self.stdout.write(self.style.SUCCESS(f"Successfully loaded {count} species records."))
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f"Error loading species data: {str(e)}"))
+        with ontology_cache.suspend_invalidation():
+            try:
+                parse_uniprot_species(file_path)
+                count = Species.objects.count()
+                self.stdout.write(self.style.SUCCESS(f"Successfully loaded {count} species records."))
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"Error loading species data: {str(e)}"))
+        invalidate_ontology_model(Species)
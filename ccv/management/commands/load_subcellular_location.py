@@ -7,6 +7,7 @@ from django.core.management.base import BaseCommand
 import requests
 
 from ccv.models import SubcellularLocation
+from ccv.ontology_cache import invalidate_ontology_model, ontology_cache
 
 
 def parse_subcellular_location_file(filename=None):
@@ -103,10 +104,12 @@ class Command(BaseCommand):
         file_path = options.get("file")
 
         self.stdout.write("Loading UniProt subcellular location data...")
-        try:
-            SubcellularLocation.objects.all().delete()
-            parse_subcellular_location_file(file_path)
-            count = SubcellularLocation.objects.count()
-            self.stdout.write(self.style.SUCCESS(f"Successfully loaded {count} subcellular location records."))
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f"Error loading subcellular location data: {str(e)}"))
+        with ontology_cache.suspend_invalidation():
+            try:
+                SubcellularLocation.objects.all().delete()
+                parse_subcellular_location_file(file_path)
+                count = SubcellularLocation.objects.count()
+                self.stdout.write(self.style.SUCCESS(f"Successfully loaded {count} subcellular location records."))
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"Error loading subcellular location data: {str(e)}"))
+        invalidate_ontology_model(SubcellularLocation)
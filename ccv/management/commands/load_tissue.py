@@ -7,6 +7,7 @@ from django.core.management.base import BaseCommand
 import requests
 
 from ccv.models import Tissue
+from ccv.ontology_cache import invalidate_ontology_model, ontology_cache
 
 
 def parse_tissue_file(filename=None):
@@ -64,10 +65,12 @@ class Command(BaseCommand):
         file_path = options.get("file")
 
         self.stdout.write("Loading UniProt tissue data...")
-        try:
-            Tissue.objects.all().delete()
-            parse_tissue_file(file_path)
-            count = Tissue.objects.count()
-            self.stdout.write(self.style.SUCCESS(f"Successfully loaded {count} tissue records."))
-        except Exception as e:
-            self.stdout.write(self.style.ERROR(f"Error loading tissue data: {str(e)}"))
+        with ontology_cache.suspend_invalidation():
+            try:
+                Tissue.objects.all().delete()
+                parse_tissue_file(file_path)
+                count = Tissue.objects.count()
+                self.stdout.write(self.style.SUCCESS(f"Successfully loaded {count} tissue records."))
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f"Error loading tissue data: {str(e)}"))
+        invalidate_ontology_model(Tissue)
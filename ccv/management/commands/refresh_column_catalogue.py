@@ -0,0 +1,16 @@
+"""
+Management command to rebuild the materialised column catalogue.
+"""
+from django.core.management.base import BaseCommand
+
+from ccv.models import MetadataColumnCatalogueEntry
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialised (column_name, column_type) catalogue of public column templates"
+
+    def handle(self, *args, **options):
+        MetadataColumnCatalogueEntry.refresh()
+        self.stdout.write(
+            self.style.SUCCESS(f"Column catalogue rebuilt with {MetadataColumnCatalogueEntry.objects.count()} entries.")
+        )
@@ -0,0 +1,61 @@
+# Generated by Django 6.0.5 on 2026-10-18 21:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("ccv", "0011_add_bto_and_doid_models"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MetadataColumnCatalogueEntry",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "column_name",
+                    models.CharField(help_text="Column name shared by the grouped templates", max_length=255),
+                ),
+                (
+                    "column_type",
+                    models.CharField(help_text="Column type shared by the grouped templates", max_length=255),
+                ),
+                ("schema_count", models.PositiveIntegerField(default=0, help_text="Number of templates in this group")),
+                (
+                    "schemas",
+                    models.JSONField(
+                        blank=True, default=list, help_text="Distinct source schemas of the grouped templates"
+                    ),
+                ),
+                ("template_ids", models.JSONField(blank=True, default=list, help_text="Template IDs ordered by usage")),
+                ("refreshed_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["column_name", "column_type"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="metadatacolumntemplate",
+            index=models.Index(fields=["column_name", "column_type"], name="ccv_metadat_column__fa6a50_idx"),
+        ),
+        migrations.AddField(
+            model_name="metadatacolumncatalogueentry",
+            name="sample_template",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Most used template in this group",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="ccv.metadatacolumntemplate",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="metadatacolumncatalogueentry",
+            constraint=models.UniqueConstraint(
+                fields=("column_name", "column_type"), name="unique_column_catalogue_entry"
+            ),
+        ),
+    ]
@@ -11,12 +11,13 @@ from django.contrib.auth.models import User
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 
 from simple_history.models import HistoricalRecords
 
 from ccc.models import AbstractResource, LabGroup, ResourceType
+from ccv.ontology_cache import cached_ontology_lookup
 from ccv.ontology_registry import registry
 
 
@@ -1514,19 +1515,25 @@ class MetadataColumn(models.Model):
 
         # Check if value exists in ontology based on model type
         if self.ontology_type == "species":
-            return model_class.objects.filter(
+            lookup = (
                 models.Q(official_name__iexact=value)
                 | models.Q(common_name__iexact=value)
                 | models.Q(code__iexact=value)
-            ).exists()
+            )
         elif self.ontology_type in ["tissue", "disease", "subcellular_location"]:
-            return model_class.objects.filter(
-                models.Q(accession__iexact=value) | models.Q(synonyms__icontains=value)
-            ).exists()
+            lookup = models.Q(accession__iexact=value) | models.Q(synonyms__icontains=value)
         elif self.ontology_type in ["ms_unique_vocabularies", "unimod"]:
-            return model_class.objects.filter(models.Q(name__iexact=value) | models.Q(accession__iexact=value)).exists()
+            lookup = models.Q(name__iexact=value) | models.Q(accession__iexact=value)
+        else:
+            return True
 
-        return True
+        return cached_ontology_lookup(
+            self.ontology_type,
+            "validate",
+            value,
+            lambda: model_class.objects.filter(lookup).exists(),
+            search_type="iexact",
+        )
 
     def _format_sample_indices_to_string(self, indices: list[int]) -> str:
         """Formats a list of 1-based sample indices to a compressed string.
@@ -3630,6 +3637,9 @@ class MetadataColumnTemplate(AbstractResource):
     class Meta(AbstractResource.Meta):
         app_label = "ccv"
         ordering = ["-usage_count", "name"]
+        indexes = [
+            models.Index(fields=["column_name", "column_type"]),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.column_name}[{self.column_type}])"
@@ -3700,6 +3710,92 @@ class MetadataColumnTemplate(AbstractResource):
         return column
 
 
+class MetadataColumnCatalogueEntry(models.Model):
+    """
+    Materialised (column_name, column_type) grouping of publicly visible column templates.
+
+    Rows are refreshed by MetadataColumnTemplate signals so the schema builder can
+    browse the shared column catalogue without regrouping templates on every request.
+    """
+
+    CATALOGUE_VISIBILITIES = ("global", "public")
+
+    column_name = models.CharField(max_length=255, help_text="Column name shared by the grouped templates")
+    column_type = models.CharField(max_length=255, help_text="Column type shared by the grouped templates")
+    schema_count = models.PositiveIntegerField(default=0, help_text="Number of templates in this group")
+    schemas = models.JSONField(default=list, blank=True, help_text="Distinct source schemas of the grouped templates")
+    template_ids = models.JSONField(default=list, blank=True, help_text="Template IDs ordered by usage")
+    sample_template = models.ForeignKey(
+        MetadataColumnTemplate,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name="+",
+        help_text="Most used template in this group",
+    )
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = "ccv"
+        ordering = ["column_name", "column_type"]
+        constraints = [
+            models.UniqueConstraint(fields=["column_name", "column_type"], name="unique_column_catalogue_entry"),
+        ]
+
+    def __str__(self):
+        return f"{self.column_name}[{self.column_type}] ({self.schema_count})"
+
+    @classmethod
+    def catalogue_templates(cls):
+        """Templates that are visible to every user and therefore safe to materialise."""
+        return MetadataColumnTemplate.objects.filter(visibility__in=cls.CATALOGUE_VISIBILITIES)
+
+    @classmethod
+    def refresh(cls, column_name=None, column_type=None):
+        """
+        Rebuild catalogue rows from the current templates.
+
+        Args:
+            column_name: Refresh only this group (requires column_type); rebuilds everything when omitted
+            column_type: Column type of the group to refresh
+        """
+        from .utils import group_templates_by_column
+
+        templates = cls.catalogue_templates()
+        existing = cls.objects.all()
+        if column_name is not None:
+            templates = templates.filter(column_name=column_name, column_type=column_type)
+            existing = existing.filter(column_name=column_name, column_type=column_type)
+
+        _, groups = group_templates_by_column(templates)
+        current_keys = {(group["column_name"], group["column_type"]) for group in groups}
+        stale_ids = [
+            pk
+            for pk, name, column_type in existing.values_list("pk", "column_name", "column_type")
+            if (name, column_type) not in current_keys
+        ]
+
+        with transaction.atomic():
+            if stale_ids:
+                cls.objects.filter(pk__in=stale_ids).delete()
+            cls.objects.bulk_create(
+                [
+                    cls(
+                        column_name=group["column_name"],
+                        column_type=group["column_type"],
+                        schema_count=group["schema_count"],
+                        schemas=group["schemas"],
+                        template_ids=group["template_ids"],
+                        sample_template_id=group["sample_template_id"],
+                    )
+                    for group in groups
+                ],
+                update_conflicts=True,
+                unique_fields=["column_name", "column_type"],
+                update_fields=["schema_count", "schemas", "template_ids", "sample_template", "refreshed_at"],
+            )
+
+
 # ===================================================================
 # COMPREHENSIVE ONTOLOGY MODELS FOR SDRF VALIDATION
 # ===================================================================
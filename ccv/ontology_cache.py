@@ -0,0 +1,238 @@
+"""
+Shared ontology-resolution cache for CUPCAKE Vanilla.
+
+Ontology lookups (typeahead suggestions, SDRF value conversion and value
+validation) hit large vocabulary tables with ``icontains`` scans. Results are
+cached in two tiers: a small per-process LRU in front of the shared Redis
+cache, so repeated lookups within a worker skip even the Redis round trip.
+
+Every key embeds a per-ontology version stamp kept in Redis. Bumping the stamp
+(after ``load_ontologies`` or any ontology row change) invalidates all cached
+results for that ontology across every worker without scanning keys. Empty
+results are cached too (negative caching) with a shorter timeout so repeated
+misses on unknown terms do not go back to the database.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from django.conf import settings
+
+from .cache_utils import cache_get, cache_set, get_cache_key, get_namespace_version, invalidate_namespace
+from .ontology_registry import registry
+
+CASE_INSENSITIVE_SEARCH_TYPES = ("icontains", "istartswith", "iexact")
+
+
+class OntologyResolutionCache:
+    """Two-tier (process LRU + Redis) cache for ontology lookups with version-stamp invalidation."""
+
+    def __init__(self) -> None:
+        """Initialise empty local stores and counters."""
+        self._lock = threading.Lock()
+        self._local: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self._versions: Dict[str, tuple[float, int]] = {}
+        self._suspended = threading.local()
+        self.reset_metrics()
+
+    # -- configuration -------------------------------------------------------
+
+    @property
+    def enabled(self) -> bool:
+        return getattr(settings, "ONTOLOGY_CACHE_ENABLED", True)
+
+    @property
+    def local_size(self) -> int:
+        return getattr(settings, "ONTOLOGY_CACHE_LOCAL_SIZE", 2048)
+
+    @property
+    def local_ttl(self) -> int:
+        return getattr(settings, "ONTOLOGY_CACHE_LOCAL_TTL", 300)
+
+    @property
+    def version_check_interval(self) -> int:
+        return getattr(settings, "ONTOLOGY_CACHE_VERSION_CHECK_INTERVAL", 15)
+
+    @property
+    def timeout(self) -> int:
+        return getattr(settings, "ONTOLOGY_CACHE_TTL", 60 * 60 * 24)
+
+    @property
+    def negative_timeout(self) -> int:
+        return getattr(settings, "ONTOLOGY_CACHE_NEGATIVE_TTL", 60 * 10)
+
+    # -- version stamps ------------------------------------------------------
+
+    @staticmethod
+    def namespace(type_key: str) -> str:
+        return f"cupcake:ontology:{type_key}"
+
+    def get_version(self, type_key: str) -> int:
+        """Return the current version stamp for an ontology, re-reading Redis periodically."""
+        now = time.monotonic()
+        cached = self._versions.get(type_key)
+        if cached and now - cached[0] < self.version_check_interval:
+            return cached[1]
+
+        version = get_namespace_version(self.namespace(type_key))
+        self._versions[type_key] = (now, version)
+        return version
+
+    def bump_version(self, type_key: str) -> int:
+        """Invalidate every cached result for an ontology by bumping its version stamp."""
+        version = invalidate_namespace(self.namespace(type_key))
+        self._versions[type_key] = (time.monotonic(), version)
+        with self._lock:
+            prefix = f"{type_key}:"
+            for local_key in [k for k in self._local if k.startswith(prefix)]:
+                del self._local[local_key]
+        return version
+
+    @contextmanager
+    def suspend_invalidation(self):
+        """Skip per-row invalidation (e.g. during bulk loads); callers bump once afterwards."""
+        self._suspended.active = True
+        try:
+            yield
+        finally:
+            self._suspended.active = False
+
+    @property
+    def invalidation_suspended(self) -> bool:
+        return getattr(self._suspended, "active", False)
+
+    # -- keys ----------------------------------------------------------------
+
+    @staticmethod
+    def normalise_term(term: Any, search_type: str = "icontains") -> str:
+        """Normalise a search term so equivalent lookups share a cache entry."""
+        term = "" if term is None else str(term)
+        if search_type in CASE_INSENSITIVE_SEARCH_TYPES:
+            return term.casefold()
+        return term
+
+    def make_key(self, type_key: str, kind: str, *parts: Iterable[Any]) -> str:
+        """Build a versioned cache key for an ontology lookup."""
+        encoded = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"))
+        return get_cache_key("ontology", type_key, f"v{self.get_version(type_key)}", kind, encoded, prefix="cupcake")
+
+    # -- lookups -------------------------------------------------------------
+
+    def _local_get(self, key: str):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return value
+
+    def _local_set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._local[key] = (time.monotonic() + self.local_ttl, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def get_or_compute(self, type_key: str, kind: str, parts: tuple, compute: Callable[[], Any]) -> Any:
+        """
+        Return a cached lookup result, computing and storing it on a miss.
+
+        Args:
+            type_key: Ontology type key (namespaces the version stamp)
+            kind: Lookup kind, e.g. "suggestions" or "validate"
+            parts: Normalised key components (term, search type, filters, ...)
+            compute: Callable that performs the database lookup
+
+        Returns:
+            The cached or freshly computed result
+        """
+        if not self.enabled:
+            return compute()
+
+        key = self.make_key(type_key, kind, *parts)
+        local_key = f"{type_key}:{key}"
+
+        value = self._local_get(local_key)
+        if value is not None:
+            self._record("local_hits", value)
+            return value
+
+        value = cache_get(key)
+        if value is not None:
+            self._record("shared_hits", value)
+            self._local_set(local_key, value)
+            return value
+
+        value = compute()
+        self._record("misses", value)
+        negative = not value
+        cache_set(key, value, self.negative_timeout if negative else self.timeout)
+        self._local_set(local_key, value)
+        return value
+
+    # -- metrics -------------------------------------------------------------
+
+    def _record(self, counter: str, value: Any) -> None:
+        with self._lock:
+            self._metrics[counter] += 1
+            if counter != "misses" and not value:
+                self._metrics["negative_hits"] += 1
+
+    def reset_metrics(self) -> None:
+        """Reset hit/miss counters."""
+        self._metrics = {"local_hits": 0, "shared_hits": 0, "misses": 0, "negative_hits": 0}
+
+    def clear_local(self) -> None:
+        """Drop the per-process LRU and cached version stamps."""
+        with self._lock:
+            self._local.clear()
+            self._versions.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Return hit/miss counters and hit rates for this process."""
+        with self._lock:
+            metrics = dict(self._metrics)
+            local_entries = len(self._local)
+        lookups = metrics["local_hits"] + metrics["shared_hits"] + metrics["misses"]
+        hits = metrics["local_hits"] + metrics["shared_hits"]
+        metrics.update(
+            {
+                "lookups": lookups,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "local_hit_rate": round(metrics["local_hits"] / lookups, 4) if lookups else 0.0,
+                "local_entries": local_entries,
+            }
+        )
+        return metrics
+
+
+ontology_cache = OntologyResolutionCache()
+
+
+def cached_ontology_lookup(
+    type_key: str,
+    kind: str,
+    term: Any,
+    compute: Callable[[], Any],
+    search_type: str = "icontains",
+    extra: Optional[tuple] = None,
+) -> Any:
+    """Convenience wrapper keying a lookup by type, normalised term, search type and extras."""
+    parts = (ontology_cache.normalise_term(term, search_type), search_type) + tuple(extra or ())
+    return ontology_cache.get_or_compute(type_key, kind, parts, compute)
+
+
+def invalidate_ontology_model(model) -> list[str]:
+    """Bump the version stamp of every ontology type backed by ``model``; returns the bumped type keys."""
+    type_keys = registry.get_type_keys_for_model(model)
+    for type_key in type_keys:
+        ontology_cache.bump_version(type_key)
+    return type_keys
@@ -200,6 +200,14 @@ class OntologyRegistry:
     def get(self, type_key: str) -> OntologyDescriptor | None:
         return self._descriptors.get(type_key)
 
+    def descriptors(self) -> list[OntologyDescriptor]:
+        return list(self._descriptors.values())
+
+    def get_type_keys_for_model(self, model) -> list[str]:
+        """Return every type_key backed by the given ontology model (used for cache invalidation)."""
+        label = model._meta.label
+        return [d.type_key for d in self._descriptors.values() if d.model_label == label]
+
     def choices(self) -> list[tuple[str, str]]:
         return [d.choices_tuple for d in self._descriptors.values()]
 
@@ -207,6 +215,9 @@ class OntologyRegistry:
         desc = self.get(type_key)
         return desc.model if desc else None
 
+    def get_sdrf_names(self) -> list[str]:
+        return list(self._sdrf_mappings)
+
     def get_sdrf_mappings(self, sdrf_name: str) -> list[SdrfMapping]:
         """Return all SdrfMappings registered for the given SDRF ontology short-name."""
         return self._sdrf_mappings.get(sdrf_name, [])
@@ -219,10 +230,22 @@ class OntologyRegistry:
         search_type: str = "icontains",
         custom_filters: dict | None = None,
     ) -> list[dict]:
+        """Return ontology suggestions, served from the shared ontology cache when possible."""
+        from .ontology_cache import cached_ontology_lookup
+
         desc = self.get(type_key)
         if not desc:
             return []
-        return desc.get_suggestions(search_term, limit, search_type, custom_filters)
+        return list(
+            cached_ontology_lookup(
+                type_key,
+                "suggestions",
+                search_term,
+                lambda: desc.get_suggestions(search_term, limit, search_type, custom_filters),
+                search_type=search_type,
+                extra=(limit, custom_filters or {}),
+            )
+        )
 
     def serialize(self, type_key: str, data: dict) -> dict:
         desc = self.get(type_key)
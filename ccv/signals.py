@@ -2,10 +2,20 @@
 Django signals for CUPCAKE Vanilla metadata models.
 """
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from .models import MetadataColumn, MetadataTableTemplate, SamplePool
+from .favourite_index import invalidate_favourite_index
+from .models import (
+    FavouriteMetadataOption,
+    MetadataColumn,
+    MetadataColumnCatalogueEntry,
+    MetadataColumnTemplate,
+    MetadataTableTemplate,
+    SamplePool,
+)
+from .ontology_cache import invalidate_ontology_model, ontology_cache
+from .ontology_registry import registry
 
 
 @receiver(post_save, sender=MetadataTableTemplate)
@@ -49,3 +59,82 @@ def update_pooled_sample_columns_on_pool_save(sender, instance, **kwargs):
     except Exception:
         # Silently continue if there's an issue updating pooled columns
         pass
+
+
+@receiver(pre_save, sender=FavouriteMetadataOption)
+def remember_favourite_scope(sender, instance, **kwargs):
+    """
+    Remember the scope a favourite had before this save so a move between
+    user, lab group and global scopes also invalidates the old index.
+    """
+    instance._pre_save_scope = None
+    if instance.pk:
+        instance._pre_save_scope = (
+            sender.objects.filter(pk=instance.pk).values_list("user_id", "lab_group_id", "is_global").first()
+        )
+
+
+@receiver(post_save, sender=FavouriteMetadataOption)
+def invalidate_favourite_index_on_save(sender, instance, **kwargs):
+    """Drop cached favourites indexes affected by a saved favourite."""
+    previous_scope = getattr(instance, "_pre_save_scope", None)
+    if previous_scope:
+        invalidate_favourite_index(*previous_scope)
+    invalidate_favourite_index(instance.user_id, instance.lab_group_id, instance.is_global)
+
+
+@receiver(post_delete, sender=FavouriteMetadataOption)
+def invalidate_favourite_index_on_delete(sender, instance, **kwargs):
+    """Drop cached favourites indexes affected by a deleted favourite."""
+    invalidate_favourite_index(instance.user_id, instance.lab_group_id, instance.is_global)
+
+
+@receiver(pre_save, sender=MetadataColumnTemplate)
+def remember_template_catalogue_group(sender, instance, **kwargs):
+    """Remember the catalogue group a template belonged to before this save."""
+    instance._pre_save_catalogue_group = None
+    if instance.pk:
+        instance._pre_save_catalogue_group = (
+            sender.objects.filter(pk=instance.pk).values_list("column_name", "column_type", "visibility").first()
+        )
+
+
+def _refresh_catalogue_groups(groups):
+    catalogue_visibilities = MetadataColumnCatalogueEntry.CATALOGUE_VISIBILITIES
+    if not any(visibility in catalogue_visibilities for _, _, visibility in groups):
+        return
+    for column_name, column_type in {(name, column_type) for name, column_type, _ in groups}:
+        MetadataColumnCatalogueEntry.refresh(column_name, column_type)
+
+
+@receiver(post_save, sender=MetadataColumnTemplate)
+def refresh_column_catalogue_on_save(sender, instance, **kwargs):
+    """Refresh the materialised column catalogue groups touched by a saved template."""
+    groups = [(instance.column_name, instance.column_type, instance.visibility)]
+    previous_group = getattr(instance, "_pre_save_catalogue_group", None)
+    if previous_group:
+        groups.append(previous_group)
+    _refresh_catalogue_groups(groups)
+
+
+@receiver(post_delete, sender=MetadataColumnTemplate)
+def refresh_column_catalogue_on_delete(sender, instance, **kwargs):
+    """Refresh the materialised column catalogue group of a deleted template."""
+    _refresh_catalogue_groups([(instance.column_name, instance.column_type, instance.visibility)])
+
+
+def invalidate_ontology_cache_on_save(sender, instance, **kwargs):
+    """Bump the ontology cache version when an individual ontology term is edited."""
+    if not ontology_cache.invalidation_suspended:
+        invalidate_ontology_model(sender)
+
+
+# Only post_save is connected: a post_delete receiver would force Django off the fast
+# bulk-delete path used by the loader commands. Deletes invalidate explicitly instead,
+# in the loaders and in the ontology admins (the ontology API is read-only).
+for _model_label in {descriptor.model_label for descriptor in registry.descriptors()}:
+    post_save.connect(
+        invalidate_ontology_cache_on_save,
+        sender=_model_label,
+        dispatch_uid=f"invalidate_ontology_cache_{_model_label}",
+    )
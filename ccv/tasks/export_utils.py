@@ -7,7 +7,6 @@ sync views and async RQ tasks.
 
 import io
 import json
-import re
 import traceback
 import zipfile
 from typing import Any, Dict, List, Optional
@@ -19,7 +18,8 @@ from openpyxl.styles import Alignment, Border, PatternFill, Side
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
 
-from ccv.models import FavouriteMetadataOption, MetadataColumn, MetadataTable, SamplePool
+from ccv.favourite_index import format_excel_favourites, resolve_table_favourites
+from ccv.models import MetadataColumn, MetadataTable, SamplePool
 from ccv.utils import sort_metadata, sort_pool_metadata
 from ccv.utils import validate_sdrf as validate_sdrf_data
 
@@ -544,73 +544,14 @@ def export_excel_template_data(
     # Get pools
     pools = list(metadata_table.sample_pools.all()) if include_pools else []
 
-    # Get favourites for each metadata column based on column names
-    favourites = {}
-
-    def _inner_name(raw: str) -> str:
-        """Return the inner column name, stripping any SDRF type prefix.
-
-        Handles both 'characteristics[organism]' → 'organism' and plain 'organism'.
-        """
-        raw = raw.lower()
-        if "[" in raw and raw.endswith("]"):
-            return raw.split("[", 1)[1][:-1]
-        return raw
-
-    inner_column_names = set(_inner_name(column.name) for column in metadata_columns)
-
-    # FavouriteMetadataOption.name may be stored as either the inner name ('organism')
-    # or the full SDRF name ('characteristics[organism]') depending on which UI path
-    # created it. Include both forms in the regex so we match either storage format.
-    all_name_variants = inner_column_names | {column.name.lower() for column in metadata_columns}
-
-    def _fav_key(name: str) -> str:
-        return _inner_name(name)
-
-    def _build_regex(names):
-        return r"^(" + "|".join(re.escape(n) for n in names) + ")$"
-
-    if inner_column_names:
-        # User-specific favourites
-        user_favourites = FavouriteMetadataOption.objects.filter(
-            user=user,
-            lab_group__isnull=True,
-            name__iregex=_build_regex(all_name_variants),
+    # Resolve favourites for all columns at once from the cached favourites index
+    favourites = format_excel_favourites(
+        resolve_table_favourites(
+            [column.name for column in metadata_columns],
+            user,
+            lab_group_ids=lab_group_ids,
         )
-        for fav in user_favourites:
-            key = _fav_key(fav.name)
-            if key not in favourites:
-                favourites[key] = []
-            favourites[key].append(f"[{fav.id}] {fav.display_value}[*]")
-
-        if lab_group_ids is not None:
-            if lab_group_ids == []:
-                lab_favourites = FavouriteMetadataOption.objects.filter(
-                    lab_group__isnull=False,
-                    name__iregex=_build_regex(all_name_variants),
-                )
-            else:
-                lab_favourites = FavouriteMetadataOption.objects.filter(
-                    lab_group_id__in=lab_group_ids,
-                    name__iregex=_build_regex(all_name_variants),
-                )
-
-            for fav in lab_favourites:
-                key = _fav_key(fav.name)
-                if key not in favourites:
-                    favourites[key] = []
-                favourites[key].append(f"[{fav.id}] {fav.display_value}[**]")
-                if key in ("tissue", "organism part"):
-                    favourites[key].append("not applicable")
-
-        global_favourites = FavouriteMetadataOption.objects.filter(
-            is_global=True, name__iregex=_build_regex(all_name_variants)
-        )
-        for fav in global_favourites:
-            key = _fav_key(fav.name)
-            if key not in favourites:
-                favourites[key] = []
-            favourites[key].append(f"[{fav.id}] {fav.display_value}[***]")
+    )
 
     # Create Excel workbook using existing utility
     try:
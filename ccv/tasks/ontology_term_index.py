@@ -0,0 +1,149 @@
+"""
+Local ontology-term index used to short-circuit OLS lookups during SDRF validation.
+
+sdrf-pipelines validates ontology columns by calling ``OlsClient.search`` once per
+distinct term, which goes to the remote OLS API unless ``use_ols_cache_only`` is
+set. Most terms in our own tables are already known locally, so before validating
+we resolve every candidate term in the parsed SDRF frame against the ontology
+tables in one query per ontology and answer those lookups from memory. Terms that
+are not found locally still fall through to the regular OLS search.
+"""
+
+import contextvars
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Set
+
+from django.db.models.functions import Lower
+
+from ccv.ontology_registry import registry
+
+logger = logging.getLogger(__name__)
+
+TERM_LOOKUP_BATCH_SIZE = 500
+
+_active_index: contextvars.ContextVar[Optional[Dict[str, Set[str]]]] = contextvars.ContextVar(
+    "local_ontology_term_index", default=None
+)
+_original_search = None
+
+
+def extract_candidate_terms(sdrf_df) -> Set[str]:
+    """
+    Collect the lowercased term names (``NT=`` values or plain values) from ontology-bearing columns.
+
+    Args:
+        sdrf_df: Parsed SDRF frame
+
+    Returns:
+        set: Candidate term labels
+    """
+    terms = set()
+    for column in sdrf_df.columns:
+        if "[" not in str(column):
+            continue
+        for raw in sdrf_df[column].dropna().unique():
+            value = str(raw).strip()
+            if not value:
+                continue
+            if "=" in value:
+                for part in value.split(";"):
+                    key, _, term = part.partition("=")
+                    if key.strip().upper() == "NT" and term.strip():
+                        terms.add(term.strip().lower())
+            else:
+                terms.add(value.lower())
+    return terms
+
+
+def _matching_labels(type_key: str, terms: Iterable[str], custom_filter: Optional[dict]) -> Set[str]:
+    descriptor = registry.get(type_key)
+    if not descriptor:
+        return set()
+
+    queryset = descriptor.model.objects.all()
+    if descriptor.obsolete_filter:
+        queryset = queryset.filter(obsolete=False)
+    if custom_filter:
+        queryset = queryset.filter(**custom_filter)
+    queryset = queryset.annotate(_term_label=Lower(descriptor.display_field))
+
+    terms = list(terms)
+    labels = set()
+    for start in range(0, len(terms), TERM_LOOKUP_BATCH_SIZE):
+        batch = terms[start : start + TERM_LOOKUP_BATCH_SIZE]
+        labels.update(queryset.filter(_term_label__in=batch).values_list("_term_label", flat=True))
+    return labels
+
+
+def build_local_term_index(sdrf_df) -> Dict[str, Set[str]]:
+    """
+    Resolve the frame's candidate terms against the local ontology tables.
+
+    Args:
+        sdrf_df: Parsed SDRF frame
+
+    Returns:
+        dict: Mapping of SDRF ontology short-name (e.g. "ncbitaxon") to the set of
+            lowercased labels from the frame that exist locally
+    """
+    terms = extract_candidate_terms(sdrf_df)
+    if not terms:
+        return {}
+
+    index = {}
+    resolved = {}
+    for sdrf_name in registry.get_sdrf_names():
+        labels = set()
+        for mapping in registry.get_sdrf_mappings(sdrf_name):
+            cache_key = (mapping.type_key, repr(sorted((mapping.custom_filter or {}).items())))
+            if cache_key not in resolved:
+                try:
+                    resolved[cache_key] = _matching_labels(mapping.type_key, terms, mapping.custom_filter)
+                except Exception as e:
+                    logger.warning("Local ontology term lookup failed for %s: %s", mapping.type_key, e)
+                    resolved[cache_key] = set()
+            labels |= resolved[cache_key]
+        if labels:
+            index[sdrf_name] = labels
+    return index
+
+
+def _search_with_local_terms(self, term, ontology=None, exact=True, use_ols_cache_only=False, **kwargs):
+    index = _active_index.get()
+    if index and exact and not use_ols_cache_only and term:
+        label = str(term).lower()
+        ontologies = [ontology.lower()] if ontology else list(index)
+        for name in ontologies:
+            if label in index.get(name, ()):
+                return [{"label": label, "ontology_name": name}]
+    return _original_search(self, term, ontology=ontology, exact=exact, use_ols_cache_only=use_ols_cache_only, **kwargs)
+
+
+def _install_search_hook() -> bool:
+    global _original_search
+    if _original_search is not None:
+        return True
+    try:
+        from sdrf_pipelines.ols.ols import OlsClient
+    except ImportError:
+        return False
+    _original_search = OlsClient.search
+    OlsClient.search = _search_with_local_terms
+    return True
+
+
+def activate_local_term_index(index: Optional[Dict[str, Set[str]]]) -> None:
+    """Make ``index`` answer OLS lookups in the current context (used by validation worker processes)."""
+    if index and _install_search_hook():
+        _active_index.set(index)
+
+
+@contextmanager
+def local_term_index(index: Optional[Dict[str, Set[str]]]):
+    """Answer OLS lookups from ``index`` for the duration of the block."""
+    token = _active_index.set(index if index and _install_search_hook() else None)
+    try:
+        yield
+    finally:
+        _active_index.reset(token)
@@ -11,13 +11,43 @@ from django_rq import job
 from ccc.models import AsyncTaskStatus
 from ccv.models import MetadataTable
 
-from .validation_utils import validate_metadata_table, validate_sdrf_file_content
+from .validation_utils import SchemaResultCallback, validate_metadata_table, validate_sdrf_file_content
+
+
+def _stream_schema_results(task_id: str = None) -> SchemaResultCallback | None:
+    """
+    Build a callback that publishes each finished schema's result on the task.
+
+    The partial results are stored on ``AsyncTaskStatus.result`` and pushed over the
+    websocket, so clients see per-schema outcomes before the whole run completes.
+    """
+    if not task_id:
+        return None
+
+    finished = []
+
+    def on_schema_result(schema_result: Dict[str, Any], completed: int, total: int) -> None:
+        finished.append(schema_result)
+        try:
+            task = AsyncTaskStatus.objects.get(id=task_id)
+        except AsyncTaskStatus.DoesNotExist:
+            return
+        task.result = {"partial": True, "schema_results": list(finished)}
+        task.progress_current = completed
+        task.progress_total = total
+        task.progress_description = f"Validated schema '{schema_result['schema_name']}' ({completed}/{total})"
+        task.save(update_fields=["result", "progress_current", "progress_total", "progress_description"])
+        task.send_websocket_update()
+
+    return on_schema_result
 
 
 def validate_metadata_table_sync(
     metadata_table_id: int,
     user_id: int,
     validation_options: Dict[str, Any] = None,
+    on_schema_result: SchemaResultCallback = None,
+    parallel: bool = False,
 ) -> Dict[str, Any]:
     """
     Synchronous version of metadata table validation.
@@ -26,6 +56,8 @@ def validate_metadata_table_sync(
         metadata_table_id: ID of the metadata table to validate
         user_id: ID of the user performing validation
         validation_options: Optional validation configuration
+        on_schema_result: Optional callback invoked with each schema's result as it finishes
+        parallel: Whether schemas may be validated in worker processes
 
     Returns:
         Dict with validation results
@@ -35,7 +67,11 @@ def validate_metadata_table_sync(
         metadata_table = MetadataTable.objects.get(id=metadata_table_id)
 
         result = validate_metadata_table(
-            metadata_table=metadata_table, user=user, validation_options=validation_options or {}
+            metadata_table=metadata_table,
+            user=user,
+            validation_options=validation_options or {},
+            on_schema_result=on_schema_result,
+            parallel=parallel,
         )
 
         return {
@@ -86,6 +122,8 @@ def validate_metadata_table_task(
             metadata_table_id=metadata_table_id,
             user_id=user_id,
             validation_options=validation_options,
+            on_schema_result=_stream_schema_results(task_id),
+            parallel=True,
         )
 
         if not result["success"]:
@@ -165,6 +203,8 @@ def validate_sdrf_file_task(
         result = validate_sdrf_file_content(
             file_content=file_content,
             validation_options=validation_options or {},
+            on_schema_result=_stream_schema_results(task_id),
+            parallel=True,
         )
 
         if task_id:
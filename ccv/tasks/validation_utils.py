@@ -3,8 +3,11 @@ Metadata table validation utilities for SDRF compliance using sdrf_pipelines.
 """
 import io
 import logging
-from typing import Any, Dict
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional
 
+from django.conf import settings
 from django.contrib.auth.models import User
 
 from sdrf_pipelines.sdrf.schemas import SchemaRegistry, SchemaValidator
@@ -12,6 +15,14 @@ from sdrf_pipelines.sdrf.sdrf import read_sdrf
 
 from ccv.models import MetadataTable
 from ccv.tasks.export_utils import export_sdrf_data
+from ccv.tasks.ontology_term_index import activate_local_term_index, build_local_term_index, local_term_index
+
+# Called with (schema_result, completed_count, total_count) as each schema finishes.
+SchemaResultCallback = Callable[[Dict[str, Any], int, int], None]
+
+# Per-process state for schema validation workers, inherited from the parent on fork
+# so the parsed SDRF frame and schema registry are shared rather than re-pickled.
+_worker_state: Dict[str, Any] = {}
 
 
 def _validate_against_schema(
@@ -72,7 +83,117 @@ def _validate_against_schema(
     return schema_result
 
 
-def validate_sdrf_file_content(file_content: str, validation_options: Dict[str, Any] = None) -> Dict[str, Any]:
+def _init_schema_worker(validator: SchemaValidator, sdrf_df, term_index: Optional[dict]) -> None:
+    _worker_state["validator"] = validator
+    _worker_state["sdrf_df"] = sdrf_df
+    activate_local_term_index(term_index)
+
+
+def _validate_schema_in_worker(schema_name: str, use_ols_cache_only: bool, skip_ontology: bool) -> Dict[str, Any]:
+    return _validate_against_schema(
+        validator=_worker_state["validator"],
+        sdrf_df=_worker_state["sdrf_df"],
+        schema_name=schema_name,
+        use_ols_cache_only=use_ols_cache_only,
+        skip_ontology=skip_ontology,
+    )
+
+
+def _schema_worker_count(schema_count: int, parallel: bool) -> int:
+    """
+    Number of processes to validate ``schema_count`` schemas with.
+
+    Workers are forked so they inherit the parsed frame. Only RQ tasks ask for
+    ``parallel``: forking from a threaded web worker risks deadlocks, so requests,
+    platforms without ``fork`` and single-schema runs validate in-process.
+    """
+    max_workers = getattr(settings, "SDRF_VALIDATION_MAX_WORKERS", 2)
+    if not parallel or schema_count < 2 or max_workers < 2 or "fork" not in multiprocessing.get_all_start_methods():
+        return 1
+    return min(schema_count, max_workers)
+
+
+def _run_schema_validations(
+    sdrf_df,
+    schema_names: List[str],
+    use_ols_cache_only: bool,
+    skip_ontology: bool,
+    on_schema_result: Optional[SchemaResultCallback] = None,
+    parallel: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Validate one parsed SDRF frame against several schemas, concurrently where allowed.
+
+    Args:
+        sdrf_df: Parsed SDRF frame shared by every schema
+        schema_names: Schemas to validate against
+        use_ols_cache_only: Whether to use only cached OLS data
+        skip_ontology: Whether to skip ontology validation
+        on_schema_result: Optional callback invoked as each schema finishes
+        parallel: Whether schemas may be validated in forked worker processes
+
+    Returns:
+        List of per-schema results in the order of ``schema_names``
+    """
+    validator = SchemaValidator(SchemaRegistry())
+    term_index = None
+    if not (use_ols_cache_only or skip_ontology):
+        term_index = build_local_term_index(sdrf_df)
+
+    unique_names = list(dict.fromkeys(schema_names))
+    results = {}
+
+    def record(schema_result):
+        results[schema_result["schema_name"]] = schema_result
+        if on_schema_result:
+            on_schema_result(schema_result, len(results), len(unique_names))
+
+    workers = _schema_worker_count(len(unique_names), parallel)
+    if workers == 1:
+        with local_term_index(term_index):
+            for schema_name in unique_names:
+                record(
+                    _validate_against_schema(
+                        validator=validator,
+                        sdrf_df=sdrf_df,
+                        schema_name=schema_name,
+                        use_ols_cache_only=use_ols_cache_only,
+                        skip_ontology=skip_ontology,
+                    )
+                )
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_schema_worker,
+            initargs=(validator, sdrf_df, term_index),
+        ) as pool:
+            futures = {
+                pool.submit(_validate_schema_in_worker, schema_name, use_ols_cache_only, skip_ontology): schema_name
+                for schema_name in unique_names
+            }
+            for future in as_completed(futures):
+                schema_name = futures[future]
+                try:
+                    schema_result = future.result()
+                except Exception as e:
+                    schema_result = {
+                        "schema_name": schema_name,
+                        "success": False,
+                        "errors": [f"Validation error: {str(e)}"],
+                        "warnings": [],
+                    }
+                record(schema_result)
+
+    return [results[schema_name] for schema_name in schema_names]
+
+
+def validate_sdrf_file_content(
+    file_content: str,
+    validation_options: Dict[str, Any] = None,
+    on_schema_result: Optional[SchemaResultCallback] = None,
+    parallel: bool = False,
+) -> Dict[str, Any]:
     """
     Validate raw SDRF file content without persisting anything to the database.
 
@@ -82,6 +203,8 @@ def validate_sdrf_file_content(file_content: str, validation_options: Dict[str,
             - schema_names: List of schema names (default: ["default"])
             - use_ols_cache_only: Use only cached OLS data (default: False)
             - skip_ontology: Skip ontology validation (default: False)
+        on_schema_result: Optional callback invoked with each schema's result as it finishes
+        parallel: Whether schemas may be validated in worker processes (RQ tasks only)
 
     Returns:
         Dict with validation results including per-schema breakdown
@@ -110,21 +233,20 @@ def validate_sdrf_file_content(file_content: str, validation_options: Dict[str,
 
     try:
         sdrf_df = read_sdrf(io.StringIO(file_content))
-        registry = SchemaRegistry()
-        validator = SchemaValidator(registry)
 
         all_errors = []
         all_warnings = []
         passed_count = 0
 
-        for schema_name in schema_names:
-            schema_result = _validate_against_schema(
-                validator=validator,
-                sdrf_df=sdrf_df,
-                schema_name=schema_name,
-                use_ols_cache_only=use_ols_cache_only,
-                skip_ontology=skip_ontology,
-            )
+        schema_results = _run_schema_validations(
+            sdrf_df,
+            schema_names,
+            use_ols_cache_only,
+            skip_ontology,
+            on_schema_result=on_schema_result,
+            parallel=parallel,
+        )
+        for schema_name, schema_result in zip(schema_names, schema_results):
             result["schema_results"].append(schema_result)
 
             if schema_result["success"]:
@@ -148,12 +270,17 @@ def validate_sdrf_file_content(file_content: str, validation_options: Dict[str,
 
 
 def validate_metadata_table(
-    metadata_table: MetadataTable, user: User, validation_options: Dict[str, Any] = None
+    metadata_table: MetadataTable,
+    user: User,
+    validation_options: Dict[str, Any] = None,
+    on_schema_result: Optional[SchemaResultCallback] = None,
+    parallel: bool = False,
 ) -> Dict[str, Any]:
     """
     Validate a metadata table using sdrf_pipelines SchemaValidator.
 
-    Supports validating against multiple schemas simultaneously.
+    Supports validating against multiple schemas simultaneously; with ``parallel``
+    schemas are validated in worker processes sharing one parsed SDRF frame.
 
     Args:
         metadata_table: MetadataTable instance to validate
@@ -163,6 +290,8 @@ def validate_metadata_table(
             - schema_names: List of schema names to validate against (default: ["default"])
             - use_ols_cache_only: Whether to use only cached OLS data (default: False)
             - skip_ontology: Whether to skip ontology validation (default: False)
+        on_schema_result: Optional callback invoked with each schema's result as it finishes
+        parallel: Whether schemas may be validated in worker processes (RQ tasks only)
 
     Returns:
         Dict containing validation results with per-schema breakdown
@@ -228,21 +357,19 @@ def validate_metadata_table(
         sdrf_io = io.StringIO(sdrf_content)
         sdrf_df = read_sdrf(sdrf_io)
 
-        registry = SchemaRegistry()
-        validator = SchemaValidator(registry)
-
         all_errors = []
         all_warnings = []
         passed_count = 0
 
-        for schema_name in schema_names:
-            schema_result = _validate_against_schema(
-                validator=validator,
-                sdrf_df=sdrf_df,
-                schema_name=schema_name,
-                use_ols_cache_only=use_ols_cache_only,
-                skip_ontology=skip_ontology,
-            )
+        schema_results = _run_schema_validations(
+            sdrf_df,
+            schema_names,
+            use_ols_cache_only,
+            skip_ontology,
+            on_schema_result=on_schema_result,
+            parallel=parallel,
+        )
+        for schema_name, schema_result in zip(schema_names, schema_results):
             validation_results["schema_results"].append(schema_result)
 
             if schema_result["success"]:
@@ -0,0 +1,97 @@
+"""
+Tests for cache utilities: namespaces, batch API and SCAN-based pattern deletion.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from ccv.cache_utils import (
+    cache_delete_pattern,
+    cache_get,
+    cache_get_many,
+    cache_set,
+    cache_set_many,
+    cache_template_data,
+    cache_user_data,
+    get_cache_key,
+    get_cache_metrics,
+    get_cached_template_data,
+    get_cached_user_data,
+    invalidate_namespace,
+    invalidate_user_cache,
+    reset_cache_metrics,
+)
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class CacheUtilsTest(SimpleTestCase):
+    """Test namespace versioning, batch operations and metrics."""
+
+    def setUp(self):
+        cache.clear()
+        reset_cache_metrics()
+
+    def test_namespace_version_baked_into_key(self):
+        """Invalidating a namespace changes the keys built for it and no other namespace."""
+        key = get_cache_key("item", 1, prefix="cupcake", namespace="cupcake:things")
+        other = get_cache_key("item", 1, prefix="cupcake", namespace="cupcake:others")
+        self.assertEqual(key, get_cache_key("item", 1, prefix="cupcake", namespace="cupcake:things"))
+
+        invalidate_namespace("cupcake:things")
+
+        self.assertNotEqual(key, get_cache_key("item", 1, prefix="cupcake", namespace="cupcake:things"))
+        self.assertEqual(other, get_cache_key("item", 1, prefix="cupcake", namespace="cupcake:others"))
+
+    def test_invalidate_user_cache_uses_namespace(self):
+        """User and template helpers are invalidated without scanning keys."""
+        cache_user_data(1, {"name": "one"})
+        cache_user_data(2, {"name": "two"})
+        cache_template_data(3, {"id": 3})
+
+        self.assertTrue(invalidate_user_cache(1))
+
+        self.assertIsNone(get_cached_user_data(1))
+        self.assertEqual(get_cached_user_data(2), {"name": "two"})
+        self.assertEqual(get_cached_template_data(3), {"id": 3})
+
+    def test_get_many_and_set_many(self):
+        """Batch operations round-trip values and count hits and misses."""
+        self.assertTrue(cache_set_many({"a": 1, "b": 2}))
+
+        self.assertEqual(cache_get_many(["a", "b", "c"]), {"a": 1, "b": 2})
+        self.assertEqual(cache_get_many([]), {})
+
+        metrics = get_cache_metrics()
+        self.assertEqual(metrics["hits"], 2)
+        self.assertEqual(metrics["misses"], 1)
+
+    def test_errors_counted_instead_of_raised(self):
+        """Backend failures are swallowed and recorded as metrics."""
+        with patch("ccv.cache_utils.cache") as broken:
+            broken.get.side_effect = ConnectionError("down")
+            broken.set.side_effect = ConnectionError("down")
+            self.assertIsNone(cache_get("key"))
+            self.assertFalse(cache_set("key", 1))
+
+        metrics = get_cache_metrics()
+        self.assertEqual(metrics["errors"], 2)
+        self.assertEqual(metrics["get_errors"], 1)
+        self.assertEqual(metrics["set_errors"], 1)
+
+    def test_delete_pattern_scans_in_batches(self):
+        """Pattern deletion iterates keys with SCAN and deletes them in batches."""
+        backend = MagicMock()
+        backend.iter_keys.return_value = iter([f"key:{i}" for i in range(1201)])
+
+        with patch("ccv.cache_utils.cache", backend):
+            self.assertTrue(cache_delete_pattern("key:*"))
+
+        backend.keys.assert_not_called()
+        self.assertEqual([len(c.args[0]) for c in backend.delete_many.call_args_list], [500, 500, 201])
+
+    def test_delete_pattern_unsupported_backend(self):
+        """Backends without key iteration report failure instead of raising."""
+        self.assertFalse(cache_delete_pattern("key:*"))
+        self.assertEqual(get_cache_metrics()["delete_pattern_errors"], 1)
@@ -0,0 +1,129 @@
+"""
+Tests for grouped column template listing and the materialised column catalogue.
+"""
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ccv.models import MetadataColumnCatalogueEntry, MetadataColumnTemplate
+from ccv.utils import group_templates_by_column
+
+User = get_user_model()
+
+
+class GroupedByColumnTest(APITestCase):
+    """Test grouping column templates by (column_name, column_type)."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="grouper", password="testpass")
+        self.other_user = User.objects.create_user(username="other", password="testpass")
+        self.client.force_authenticate(user=self.user)
+
+        self.popular = MetadataColumnTemplate.objects.create(
+            name="organism popular",
+            column_name="characteristics[organism]",
+            column_type="characteristics",
+            source_schema="human",
+            usage_count=10,
+            owner=self.user,
+            visibility="public",
+        )
+        self.rare = MetadataColumnTemplate.objects.create(
+            name="organism rare",
+            column_name="characteristics[organism]",
+            column_type="characteristics",
+            source_schema="default",
+            usage_count=1,
+            owner=self.user,
+            visibility="public",
+        )
+        self.duplicate_schema = MetadataColumnTemplate.objects.create(
+            name="organism copy",
+            column_name="characteristics[organism]",
+            column_type="characteristics",
+            source_schema="human",
+            usage_count=0,
+            owner=self.user,
+            visibility="public",
+        )
+        self.private = MetadataColumnTemplate.objects.create(
+            name="disease private",
+            column_name="characteristics[disease]",
+            column_type="characteristics",
+            owner=self.user,
+            visibility="private",
+        )
+        MetadataColumnTemplate.objects.create(
+            name="hidden",
+            column_name="characteristics[hidden]",
+            column_type="characteristics",
+            owner=self.other_user,
+            visibility="private",
+        )
+
+    def test_group_templates_by_column_aggregates_in_one_query(self):
+        """Grouping returns ordered template IDs, distinct schemas and the sample template."""
+        with self.assertNumQueries(2):
+            total, groups = group_templates_by_column(MetadataColumnTemplate.objects.all())
+
+        self.assertEqual(total, 3)
+        organism = next(g for g in groups if g["column_name"] == "characteristics[organism]")
+        self.assertEqual(organism["schema_count"], 3)
+        self.assertEqual(organism["template_ids"], [self.popular.id, self.rare.id, self.duplicate_schema.id])
+        self.assertEqual(organism["schemas"], ["human", "default"])
+        self.assertEqual(organism["sample_template_id"], self.popular.id)
+
+    def test_grouped_by_column_endpoint(self):
+        """The endpoint respects visibility and serialises the most used template."""
+        response = self.client.get(reverse("ccv:metadatacolumntemplate-grouped-by-column"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 2)
+        names = [group["column_name"] for group in response.data["results"]]
+        self.assertEqual(names, ["characteristics[disease]", "characteristics[organism]"])
+        organism = response.data["results"][1]
+        self.assertEqual(organism["sample_template"]["id"], self.popular.id)
+
+    def test_grouped_by_column_paginates(self):
+        """Limit and offset page over groups."""
+        response = self.client.get(reverse("ccv:metadatacolumntemplate-grouped-by-column"), {"limit": 1, "offset": 1})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["column_name"], "characteristics[organism]")
+        self.assertIsNone(response.data["next"])
+
+    def test_catalogue_refreshed_by_template_signals(self):
+        """Saving and deleting templates keeps the catalogue up to date."""
+        entry = MetadataColumnCatalogueEntry.objects.get(column_name="characteristics[organism]")
+        self.assertEqual(entry.schema_count, 3)
+        self.assertEqual(entry.sample_template_id, self.popular.id)
+        self.assertFalse(MetadataColumnCatalogueEntry.objects.filter(column_name="characteristics[disease]").exists())
+
+        self.rare.usage_count = 50
+        self.rare.save()
+        entry.refresh_from_db()
+        self.assertEqual(entry.sample_template_id, self.rare.id)
+
+        self.popular.visibility = "private"
+        self.popular.save()
+        self.duplicate_schema.delete()
+        entry.refresh_from_db()
+        self.assertEqual(entry.template_ids, [self.rare.id])
+
+    def test_grouped_by_column_from_catalogue(self):
+        """The catalogue path serves public templates without regrouping."""
+        MetadataColumnCatalogueEntry.objects.all().delete()
+        MetadataColumnCatalogueEntry.refresh()
+
+        response = self.client.get(
+            reverse("ccv:metadatacolumntemplate-grouped-by-column"), {"catalogue": "true", "search": "organism"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["schemas"], ["human", "default"])
+        self.assertEqual(response.data["results"][0]["sample_template"]["id"], self.popular.id)
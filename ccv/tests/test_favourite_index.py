@@ -0,0 +1,155 @@
+"""
+Tests for the cached favourites index used by Excel dropdowns and typeahead.
+"""
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from ccv.favourite_index import (
+    SCOPE_GLOBAL,
+    SCOPE_USER,
+    format_excel_favourites,
+    get_scope_index,
+    resolve_table_favourites,
+)
+from ccv.models import FavouriteMetadataOption, LabGroup, MetadataColumn, MetadataTable
+from ccv.tasks.export_utils import export_excel_template_data
+from ccv.utils import get_favourite_metadata_options
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class FavouriteIndexTestCase(TestCase):
+    """Test favourites index resolution and signal-driven invalidation."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="favuser", password="testpass")
+        self.lab_group = LabGroup.objects.create(name="Fav Lab", creator=self.user)
+        self.table = MetadataTable.objects.create(name="Fav Table", owner=self.user, sample_count=3)
+        self.organism = MetadataColumn.objects.create(
+            metadata_table=self.table, name="characteristics[organism]", type="characteristics", column_position=0
+        )
+        self.tissue = MetadataColumn.objects.create(
+            metadata_table=self.table, name="characteristics[tissue]", type="characteristics", column_position=1
+        )
+        self.personal = FavouriteMetadataOption.objects.create(
+            user=self.user, name="organism", type="characteristics", value="homo sapiens", display_value="human"
+        )
+        self.group = FavouriteMetadataOption.objects.create(
+            user=self.user,
+            lab_group=self.lab_group,
+            name="characteristics[tissue]",
+            type="characteristics",
+            value="liver",
+            display_value="liver",
+        )
+        self.global_fav = FavouriteMetadataOption.objects.create(
+            name="organism", type="characteristics", value="mus musculus", display_value="mouse", is_global=True
+        )
+
+    def test_resolve_table_favourites_orders_by_provenance(self):
+        """Personal, lab group and global favourites resolve in a single pass."""
+        resolved = resolve_table_favourites(
+            [self.organism.name, self.tissue.name], self.user, lab_group_ids=[self.lab_group.id]
+        )
+
+        self.assertEqual([entry["source"] for entry in resolved["organism"]], ["user", "global"])
+        self.assertEqual([entry["id"] for entry in resolved["tissue"]], [self.group.id])
+
+    def test_format_excel_favourites_matches_export_markers(self):
+        """Excel formatting keeps the id prefix, markers and lab group not applicable entries."""
+        favourites = format_excel_favourites(
+            resolve_table_favourites(
+                [self.organism.name, self.tissue.name], self.user, lab_group_ids=[self.lab_group.id]
+            )
+        )
+
+        self.assertEqual(
+            favourites["organism"],
+            [f"[{self.personal.id}] human[*]", f"[{self.global_fav.id}] mouse[***]"],
+        )
+        self.assertEqual(favourites["tissue"], [f"[{self.group.id}] liver[**]", "not applicable"])
+
+    def test_lab_group_favourites_skipped_without_ids(self):
+        """Lab group favourites are only included when lab group IDs are requested."""
+        resolved = resolve_table_favourites([self.tissue.name], self.user)
+        self.assertNotIn("tissue", resolved)
+
+        resolved = resolve_table_favourites([self.tissue.name], self.user, lab_group_ids=[])
+        self.assertEqual([entry["id"] for entry in resolved["tissue"]], [self.group.id])
+
+    def test_index_served_from_cache(self):
+        """A warm index resolves without touching the database."""
+        resolve_table_favourites([self.organism.name], self.user, lab_group_ids=[self.lab_group.id])
+
+        with self.assertNumQueries(0):
+            resolve_table_favourites([self.organism.name], self.user, lab_group_ids=[self.lab_group.id])
+
+    def test_save_and_delete_invalidate_index(self):
+        """Favourite signals drop the affected scope indexes."""
+        get_scope_index(SCOPE_USER, self.user.pk)
+        new_fav = FavouriteMetadataOption.objects.create(
+            user=self.user, name="organism", type="characteristics", value="rattus", display_value="rat"
+        )
+        ids = [entry["id"] for entry in get_scope_index(SCOPE_USER, self.user.pk)["organism"]]
+        self.assertIn(new_fav.id, ids)
+
+        new_fav.delete()
+        ids = [entry["id"] for entry in get_scope_index(SCOPE_USER, self.user.pk)["organism"]]
+        self.assertNotIn(new_fav.id, ids)
+
+    def test_scope_change_invalidates_previous_scope(self):
+        """Moving a favourite to global scope refreshes both indexes."""
+        get_scope_index(SCOPE_GLOBAL)
+        self.personal.is_global = True
+        self.personal.user = None
+        self.personal.save()
+
+        self.assertNotIn("organism", get_scope_index(SCOPE_USER, self.user.pk))
+        ids = [entry["id"] for entry in get_scope_index(SCOPE_GLOBAL)["organism"]]
+        self.assertIn(self.personal.id, ids)
+
+    def test_get_favourite_metadata_options_uses_index(self):
+        """The legacy helper keeps its name keys and markers."""
+        favourites = get_favourite_metadata_options(self.user, self.lab_group)
+
+        self.assertEqual(favourites["organism"], ["human[*]", "mouse[***]"])
+        self.assertEqual(favourites["characteristics[tissue]"], ["liver[**]"])
+
+    def test_export_excel_template_data_uses_index(self):
+        """Excel template export succeeds with favourites from the index."""
+        result = export_excel_template_data(self.table, self.user, lab_group_ids=[self.lab_group.id])
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["column_count"], 2)
+
+    def test_favourite_options_endpoint(self):
+        """The batch endpoint returns options for every column of the table."""
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.get(
+            f"/api/v1/metadata-tables/{self.table.id}/favourite_options/",
+            {"lab_group_ids": str(self.lab_group.id)},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        columns = {column["id"]: column for column in response.data["columns"]}
+        self.assertEqual(
+            [option["source"] for option in columns[self.organism.id]["options"]],
+            ["user", "global"],
+        )
+        self.assertEqual(columns[self.tissue.id]["options"][0]["display_value"], "liver")
+
+    def test_favourite_options_endpoint_rejects_bad_ids(self):
+        """Non-integer lab group IDs are rejected."""
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        response = client.get(f"/api/v1/metadata-tables/{self.table.id}/favourite_options/", {"lab_group_ids": "x"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
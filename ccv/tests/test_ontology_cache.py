@@ -0,0 +1,153 @@
+"""
+Tests for the two-tier ontology resolution cache.
+"""
+
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from ccv.models import MetadataColumn, MetadataTable, Tissue
+from ccv.ontology_cache import OntologyResolutionCache, invalidate_ontology_model, ontology_cache
+from ccv.ontology_registry import registry
+
+User = get_user_model()
+
+CACHE_SETTINGS = {
+    "ONTOLOGY_CACHE_ENABLED": True,
+    "CACHES": {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+}
+
+
+@override_settings(**CACHE_SETTINGS)
+class OntologyResolutionCacheTest(TestCase):
+    """Test cache tiers, negative caching and version-stamp invalidation."""
+
+    def setUp(self):
+        cache.clear()
+        ontology_cache.clear_local()
+        ontology_cache.reset_metrics()
+        self.liver = Tissue.objects.create(identifier="Liver", accession="UPTI-0001", synonyms="hepar")
+
+    def test_suggestions_served_from_local_tier(self):
+        """Repeated lookups differing only in case hit the process-local tier without queries."""
+        first = registry.get_suggestions("tissue", "liver", limit=5)
+        self.assertEqual([row["identifier"] for row in first], ["Liver"])
+
+        with self.assertNumQueries(0):
+            second = registry.get_suggestions("tissue", "LIVER", limit=5)
+
+        self.assertEqual(second, first)
+        metrics = ontology_cache.metrics()
+        self.assertEqual(metrics["misses"], 1)
+        self.assertEqual(metrics["local_hits"], 1)
+        self.assertEqual(metrics["hit_rate"], 0.5)
+
+    def test_shared_tier_used_by_other_processes(self):
+        """A fresh process-local cache falls back to the shared cache before the database."""
+        registry.get_suggestions("tissue", "liver")
+        other_worker = OntologyResolutionCache()
+
+        with patch("ccv.ontology_registry.OntologyDescriptor.get_suggestions") as compute:
+            with patch("ccv.ontology_cache.ontology_cache", other_worker):
+                registry.get_suggestions("tissue", "liver")
+
+        compute.assert_not_called()
+        self.assertEqual(other_worker.metrics()["shared_hits"], 1)
+
+    def test_key_includes_limit_search_type_and_filters(self):
+        """Lookups with different limits, search types or filters do not share entries."""
+        registry.get_suggestions("tissue", "liver", limit=5)
+        registry.get_suggestions("tissue", "liver", limit=1)
+        registry.get_suggestions("tissue", "liver", search_type="istartswith")
+        registry.get_suggestions("tissue", "liver", custom_filters={"accession": "UPTI-0002"})
+
+        self.assertEqual(ontology_cache.metrics()["misses"], 4)
+
+    def test_negative_results_cached(self):
+        """Misses are cached so unknown terms do not repeatedly scan the table."""
+        self.assertEqual(registry.get_suggestions("tissue", "kidney"), [])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(registry.get_suggestions("tissue", "kidney"), [])
+        self.assertEqual(ontology_cache.metrics()["negative_hits"], 1)
+
+    def test_version_bump_invalidates(self):
+        """Saving an ontology term bumps the version stamp so cached misses are recomputed."""
+        self.assertEqual(registry.get_suggestions("tissue", "kidney"), [])
+        version = ontology_cache.get_version("tissue")
+
+        Tissue.objects.create(identifier="Kidney", accession="UPTI-0002")
+
+        self.assertGreater(ontology_cache.get_version("tissue"), version)
+        self.assertEqual([row["identifier"] for row in registry.get_suggestions("tissue", "kidney")], ["Kidney"])
+
+    def test_suspended_invalidation_and_explicit_bump(self):
+        """Bulk loads suspend per-row invalidation and bump once afterwards."""
+        version = ontology_cache.get_version("tissue")
+        with ontology_cache.suspend_invalidation():
+            Tissue.objects.create(identifier="Heart", accession="UPTI-0003")
+        self.assertEqual(ontology_cache.get_version("tissue"), version)
+
+        self.assertEqual(invalidate_ontology_model(Tissue), ["tissue"])
+        self.assertGreater(ontology_cache.get_version("tissue"), version)
+
+    def test_admin_delete_invalidates(self):
+        """Deleting terms through the admin drops cached lookups for them."""
+        self.assertEqual([row["identifier"] for row in registry.get_suggestions("tissue", "liver")], ["Liver"])
+        tissue_admin = admin.site._registry[Tissue]
+        request = RequestFactory().post("/admin/")
+
+        tissue_admin.delete_model(request, self.liver)
+        self.assertEqual(registry.get_suggestions("tissue", "liver"), [])
+
+        Tissue.objects.create(identifier="Liver lobe", accession="UPTI-0004")
+        self.assertEqual(len(registry.get_suggestions("tissue", "liver")), 1)
+        tissue_admin.delete_queryset(request, Tissue.objects.all())
+        self.assertEqual(registry.get_suggestions("tissue", "liver"), [])
+
+    def test_validate_value_against_ontology_cached(self):
+        """Column validation results are cached per normalised value."""
+        table = MetadataTable.objects.create(name="Cache table", owner=User.objects.create_user("cache-owner"))
+        column = MetadataColumn.objects.create(
+            metadata_table=table, name="characteristics[organism part]", type="characteristics", ontology_type="tissue"
+        )
+
+        self.assertTrue(column.validate_value_against_ontology("UPTI-0001"))
+        with self.assertNumQueries(0):
+            self.assertTrue(column.validate_value_against_ontology("upti-0001"))
+        self.assertFalse(column.validate_value_against_ontology("UPTI-9999"))
+
+    def test_load_ontologies_bumps_loaded_ontology_versions(self):
+        """load_ontologies bumps the version of each ontology it loads."""
+        version = ontology_cache.get_version("mondo")
+        uberon_version = ontology_cache.get_version("uberon")
+        with patch("ccv.management.commands.load_ontologies.Command.load_mondo_disease", return_value=(0, 0)) as loader:
+            call_command("load_ontologies", ontology="mondo", stdout=StringIO())
+
+        loader.assert_called_once()
+        self.assertGreater(ontology_cache.get_version("mondo"), version)
+        self.assertEqual(ontology_cache.get_version("uberon"), uberon_version)
+
+
+@override_settings(**CACHE_SETTINGS)
+class OntologyCacheStatsEndpointTest(APITestCase):
+    """Test the admin-only cache metrics endpoint."""
+
+    def test_cache_stats_requires_admin(self):
+        url = reverse("ccv:ontologysearch-cache-stats")
+        self.client.force_authenticate(user=User.objects.create_user("plain"))
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=User.objects.create_superuser("admin", password="pw"))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("hit_rate", response.data)
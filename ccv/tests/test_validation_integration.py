@@ -4,14 +4,20 @@ Integration tests for metadata table validation functionality.
 Tests validation using real fixture data through import/export workflows.
 """
 
+import io
 from unittest.mock import MagicMock, patch
 
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
 
+from sdrf_pipelines.sdrf.sdrf import read_sdrf
+
+from ccc.models import AsyncTaskStatus
+from ccv.models import Species
 from ccv.tasks.import_utils import import_sdrf_data
-from ccv.tasks.validation_tasks import validate_metadata_table_task
-from ccv.tasks.validation_utils import validate_metadata_table
+from ccv.tasks.ontology_term_index import build_local_term_index, local_term_index
+from ccv.tasks.validation_tasks import _stream_schema_results, validate_metadata_table_task
+from ccv.tasks.validation_utils import validate_metadata_table, validate_sdrf_file_content
 from tests.factories import MetadataTableFactory, QuickTestDataMixin, UserFactory, read_fixture_content
 
 User = get_user_model()
@@ -313,3 +319,73 @@ class ValidationOptionsTest(TestCase, QuickTestDataMixin):
 
         self.assertIsInstance(result_empty, dict)
         self.assertIn("success", result_empty)
+
+
+class ParallelSchemaValidationTest(TestCase):
+    """Test concurrent multi-schema validation, result streaming and the local term index."""
+
+    SDRF_CONTENT = (
+        "source name\tcharacteristics[organism]\tcharacteristics[disease]\n"
+        "sample 1\tHomo sapiens\tNT=normal;AC=PATO:0000461\n"
+    )
+
+    def test_parallel_results_match_sequential(self):
+        """Schemas validated in worker processes report the same results, in request order."""
+        options = {"schema_names": ["human", "default"], "skip_ontology": True}
+        streamed = []
+
+        with override_settings(SDRF_VALIDATION_MAX_WORKERS=1):
+            sequential = validate_sdrf_file_content(self.SDRF_CONTENT, options)
+        with override_settings(SDRF_VALIDATION_MAX_WORKERS=2):
+            parallel = validate_sdrf_file_content(
+                self.SDRF_CONTENT,
+                options,
+                on_schema_result=lambda result, done, total: streamed.append((done, total)),
+                parallel=True,
+            )
+
+        self.assertEqual([r["schema_name"] for r in parallel["schema_results"]], ["human", "default"])
+        self.assertEqual(parallel["schema_results"], sequential["schema_results"])
+        self.assertEqual(parallel["summary"], sequential["summary"])
+        self.assertEqual(sorted(streamed), [(1, 2), (2, 2)])
+
+    @override_settings(SDRF_VALIDATION_MAX_WORKERS=2)
+    @patch("ccv.tasks.validation_utils.ProcessPoolExecutor")
+    def test_request_path_validates_in_process(self, mock_pool):
+        """Without ``parallel`` no worker processes are forked, even for several schemas."""
+        result = validate_sdrf_file_content(
+            self.SDRF_CONTENT, {"schema_names": ["human", "default"], "skip_ontology": True}
+        )
+
+        mock_pool.assert_not_called()
+        self.assertEqual([r["schema_name"] for r in result["schema_results"]], ["human", "default"])
+
+    def test_stream_schema_results_updates_task(self):
+        """Each finished schema is published on the AsyncTaskStatus as a partial result."""
+        user = UserFactory.create_user()
+        task = AsyncTaskStatus.objects.create(task_type="VALIDATE_TABLE", user=user)
+        callback = _stream_schema_results(str(task.id))
+
+        callback({"schema_name": "default", "success": True, "errors": [], "warnings": []}, 1, 2)
+
+        task.refresh_from_db()
+        self.assertTrue(task.result["partial"])
+        self.assertEqual([r["schema_name"] for r in task.result["schema_results"]], ["default"])
+        self.assertEqual((task.progress_current, task.progress_total), (1, 2))
+        self.assertIsNone(_stream_schema_results(None))
+
+    def test_local_term_index_answers_ols_lookups(self):
+        """Terms present in local ontology tables are resolved without calling OLS."""
+        Species.objects.create(code="HUMAN", taxon=9606, official_name="Homo sapiens", common_name="Human")
+        sdrf_df = read_sdrf(io.StringIO(self.SDRF_CONTENT))
+
+        index = build_local_term_index(sdrf_df)
+
+        self.assertEqual(index["ncbitaxon"], {"homo sapiens"})
+        from sdrf_pipelines.ols.ols import OlsClient
+
+        with local_term_index(index):
+            with patch("ccv.tasks.ontology_term_index._original_search") as remote_search:
+                hits = OlsClient.search(MagicMock(), term="homo sapiens", ontology="ncbitaxon", exact=True)
+        remote_search.assert_not_called()
+        self.assertEqual(hits[0]["label"], "homo sapiens")
@@ -11,11 +11,16 @@ import logging
 from pathlib import Path
 from typing import Any, Dict, List, Literal, Optional, Tuple, TypedDict
 
+from django.db import connection
+from django.db.models import Aggregate, Count, JSONField
+from django.db.models.functions import JSONObject
+
 import pandas as pd
 from sdrf_pipelines.sdrf.schemas import SchemaRegistry, SchemaValidator
 from sdrf_pipelines.sdrf.sdrf import read_sdrf
 
-from .models import FavouriteMetadataOption, MetadataColumn, MetadataTable, SamplePool, Schema
+from .favourite_index import PROVENANCE_MARKERS, SCOPE_GLOBAL, SCOPE_LAB_GROUP, SCOPE_USER, get_scope_index
+from .models import MetadataColumn, MetadataTable, SamplePool, Schema
 
 
 class VariationSpecRange(TypedDict, total=False):
@@ -394,48 +399,103 @@ def get_favourite_metadata_options(user: Any, lab_group: Any = None, metadata_na
         Dictionary mapping metadata names to lists of options
     """
     favourites = {}
+    name_filter = metadata_name.lower() if metadata_name else None
+
+    # Personal and lab group scopes exclude global recommendations, which are listed once below
+    scopes = [(get_scope_index(SCOPE_USER, user.pk), PROVENANCE_MARKERS[SCOPE_USER], True)]
+    if lab_group:
+        scopes.append((get_scope_index(SCOPE_LAB_GROUP, lab_group.pk), PROVENANCE_MARKERS[SCOPE_LAB_GROUP], True))
+    scopes.append((get_scope_index(SCOPE_GLOBAL), PROVENANCE_MARKERS[SCOPE_GLOBAL], False))
+
+    for index, marker, exclude_global in scopes:
+        for entries in index.values():
+            for entry in entries:
+                if exclude_global and entry["is_global"]:
+                    continue
+                if name_filter and entry["name"] != name_filter:
+                    continue
+                favourites.setdefault(entry["name"], []).append(f"{entry['display_value'] or entry['value']}{marker}")
 
-    # User-specific favourites
-    user_favourites = FavouriteMetadataOption.objects.filter(user=user, lab_group__isnull=True, is_global=False)
+    return favourites
 
-    # Lab group favourites
-    lab_group_favourites = (
-        FavouriteMetadataOption.objects.filter(lab_group=lab_group, is_global=False)
-        if lab_group
-        else FavouriteMetadataOption.objects.none()
-    )
 
-    # Global favourites
-    global_favourites = FavouriteMetadataOption.objects.filter(is_global=True)
-
-    # Apply metadata name filter if provided
-    if metadata_name:
-        user_favourites = user_favourites.filter(name__iexact=metadata_name)
-        lab_group_favourites = lab_group_favourites.filter(name__iexact=metadata_name)
-        global_favourites = global_favourites.filter(name__iexact=metadata_name)
-
-    # Process user favourites
-    for fav in user_favourites:
-        name_key = fav.name.lower()
-        if name_key not in favourites:
-            favourites[name_key] = []
-        favourites[name_key].append(f"{fav.display_value or fav.value}[*]")
-
-    # Process lab group favourites
-    for fav in lab_group_favourites:
-        name_key = fav.name.lower()
-        if name_key not in favourites:
-            favourites[name_key] = []
-        favourites[name_key].append(f"{fav.display_value or fav.value}[**]")
-
-    # Process global favourites
-    for fav in global_favourites:
-        name_key = fav.name.lower()
-        if name_key not in favourites:
-            favourites[name_key] = []
-        favourites[name_key].append(f"{fav.display_value or fav.value}[***]")
+# ===================================================================
+# COLUMN TEMPLATE GROUPING
+# ===================================================================
 
-    return favourites
+TEMPLATE_GROUP_ORDERING = ("-usage_count", "name", "id")
+
+
+class JSONGroupArray(Aggregate):
+    """SQLite ``json_group_array`` aggregate, the closest equivalent of PostgreSQL ``ARRAY_AGG``."""
+
+    function = "JSON_GROUP_ARRAY"
+    name = "JSONGroupArray"
+    allow_distinct = True
+    output_field = JSONField()
+
+
+def _template_group_annotations() -> Dict[str, Any]:
+    """Build the per-group array aggregations for the active database backend."""
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.aggregates import ArrayAgg
+
+        return {
+            "template_ids": ArrayAgg("id", order_by=TEMPLATE_GROUP_ORDERING),
+            "template_schemas": ArrayAgg("source_schema", order_by=TEMPLATE_GROUP_ORDERING),
+        }
+
+    # SQLite cannot order inside an aggregate before 3.44, so collect the sort
+    # keys alongside each row and order the (small) groups in Python.
+    return {
+        "template_rows": JSONGroupArray(
+            JSONObject(id="id", usage_count="usage_count", name="name", source_schema="source_schema")
+        )
+    }
+
+
+def _unpack_template_group(group: Dict[str, Any]) -> Dict[str, Any]:
+    if "template_rows" in group:
+        rows = sorted(group.pop("template_rows") or [], key=lambda r: (-(r["usage_count"] or 0), r["name"], r["id"]))
+        template_ids = [row["id"] for row in rows]
+        template_schemas = [row["source_schema"] for row in rows]
+    else:
+        template_ids = group.pop("template_ids") or []
+        template_schemas = group.pop("template_schemas") or []
+
+    group["template_ids"] = template_ids
+    group["schemas"] = list(dict.fromkeys(schema for schema in template_schemas if schema))
+    group["sample_template_id"] = template_ids[0] if template_ids else None
+    return group
+
+
+def group_templates_by_column(queryset, offset: int = 0, limit: Optional[int] = None) -> Tuple[int, List[Dict]]:
+    """
+    Group column templates by (column_name, column_type) in a single aggregate query.
+
+    Template IDs and source schemas for every group are collected database-side,
+    ordered by usage so the first template ID is the group's sample template.
+
+    Args:
+        queryset: MetadataColumnTemplate queryset to group (may use joins/DISTINCT)
+        offset: Number of groups to skip
+        limit: Maximum number of groups to return (None for all)
+
+    Returns:
+        Tuple of (total group count, list of group dicts with column_name,
+        column_type, schema_count, schemas, template_ids and sample_template_id)
+    """
+    # Regroup over primary keys so joins in the visibility filter cannot duplicate rows
+    base = queryset.model.objects.filter(id__in=queryset.order_by().values("id"))
+    grouped = (
+        base.values("column_name", "column_type")
+        .annotate(schema_count=Count("id"), **_template_group_annotations())
+        .order_by("column_name", "column_type")
+    )
+
+    total_count = grouped.count()
+    page = grouped[offset : offset + limit] if limit is not None else grouped[offset:]
+    return total_count, [_unpack_template_group(dict(group)) for group in page]
 
 
 # ===================================================================
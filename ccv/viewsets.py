@@ -4,7 +4,6 @@ Django REST Framework ViewSets for CUPCAKE Vanilla metadata management.
 
 import io
 import json
-import re
 
 from django.contrib.auth.models import User
 from django.db import models, transaction
@@ -28,6 +27,7 @@ from sdrf_pipelines.sdrf.schemas import SchemaRegistry as SdrfSchemaRegistry
 
 from ccc.models import LabGroup, ResourceRole, ResourceVisibility
 
+from .favourite_index import format_excel_favourites, normalise_favourite_name, resolve_table_favourites
 from .models import (
     BTOTerm,
     CellOntology,
@@ -36,6 +36,7 @@ from .models import (
     FavouriteMetadataOption,
     HumanDisease,
     MetadataColumn,
+    MetadataColumnCatalogueEntry,
     MetadataColumnTemplate,
     MetadataColumnTemplateShare,
     MetadataTable,
@@ -52,6 +53,7 @@ from .models import (
     UberonAnatomy,
     Unimod,
 )
+from .ontology_cache import ontology_cache
 from .ontology_registry import registry
 from .permissions import MetadataColumnAccessPermission, MetadataTableAccessPermission
 from .sdrf_defaults import (
@@ -113,6 +115,7 @@ from .utils import (
     SampleVariationGenerator,
     apply_ontology_mapping_to_column,
     detect_ontology_type,
+    group_templates_by_column,
     parse_sn_source_names,
     sort_metadata,
     validate_sdrf,
@@ -510,6 +513,56 @@ class MetadataTableViewSet(FilterMixin, viewsets.ModelViewSet):
         serializer = self.get_serializer(queryset, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=["get"])
+    def favourite_options(self, request, pk=None):
+        """
+        Get favourite options for every column of this table in one call.
+
+        Query parameters:
+            lab_group_ids: Comma-separated lab group IDs to include group favourites,
+                or "all" for every lab group. Omit to skip lab group favourites.
+        """
+        table = self.get_object()
+
+        lab_group_ids = None
+        lab_group_param = request.query_params.get("lab_group_ids")
+        if lab_group_param is not None:
+            if lab_group_param.strip().lower() == "all":
+                lab_group_ids = []
+            else:
+                try:
+                    lab_group_ids = [int(value) for value in lab_group_param.split(",") if value.strip()]
+                except ValueError:
+                    return Response(
+                        {"error": "lab_group_ids must be a comma-separated list of integers or 'all'"},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+
+        columns = list(table.columns.order_by("column_position").values("id", "name"))
+        resolved = resolve_table_favourites([column["name"] for column in columns], request.user, lab_group_ids)
+
+        return Response(
+            {
+                "metadata_table_id": table.id,
+                "columns": [
+                    {
+                        "id": column["id"],
+                        "name": column["name"],
+                        "options": [
+                            {
+                                "id": entry["id"],
+                                "value": entry["value"],
+                                "display_value": entry["display_value"],
+                                "source": entry["source"],
+                            }
+                            for entry in resolved.get(normalise_favourite_name(column["name"]), [])
+                        ],
+                    }
+                    for column in columns
+                ],
+            }
+        )
+
     @action(detail=False, methods=["post"])
     def combine_columnwise(self, request):
         """
@@ -3003,73 +3056,17 @@ class MetadataManagementViewSet(viewsets.GenericViewSet):
             # We'll use the same metadata structure but organize by pool
             pass
 
-        # Get favourites for each metadata column based on column names
-        favourites = {}
-
-        def _inner_name(raw: str) -> str:
-            raw = raw.lower()
-            if "[" in raw and raw.endswith("]"):
-                return raw.split("[", 1)[1][:-1]
-            return raw
-
-        def _fav_key(name: str) -> str:
-            return _inner_name(name)
-
-        def _build_regex(names):
-            return r"^(" + "|".join(re.escape(n) for n in names) + ")$"
-
-        inner_column_names = set(_inner_name(column.name) for column in metadata_columns)
-
-        if not inner_column_names:
+        if not metadata_columns:
             return Response({"error": "No metadata columns found"}, status=400)
 
-        all_name_variants = inner_column_names | {column.name.lower() for column in metadata_columns}
-
-        # User-specific favourites
-        user_favourites = FavouriteMetadataOption.objects.filter(
-            user=request.user,
-            lab_group__isnull=True,
-            name__iregex=_build_regex(all_name_variants),
-        )
-        for fav in user_favourites:
-            key = _fav_key(fav.name)
-            if key not in favourites:
-                favourites[key] = []
-            favourites[key].append(f"[{fav.id}] {fav.display_value}[*]")
-
-        # Lab group favourites
-        lab_group_ids = data.get("lab_group_ids")
-        if lab_group_ids is not None:  # Check for None vs empty list
-            if lab_group_ids == []:
-                # Empty list means "all lab groups"
-                lab_favourites = FavouriteMetadataOption.objects.filter(
-                    lab_group__isnull=False,
-                    name__iregex=_build_regex(all_name_variants),
-                )
-            else:
-                # Specific lab group IDs
-                lab_favourites = FavouriteMetadataOption.objects.filter(
-                    lab_group_id__in=lab_group_ids,
-                    name__iregex=_build_regex(all_name_variants),
-                )
-
-            for fav in lab_favourites:
-                key = _fav_key(fav.name)
-                if key not in favourites:
-                    favourites[key] = []
-                favourites[key].append(f"[{fav.id}] {fav.display_value}[**]")
-                if key in ("tissue", "organism part"):
-                    favourites[key].append("not applicable")
-
-        # Global recommendations
-        global_favourites = FavouriteMetadataOption.objects.filter(
-            is_global=True, name__iregex=_build_regex(inner_column_names)
+        # Resolve favourites for all columns at once from the cached favourites index
+        favourites = format_excel_favourites(
+            resolve_table_favourites(
+                [column.name for column in metadata_columns],
+                request.user,
+                lab_group_ids=data.get("lab_group_ids"),
+            )
         )
-        for fav in global_favourites:
-            key = _fav_key(fav.name)
-            if key not in favourites:
-                favourites[key] = []
-            favourites[key].append(f"[{fav.id}] {fav.display_value}[***]")
 
         # Create Excel workbook with multiple sheets (original CUPCAKE structure)
         wb = Workbook()
@@ -4993,27 +4990,8 @@ class MetadataColumnTemplateViewSet(FilterMixin, viewsets.ModelViewSet):
         - is_system_template: Filter by system templates only
         - limit: Max groups to return (default 10, max 100)
         - offset: Pagination offset
+        - catalogue: Serve from the materialised catalogue of public/global templates
         """
-        from django.db.models import Count, Min
-
-        queryset = self.get_queryset()
-
-        is_system_template = request.query_params.get("is_system_template")
-        if is_system_template is not None:
-            queryset = queryset.filter(is_system_template=is_system_template.lower() == "true")
-
-        search = request.query_params.get("search", "")
-        if search and len(search) >= 3:
-            queryset = queryset.filter(column_name__icontains=search)
-
-        grouped = (
-            queryset.values("column_name", "column_type")
-            .annotate(schema_count=Count("id"), first_id=Min("id"))
-            .order_by("column_name", "column_type")
-        )
-
-        total_count = grouped.count()
-
         try:
             limit = min(int(request.query_params.get("limit", 10)), 100)
             offset = int(request.query_params.get("offset", 0))
@@ -5021,32 +4999,47 @@ class MetadataColumnTemplateViewSet(FilterMixin, viewsets.ModelViewSet):
             limit = 10
             offset = 0
 
-        grouped_list = list(grouped[offset : offset + limit])
-
-        results = []
-        for group in grouped_list:
-            templates_in_group = queryset.filter(column_name=group["column_name"], column_type=group["column_type"])
-
-            schemas = list(templates_in_group.values_list("source_schema", flat=True).distinct())
-            schemas = [s for s in schemas if s]
-
-            template_ids = list(templates_in_group.values_list("id", flat=True))
-
-            sample_template = templates_in_group.first()
-            sample_serializer = (
-                MetadataColumnTemplateSerializer(sample_template, context={"request": request})
-                if sample_template
-                else None
+        search = request.query_params.get("search", "")
+        is_system_template = request.query_params.get("is_system_template")
+        use_catalogue = request.query_params.get("catalogue", "false").lower() == "true"
+
+        if use_catalogue and is_system_template is None:
+            entries = MetadataColumnCatalogueEntry.objects.all()
+            if search and len(search) >= 3:
+                entries = entries.filter(column_name__icontains=search)
+            total_count = entries.count()
+            groups = list(
+                entries[offset : offset + limit].values(
+                    "column_name", "column_type", "schema_count", "schemas", "template_ids", "sample_template_id"
+                )
             )
+        else:
+            queryset = self.get_queryset()
+            if is_system_template is not None:
+                queryset = queryset.filter(is_system_template=is_system_template.lower() == "true")
+            if search and len(search) >= 3:
+                queryset = queryset.filter(column_name__icontains=search)
+            total_count, groups = group_templates_by_column(queryset, offset=offset, limit=limit)
+
+        sample_templates = MetadataColumnTemplate.objects.select_related("owner", "lab_group", "schema").in_bulk(
+            [group["sample_template_id"] for group in groups if group["sample_template_id"]]
+        )
 
+        results = []
+        for group in groups:
+            sample_template = sample_templates.get(group["sample_template_id"])
             results.append(
                 {
                     "column_name": group["column_name"],
                     "column_type": group["column_type"],
                     "schema_count": group["schema_count"],
-                    "schemas": schemas,
-                    "template_ids": template_ids,
-                    "sample_template": sample_serializer.data if sample_serializer else None,
+                    "schemas": group["schemas"],
+                    "template_ids": group["template_ids"],
+                    "sample_template": (
+                        MetadataColumnTemplateSerializer(sample_template, context={"request": request}).data
+                        if sample_template
+                        else None
+                    ),
                 }
             )
 
@@ -5530,11 +5523,14 @@ class OntologySearchViewSet(viewsets.ViewSet):
     def _get_ontology_suggestions_unified(
         self, ontology_type: str, search_term: str, limit: int, search_type: str, custom_filters: dict = None
     ):
-        """Get ontology suggestions via the registry."""
-        desc = registry.get(ontology_type)
-        if not desc:
-            return []
-        return desc.build_search_queryset(search_term, search_type, custom_filters)[:limit]
+        """Get ontology suggestions via the registry (served from the ontology cache)."""
+        return registry.get_suggestions(
+            ontology_type,
+            search_term=search_term,
+            limit=limit,
+            search_type=search_type,
+            custom_filters=custom_filters or None,
+        )
 
     def _format_ontology_suggestion(self, result, ontology_type: str, match_type: str):
         """Format a single ontology result into the expected suggestion format."""
@@ -5746,6 +5742,11 @@ class OntologySearchViewSet(viewsets.ViewSet):
             }
         )
 
+    @action(detail=False, methods=["get"], permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        """Return hit-rate metrics for the ontology resolution cache in this process."""
+        return Response(ontology_cache.metrics())
+
 
 class SchemaViewSet(FilterMixin, viewsets.ReadOnlyModelViewSet):
     """
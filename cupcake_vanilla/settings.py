@@ -166,6 +166,14 @@ SESSION_CACHE_ALIAS = "default"
 # Cache time to live is 15 minutes by default
 CACHE_TTL = 60 * 15
 
+# Two-tier ontology lookup cache (see ccv.ontology_cache); test runs against a shared
+# Redis should disable it so results for rolled-back test data do not leak between tests
+ONTOLOGY_CACHE_ENABLED = os.environ.get("ONTOLOGY_CACHE_ENABLED", "True").lower() == "true"
+
+# Worker processes an RQ validation task may fork to check several SDRF schemas at once;
+# validation run inside a web request always stays in-process
+SDRF_VALIDATION_MAX_WORKERS = int(os.environ.get("SDRF_VALIDATION_MAX_WORKERS", "2"))
+
 # RQ (Redis Queue) configuration
 RQ_QUEUES = {
     "default": {
@@ -208,6 +216,16 @@ RQ_QUEUES = {
             "health_check_interval": 30,
         },
     },
+    "mail": {
+        "HOST": REDIS_HOST,
+        "PORT": int(REDIS_PORT),
+        "DB": REDIS_DB_RQ,
+        "PASSWORD": REDIS_PASSWORD or None,
+        "DEFAULT_TIMEOUT": 600,
+        "CONNECTION_KWARGS": {
+            "health_check_interval": 30,
+        },
+    },
 }
 
 
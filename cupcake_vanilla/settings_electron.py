@@ -116,6 +116,16 @@ RQ_QUEUES = {
             "health_check_interval": 30,
         },
     },
+    "mail": {
+        "HOST": REDIS_HOST,
+        "PORT": int(REDIS_PORT),
+        "DB": REDIS_DB_RQ,
+        "PASSWORD": REDIS_PASSWORD or None,
+        "DEFAULT_TIMEOUT": 600,
+        "CONNECTION_KWARGS": {
+            "health_check_interval": 30,
+        },
+    },
 }
 
 # Static files configuration for Electron
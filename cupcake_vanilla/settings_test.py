@@ -24,3 +24,7 @@ CHANNEL_LAYERS = {
         "BACKEND": "channels.layers.InMemoryChannelLayer",
     },
 }
+
+# The ontology cache lives outside the test database, so results for rolled-back test
+# data would leak between tests; cache tests enable it explicitly.
+ONTOLOGY_CACHE_ENABLED = False